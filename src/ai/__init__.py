@@ -1,9 +1,15 @@
 """AI decision making systems."""
 from .faction_ai import FactionAI
 from .ship_ai import ShipAI
-from .trade_routes import SpatialIndex, TradeRouteFinder, TradeOpportunity
+from .trade_routes import SpatialIndex, BodyRelativeIndex, TradeRouteFinder, TradeOpportunity, MarketSnapshot
+from .route_planner import RoutePlanner, TradeTour, TradeLeg
+from .trade_assignment import TradeAssignmentSolver, TradeAssignment, AssignmentMode
+from .planning_pool import PlanningPool
 
 __all__ = [
     'FactionAI', 'ShipAI',
-    'SpatialIndex', 'TradeRouteFinder', 'TradeOpportunity',
+    'SpatialIndex', 'BodyRelativeIndex', 'TradeRouteFinder', 'TradeOpportunity', 'MarketSnapshot',
+    'RoutePlanner', 'TradeTour', 'TradeLeg',
+    'TradeAssignmentSolver', 'TradeAssignment', 'AssignmentMode',
+    'PlanningPool',
 ]
@@ -29,7 +29,17 @@ class DroneBehavior(ShipBehavior):
     When idle, they patrol around their home station.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, station_index=None, supply_index=None) -> None:
+        """Initialize drone behavior.
+
+        Args:
+            station_index: Optional station SpatialIndex used to limit
+                pickup searches to stations within reach
+            supply_index: Optional LocalSupplyIndex. Drones with a local
+                system then only look at their system's candidate stations.
+        """
+        self.station_index = station_index
+        self.supply_index = supply_index
         self.patrol_radius = 0.02  # AU (reduced from 0.05 - keeps drones visible near home)
         self.max_pickup_distance = 0.1  # AU - max distance for pickups
         self.supply_check_threshold = 15  # Check stations below this stock level
@@ -171,12 +181,57 @@ class DroneBehavior(ShipBehavior):
 
         return BehaviorResult(status=BehaviorStatus.RUNNING, wait_time=0.2)  # Faster transitions
 
+    def _stations_in_reach(self, ctx: BehaviorContext):
+        """Yield (entity, Station) pairs that may be within pickup distance.
+
+        Uses the station index when available; otherwise falls back to
+        scanning every station. Callers still check exact distance.
+        """
+        from ...entities.stations import Station
+
+        em = ctx.entity_manager
+        if self.station_index is None:
+            yield from em.get_all_components(Station)
+            return
+
+        for station_id in self.station_index.get_nearby(
+            ctx.position.x, ctx.position.y, self.max_pickup_distance
+        ):
+            entity = em.get_entity(station_id)
+            station = em.get_component(entity, Station) if entity else None
+            if station:
+                yield entity, station
+
+    def _nearest_in_reach(self, ctx: BehaviorContext, home_station, candidates) -> tuple | None:
+        """Pick the closest (station_id, resource) pair within pickup distance.
+
+        Args:
+            candidates: (station_id, resource) pairs in preference order
+        """
+        from ...solar_system.orbits import Position
+
+        best = None
+        best_dist = float('inf')
+        for station_id, resource in candidates:
+            if station_id == home_station.id:
+                continue
+            entity = ctx.get_entity(station_id)
+            station_pos = ctx.entity_manager.get_component(entity, Position) if entity else None
+            if not station_pos:
+                continue
+
+            dist = ctx.position.distance_to(station_pos)
+            if dist <= self.max_pickup_distance and dist < best_dist:
+                best_dist = dist
+                best = (station_id, resource)
+        return best
+
     def _find_pickup_target(self, ctx: BehaviorContext, home_station) -> tuple | None:
         """Find a station with resources needed by home station.
 
         Returns: (station_id, resource_type) or None
         """
-        from ...simulation.production import get_station_input_resources
+        from ..supply_index import station_inputs
         from ...simulation.resources import Inventory
         from ...entities.stations import Station
         from ...solar_system.orbits import Position
@@ -190,7 +245,7 @@ class DroneBehavior(ShipBehavior):
 
         # Get what resources home station needs
         station_type_str = home_station_comp.station_type.value
-        needed_input_types = get_station_input_resources(station_type_str)
+        needed_input_types = station_inputs(station_type_str)
 
         # Find resources that are low
         needed_resources = []
@@ -202,12 +257,22 @@ class DroneBehavior(ShipBehavior):
         if not needed_resources:
             return None
 
+        local_system = ctx.ship.local_system
+        if self.supply_index and local_system:
+            # Only stations in our system that hold a needed resource
+            index = self.supply_index
+            return self._nearest_in_reach(ctx, home_station, (
+                (station_id, resource)
+                for resource in needed_resources
+                for station_id in index.suppliers(ctx.entity_manager, local_system, resource, ctx.game_time)
+            ))
+
         # Find nearby station with these resources
         best_source = None
         best_dist = float('inf')
         best_resource = None
 
-        for entity, station in ctx.entity_manager.get_all_components(Station):
+        for entity, station in self._stations_in_reach(ctx):
             # Skip home station
             if entity.id == home_station.id:
                 continue
@@ -249,7 +314,7 @@ class DroneBehavior(ShipBehavior):
 
         Returns: (station_id, resource_type) or None
         """
-        from ...simulation.production import get_station_input_resources
+        from ..supply_index import station_inputs
         from ...simulation.resources import Inventory
         from ...entities.stations import Station
         from ...solar_system.orbits import Position
@@ -261,11 +326,22 @@ class DroneBehavior(ShipBehavior):
         if not home_inv:
             return None
 
+        local_system = ctx.ship.local_system
+        if self.supply_index and local_system:
+            # Only stations in our system short of something home can spare
+            index = self.supply_index
+            spare = [resource for resource, amount in home_inv.resources.items() if amount > 10]
+            return self._nearest_in_reach(ctx, home_station, (
+                (station_id, resource)
+                for resource in spare
+                for station_id in index.needing(em, local_system, resource, ctx.game_time)
+            ))
+
         best_target = None
         best_dist = float('inf')
         best_resource = None
 
-        for entity, station in em.get_all_components(Station):
+        for entity, station in self._stations_in_reach(ctx):
             if entity.id == home_station.id:
                 continue
 
@@ -291,7 +367,7 @@ class DroneBehavior(ShipBehavior):
 
             # Get what this station needs
             station_type_str = station.station_type.value
-            needed_inputs = get_station_input_resources(station_type_str)
+            needed_inputs = station_inputs(station_type_str)
 
             for resource in needed_inputs:
                 station_amount = station_inv.get(resource)
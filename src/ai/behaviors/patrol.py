@@ -5,10 +5,16 @@ Creates visible activity in the game world.
 """
 from __future__ import annotations
 import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 from uuid import UUID
 
 from .base import ShipBehavior, BehaviorContext, BehaviorResult, BehaviorStatus
 
+if TYPE_CHECKING:
+    from ...core.ecs import EntityManager
+    from ...core.events import EventBus, MarketsUpdatedEvent
+
 
 class PatrolState:
     """State constants for patrol behavior."""
@@ -17,6 +23,136 @@ class PatrolState:
     WAITING = "waiting"
 
 
+@dataclass
+class _Neighborhood:
+    """Patrol targets around one celestial body, nearest first."""
+    position: tuple[float, float]
+    stations: list[tuple[UUID, str]] = field(default_factory=list)  # (target, body it sits at)
+    mixed: list[tuple[UUID, str]] = field(default_factory=list)  # Stations and bodies
+
+
+class PatrolNeighborhoods:
+    """Precomputed patrol targets per celestial body.
+
+    Each body keeps its nearest stations, and nearest stations plus
+    planets/moons, within the patrol radius. Lists are rebuilt lazily
+    after each economy tick (MarketsUpdatedEvent), or every
+    rebuild_interval game days without an event bus, so picking a
+    target never touches the full station set.
+    """
+
+    def __init__(
+        self,
+        max_distance: float = 3.0,
+        per_body: int = 6,
+        rebuild_interval: float = 10.0,
+        event_bus: EventBus | None = None
+    ) -> None:
+        """Initialize the neighborhoods.
+
+        Args:
+            max_distance: Patrol radius in AU
+            per_body: Nearest targets kept per body
+            rebuild_interval: Game days between rebuilds without an event bus
+            event_bus: Optional event bus; economy ticks trigger a rebuild
+        """
+        self.max_distance = max_distance
+        self.per_body = per_body
+        self.rebuild_interval = rebuild_interval
+        self._bodies: dict[str, _Neighborhood] = {}
+        self._next_rebuild: float | None = None  # Rebuild on first use
+
+        if event_bus:
+            from ...core.events import MarketsUpdatedEvent
+            event_bus.subscribe(MarketsUpdatedEvent, self._on_markets_updated)
+
+    def get(self, entity_manager: EntityManager, body_name: str, game_time: float = 0.0) -> _Neighborhood | None:
+        """Get the neighborhood around a body."""
+        self._ensure_built(entity_manager, game_time)
+        return self._bodies.get(body_name)
+
+    def nearest_body(
+        self,
+        entity_manager: EntityManager,
+        position: tuple[float, float],
+        game_time: float = 0.0
+    ) -> str | None:
+        """Name of the body closest to a position."""
+        self._ensure_built(entity_manager, game_time)
+        best = None
+        best_dist = float('inf')
+        px, py = position
+        for name, hood in self._bodies.items():
+            dx = hood.position[0] - px
+            dy = hood.position[1] - py
+            dist = dx * dx + dy * dy
+            if dist < best_dist:
+                best = name
+                best_dist = dist
+        return best
+
+    def _ensure_built(self, entity_manager: EntityManager, game_time: float) -> None:
+        if self._next_rebuild is None or game_time >= self._next_rebuild:
+            self.rebuild(entity_manager)
+            self._next_rebuild = game_time + self.rebuild_interval
+
+    def rebuild(self, entity_manager: EntityManager) -> None:
+        """Recompute every body's nearby targets."""
+        from ...entities.stations import Station
+        from ...entities.celestial import CelestialBody
+        from ...solar_system.orbits import Position
+
+        stations: list[tuple[float, float, UUID, str]] = []
+        for entity, station in entity_manager.get_all_components(Station):
+            pos = entity_manager.get_component(entity, Position)
+            if pos:
+                stations.append((pos.x, pos.y, entity.id, station.parent_body))
+
+        anchors: dict[str, tuple[float, float]] = {}
+        bodies: list[tuple[float, float, UUID, str]] = []
+        for entity, body in entity_manager.get_all_components(CelestialBody):
+            pos = entity_manager.get_component(entity, Position)
+            if not pos:
+                continue
+            anchors[entity.name] = (pos.x, pos.y)
+            # Only patrol to planets and moons, not the sun
+            if body.body_type.value in ('planet', 'moon', 'dwarf_planet'):
+                bodies.append((pos.x, pos.y, entity.id, entity.name))
+
+        limit = self.max_distance * self.max_distance
+        hoods: dict[str, _Neighborhood] = {}
+        for name, (ax, ay) in anchors.items():
+            near_stations = self._nearest(ax, ay, stations, limit)
+            near_bodies = self._nearest(ax, ay, bodies, limit)
+            mixed = sorted(near_stations + near_bodies)[:self.per_body]
+            hoods[name] = _Neighborhood(
+                (ax, ay),
+                stations=[(target, body) for _, target, body in near_stations[:self.per_body]],
+                mixed=[(target, body) for _, target, body in mixed],
+            )
+        self._bodies = hoods
+
+    def _nearest(
+        self,
+        ax: float,
+        ay: float,
+        targets: list[tuple[float, float, UUID, str]],
+        limit: float
+    ) -> list[tuple[float, UUID, str]]:
+        """Targets within the patrol radius of a point as (dist_sq, id, body), nearest first."""
+        found = []
+        for x, y, target, body in targets:
+            dist = (x - ax) ** 2 + (y - ay) ** 2
+            if dist <= limit:
+                found.append((dist, target, body))
+        found.sort(key=lambda t: t[0])
+        return found[:self.per_body]
+
+    def _on_markets_updated(self, event: MarketsUpdatedEvent) -> None:
+        """Rebuild on the next query."""
+        self._next_rebuild = None
+
+
 class PatrolBehavior(ShipBehavior):
     """Behavior for idle ships to patrol between stations.
 
@@ -24,10 +160,18 @@ class PatrolBehavior(ShipBehavior):
     even when not actively trading. This makes the game feel alive.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, event_bus: EventBus | None = None, seed: int | None = None) -> None:
+        """Initialize patrol behavior.
+
+        Args:
+            event_bus: Optional event bus; neighbor lists refresh each economy tick
+            seed: Seed for target and wait-time sampling
+        """
         self.max_patrol_distance = 3.0  # AU
         self.min_wait_time = 0.5  # seconds (reduced from 2.0 for more activity)
         self.max_wait_time = 3.0  # seconds (reduced from 8.0 for more activity)
+        self.rng = random.Random(seed)
+        self.neighborhoods = PatrolNeighborhoods(self.max_patrol_distance, event_bus=event_bus)
 
     @property
     def name(self) -> str:
@@ -37,6 +181,7 @@ class PatrolBehavior(ShipBehavior):
         """Initialize patrol state."""
         ctx.state_data["patrol_state"] = PatrolState.SELECTING_TARGET
         ctx.state_data["patrol_target_id"] = None
+        ctx.state_data["patrol_body"] = None
 
     def update(self, ctx: BehaviorContext) -> BehaviorResult:
         """Update patrol behavior."""
@@ -76,7 +221,7 @@ class PatrolBehavior(ShipBehavior):
         if state == PatrolState.TRAVELING:
             # Arrived - wait before selecting next target
             ctx.state_data["patrol_state"] = PatrolState.WAITING
-            wait_time = random.uniform(self.min_wait_time, self.max_wait_time)
+            wait_time = self.rng.uniform(self.min_wait_time, self.max_wait_time)
             return BehaviorResult(
                 status=BehaviorStatus.RUNNING,
                 wait_time=wait_time,
@@ -89,60 +234,34 @@ class PatrolBehavior(ShipBehavior):
         """Select a destination to patrol to.
 
         Includes both stations and celestial bodies for more varied movement.
-        Prefers nearby targets but occasionally picks farther ones.
+        Targets come from the precomputed neighborhood of the body the ship
+        last patrolled to (or the nearest body on its first pick): the
+        closest one at first, then a random one of the nearest few.
         """
-        from ...entities.stations import Station
-        from ...entities.celestial import CelestialBody
-        from ...solar_system.orbits import Position
-
         em = ctx.entity_manager
-        targets_by_dist: list[tuple] = []
-
-        # Collect stations as targets
-        for entity, station in em.get_all_components(Station):
-            pos = em.get_component(entity, Position)
-            if not pos:
-                continue
-
-            dist = ctx.position.distance_to(pos)
-            if dist > self.max_patrol_distance:
-                continue
-
-            targets_by_dist.append((entity, dist, 'station'))
-
-        # Also collect planets/moons as targets (30% chance to consider)
-        if random.random() < 0.3:
-            for entity, body in em.get_all_components(CelestialBody):
-                # Only patrol to planets and moons, not the sun
-                if body.body_type.value not in ('planet', 'moon', 'dwarf_planet'):
-                    continue
-
-                pos = em.get_component(entity, Position)
-                if not pos:
-                    continue
-
-                dist = ctx.position.distance_to(pos)
-                if dist > self.max_patrol_distance:
-                    continue
-
-                targets_by_dist.append((entity, dist, 'body'))
-
-        if not targets_by_dist:
+        hoods = self.neighborhoods
+
+        body_name = ctx.state_data.get("patrol_body")
+        hood = hoods.get(em, body_name, ctx.game_time) if body_name else None
+        if hood is None:
+            body_name = hoods.nearest_body(em, (ctx.position.x, ctx.position.y), ctx.game_time)
+            hood = hoods.get(em, body_name, ctx.game_time) if body_name else None
+        if hood is None:
             return None
 
-        # Sort by distance
-        targets_by_dist.sort(key=lambda x: x[1])
-
-        # If we're near a target (first one), pick a different one
-        if targets_by_dist[0][1] < 0.1 and len(targets_by_dist) > 1:
-            # Weight towards closer targets but allow farther ones
-            # Take from the first 5 targets (excluding current)
-            candidates = targets_by_dist[1:min(6, len(targets_by_dist))]
-            if candidates:
-                return random.choice(candidates)[0]
+        # Also consider planets/moons as targets (30% chance)
+        pool = hood.mixed if self.rng.random() < 0.3 else hood.stations
+        current = ctx.state_data.get("patrol_target_id")
+        candidates = [c for c in pool if c[0] != current]
+        if not candidates:
+            return None
 
-        # Not near any target - go to closest
-        return targets_by_dist[0][0]
+        # Fresh patrols go to the closest target, later legs wander
+        target_id, target_body = candidates[0] if current is None else self.rng.choice(candidates)
+        target = ctx.get_entity(target_id)
+        if target:
+            ctx.state_data["patrol_body"] = target_body
+        return target
 
     def _navigate_to_target(self, ctx: BehaviorContext, target_id: UUID) -> BehaviorResult:
         """Create navigation result for a station or celestial body."""
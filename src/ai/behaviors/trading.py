@@ -7,6 +7,9 @@ from uuid import UUID
 
 from .base import ShipBehavior, BehaviorContext, BehaviorResult, BehaviorStatus
 
+# Returned by _find_trade_route while a worker process is still planning
+_PLANNING = object()
+
 
 class TradingState:
     """State constants for trading behavior."""
@@ -25,13 +28,36 @@ class TradingBehavior(ShipBehavior):
     Uses the TradeRouteFinder for efficient route discovery.
     """
 
-    def __init__(self, route_finder=None) -> None:
+    def __init__(
+        self,
+        route_finder=None,
+        route_planner=None,
+        assignment_solver=None,
+        planning_pool=None,
+        game_time=None
+    ) -> None:
         """Initialize trading behavior.
 
         Args:
             route_finder: Optional TradeRouteFinder for route discovery
+            route_planner: Optional RoutePlanner for multi-leg tours
+            assignment_solver: Optional TradeAssignmentSolver. When set,
+                routes come from the fleet-wide assignment pass instead of
+                being planned per ship.
+            planning_pool: Optional PlanningPool. When set and the route
+                finder publishes snapshots, tours are planned in worker
+                processes and picked up on a later update.
+            game_time: Optional world GameTime. Reservations expire against
+                it, like those made by TradeSystem; without it they use the
+                context's game time.
         """
+        from ..route_planner import RoutePlanner
+
         self.route_finder = route_finder
+        self.route_planner = route_planner or RoutePlanner()
+        self.assignment_solver = assignment_solver
+        self.planning_pool = planning_pool
+        self.game_time = game_time
         self.min_profit_threshold = 5.0  # Minimum profit per unit to consider
 
     @property
@@ -46,6 +72,16 @@ class TradingBehavior(ShipBehavior):
         ctx.state_data["route_resource"] = None
         ctx.state_data["route_amount"] = 0.0
         ctx.state_data["route_profit"] = 0.0
+        ctx.state_data["tour_legs"] = []  # Remaining (source_id, dest_id) legs
+
+    def on_exit(self, ctx: BehaviorContext) -> None:
+        """Give up any claims on stock and credits when switching away."""
+        if self.planning_pool:
+            self.planning_pool.cancel(ctx.ship_entity.id)
+        route = self._route_from_state(ctx)
+        if route:
+            from ...simulation.trade import release_route
+            release_route(ctx.entity_manager, ctx.ship_entity.id, route)
 
     def update(self, ctx: BehaviorContext) -> BehaviorResult:
         """Update trading behavior."""
@@ -68,6 +104,12 @@ class TradingBehavior(ShipBehavior):
         if state == TradingState.IDLE:
             # Find a new trade route
             route = self._find_trade_route(ctx, cargo)
+            if route is _PLANNING:
+                return BehaviorResult(
+                    status=BehaviorStatus.WAITING,
+                    wait_time=0.5,
+                    message="Waiting for route plan"
+                )
             if route:
                 ctx.state_data["route_source_id"] = route[0]
                 ctx.state_data["route_dest_id"] = route[1]
@@ -76,6 +118,14 @@ class TradingBehavior(ShipBehavior):
                 ctx.state_data["route_profit"] = route[4]
                 ctx.state_data["trade_state"] = TradingState.TRAVELING_TO_BUY
 
+                # Claim the stock and credits so other ships plan around them
+                from ...simulation.trade import reserve_route, RESERVATION_TTL
+                now = self.game_time.total_days if self.game_time is not None else ctx.game_time
+                reserve_route(
+                    ctx.entity_manager, ctx.ship_entity.id,
+                    self._route_from_state(ctx), now + RESERVATION_TTL
+                )
+
                 # Update trader component if exists
                 if trader:
                     from ...simulation.trade import TradeRoute, TradeState
@@ -116,8 +166,13 @@ class TradingBehavior(ShipBehavior):
 
         elif state == TradingState.BUYING:
             # Execute buy
+            from ...simulation.trade import release_route
+            route = self._route_from_state(ctx)
             success = self._execute_buy(ctx, cargo)
             if success:
+                # Stock is aboard - only the buyer's credits stay claimed
+                if route:
+                    release_route(ctx.entity_manager, ctx.ship_entity.id, route, credits=False)
                 ctx.state_data["trade_state"] = TradingState.TRAVELING_TO_SELL
                 dest_id = ctx.state_data.get("route_dest_id")
                 if trader:
@@ -125,8 +180,13 @@ class TradingBehavior(ShipBehavior):
                     trader.state = TradeState.TRAVELING_TO_SELL
                 return self._navigate_to_station(ctx, dest_id)
             else:
-                # Buy failed - reset
+                # Buy failed - reset and drop the rest of the tour
                 ctx.state_data["trade_state"] = TradingState.IDLE
+                ctx.state_data["tour_legs"] = []
+                if self.planning_pool:
+                    self.planning_pool.cancel(ctx.ship_entity.id)
+                if route:
+                    release_route(ctx.entity_manager, ctx.ship_entity.id, route)
                 if trader:
                     trader.current_route = None
                     from ...simulation.trade import TradeState
@@ -143,7 +203,11 @@ class TradingBehavior(ShipBehavior):
 
         elif state == TradingState.SELLING:
             # Execute sell
+            from ...simulation.trade import release_route
             self._execute_sell(ctx, cargo)
+            route = self._route_from_state(ctx)
+            if route:
+                release_route(ctx.entity_manager, ctx.ship_entity.id, route)
             ctx.state_data["trade_state"] = TradingState.IDLE
             if trader:
                 trader.current_route = None
@@ -180,48 +244,150 @@ class TradingBehavior(ShipBehavior):
         return BehaviorResult(status=BehaviorStatus.RUNNING)
 
     def _find_trade_route(self, ctx: BehaviorContext, cargo) -> tuple | None:
-        """Find best trade route.
+        """Find the next trade leg.
+
+        Continues the current tour if its next leg (starting where the last
+        sale happened) is still profitable. Otherwise, with an assignment
+        solver, takes the leg the fleet-wide pass gave this ship and plans
+        the rest of a tour from its destination while the ship flies it;
+        without one, plans a new tour and keeps its remaining legs for later.
 
-        Returns: (source_id, dest_id, resource_type, amount, profit_per_unit) or None
+        Returns: (source_id, dest_id, resource_type, amount, profit_per_unit),
+            None, or _PLANNING while a worker process plans the tour
         """
-        from ...simulation.economy import Market, find_best_trade
-        from ...simulation.resources import Inventory
-        from ...entities.stations import Station
+        route = self._next_tour_leg(ctx, cargo)
+        if route:
+            return route
+
+        if self.assignment_solver:
+            return self._take_assignment(ctx, cargo)
+
+        snapshot = self.route_finder.snapshot if self.route_finder else None
+        if self.planning_pool and snapshot is not None:
+            return self._collect_planned_tour(ctx, cargo, snapshot)
+
+        tour = self.route_planner.plan(
+            ctx.entity_manager,
+            (ctx.position.x, ctx.position.y),
+            cargo.free_space,
+            ctx.ship.max_speed,
+            self.min_profit_threshold,
+            game_time=ctx.game_time,
+        )
+        if not tour:
+            ctx.state_data["tour_legs"] = []
+            return None
 
-        em = ctx.entity_manager
-        best_route = None
-        best_profit = self.min_profit_threshold
+        first = tour.legs[0]
+        ctx.state_data["tour_legs"] = [(leg.source_id, leg.destination_id) for leg in tour.legs[1:]]
+        return (first.source_id, first.destination_id, first.resource, first.amount, first.profit_per_unit)
+
+    def _take_assignment(self, ctx: BehaviorContext, cargo) -> tuple | None:
+        """Fly the assigned leg, or the onward tour planned during the last one."""
+        ship_id = ctx.ship_entity.id
+        assignment = self.assignment_solver.take_assignment(ship_id)
+        if assignment:
+            if self.planning_pool:
+                self.planning_pool.cancel(ship_id)
+            leg = assignment.leg
+            self._plan_onward(ctx, cargo, leg.destination_id)
+            return (leg.source_id, leg.destination_id, leg.resource, leg.amount, leg.profit_per_unit)
+
+        # Ships holding a finished plan are left out of the solve
+        if self.planning_pool and self.planning_pool.is_ready(ship_id):
+            tour = self.planning_pool.take(ship_id)
+            if tour:
+                ctx.state_data["tour_legs"] = [(leg.source_id, leg.destination_id) for leg in tour.legs]
+                return self._next_tour_leg(ctx, cargo)
+        return None
 
-        # Get all stations with markets
-        stations = list(em.get_entities_with(Market, Inventory))
+    def _plan_onward(self, ctx: BehaviorContext, cargo, station_id: UUID) -> None:
+        """Plan a tour starting where the current leg ends.
 
-        for source in stations:
-            source_market = em.get_component(source, Market)
-            source_inv = em.get_component(source, Inventory)
-            if not source_market or not source_inv:
-                continue
+        With a planning pool and a published snapshot the plan runs in a
+        worker while the ship is under way and is collected when it next
+        looks for work.
+        """
+        from ...solar_system.orbits import Position
 
-            for dest in stations:
-                if source.id == dest.id:
-                    continue
+        ctx.state_data["tour_legs"] = []
+        station = ctx.get_entity(station_id)
+        pos = ctx.entity_manager.get_component(station, Position) if station else None
+        if not pos:
+            return
 
-                dest_market = em.get_component(dest, Market)
-                dest_inv = em.get_component(dest, Inventory)
-                if not dest_market or not dest_inv:
-                    continue
+        snapshot = self.route_finder.snapshot if self.route_finder else None
+        if self.planning_pool and snapshot is not None:
+            self.planning_pool.submit(
+                ctx.ship_entity.id, self.route_planner, snapshot, (pos.x, pos.y),
+                cargo.free_space, ctx.ship.max_speed, self.min_profit_threshold, station_id,
+            )
+            return
 
-                trade = find_best_trade(
-                    source_market, source_inv,
-                    dest_market, dest_inv,
-                    cargo.free_space
-                )
+        tour = self.route_planner.plan(
+            ctx.entity_manager, (pos.x, pos.y), cargo.free_space, ctx.ship.max_speed,
+            self.min_profit_threshold, start_id=station_id, game_time=ctx.game_time,
+        )
+        if tour:
+            ctx.state_data["tour_legs"] = [(leg.source_id, leg.destination_id) for leg in tour.legs]
+
+    def _next_tour_leg(self, ctx: BehaviorContext, cargo) -> tuple | None:
+        """Take the next leg of the current tour that is still profitable."""
+        tour_legs = ctx.state_data.get("tour_legs") or []
+        while tour_legs:
+            source_id, dest_id = tour_legs.pop(0)
+            leg = self.route_planner.evaluate_leg(
+                ctx.entity_manager, source_id, dest_id,
+                cargo.free_space, self.min_profit_threshold
+            )
+            if leg:
+                ctx.state_data["tour_legs"] = tour_legs
+                return (leg.source_id, leg.destination_id, leg.resource, leg.amount, leg.profit_per_unit)
+        ctx.state_data["tour_legs"] = []
+        return None
+
+    def _collect_planned_tour(self, ctx: BehaviorContext, cargo, snapshot):
+        """Request a tour from the planning pool, or start the one it finished.
 
-                if trade and trade[2] > best_profit:
-                    resource, amount, profit = trade
-                    best_profit = profit
-                    best_route = (source.id, dest.id, resource, amount, profit)
+        The tour was planned against a snapshot, so every leg - the first
+        included - is re-checked against the live markets before flying it.
+        """
+        pool = self.planning_pool
+        ship_id = ctx.ship_entity.id
+        if pool.is_pending(ship_id):
+            return _PLANNING
+
+        if not pool.is_ready(ship_id):
+            pool.submit(
+                ship_id, self.route_planner, snapshot,
+                (ctx.position.x, ctx.position.y),
+                cargo.free_space, ctx.ship.max_speed, self.min_profit_threshold,
+            )
+            return _PLANNING
 
-        return best_route
+        tour = pool.take(ship_id)
+        if not tour:
+            return None
+
+        ctx.state_data["tour_legs"] = [(leg.source_id, leg.destination_id) for leg in tour.legs]
+        return self._next_tour_leg(ctx, cargo)
+
+    def _route_from_state(self, ctx: BehaviorContext):
+        """Rebuild the current TradeRoute from state data, if any."""
+        from ...simulation.trade import TradeRoute
+
+        source_id = ctx.state_data.get("route_source_id")
+        dest_id = ctx.state_data.get("route_dest_id")
+        resource = ctx.state_data.get("route_resource")
+        if not source_id or not dest_id or not resource:
+            return None
+        return TradeRoute(
+            source_id=source_id,
+            destination_id=dest_id,
+            resource=resource,
+            amount=ctx.state_data.get("route_amount", 0.0),
+            profit_per_unit=ctx.state_data.get("route_profit", 0.0),
+        )
 
     def _navigate_to_station(self, ctx: BehaviorContext, station_id: UUID) -> BehaviorResult:
         """Create navigation result for a station."""
@@ -281,7 +447,8 @@ class TradingBehavior(ShipBehavior):
         if price is None:
             return False
 
-        available = source_inv.get(resource)
+        # Our own claim counts as available; other ships' claims do not
+        available = source_inv.available(resource, ctx.ship_entity.id)
         buy_amount = min(amount, available, cargo.free_space)
 
         if buy_amount <= 0:
@@ -328,9 +495,10 @@ class TradingBehavior(ShipBehavior):
 
         total_value = price * sell_amount
 
-        # Check if market can afford it
-        if dest_market.credits < total_value:
-            total_value = dest_market.credits
+        # Check if market can afford it (credits claimed by other ships are off limits)
+        credits = dest_market.available_credits(ctx.ship_entity.id)
+        if credits < total_value:
+            total_value = credits
             sell_amount = total_value / price if price > 0 else 0
 
         if sell_amount <= 0:
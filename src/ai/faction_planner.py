@@ -0,0 +1,378 @@
+"""Utility-based planning for faction AI.
+
+Each decision cycle a faction's candidate actions - build a station type at
+a body, buy a ship type at an owned shipyard, upgrade an owned station -
+are scored by expected value per credit spent. Bodies with no faction ship
+close enough to build are skipped, as the building system would refuse.
+A candidate's score is memoized together with the inputs it was computed
+from (affordability, the faction's holdings, the body's occupancy and the
+market tightness of the resources involved), so only candidates whose
+inputs changed since the last cycle are rescored. Actions that failed are
+left out of the ranking until those inputs change.
+"""
+from __future__ import annotations
+import math
+import zlib
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..entities.stations import StationType
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+    from ..entities.factions import Faction
+    from ..entities.ships import ShipType
+    from ..simulation.resources import ResourceType
+    from ..systems.building import BuildingSystem
+    from .world_summary import BodySummary, FactionSummary, WorldSummary
+
+
+class ActionKind(Enum):
+    """Kinds of faction actions."""
+    BUILD_STATION = "build_station"
+    BUY_SHIP = "buy_ship"
+    UPGRADE_STATION = "upgrade_station"
+
+
+@dataclass(frozen=True)
+class CandidateAction:
+    """One thing a faction could spend its credits on."""
+    kind: ActionKind
+    station_type: StationType | None = None  # Type to build, or upgrade target
+    body_name: str = ""  # Build location
+    resource_type: ResourceType | None = None  # Deposit for mining stations
+    ship_type: ShipType | None = None
+    station_id: UUID | None = None  # Station to upgrade, or shipyard to buy at
+
+
+@dataclass
+class ScoredAction:
+    """A candidate with its utility."""
+    action: CandidateAction
+    utility: float
+
+
+# Station types the planner builds from scratch; the rest come from upgrades
+BUILDABLE_TYPES = (
+    StationType.OUTPOST,
+    StationType.MINING_STATION,
+    StationType.REFINERY,
+    StationType.FACTORY,
+)
+
+MINING_WEIGHT = 3.0  # Scales deposit value against processed output value
+CLAIMED_DEPOSIT_FACTOR = 0.25  # Value of mining a deposit someone already mines
+UNSUPPLIED_FACTOR = 0.2  # Value of a processing station with no upstream supply
+SHIP_WEIGHT = 2.0  # Scales cargo throughput (capacity x speed)
+SHIPS_PER_STATION = 2  # Fleet size beyond which more ships are worth little
+BUILD_OFFSET = 0.05  # AU from body center, on both axes, where stations are placed
+
+
+def build_position(body: BodySummary) -> tuple[float, float]:
+    """Where a faction places a new station at a body."""
+    return (body.position[0] + BUILD_OFFSET, body.position[1] + BUILD_OFFSET)
+
+
+class FactionPlanner:
+    """Scores candidate faction actions, reusing scores whose inputs are unchanged."""
+
+    def __init__(self, min_utility: float = 0.25) -> None:
+        """Initialize the planner.
+
+        Args:
+            min_utility: Lowest utility worth acting on
+        """
+        self.min_utility = min_utility
+        self.rescored = 0  # Candidates scored from scratch (for profiling)
+        self._memo: dict[UUID, dict[CandidateAction, tuple[tuple, float | None]]] = {}
+        # Inputs each failed action had when it failed, per faction
+        self._failed: dict[UUID, dict[CandidateAction, tuple]] = {}
+        # Best deposit per (body, resources already mined there)
+        self._deposits: dict[tuple[str, frozenset], ResourceType | None] = {}
+
+    def forget(self, faction_id: UUID) -> None:
+        """Drop a faction's memoized scores and failures."""
+        self._memo.pop(faction_id, None)
+        self._failed.pop(faction_id, None)
+
+    def mark_failed(self, faction_id: UUID, action: CandidateAction) -> None:
+        """Leave an action out of later rankings until its inputs change."""
+        entry = self._memo.get(faction_id, {}).get(action)
+        if entry is not None:
+            self._failed.setdefault(faction_id, {})[action] = entry[0]
+
+    def rank(
+        self,
+        faction_id: UUID,
+        faction: Faction,
+        summary: WorldSummary,
+        building: BuildingSystem,
+        entity_manager: EntityManager
+    ) -> list[ScoredAction]:
+        """Rank a faction's affordable candidates by utility, best first.
+
+        Args:
+            faction_id: Faction to plan for
+            faction: Faction component (for affordability)
+            summary: World summary for this decision cycle
+            building: Building system for costs and affordability
+            entity_manager: Entity manager for owned station lookups
+
+        Returns:
+            Candidates above min_utility
+        """
+        holdings = summary.faction(faction_id)
+        if not holdings:
+            return []
+
+        previous = self._memo.get(faction_id, {})
+        failed = self._failed.get(faction_id, {})
+        still_failed: dict[CandidateAction, tuple] = {}
+        memo: dict[CandidateAction, tuple[tuple, float | None]] = {}
+        affordable: dict[tuple, bool] = {}  # Per-cycle can_afford results
+        input_keys: dict[tuple, tuple] = {}  # Per-cycle holdings and tightness keys
+
+        def can_afford(kind: ActionKind, item) -> bool:
+            key = (kind, item)
+            if key not in affordable:
+                if kind == ActionKind.BUY_SHIP:
+                    ok = building.can_afford_ship(faction, item, entity_manager, faction_id)
+                elif kind == ActionKind.UPGRADE_STATION:
+                    ok = building.can_afford_upgrade(faction, item, entity_manager, faction_id)
+                else:
+                    ok = building.can_afford(faction, item, entity_manager, faction_id)
+                affordable[key] = ok
+            return affordable[key]
+
+        ranked: list[ScoredAction] = []
+        for action, context in self._candidates(faction_id, holdings, summary, building, entity_manager):
+            item = action.ship_type if action.kind == ActionKind.BUY_SHIP else action.station_type
+            ok = can_afford(action.kind, item)
+
+            # Holdings and tightness keys depend only on what is built or bought
+            group = (action.kind, item, action.resource_type)
+            keys = input_keys.get(group)
+            if keys is None:
+                keys = (self._holdings_key(action, holdings), self._tightness_key(action, summary))
+                input_keys[group] = keys
+            deps = (ok, keys, context)
+
+            cached = previous.get(action)
+            if cached is not None and cached[0] == deps:
+                utility = cached[1]
+            else:
+                utility = self._score(action, faction_id, holdings, summary, building) if ok else None
+                self.rescored += 1
+            memo[action] = (deps, utility)
+
+            if failed.get(action) == deps:
+                still_failed[action] = deps
+                continue
+            if utility is not None and utility >= self.min_utility:
+                ranked.append(ScoredAction(action, utility))
+
+        self._memo[faction_id] = memo
+        self._failed[faction_id] = still_failed
+        ranked.sort(key=lambda s: s.utility, reverse=True)
+        return ranked
+
+    def _candidates(
+        self,
+        faction_id: UUID,
+        holdings: FactionSummary,
+        summary: WorldSummary,
+        building: BuildingSystem,
+        entity_manager: EntityManager
+    ):
+        """Yield (action, context) pairs; context is the occupancy the score reads."""
+        from ..entities.factions import get_ownership_index
+        from ..entities.stations import Station
+        from ..systems.building import SHIP_COSTS
+
+        for body in summary.bodies.values():
+            if body.full:
+                continue
+            # Building needs one of the faction's ships on site
+            if not building.has_ship_nearby(build_position(body), faction_id, entity_manager):
+                continue
+            mined = frozenset(body.mined)
+            context = (
+                mined,
+                body.station_types.get(StationType.MINING_STATION, 0) > 0,
+                body.station_types.get(StationType.REFINERY, 0) > 0,
+                holdings.stations_at_body.get(body.name, 0) > 0,
+            )
+            for station_type in BUILDABLE_TYPES:
+                resource_type = None
+                if station_type == StationType.MINING_STATION:
+                    resource_type = self._best_deposit(body, mined, building, entity_manager)
+                    if resource_type is None:
+                        continue
+                action = CandidateAction(
+                    ActionKind.BUILD_STATION, station_type=station_type,
+                    body_name=body.name, resource_type=resource_type
+                )
+                yield action, context
+
+        for station_id in get_ownership_index(entity_manager).stations_of(faction_id):
+            entity = entity_manager.get_entity(station_id)
+            station = entity_manager.get_component(entity, Station) if entity else None
+            if not station:
+                continue
+
+            if station.station_type == StationType.SHIPYARD:
+                for ship_type in SHIP_COSTS:
+                    yield CandidateAction(ActionKind.BUY_SHIP, ship_type=ship_type, station_id=station_id), ()
+
+            for target in building.get_available_upgrades(station.station_type):
+                # Upgrading only changes the station type, it adds no extractor
+                if target == StationType.MINING_STATION:
+                    continue
+                action = CandidateAction(
+                    ActionKind.UPGRADE_STATION, station_type=target, station_id=station_id
+                )
+                yield action, (station.station_type,)
+
+    def _best_deposit(
+        self,
+        body: BodySummary,
+        mined: frozenset,
+        building: BuildingSystem,
+        entity_manager: EntityManager
+    ) -> ResourceType | None:
+        """Richest deposit at a body, preferring ones nobody mines yet."""
+        key = (body.name, mined)
+        if key in self._deposits:
+            return self._deposits[key]
+
+        deposits = building.get_body_resources(body.name, entity_manager)
+        unclaimed = [d for d in deposits if d[0] not in mined]
+        pool = unclaimed or deposits
+        best = max(pool, key=lambda d: d[1])[0] if pool else None
+        self._deposits[key] = best
+        return best
+
+    def _holdings_key(self, action: CandidateAction, holdings: FactionSummary) -> tuple:
+        """The parts of a faction's holdings a candidate's score reads."""
+        if action.kind == ActionKind.BUY_SHIP:
+            return (holdings.ship_count >= holdings.station_count * SHIPS_PER_STATION,)
+        owned = holdings.station_types
+        return (
+            owned.get(action.station_type, 0),
+            _supply_factor(action.station_type, owned),
+            holdings.station_count == 0,
+        )
+
+    def _tightness_key(self, action: CandidateAction, summary: WorldSummary) -> tuple:
+        """Market tightness of the resources a candidate's value depends on."""
+        resources = _value_resources(action)
+        return tuple(round(summary.tightness.get(r, 1.0), 1) for r in resources)
+
+    def _score(
+        self,
+        action: CandidateAction,
+        faction_id: UUID,
+        holdings: FactionSummary,
+        summary: WorldSummary,
+        building: BuildingSystem
+    ) -> float | None:
+        """Expected value per thousand credits spent."""
+        tightness = summary.tightness
+
+        if action.kind == ActionKind.BUY_SHIP:
+            from ..entities.ships import SHIP_CONFIGS
+
+            config = SHIP_CONFIGS.get(action.ship_type, {})
+            value = config.get("cargo_capacity", 0) * config.get("max_speed", 0) * SHIP_WEIGHT
+            if holdings.ship_count >= holdings.station_count * SHIPS_PER_STATION:
+                value *= 0.1
+            cost = building.get_ship_cost(action.ship_type)
+            return value * 1000 / cost if cost > 0 else None
+
+        owned = holdings.station_types
+        if action.kind == ActionKind.UPGRADE_STATION:
+            value = _output_value(action.station_type, tightness) * _supply_factor(action.station_type, owned)
+            cost = building.get_upgrade_cost(action.station_type)
+        else:
+            value = self._build_value(action, faction_id, holdings, summary)
+            cost = building.get_cost(action.station_type)
+
+        if value is None or cost <= 0:
+            return None
+
+        # Diminishing returns on types the faction already runs
+        value /= 1 + 0.5 * owned.get(action.station_type, 0)
+        return value * 1000 / cost
+
+    def _build_value(
+        self,
+        action: CandidateAction,
+        faction_id: UUID,
+        holdings: FactionSummary,
+        summary: WorldSummary
+    ) -> float | None:
+        """Value of a new station at a body."""
+        from ..simulation.resources import BASE_PRICES
+
+        body = summary.bodies.get(action.body_name)
+        if not body:
+            return None
+        station_type = action.station_type
+        owned = holdings.station_types
+
+        if station_type == StationType.OUTPOST:
+            # A first foothold matters most
+            value = 50.0 if holdings.station_count == 0 else 10.0 / (1 + owned.get(StationType.OUTPOST, 0))
+        elif station_type == StationType.MINING_STATION:
+            resource = action.resource_type
+            richness = next((r for res, r in body.data.resources if res == resource), 0.0)
+            price = BASE_PRICES.get(resource, 10.0) * summary.tightness.get(resource, 1.0)
+            value = MINING_WEIGHT * richness * math.sqrt(price)
+            if resource in body.mined:
+                value *= CLAIMED_DEPOSIT_FACTOR
+        else:
+            value = _output_value(station_type, summary.tightness) * _supply_factor(station_type, owned)
+            # Prefer sites next to the stations that feed them
+            upstream = StationType.MINING_STATION if station_type == StationType.REFINERY else StationType.REFINERY
+            if body.station_types.get(upstream, 0) == 0:
+                value *= 0.5
+
+        # Prefer closer bodies (less travel time) and ones we already hold
+        value /= 1 + 0.2 * body.data.semi_major_axis
+        if holdings.stations_at_body.get(body.name, 0) > 0:
+            value *= 1.2
+
+        # Stable per-faction jitter so factions don't all pick the same site
+        jitter = zlib.crc32(f"{faction_id}:{body.name}".encode()) / 0xFFFFFFFF
+        return value * (0.9 + 0.2 * jitter)
+
+
+def _value_resources(action: CandidateAction) -> tuple:
+    """Resources whose prices a candidate's value reads."""
+    from ..entities.stations import STATION_CONFIGS
+
+    if action.kind == ActionKind.BUY_SHIP:
+        return ()
+    if action.station_type == StationType.MINING_STATION:
+        return (action.resource_type,)
+    return tuple(STATION_CONFIGS.get(action.station_type, {}).get("sells", ()))
+
+
+def _output_value(station_type: StationType, tightness: dict) -> float:
+    """Market value of one unit of each resource a station type sells."""
+    from ..entities.stations import STATION_CONFIGS
+    from ..simulation.resources import BASE_PRICES
+
+    sells = STATION_CONFIGS.get(station_type, {}).get("sells", ())
+    return sum(BASE_PRICES.get(r, 10.0) * tightness.get(r, 1.0) for r in sells)
+
+
+def _supply_factor(station_type: StationType, owned: dict) -> float:
+    """Discount processing stations the faction has nothing to feed."""
+    if station_type == StationType.REFINERY and not owned.get(StationType.MINING_STATION):
+        return UNSUPPLIED_FACTOR
+    if station_type == StationType.FACTORY and not owned.get(StationType.REFINERY):
+        return UNSUPPLIED_FACTOR
+    return 1.0
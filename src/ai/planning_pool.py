@@ -0,0 +1,104 @@
+"""Trade tour planning in worker processes.
+
+Planning only reads a MarketSnapshot, so it can run on spare cores while
+the main loop keeps ticking. Requests are answered on a later tick: a ship
+submits once, then collects the finished tour when it is next updated.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from .route_planner import RoutePlanner, TradeTour
+    from .trade_routes import MarketSnapshot
+
+
+class PlanningPool:
+    """Answers tour planning requests with a process pool.
+
+    At most one request per ship is outstanding. The executor is created on
+    the first request, so an unused pool costs nothing.
+    """
+
+    def __init__(self, max_workers: int | None = None, executor: Executor | None = None) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Worker processes (defaults to the CPU count)
+            executor: Executor to use instead of a new ProcessPoolExecutor
+        """
+        self.max_workers = max_workers
+        self._executor = executor
+        self._futures: dict[UUID, Future] = {}
+
+    def submit(
+        self,
+        ship_id: UUID,
+        planner: RoutePlanner,
+        snapshot: MarketSnapshot,
+        start_position: tuple[float, float],
+        cargo_capacity: float,
+        speed: float,
+        min_profit: float = 5.0,
+        start_id: UUID | None = None
+    ) -> None:
+        """Queue a tour plan for a ship, replacing any earlier request.
+
+        Args:
+            ship_id: Ship the plan is for
+            planner: Planner whose settings the worker uses
+            snapshot: Market state to plan against
+            start_position: Ship's current (x, y) in AU
+            cargo_capacity: Free cargo space
+            speed: Ship speed in AU per day
+            min_profit: Minimum profit per unit for a leg
+            start_id: Station the tour must start from, or None
+        """
+        self.cancel(ship_id)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._futures[ship_id] = self._executor.submit(
+            planner.plan_snapshot, snapshot, start_position, cargo_capacity, speed, min_profit, start_id
+        )
+
+    def is_pending(self, ship_id: UUID) -> bool:
+        """Check if a ship's plan is still being worked on."""
+        future = self._futures.get(ship_id)
+        return future is not None and not future.done()
+
+    def is_ready(self, ship_id: UUID) -> bool:
+        """Check if a ship's plan is finished and waiting to be taken."""
+        future = self._futures.get(ship_id)
+        return future is not None and future.done()
+
+    def take(self, ship_id: UUID) -> TradeTour | None:
+        """Collect a ship's finished plan.
+
+        Returns:
+            The planned tour, or None if nothing was found, the plan isn't
+            ready, or the worker failed
+        """
+        future = self._futures.get(ship_id)
+        if future is None or not future.done():
+            return None
+
+        del self._futures[ship_id]
+        if future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def cancel(self, ship_id: UUID) -> None:
+        """Drop a ship's outstanding request."""
+        future = self._futures.pop(ship_id, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the workers and drop every outstanding request."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,488 @@
+"""Multi-stop trade route planning.
+
+Builds tours of up to four legs where each sale is chained with the next
+purchase at the same station, so traders stop deadheading home empty.
+Tours are scored by profit per travel-day with a bounded beam search.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+    from .trade_routes import MarketSnapshot
+    from ..simulation.economy import OpportunityIndex
+    from ..simulation.resources import ResourceType
+    from ..solar_system.orbits import Position
+
+
+@dataclass(frozen=True)
+class TradeLeg:
+    """A single buy-at-source, sell-at-destination hop."""
+    source_id: UUID
+    destination_id: UUID
+    resource: ResourceType
+    amount: float
+    profit_per_unit: float
+
+    @property
+    def total_profit(self) -> float:
+        return self.amount * self.profit_per_unit
+
+
+@dataclass
+class TradeTour:
+    """A chain of legs where each destination is the next leg's source."""
+    legs: tuple[TradeLeg, ...]
+    total_profit: float
+    travel_days: float
+
+    @property
+    def profit_per_day(self) -> float:
+        if self.travel_days <= 0:
+            return self.total_profit
+        return self.total_profit / self.travel_days
+
+
+class RoutePlanner:
+    """Plans multi-leg trade tours for a ship.
+
+    Only the cheapest stocked sellers of each resource are tried as the
+    first source, and with an OpportunityIndex only its top buyers are
+    tried as destinations, so a plan never scans every station pair.
+    Leg values and station distances are memoized for the whole tick:
+    every plan made at the same game time shares them, however many
+    ships or partial tours pass through a station.
+    """
+
+    def __init__(
+        self,
+        max_legs: int = 4,
+        beam_width: int = 8,
+        branching: int = 4,
+        dock_days: float = 1.0,
+        seed_sellers: int = 8,
+        opportunity_index: OpportunityIndex | None = None
+    ) -> None:
+        """Initialize the planner.
+
+        Args:
+            max_legs: Longest tour to consider
+            beam_width: Partial tours kept at each depth
+            branching: Best outgoing legs considered per station
+            dock_days: Time spent buying or selling at each stop (days)
+            seed_sellers: Cheapest sellers per resource tried as the first
+                source when there is no built OpportunityIndex
+            opportunity_index: Optional shared index whose sellers seed the
+                search and whose buyers are the candidate destinations
+        """
+        self.max_legs = max_legs
+        self.beam_width = beam_width
+        self.branching = branching
+        self.dock_days = dock_days
+        self.seed_sellers = seed_sellers
+        self.opportunity_index = opportunity_index
+
+        # Memo shared by every plan made at the same game time
+        self._tick: float | None = None
+        self._tick_manager: EntityManager | None = None
+        self._station_positions: dict[UUID, Position] = {}
+        self._memos: dict[tuple[float, float], _LegMemo] = {}
+        self._distances: dict[tuple[UUID, UUID], float] = {}
+
+    def __getstate__(self) -> dict:
+        """Ship only the search settings to worker processes."""
+        state = self.__dict__.copy()
+        state["opportunity_index"] = None
+        state["_tick"] = None
+        state["_tick_manager"] = None
+        state["_station_positions"] = {}
+        state["_memos"] = {}
+        state["_distances"] = {}
+        return state
+
+    def plan(
+        self,
+        entity_manager: EntityManager,
+        start_position: tuple[float, float],
+        cargo_capacity: float,
+        speed: float,
+        min_profit: float = 5.0,
+        start_id: UUID | None = None,
+        game_time: float | None = None
+    ) -> TradeTour | None:
+        """Find the tour with the best profit per travel-day.
+
+        Args:
+            entity_manager: Entity manager for market access
+            start_position: Ship's current (x, y) in AU
+            cargo_capacity: Free cargo space
+            speed: Ship speed in AU per day
+            min_profit: Minimum profit per unit for a leg
+            start_id: Station the first leg must leave from, for a ship
+                already there or on its way; None tries every seed source
+            game_time: Current game time. Plans made at the same time share
+                one memo; None plans from scratch.
+
+        Returns:
+            Best TradeTour, or None if no profitable leg exists
+        """
+        if cargo_capacity <= 0 or speed <= 0:
+            return None
+
+        if game_time is None or game_time != self._tick or entity_manager is not self._tick_manager:
+            self._tick = game_time
+            self._tick_manager = entity_manager
+            self._station_positions = self._collect_stations(entity_manager)
+            self._memos = {}
+            self._distances = {}
+
+        station_positions = self._station_positions
+        if len(station_positions) < 2 or (start_id is not None and start_id not in station_positions):
+            return None
+
+        key = (cargo_capacity, min_profit)
+        memo = self._memos.get(key)
+        if memo is None:
+            sources, destinations = self._index_candidates(station_positions)
+            if sources is None:
+                sources = self._cheapest_sellers(entity_manager, station_positions)
+            memo = _LegMemo(
+                entity_manager, station_positions, cargo_capacity, min_profit, self.branching,
+                sources, destinations, self._distances,
+            )
+            self._memos[key] = memo
+        return self._search(memo, start_position, speed, start_id)
+
+    def plan_snapshot(
+        self,
+        snapshot: MarketSnapshot,
+        start_position: tuple[float, float],
+        cargo_capacity: float,
+        speed: float,
+        min_profit: float = 5.0,
+        start_id: UUID | None = None
+    ) -> TradeTour | None:
+        """Find the best tour using a market snapshot instead of live markets.
+
+        Touches no entities, so it can run in a worker process. Legs reflect
+        the market at snapshot time and should be re-checked with
+        evaluate_leg before they are flown.
+
+        Args:
+            snapshot: Market state captured by TradeRouteFinder
+            start_position: Ship's current (x, y) in AU
+            cargo_capacity: Free cargo space
+            speed: Ship speed in AU per day
+            min_profit: Minimum profit per unit for a leg
+            start_id: Station the first leg must leave from, or None
+
+        Returns:
+            Best TradeTour, or None if no profitable leg exists
+        """
+        from ..solar_system.orbits import Position
+
+        if cargo_capacity <= 0 or speed <= 0 or len(snapshot) < 2:
+            return None
+
+        station_positions = {
+            station_id: Position(x=float(x), y=float(y))
+            for station_id, (x, y) in zip(snapshot.station_ids, snapshot.positions)
+        }
+        if start_id is not None and start_id not in station_positions:
+            return None
+
+        memo = _SnapshotLegMemo(
+            snapshot, station_positions, cargo_capacity, min_profit, self.branching, self.seed_sellers
+        )
+        return self._search(memo, start_position, speed, start_id)
+
+    def _collect_stations(self, entity_manager: EntityManager) -> dict[UUID, Position]:
+        """Positions of every station with a market."""
+        from ..simulation.economy import Market
+        from ..simulation.resources import Inventory
+        from ..solar_system.orbits import Position
+
+        station_positions: dict[UUID, Position] = {}
+        for entity in entity_manager.get_entities_with(Market, Inventory):
+            pos = entity_manager.get_component(entity, Position)
+            if pos:
+                station_positions[entity.id] = pos
+        return station_positions
+
+    def _index_candidates(
+        self,
+        station_positions: dict[UUID, Position]
+    ) -> tuple[list[UUID] | None, list[UUID] | None]:
+        """Sources and destinations from the opportunity index, if built."""
+        index = self.opportunity_index
+        if index is None or not index.is_built:
+            return None, None
+
+        sources: dict[UUID, None] = {}
+        for resource, quotes in index.sellers.items():
+            if not index.buyers.get(resource):
+                continue
+            for quote in quotes:
+                if quote.quantity > 0 and quote.station_id in station_positions:
+                    sources[quote.station_id] = None
+
+        destinations: dict[UUID, None] = {}
+        for quotes in index.buyers.values():
+            for quote in quotes:
+                if quote.quantity > 0 and quote.station_id in station_positions:
+                    destinations[quote.station_id] = None
+        return list(sources), list(destinations)
+
+    def _cheapest_sellers(
+        self,
+        entity_manager: EntityManager,
+        station_positions: dict[UUID, Position]
+    ) -> list[UUID]:
+        """The cheapest stocked sellers of each resource."""
+        from ..simulation.economy import Market
+        from ..simulation.resources import Inventory
+
+        asks: dict[ResourceType, list[tuple[float, UUID]]] = {}
+        for station_id in station_positions:
+            entity = entity_manager.get_entity(station_id)
+            market = entity_manager.get_component(entity, Market)
+            inventory = entity_manager.get_component(entity, Inventory)
+            for resource in market.sells:
+                price = market.get_sell_price(resource)
+                if price is not None and inventory.available(resource) > 0:
+                    asks.setdefault(resource, []).append((price, station_id))
+
+        sources: dict[UUID, None] = {}
+        for quotes in asks.values():
+            quotes.sort(key=lambda quote: quote[0])
+            for _, station_id in quotes[:self.seed_sellers]:
+                sources[station_id] = None
+        return list(sources)
+
+    def _search(
+        self,
+        memo: _LegMemo,
+        start_position: tuple[float, float],
+        speed: float,
+        start_id: UUID | None = None
+    ) -> TradeTour | None:
+        """Beam search over chained legs."""
+        from ..solar_system.orbits import Position
+
+        start = Position(x=start_position[0], y=start_position[1])
+
+        # Depth 1: fly to a seed source (or the given one), then make the first sale
+        beam: list[TradeTour] = []
+        sources = memo.sources if start_id is None else (start_id,)
+        for source_id in sources:
+            legs = memo.legs_from(source_id)
+            if not legs:
+                continue
+            deadhead = memo.transfer_time_from(start, memo.station_positions[source_id], speed)
+            for leg in legs:
+                days = deadhead + memo.transfer_time(source_id, leg.destination_id, speed) + 2 * self.dock_days
+                beam.append(TradeTour((leg,), leg.total_profit, days))
+
+        if not beam:
+            return None
+
+        beam = self._prune(beam)
+        best = beam[0]
+
+        # Deeper: chain each sale with the next purchase at the same station
+        for _ in range(1, self.max_legs):
+            extended: list[TradeTour] = []
+            for tour in beam:
+                last = tour.legs[-1]
+                used = {(leg.source_id, leg.destination_id, leg.resource) for leg in tour.legs}
+                for leg in memo.legs_from(last.destination_id):
+                    if (leg.source_id, leg.destination_id, leg.resource) in used:
+                        continue
+                    days = tour.travel_days + memo.transfer_time(leg.source_id, leg.destination_id, speed) + 2 * self.dock_days
+                    extended.append(TradeTour(tour.legs + (leg,), tour.total_profit + leg.total_profit, days))
+
+            if not extended:
+                break
+
+            beam = self._prune(extended)
+            if beam[0].profit_per_day > best.profit_per_day:
+                best = beam[0]
+
+        return best
+
+    def evaluate_leg(
+        self,
+        entity_manager: EntityManager,
+        source_id: UUID,
+        destination_id: UUID,
+        cargo_capacity: float,
+        min_profit: float = 5.0
+    ) -> TradeLeg | None:
+        """Re-check a planned leg against current market conditions.
+
+        Returns:
+            Updated TradeLeg, or None if the leg is no longer profitable
+        """
+        from ..simulation.economy import Market, find_best_trade
+        from ..simulation.resources import Inventory
+
+        source = entity_manager.get_entity(source_id)
+        dest = entity_manager.get_entity(destination_id)
+        if not source or not dest:
+            return None
+
+        source_market = entity_manager.get_component(source, Market)
+        source_inv = entity_manager.get_component(source, Inventory)
+        dest_market = entity_manager.get_component(dest, Market)
+        dest_inv = entity_manager.get_component(dest, Inventory)
+        if not source_market or not source_inv or not dest_market or not dest_inv:
+            return None
+
+        trade = find_best_trade(source_market, source_inv, dest_market, dest_inv, cargo_capacity)
+        if not trade or trade[2] < min_profit:
+            return None
+
+        resource, amount, profit = trade
+        return TradeLeg(source_id, destination_id, resource, amount, profit)
+
+    def _prune(self, tours: list[TradeTour]) -> list[TradeTour]:
+        """Keep the best tours by profit per day."""
+        tours.sort(key=lambda t: t.profit_per_day, reverse=True)
+        return tours[:self.beam_width]
+
+
+class _LegMemo:
+    """Cache of leg values and station distances, shared for a tick."""
+
+    def __init__(
+        self,
+        entity_manager: EntityManager,
+        station_positions: dict[UUID, Position],
+        cargo_capacity: float,
+        min_profit: float,
+        branching: int,
+        sources: list[UUID],
+        destinations: list[UUID] | None = None,
+        distances: dict[tuple[UUID, UUID], float] | None = None
+    ) -> None:
+        self.entity_manager = entity_manager
+        self.station_positions = station_positions
+        self.cargo_capacity = cargo_capacity
+        self.min_profit = min_profit
+        self.branching = branching
+        self.sources = sources
+        self.destinations = destinations if destinations is not None else list(station_positions)
+        self._legs: dict[UUID, list[TradeLeg]] = {}
+        self._distances = distances if distances is not None else {}
+        self._markets: dict[UUID, tuple] = {}
+
+    def _market(self, station_id: UUID) -> tuple:
+        """Get (Market, Inventory) for a station, cached."""
+        cached = self._markets.get(station_id)
+        if cached is None:
+            from ..simulation.economy import Market
+            from ..simulation.resources import Inventory
+
+            entity = self.entity_manager.get_entity(station_id)
+            cached = (
+                self.entity_manager.get_component(entity, Market),
+                self.entity_manager.get_component(entity, Inventory),
+            )
+            self._markets[station_id] = cached
+        return cached
+
+    def _top_legs(self, legs: list[TradeLeg]) -> list[TradeLeg]:
+        """Keep the most profitable legs."""
+        legs.sort(key=lambda leg: leg.total_profit, reverse=True)
+        return legs[:self.branching]
+
+    def legs_from(self, source_id: UUID) -> list[TradeLeg]:
+        """Get the most profitable legs out of a station."""
+        legs = self._legs.get(source_id)
+        if legs is not None:
+            return legs
+
+        from ..simulation.economy import find_best_trade
+
+        source_market, source_inv = self._market(source_id)
+        legs = []
+        for dest_id in self.destinations:
+            if dest_id == source_id:
+                continue
+            dest_market, dest_inv = self._market(dest_id)
+            trade = find_best_trade(source_market, source_inv, dest_market, dest_inv, self.cargo_capacity)
+            if trade and trade[2] >= self.min_profit:
+                resource, amount, profit = trade
+                legs.append(TradeLeg(source_id, dest_id, resource, amount, profit))
+
+        legs = self._top_legs(legs)
+        self._legs[source_id] = legs
+        return legs
+
+    def transfer_time(self, source_id: UUID, dest_id: UUID, speed: float) -> float:
+        """Travel days between two stations."""
+        key = (source_id, dest_id)
+        distance = self._distances.get(key)
+        if distance is None:
+            distance = self.station_positions[source_id].distance_to(self.station_positions[dest_id])
+            self._distances[key] = distance
+        return distance / speed
+
+    @staticmethod
+    def transfer_time_from(start: Position, end: Position, speed: float) -> float:
+        """Travel days between two positions."""
+        from ..solar_system.orbits import OrbitalMechanics
+
+        return OrbitalMechanics.calculate_transfer_time(start, end, speed)
+
+
+class _SnapshotLegMemo(_LegMemo):
+    """Per-plan leg cache that reads a MarketSnapshot instead of entities."""
+
+    def __init__(
+        self,
+        snapshot: MarketSnapshot,
+        station_positions: dict[UUID, Position],
+        cargo_capacity: float,
+        min_profit: float,
+        branching: int,
+        seed_sellers: int
+    ) -> None:
+        super().__init__(
+            None, station_positions, cargo_capacity, min_profit, branching,
+            self._cheapest_sellers(snapshot, seed_sellers),
+        )
+        self.snapshot = snapshot
+        self._row = {station_id: i for i, station_id in enumerate(snapshot.station_ids)}
+
+    @staticmethod
+    def _cheapest_sellers(snapshot: MarketSnapshot, seed_sellers: int) -> list[UUID]:
+        """The cheapest stocked sellers of each resource."""
+        import numpy as np
+
+        rows: dict[int, None] = {}
+        for res in range(len(snapshot.resources)):
+            asks = snapshot.sell[:, res]
+            stocked = np.flatnonzero(~np.isnan(asks) & (snapshot.stock[:, res] > 0))
+            order = stocked[np.argsort(asks[stocked], kind="stable")][:seed_sellers]
+            for row in order.tolist():
+                rows[row] = None
+        return [snapshot.station_ids[row] for row in rows]
+
+    def legs_from(self, source_id: UUID) -> list[TradeLeg]:
+        """Get the most profitable legs out of a station."""
+        legs = self._legs.get(source_id)
+        if legs is not None:
+            return legs
+
+        snapshot = self.snapshot
+        legs = []
+        for dest, res, amount, profit in snapshot.best_trades_from(self._row[source_id], self.cargo_capacity):
+            if profit >= self.min_profit:
+                legs.append(TradeLeg(source_id, snapshot.station_ids[dest], snapshot.resources[res], amount, profit))
+
+        legs = self._top_legs(legs)
+        self._legs[source_id] = legs
+        return legs
@@ -0,0 +1,180 @@
+"""Per-system supply index for drone logistics.
+
+Drones only work inside their local planetary system, so stations are
+grouped by system with their input resources resolved once. Each system
+keeps per-resource sets of stations with stock to spare and stations
+running low on an input. Sets are refreshed lazily from inventory version
+counters, so a drone query touches only its own system's stations.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+    from ..core.events import EventBus, StationBuiltEvent
+    from ..simulation.resources import Inventory, ResourceType
+
+
+@lru_cache(maxsize=None)
+def station_inputs(station_type: str) -> frozenset:
+    """Input resources for a station type, resolved once per type."""
+    from ..simulation.production import get_station_input_resources
+
+    return frozenset(get_station_input_resources(station_type))
+
+
+@dataclass
+class _StationSupply:
+    """Cached supply state for one station."""
+    station_id: UUID
+    inventory: Inventory
+    inputs: frozenset
+    version: int = -1  # Inventory version the sets below reflect
+    surplus: frozenset = frozenset()  # Resources held above the surplus threshold
+    low: frozenset = frozenset()  # Inputs below the low-stock threshold
+
+
+@dataclass
+class _SystemSupply:
+    """Stations in one planetary system, by resource."""
+    stations: dict[UUID, _StationSupply] = field(default_factory=dict)
+    surplus: dict[ResourceType, set[UUID]] = field(default_factory=dict)
+    low: dict[ResourceType, set[UUID]] = field(default_factory=dict)
+
+    def set_sets(self, entry: _StationSupply, surplus: frozenset, low: frozenset) -> None:
+        """Move a station between per-resource sets."""
+        for resource in entry.surplus - surplus:
+            self.surplus[resource].discard(entry.station_id)
+        for resource in surplus - entry.surplus:
+            self.surplus.setdefault(resource, set()).add(entry.station_id)
+        for resource in entry.low - low:
+            self.low[resource].discard(entry.station_id)
+        for resource in low - entry.low:
+            self.low.setdefault(resource, set()).add(entry.station_id)
+        entry.surplus = surplus
+        entry.low = low
+
+
+class LocalSupplyIndex:
+    """Stations grouped by planetary system with per-resource supply sets.
+
+    Station membership is rebuilt on the first query, when a station is
+    built, and otherwise every rescan_interval game days. Stock changes are
+    picked up from Inventory.version whenever a system is queried.
+    """
+
+    def __init__(
+        self,
+        surplus_threshold: float = 5.0,
+        low_threshold: float = 15.0,
+        rescan_interval: float = 30.0,
+        event_bus: EventBus | None = None
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            surplus_threshold: Stock above which a station can share a resource
+            low_threshold: Stock below which a station needs an input
+            rescan_interval: Game days between station membership rescans
+            event_bus: Optional event bus; new stations trigger a rescan
+        """
+        self.surplus_threshold = surplus_threshold
+        self.low_threshold = low_threshold
+        self.rescan_interval = rescan_interval
+        self._systems: dict[str, _SystemSupply] = {}
+        self._system_of: dict[UUID, str] = {}
+        self._next_rescan = None  # Rescan on first use
+
+        if event_bus:
+            from ..core.events import StationBuiltEvent
+            event_bus.subscribe(StationBuiltEvent, self._on_station_built)
+
+    def system_of(self, station_id: UUID) -> str | None:
+        """Get the planetary system a station was indexed under."""
+        return self._system_of.get(station_id)
+
+    def suppliers(
+        self,
+        entity_manager: EntityManager,
+        system: str,
+        resource: ResourceType,
+        game_time: float = 0.0
+    ) -> set[UUID]:
+        """Stations in a system holding more of a resource than the surplus threshold."""
+        supply = self._refreshed(entity_manager, system, game_time)
+        return supply.surplus.get(resource, set()) if supply else set()
+
+    def needing(
+        self,
+        entity_manager: EntityManager,
+        system: str,
+        resource: ResourceType,
+        game_time: float = 0.0
+    ) -> set[UUID]:
+        """Stations in a system that use a resource and are below the low threshold."""
+        supply = self._refreshed(entity_manager, system, game_time)
+        return supply.low.get(resource, set()) if supply else set()
+
+    def _refreshed(
+        self,
+        entity_manager: EntityManager,
+        system: str,
+        game_time: float
+    ) -> _SystemSupply | None:
+        """Get a system's supply sets, re-reading inventories that changed."""
+        if self._next_rescan is None or game_time >= self._next_rescan:
+            self.rebuild(entity_manager)
+            self._next_rescan = game_time + self.rescan_interval
+
+        supply = self._systems.get(system)
+        if not supply:
+            return None
+
+        for entry in supply.stations.values():
+            if entry.inventory.version != entry.version:
+                self._refresh_station(supply, entry)
+        return supply
+
+    def _refresh_station(self, supply: _SystemSupply, entry: _StationSupply) -> None:
+        """Recompute one station's surplus and low-stock resources."""
+        inv = entry.inventory
+        surplus = frozenset(
+            resource for resource, amount in inv.resources.items()
+            if amount > self.surplus_threshold
+        )
+        low = frozenset(
+            resource for resource in entry.inputs
+            if inv.get(resource) < self.low_threshold
+        )
+        supply.set_sets(entry, surplus, low)
+        entry.version = inv.version
+
+    def rebuild(self, entity_manager: EntityManager) -> None:
+        """Regroup every station by planetary system."""
+        from ..entities.stations import Station
+        from ..simulation.resources import Inventory
+        from ..solar_system.bodies import SolarSystemData
+
+        systems: dict[str, _SystemSupply] = {}
+        system_of: dict[UUID, str] = {}
+        for entity, station in entity_manager.get_all_components(Station):
+            inventory = entity_manager.get_component(entity, Inventory)
+            system = SolarSystemData.get_nearest_planet(station.parent_body)
+            if not inventory or not system:
+                continue
+
+            supply = systems.setdefault(system, _SystemSupply())
+            supply.stations[entity.id] = _StationSupply(
+                entity.id, inventory, station_inputs(station.station_type.value)
+            )
+            system_of[entity.id] = system
+
+        self._systems = systems
+        self._system_of = system_of
+
+    def _on_station_built(self, event: StationBuiltEvent) -> None:
+        """Pick up the new station on the next query."""
+        self._next_rescan = None
@@ -0,0 +1,421 @@
+"""Fleet-level trade assignment.
+
+Matches idle traders to trade opportunities in one batched pass per AI
+tick, so ships stop converging on the same top route. Opportunities are
+read net of the stock and credit reservations held by ships already in
+flight, and a ship reserves its own leg as soon as it takes it.
+"""
+from __future__ import annotations
+import heapq
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import numpy as np
+
+from .route_planner import TradeLeg
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+    from ..simulation.economy import OpportunityIndex, MarketQuote
+    from ..simulation.resources import ResourceType
+
+
+class AssignmentMode(Enum):
+    """How idle traders are matched to opportunities."""
+    GREEDY = "greedy"  # Best (ship, opportunity) pair first
+    AUCTION = "auction"  # Ships bid for opportunities until prices settle
+
+
+@dataclass
+class IdleTrader:
+    """A trader waiting for work."""
+    ship_id: UUID
+    position: tuple[float, float]
+    cargo_space: float
+    speed: float  # AU per day
+
+
+@dataclass
+class TradeAssignment:
+    """A trade leg assigned to a ship."""
+    ship_id: UUID
+    leg: TradeLeg
+    profit_per_day: float
+
+
+@dataclass
+class _Opportunity:
+    """A seller/buyer pair for one resource."""
+    source_id: UUID
+    destination_id: UUID
+    resource: ResourceType
+    profit_per_unit: float
+    leg_distance: float  # AU from source to destination
+
+    @property
+    def supply_key(self) -> tuple[UUID, ResourceType]:
+        return (self.source_id, self.resource)
+
+    @property
+    def demand_key(self) -> tuple[UUID, ResourceType]:
+        return (self.destination_id, self.resource)
+
+
+@dataclass
+class _Pairs:
+    """Seller/buyer pairs built from one OpportunityIndex rebuild."""
+    opportunities: list[_Opportunity]
+    sellers: dict[tuple[UUID, ResourceType], MarketQuote]
+    buyers: dict[tuple[UUID, ResourceType], MarketQuote]
+    positions: dict[UUID, tuple[float, float]]
+    source_xy: np.ndarray     # (m, 2) source station per opportunity
+    leg_distance: np.ndarray  # (m,)
+    profit: np.ndarray        # (m,) profit per unit
+
+
+@dataclass
+class _Market:
+    """Opportunities plus the shared stock and demand they draw on."""
+    opportunities: list[_Opportunity]
+    supply: dict[tuple[UUID, ResourceType], float]  # Unreserved seller stock
+    demand: dict[tuple[UUID, ResourceType], float]  # Unreserved buyer demand
+    positions: dict[UUID, tuple[float, float]]
+    pairs: _Pairs
+    available: np.ndarray  # (m,) units each opportunity could move at solve start
+
+    def amount_for(self, opp: _Opportunity, cargo_space: float) -> float:
+        return min(cargo_space, self.supply[opp.supply_key], self.demand[opp.demand_key])
+
+    def claim(self, opp: _Opportunity, amount: float) -> None:
+        self.supply[opp.supply_key] -= amount
+        self.demand[opp.demand_key] -= amount
+
+
+class TradeAssignmentSolver:
+    """Assigns idle traders to opportunities as an assignment problem.
+
+    Each solve values every (ship, opportunity) pair by profit per travel
+    day, then matches greedily or by auction. Quantities matched earlier in
+    a solve are deducted before later matches, and the results wait here
+    until each ship takes its assignment (and reserves it) on its update.
+
+    With a shared OpportunityIndex the seller/buyer pairs are built once
+    per index rebuild (once per economy tick) rather than per solve, and
+    taken legs are claimed on the index so later solves in the same economy
+    tick see them gone.
+    """
+
+    def __init__(
+        self,
+        mode: AssignmentMode = AssignmentMode.GREEDY,
+        top_k: int = 16,
+        candidates_per_ship: int = 16,
+        dock_days: float = 1.0,
+        min_profit: float = 5.0,
+        opportunity_index: OpportunityIndex | None = None
+    ) -> None:
+        """Initialize the solver.
+
+        Args:
+            mode: Matching strategy
+            top_k: Sellers and buyers considered per resource (without a
+                shared index)
+            candidates_per_ship: Best opportunities kept per ship
+            dock_days: Time spent buying or selling at each stop (days)
+            min_profit: Minimum profit per unit for an opportunity
+            opportunity_index: Index shared with EconomySystem, which
+                rebuilds it. None builds a private index on every solve.
+        """
+        self.mode = mode
+        self.top_k = top_k
+        self.candidates_per_ship = candidates_per_ship
+        self.dock_days = dock_days
+        self.min_profit = min_profit
+        self.opportunity_index = opportunity_index
+        self._assignments: dict[UUID, TradeAssignment] = {}
+
+        # Pairs built from the last index rebuild, keyed by its sellers dict
+        self._pairs_source: dict | None = None
+        self._pairs: _Pairs | None = None
+
+    def take_assignment(self, ship_id: UUID) -> TradeAssignment | None:
+        """Collect a ship's assignment, claiming it on the shared index."""
+        assignment = self._assignments.pop(ship_id, None)
+        if assignment and self.opportunity_index is not None:
+            leg = assignment.leg
+            self.opportunity_index.claim(leg.source_id, leg.destination_id, leg.resource, leg.amount)
+        return assignment
+
+    def solve(
+        self,
+        entity_manager: EntityManager,
+        traders: list[IdleTrader]
+    ) -> dict[UUID, TradeAssignment]:
+        """Assign idle traders to opportunities.
+
+        A ship still holding an untaken assignment keeps it and is not
+        matched again, and its leg stays deducted from the stock and demand
+        other ships are matched against. Untaken assignments of ships no
+        longer in traders are dropped.
+
+        Args:
+            entity_manager: Entity manager for market access
+            traders: Ships waiting for work
+
+        Returns:
+            New assignments keyed by ship ID
+        """
+        waiting = {t.ship_id for t in traders}
+        for ship_id in [ship_id for ship_id in self._assignments if ship_id not in waiting]:
+            del self._assignments[ship_id]
+
+        traders = [
+            t for t in traders
+            if t.ship_id not in self._assignments and t.cargo_space > 0 and t.speed > 0
+        ]
+        if not traders:
+            return {}
+
+        market = self._collect_opportunities(entity_manager)
+        if not market.opportunities:
+            return {}
+
+        candidates = [self._rank_candidates(t, market) for t in traders]
+
+        if self.mode == AssignmentMode.AUCTION:
+            matches = self._match_auction(traders, candidates, market)
+        else:
+            matches = self._match_greedy(traders, candidates, market)
+
+        assigned: dict[UUID, TradeAssignment] = {}
+        for trader_idx, opp_idx in matches:
+            trader = traders[trader_idx]
+            opp = market.opportunities[opp_idx]
+            amount = market.amount_for(opp, trader.cargo_space)
+            if amount <= 0:
+                continue
+
+            market.claim(opp, amount)
+            leg = TradeLeg(opp.source_id, opp.destination_id, opp.resource, amount, opp.profit_per_unit)
+            value = self._value(trader, opp, amount, market.positions)
+            assignment = TradeAssignment(trader.ship_id, leg, value)
+            self._assignments[trader.ship_id] = assignment
+            assigned[trader.ship_id] = assignment
+
+        return assigned
+
+    def _collect_opportunities(self, entity_manager: EntityManager) -> _Market:
+        """Read seller/buyer pairs and their unreserved stock and credits."""
+        from ..simulation.economy import OpportunityIndex
+
+        index = self.opportunity_index
+        if index is None:
+            index = OpportunityIndex(top_k=self.top_k)
+            index.rebuild(entity_manager)
+        elif not index.is_built:
+            index.rebuild(entity_manager)
+
+        if self._pairs is None or self._pairs_source is not index.sellers:
+            self._pairs = self._build_pairs(entity_manager, index)
+            self._pairs_source = index.sellers
+
+        pairs = self._pairs
+        supply = {key: quote.quantity for key, quote in pairs.sellers.items()}
+        demand = {key: quote.quantity for key, quote in pairs.buyers.items()}
+
+        # Legs handed out but not yet taken (and reserved) are spoken for
+        for assignment in self._assignments.values():
+            leg = assignment.leg
+            supply_key = (leg.source_id, leg.resource)
+            demand_key = (leg.destination_id, leg.resource)
+            if supply_key in supply:
+                supply[supply_key] = max(0.0, supply[supply_key] - leg.amount)
+            if demand_key in demand:
+                demand[demand_key] = max(0.0, demand[demand_key] - leg.amount)
+        available = np.array(
+            [min(supply[opp.supply_key], demand[opp.demand_key]) for opp in pairs.opportunities], dtype=float
+        )
+        return _Market(pairs.opportunities, supply, demand, pairs.positions, pairs, available)
+
+    def _build_pairs(self, entity_manager: EntityManager, index: OpportunityIndex) -> _Pairs:
+        """Pair every indexed seller with the buyers that beat min_profit."""
+        from ..solar_system.orbits import Position
+
+        positions: dict[UUID, tuple[float, float]] = {}
+
+        def position_of(station_id: UUID) -> tuple[float, float] | None:
+            if station_id not in positions:
+                entity = entity_manager.get_entity(station_id)
+                pos = entity_manager.get_component(entity, Position) if entity else None
+                if not pos:
+                    return None
+                positions[station_id] = (pos.x, pos.y)
+            return positions[station_id]
+
+        opportunities: list[_Opportunity] = []
+        sellers: dict[tuple[UUID, ResourceType], MarketQuote] = {}
+        buyers_by_key: dict[tuple[UUID, ResourceType], MarketQuote] = {}
+        for resource, seller_quotes in index.sellers.items():
+            buyers = index.buyers.get(resource)
+            if not buyers:
+                continue
+
+            for seller in seller_quotes:
+                source_pos = position_of(seller.station_id)
+                if seller.quantity <= 0 or source_pos is None:
+                    continue
+
+                for buyer in buyers:
+                    profit = buyer.price - seller.price
+                    if profit < self.min_profit:
+                        break  # Buyers are sorted by bid, highest first
+                    if buyer.station_id == seller.station_id:
+                        continue
+                    dest_pos = position_of(buyer.station_id)
+                    if buyer.quantity <= 0 or dest_pos is None:
+                        continue
+
+                    sellers[(seller.station_id, resource)] = seller
+                    buyers_by_key[(buyer.station_id, resource)] = buyer
+                    opportunities.append(_Opportunity(
+                        seller.station_id, buyer.station_id, resource, profit,
+                        _distance(source_pos, dest_pos)
+                    ))
+
+        source_xy = np.array([positions[opp.source_id] for opp in opportunities], dtype=float).reshape(-1, 2)
+        leg_distance = np.array([opp.leg_distance for opp in opportunities], dtype=float)
+        profit = np.array([opp.profit_per_unit for opp in opportunities], dtype=float)
+        return _Pairs(opportunities, sellers, buyers_by_key, positions, source_xy, leg_distance, profit)
+
+    def _value(
+        self,
+        trader: IdleTrader,
+        opp: _Opportunity,
+        amount: float,
+        positions: dict[UUID, tuple[float, float]]
+    ) -> float:
+        """Profit per travel-day of a ship flying an opportunity.
+
+        Deadhead and leg are both flown in a straight line at the ship's
+        speed, the same model _rank_candidates uses.
+        """
+        distance = _distance(trader.position, positions[opp.source_id]) + opp.leg_distance
+        days = distance / trader.speed + 2 * self.dock_days
+        return amount * opp.profit_per_unit / days
+
+    def _rank_candidates(self, trader: IdleTrader, market: _Market) -> list[tuple[float, int]]:
+        """Best opportunities for one ship as (value, index), highest first."""
+        pairs = market.pairs
+        amount = np.minimum(market.available, trader.cargo_space)
+        deadhead = np.hypot(
+            pairs.source_xy[:, 0] - trader.position[0], pairs.source_xy[:, 1] - trader.position[1]
+        )
+        days = (deadhead + pairs.leg_distance) / trader.speed + 2 * self.dock_days
+        values = amount * pairs.profit / days
+
+        valid = np.flatnonzero(amount > 0)
+        if valid.size > self.candidates_per_ship:
+            top = np.argpartition(-values[valid], self.candidates_per_ship - 1)[:self.candidates_per_ship]
+            valid = valid[top]
+        ranked = [(float(values[idx]), int(idx)) for idx in valid]
+        ranked.sort(reverse=True)
+        return ranked
+
+    def _match_greedy(
+        self,
+        traders: list[IdleTrader],
+        candidates: list[list[tuple[float, int]]],
+        market: _Market
+    ) -> list[tuple[int, int]]:
+        """Take the best remaining pair, re-valuing as quantities are claimed."""
+        heap = [
+            (-value, trader_idx, opp_idx)
+            for trader_idx, ranked in enumerate(candidates)
+            for value, opp_idx in ranked
+        ]
+        heapq.heapify(heap)
+
+        # Claim against copies - solve() replays the matches on the real pools
+        remaining = _Market(
+            market.opportunities, dict(market.supply), dict(market.demand),
+            market.positions, market.pairs, market.available,
+        )
+        matched: set[int] = set()
+        matches: list[tuple[int, int]] = []
+
+        while heap:
+            neg_value, trader_idx, opp_idx = heapq.heappop(heap)
+            if trader_idx in matched:
+                continue
+
+            trader = traders[trader_idx]
+            opp = market.opportunities[opp_idx]
+            amount = remaining.amount_for(opp, trader.cargo_space)
+            if amount <= 0:
+                continue
+
+            # Earlier matches may have shrunk this pair - requeue at its new value
+            value = self._value(trader, opp, amount, market.positions)
+            if value < -neg_value - 1e-9:
+                heapq.heappush(heap, (-value, trader_idx, opp_idx))
+                continue
+
+            matched.add(trader_idx)
+            matches.append((trader_idx, opp_idx))
+            remaining.claim(opp, amount)
+
+        return matches
+
+    def _match_auction(
+        self,
+        traders: list[IdleTrader],
+        candidates: list[list[tuple[float, int]]],
+        market: _Market
+    ) -> list[tuple[int, int]]:
+        """Forward auction: one ship per opportunity, ships outbid each other.
+
+        Each unassigned ship bids for its best opportunity net of the current
+        price, raising the price by its margin over the runner-up. Displaced
+        ships bid again until every ship holds an opportunity or has none
+        worth bidding on.
+        """
+        top_value = max((ranked[0][0] for ranked in candidates if ranked), default=0.0)
+        epsilon = max(top_value * 1e-3, 1e-9)
+
+        prices = [0.0] * len(market.opportunities)
+        owner: dict[int, int] = {}  # opportunity -> trader
+        unassigned = list(range(len(traders)))
+
+        while unassigned:
+            trader_idx = unassigned.pop()
+            best_net = 0.0
+            second_net = 0.0
+            best_opp = None
+            for value, opp_idx in candidates[trader_idx]:
+                net = value - prices[opp_idx]
+                if net > best_net:
+                    second_net = best_net
+                    best_net = net
+                    best_opp = opp_idx
+                elif net > second_net:
+                    second_net = net
+
+            if best_opp is None:
+                continue  # Nothing left worth bidding on
+
+            prices[best_opp] += best_net - second_net + epsilon
+            previous = owner.get(best_opp)
+            if previous is not None:
+                unassigned.append(previous)
+            owner[best_opp] = trader_idx
+
+        return sorted((trader_idx, opp_idx) for opp_idx, trader_idx in owner.items())
+
+
+def _distance(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Euclidean distance in AU."""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    return (dx * dx + dy * dy) ** 0.5
@@ -5,13 +5,19 @@ Scales well to hundreds of stations and ships.
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 from uuid import UUID
 import math
-import time
+
+import numpy as np
+
+from ..core.spatial import SpatialIndex, BodyRelativeIndex
 
 if TYPE_CHECKING:
     from ..core.ecs import EntityManager
+    from ..core.events import (
+        EventBus, PriceChangeEvent, TradeCompleteEvent, StationBuiltEvent, MarketsUpdatedEvent
+    )
 
 
 @dataclass
@@ -35,125 +41,241 @@ class TradeOpportunity:
         return self.total_profit * 0.7 + self.profit_per_distance * 0.3
 
 
-class SpatialIndex:
-    """Grid-based spatial index for O(1) nearby entity lookup.
+@dataclass
+class CachedRoute:
+    """Cached trade route with expiration."""
+    opportunity: TradeOpportunity
+    timestamp: float  # Game day when cached
+    ttl: float = 30.0  # Time to live in game days
+
+    def is_expired(self, current_time: float) -> bool:
+        """Check if cache entry has expired."""
+        return current_time - self.timestamp > self.ttl
+
 
-    Divides space into cells and tracks which entities are in each cell.
-    Lookups only need to check cells within the search radius.
+@dataclass
+class RouteQuery:
+    """The search area a ship's cached routes were computed for."""
+    x: float
+    y: float
+    radius: float
+
+    def contains(self, x: float, y: float) -> bool:
+        """Check if a position falls inside the searched area."""
+        return (x - self.x) ** 2 + (y - self.y) ** 2 <= self.radius * self.radius
+
+
+@dataclass
+class MarketSnapshot:
+    """Picklable copy of market quotes, stock and station positions.
+
+    Holds only plain lists and numpy arrays, so it can be shipped to worker
+    processes. Rows follow station_ids, columns follow resources; prices a
+    station doesn't trade are NaN.
     """
+    game_time: float
+    station_ids: list[UUID]
+    resources: list  # ResourceType, in column order
+    positions: np.ndarray   # (n, 2) AU
+    sell: np.ndarray        # (n, r) price a ship pays at the station
+    buy: np.ndarray         # (n, r) price a ship receives at the station
+    stock: np.ndarray       # (n, r) unreserved units on hand
+    free_space: np.ndarray  # (n,)   storage free
+    credits: np.ndarray     # (n,)   unreserved credits
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    def _affordable(self) -> np.ndarray:
+        """Units each station can pay for, indexed [dest, resource]."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.buy > 0, self.credits[:, None] / self.buy, 0.0)
+
+    def best_trades_from(
+        self,
+        source_index: int,
+        cargo_space: float
+    ) -> list[tuple[int, int, float, float]]:
+        """Most profitable trade from one station to each other station.
 
-    def __init__(self, cell_size: float = 0.5) -> None:
-        """Initialize spatial index.
+        Picks the resource with the highest total profit per destination,
+        the same choice find_best_trade makes on live markets.
 
-        Args:
-            cell_size: Size of each cell in AU (default 0.5 AU)
-        """
-        self.cell_size = cell_size
-        self._cells: dict[tuple[int, int], set[UUID]] = {}
-        self._positions: dict[UUID, tuple[float, float]] = {}
-
-    def _cell_key(self, x: float, y: float) -> tuple[int, int]:
-        """Get cell key for a position."""
-        return (int(x / self.cell_size), int(y / self.cell_size))
-
-    def update(self, entity_id: UUID, x: float, y: float) -> None:
-        """Update entity position in the index."""
-        # Remove from old cell if exists
-        if entity_id in self._positions:
-            old_x, old_y = self._positions[entity_id]
-            old_key = self._cell_key(old_x, old_y)
-            if old_key in self._cells:
-                self._cells[old_key].discard(entity_id)
-
-        # Add to new cell
-        new_key = self._cell_key(x, y)
-        if new_key not in self._cells:
-            self._cells[new_key] = set()
-        self._cells[new_key].add(entity_id)
-        self._positions[entity_id] = (x, y)
-
-    def remove(self, entity_id: UUID) -> None:
-        """Remove entity from the index."""
-        if entity_id in self._positions:
-            x, y = self._positions[entity_id]
-            key = self._cell_key(x, y)
-            if key in self._cells:
-                self._cells[key].discard(entity_id)
-            del self._positions[entity_id]
-
-    def get_nearby(self, x: float, y: float, radius: float) -> Iterator[UUID]:
-        """Get entities within radius of a position.
-
-        Yields entity IDs that are within the specified radius.
-        Average case O(1) for sparse distributions.
+        Returns:
+            (dest_index, resource_index, amount, profit_per_unit) per
+            destination with a profitable trade
         """
-        # Calculate cell range to check
-        cells_to_check = int(math.ceil(radius / self.cell_size)) + 1
-        center_cell = self._cell_key(x, y)
-        radius_sq = radius * radius
-
-        for dx in range(-cells_to_check, cells_to_check + 1):
-            for dy in range(-cells_to_check, cells_to_check + 1):
-                cell_key = (center_cell[0] + dx, center_cell[1] + dy)
-                if cell_key not in self._cells:
-                    continue
+        profit = self.buy - self.sell[source_index][None, :]  # (n, r)
+        amount = np.minimum(self.stock[source_index][None, :], self._affordable())
+        amount = np.minimum(amount, self.free_space[:, None])
+        amount = np.minimum(amount, cargo_space)
+
+        # NaN prices (not traded) compare False and drop out here
+        valid = (profit > 0) & (amount > 0)
+        valid[source_index] = False
+        total = np.where(valid, profit * amount, 0.0)
+        best = np.argmax(total, axis=1)
+
+        trades = []
+        for dest in np.flatnonzero(valid.any(axis=1)):
+            res = best[dest]
+            trades.append((int(dest), int(res), float(amount[dest, res]), float(profit[dest, res])))
+        return trades
+
+    def rank_routes(
+        self,
+        cargo_space: float,
+        min_profit: float = 5.0,
+        limit: int = 20
+    ) -> Iterator[TradeOpportunity]:
+        """Rank every profitable station pair, best score first.
 
-                for entity_id in self._cells[cell_key]:
-                    if entity_id not in self._positions:
-                        continue
-                    ex, ey = self._positions[entity_id]
-                    dist_sq = (ex - x) ** 2 + (ey - y) ** 2
-                    if dist_sq <= radius_sq:
-                        yield entity_id
+        Args:
+            cargo_space: Available cargo space
+            min_profit: Minimum profit per unit to consider
+            limit: Maximum routes to return
 
-    def get_position(self, entity_id: UUID) -> tuple[float, float] | None:
-        """Get cached position of an entity."""
-        return self._positions.get(entity_id)
+        Yields:
+            TradeOpportunity objects sorted by score (best first)
+        """
+        n = len(self.station_ids)
+        if n < 2 or limit <= 0:
+            return
 
-    def clear(self) -> None:
-        """Clear the index."""
-        self._cells.clear()
-        self._positions.clear()
+        # Work one resource at a time over only the stations that can sell
+        # or buy it, so temporaries stay (sellers, buyers) instead of (n, n, r)
+        affordable = self._affordable()
+        sources: list[np.ndarray] = []
+        dests: list[np.ndarray] = []
+        res_parts: list[np.ndarray] = []
+        profit_parts: list[np.ndarray] = []
+        amount_parts: list[np.ndarray] = []
+        for res in range(len(self.resources)):
+            sellers = np.flatnonzero(~np.isnan(self.sell[:, res]) & (self.stock[:, res] > 0))
+            buyers = np.flatnonzero(
+                (self.buy[:, res] > 0) & (affordable[:, res] > 0) & (self.free_space > 0)
+            )
+            if sellers.size == 0 or buyers.size == 0:
+                continue
 
+            profit = self.buy[buyers, res][None, :] - self.sell[sellers, res][:, None]
+            amount = np.minimum(self.stock[sellers, res][:, None], affordable[buyers, res][None, :])
+            np.minimum(amount, self.free_space[buyers][None, :], out=amount)
+            np.minimum(amount, cargo_space, out=amount)
 
-@dataclass
-class CachedRoute:
-    """Cached trade route with expiration."""
-    opportunity: TradeOpportunity
-    timestamp: float  # When cached
-    ttl: float = 10.0  # Time to live in seconds
+            valid = (profit >= min_profit) & (amount > 0)
+            valid &= sellers[:, None] != buyers[None, :]
+            rows, cols = np.nonzero(valid)
+            if rows.size == 0:
+                continue
+            sources.append(sellers[rows])
+            dests.append(buyers[cols])
+            res_parts.append(np.full(rows.size, res))
+            profit_parts.append(profit[rows, cols])
+            amount_parts.append(amount[rows, cols])
 
-    def is_expired(self, current_time: float) -> bool:
-        """Check if cache entry has expired."""
-        return current_time - self.timestamp > self.ttl
+        if not sources:
+            return
+
+        # Source-major order, as a scan over (source, dest, resource) would give
+        src_idx = np.concatenate(sources)
+        dst_idx = np.concatenate(dests)
+        res_idx = np.concatenate(res_parts)
+        order = np.lexsort((res_idx, dst_idx, src_idx))
+        src_idx, dst_idx, res_idx = src_idx[order], dst_idx[order], res_idx[order]
+        cand_profit = np.concatenate(profit_parts)[order]
+        cand_amount = np.concatenate(amount_parts)[order]
+
+        delta = self.positions[dst_idx] - self.positions[src_idx]
+        cand_distance = np.sqrt((delta ** 2).sum(axis=1))
+        cand_total = cand_profit * cand_amount
+        cand_ppd = cand_total / np.maximum(cand_distance, 0.01)
+        # Same weighting as TradeOpportunity.score
+        cand_score = cand_total * 0.7 + cand_ppd * 0.3
+
+        # Select the top results without sorting every candidate
+        if cand_score.size > limit:
+            top = np.argpartition(-cand_score, limit - 1)[:limit]
+        else:
+            top = np.arange(cand_score.size)
+        top = top[np.argsort(-cand_score[top], kind='stable')]
+
+        for i in top:
+            yield TradeOpportunity(
+                source_id=self.station_ids[src_idx[i]],
+                destination_id=self.station_ids[dst_idx[i]],
+                resource_id=self.resources[res_idx[i]].value,
+                amount=float(cand_amount[i]),
+                buy_price=float(self.sell[src_idx[i], res_idx[i]]),  # What ship pays at source
+                sell_price=float(self.buy[dst_idx[i], res_idx[i]]),  # What ship receives at dest
+                profit_per_unit=float(cand_profit[i]),
+                total_profit=float(cand_total[i]),
+                distance=float(cand_distance[i]),
+                profit_per_distance=float(cand_ppd[i]),
+            )
 
 
 class TradeRouteFinder:
     """Efficient trade route discovery with caching.
 
     Uses spatial indexing for O(n) route finding instead of O(n²).
-    Caches results to avoid repeated calculations.
+    Caches results to avoid repeated calculations. Cache lifetime is measured
+    in game days, and cached routes are dropped as soon as a price change,
+    completed trade or new station touches one of their stations.
     """
 
     def __init__(
         self,
         entity_manager: EntityManager,
-        spatial_index: SpatialIndex | None = None,
-        cache_ttl: float = 10.0
+        spatial_index: SpatialIndex | BodyRelativeIndex | None = None,
+        cache_ttl: float = 30.0,
+        event_bus: EventBus | None = None,
+        auto_update_index: bool = True,
+        publish_snapshots: bool = False
     ) -> None:
         """Initialize route finder.
 
         Args:
             entity_manager: Entity manager for component access
             spatial_index: Optional spatial index (creates new if None)
-            cache_ttl: How long to cache routes (seconds)
+            cache_ttl: Backstop lifetime of cached routes (game days)
+            event_bus: Optional event bus for precise cache invalidation
+            auto_update_index: Rescan station positions periodically. Pass
+                False when a SpatialIndexSystem already maintains the index.
+            publish_snapshots: Capture a MarketSnapshot after every economy
+                tick for planning in worker processes (needs event_bus)
         """
         self.entity_manager = entity_manager
-        self.spatial_index = spatial_index or SpatialIndex()
+        self.spatial_index = spatial_index if spatial_index is not None else SpatialIndex()
+        self.auto_update_index = auto_update_index
         self.cache_ttl = cache_ttl
         self._route_cache: dict[UUID, list[CachedRoute]] = {}
-        self._last_index_update = 0.0
-        self._index_update_interval = 1.0  # seconds
+        self._route_queries: dict[UUID, RouteQuery] = {}
+        # Reverse lookup: station ID -> ships with cached routes through it
+        self._ships_by_station: dict[UUID, set[UUID]] = {}
+        self._game_time = 0.0  # Game days, updated by the ship AI system
+        self._last_index_update = -float('inf')
+        self._index_update_interval = 1.0  # game days
+        self.publish_snapshots = publish_snapshots
+        # Latest market snapshot for worker-process planning
+        self.snapshot: MarketSnapshot | None = None
+
+        if event_bus:
+            self.subscribe(event_bus)
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        """Subscribe to the events that invalidate cached routes."""
+        from ..core.events import PriceChangeEvent, TradeCompleteEvent, StationBuiltEvent, MarketsUpdatedEvent
+
+        event_bus.subscribe(PriceChangeEvent, self._on_price_change)
+        event_bus.subscribe(TradeCompleteEvent, self._on_trade_complete)
+        event_bus.subscribe(StationBuiltEvent, self._on_station_built)
+        if self.publish_snapshots:
+            event_bus.subscribe(MarketsUpdatedEvent, self._on_markets_updated)
+
+    def set_game_time(self, game_time_days: float) -> None:
+        """Update current game time for cache expiry and index throttling."""
+        self._game_time = game_time_days
 
     def update_index(self, force: bool = False) -> None:
         """Update spatial index with current station positions.
@@ -161,7 +283,10 @@ class TradeRouteFinder:
         Args:
             force: Force update even if interval hasn't passed
         """
-        current_time = time.time()
+        if not self.auto_update_index and not force:
+            return
+
+        current_time = self._game_time
         if not force and current_time - self._last_index_update < self._index_update_interval:
             return
 
@@ -196,7 +321,7 @@ class TradeRouteFinder:
             Best TradeOpportunity or None if no profitable routes
         """
         # Check cache first
-        current_time = time.time()
+        current_time = self._game_time
         if ship_id in self._route_cache:
             cached = self._route_cache[ship_id]
             valid_routes = [r for r in cached if not r.is_expired(current_time)]
@@ -204,6 +329,7 @@ class TradeRouteFinder:
                 # Return best cached route that's still valid
                 best = max(valid_routes, key=lambda r: r.opportunity.score)
                 return best.opportunity
+            self.invalidate_cache(ship_id)
 
         # Find new routes
         routes = list(self.find_all_routes(
@@ -217,6 +343,12 @@ class TradeRouteFinder:
         self._route_cache[ship_id] = [
             CachedRoute(r, current_time, self.cache_ttl) for r in routes
         ]
+        self._route_queries[ship_id] = RouteQuery(
+            ship_position[0], ship_position[1], max_distance
+        )
+        for route in routes:
+            self._ships_by_station.setdefault(route.source_id, set()).add(ship_id)
+            self._ships_by_station.setdefault(route.destination_id, set()).add(ship_id)
 
         return routes[0]  # Best route (already sorted)
 
@@ -240,11 +372,6 @@ class TradeRouteFinder:
         Yields:
             TradeOpportunity objects sorted by score (best first)
         """
-        from ..entities.stations import Station
-        from ..simulation.economy import Market
-        from ..simulation.resources import Inventory, ResourceType
-        from ..solar_system.orbits import Position
-
         # Ensure index is updated
         self.update_index()
 
@@ -253,88 +380,87 @@ class TradeRouteFinder:
             ship_position[0], ship_position[1], max_distance
         ))
 
-        if len(nearby_stations) < 2:
+        if len(nearby_stations) < 2 or limit <= 0:
             return
 
-        # Find all trade opportunities
-        opportunities: list[TradeOpportunity] = []
+        snapshot = self.build_snapshot(nearby_stations)
+        yield from snapshot.rank_routes(cargo_space, min_profit, limit)
 
-        for source_id in nearby_stations:
-            source = self.entity_manager.get_entity(source_id)
-            if not source:
-                continue
+    def build_snapshot(self, station_ids: Iterable[UUID] | None = None) -> MarketSnapshot:
+        """Copy market state into a MarketSnapshot.
 
-            source_market = self.entity_manager.get_component(source, Market)
-            source_inv = self.entity_manager.get_component(source, Inventory)
-            source_pos = self.spatial_index.get_position(source_id)
+        Args:
+            station_ids: Stations to include (every market if None)
 
-            if not source_market or not source_inv or not source_pos:
-                continue
+        Returns:
+            Snapshot of the stations that have a market, inventory and position
+        """
+        from ..simulation.economy import Market
+        from ..simulation.resources import Inventory, ResourceType
+        from ..solar_system.orbits import Position
 
-            for dest_id in nearby_stations:
-                if source_id == dest_id:
-                    continue
+        em = self.entity_manager
+        if station_ids is None:
+            station_ids = [entity.id for entity in em.get_entities_with(Market, Inventory)]
 
-                dest = self.entity_manager.get_entity(dest_id)
-                if not dest:
-                    continue
+        resources = list(ResourceType)
 
-                dest_market = self.entity_manager.get_component(dest, Market)
-                dest_inv = self.entity_manager.get_component(dest, Inventory)
-                dest_pos = self.spatial_index.get_position(dest_id)
+        # Gather per-station market data into flat rows
+        ids: list[UUID] = []
+        positions: list[tuple[float, float]] = []
+        sell_rows: list[list[float]] = []
+        buy_rows: list[list[float]] = []
+        stock_rows: list[list[float]] = []
+        free_space: list[float] = []
+        credits: list[float] = []
 
-                if not dest_market or not dest_inv or not dest_pos:
-                    continue
+        for station_id in station_ids:
+            station = em.get_entity(station_id)
+            if not station:
+                continue
+
+            market = em.get_component(station, Market)
+            inventory = em.get_component(station, Inventory)
+            pos = self.spatial_index.get_position(station_id)
+            if pos is None:
+                component = em.get_component(station, Position)
+                pos = (component.x, component.y) if component else None
+            if not market or not inventory or not pos:
+                continue
 
-                # Calculate distance
-                distance = math.sqrt(
-                    (dest_pos[0] - source_pos[0]) ** 2 +
-                    (dest_pos[1] - source_pos[1]) ** 2
-                )
-
-                # Find profitable resources
-                for resource in ResourceType:
-                    sell_price = source_market.get_sell_price(resource)
-                    buy_price = dest_market.get_buy_price(resource)
-
-                    if sell_price is None or buy_price is None:
-                        continue
-
-                    profit_per_unit = buy_price - sell_price
-                    if profit_per_unit < min_profit:
-                        continue
-
-                    # Calculate tradeable amount
-                    available = source_inv.get(resource)
-                    dest_space = dest_inv.free_space
-                    affordable = dest_market.credits / buy_price if buy_price > 0 else 0
-
-                    amount = min(available, cargo_space, dest_space, affordable)
-                    if amount <= 0:
-                        continue
-
-                    total_profit = profit_per_unit * amount
-                    profit_per_distance = total_profit / max(distance, 0.01)
-
-                    opportunities.append(TradeOpportunity(
-                        source_id=source_id,
-                        destination_id=dest_id,
-                        resource_id=resource.value,
-                        amount=amount,
-                        buy_price=sell_price,  # What ship pays at source
-                        sell_price=buy_price,  # What ship receives at dest
-                        profit_per_unit=profit_per_unit,
-                        total_profit=total_profit,
-                        distance=distance,
-                        profit_per_distance=profit_per_distance,
-                    ))
-
-        # Sort by score and yield top results
-        opportunities.sort(key=lambda o: o.score, reverse=True)
-        for i, opp in enumerate(opportunities):
-            if i >= limit:
-                break
-            yield opp
+            sell_row = []
+            buy_row = []
+            for resource in resources:
+                sell_price = market.get_sell_price(resource)
+                buy_price = market.get_buy_price(resource)
+                sell_row.append(math.nan if sell_price is None else sell_price)
+                buy_row.append(math.nan if buy_price is None else buy_price)
+
+            ids.append(station_id)
+            positions.append(pos)
+            sell_rows.append(sell_row)
+            buy_rows.append(buy_row)
+            stock_rows.append([inventory.available(resource) for resource in resources])
+            free_space.append(inventory.free_space)
+            credits.append(market.available_credits())
+
+        r = len(resources)
+        return MarketSnapshot(
+            game_time=self._game_time,
+            station_ids=ids,
+            resources=resources,
+            positions=np.array(positions, dtype=float).reshape(-1, 2),
+            sell=np.array(sell_rows, dtype=float).reshape(-1, r),
+            buy=np.array(buy_rows, dtype=float).reshape(-1, r),
+            stock=np.array(stock_rows, dtype=float).reshape(-1, r),
+            free_space=np.array(free_space, dtype=float),
+            credits=np.array(credits, dtype=float),
+        )
+
+    def publish_snapshot(self) -> MarketSnapshot:
+        """Capture every market for off-thread planning."""
+        self.snapshot = self.build_snapshot()
+        return self.snapshot
 
     def invalidate_cache(self, ship_id: UUID | None = None) -> None:
         """Invalidate cached routes.
@@ -343,9 +469,100 @@ class TradeRouteFinder:
             ship_id: Specific ship to invalidate, or None for all
         """
         if ship_id:
-            self._route_cache.pop(ship_id, None)
+            self._route_queries.pop(ship_id, None)
+            self._unlink_routes(ship_id, self._route_cache.pop(ship_id, ()))
         else:
             self._route_cache.clear()
+            self._route_queries.clear()
+            self._ships_by_station.clear()
+
+    def _unlink_routes(
+        self,
+        ship_id: UUID,
+        routes: Iterable[CachedRoute],
+        keep: Iterable[CachedRoute] = ()
+    ) -> None:
+        """Remove a ship from the reverse lookup of dropped routes' stations.
+
+        Args:
+            ship_id: Ship whose cached routes were dropped
+            routes: The dropped routes
+            keep: Routes the ship still has cached; their stations stay linked
+        """
+        linked = set()
+        for route in keep:
+            linked.add(route.opportunity.source_id)
+            linked.add(route.opportunity.destination_id)
+
+        for route in routes:
+            for station_id in (route.opportunity.source_id, route.opportunity.destination_id):
+                if station_id in linked:
+                    continue
+                ships = self._ships_by_station.get(station_id)
+                if ships is None:
+                    continue
+                ships.discard(ship_id)
+                if not ships:
+                    del self._ships_by_station[station_id]
+
+    def invalidate_station(self, station_id: UUID) -> None:
+        """Drop every cached route that starts or ends at a station.
+
+        Args:
+            station_id: Station whose prices, stock or credits changed
+        """
+        for ship_id in self._ships_by_station.pop(station_id, ()):
+            cached = self._route_cache.get(ship_id)
+            if not cached:
+                continue
+            remaining = []
+            dropped = []
+            for route in cached:
+                if station_id in (route.opportunity.source_id, route.opportunity.destination_id):
+                    dropped.append(route)
+                else:
+                    remaining.append(route)
+            if remaining:
+                self._route_cache[ship_id] = remaining
+                self._unlink_routes(ship_id, dropped, keep=remaining)
+            else:
+                self.invalidate_cache(ship_id)
+
+    def _on_price_change(self, event: PriceChangeEvent) -> None:
+        """Prices moved at a station - its cached margins are stale."""
+        self.invalidate_station(event.station_id)
+
+    def _on_trade_complete(self, event: TradeCompleteEvent) -> None:
+        """A sale changed the buyer's stock and credits."""
+        self.invalidate_station(event.buyer_id)
+        self.invalidate_station(event.seller_id)
+
+    def _on_station_built(self, event: StationBuiltEvent) -> None:
+        """A new or upgraded station may open routes for ships nearby."""
+        self.invalidate_station(event.station_id)
+        self._index_station(event.station_id, event.position)
+
+        x, y = event.position
+        for ship_id, query in list(self._route_queries.items()):
+            if query.contains(x, y):
+                self.invalidate_cache(ship_id)
+
+    def _index_station(self, station_id: UUID, position: tuple[float, float]) -> None:
+        """Index a station, attached to its parent body when it has one."""
+        from ..solar_system.orbits import ParentBody
+
+        index = self.spatial_index
+        if isinstance(index, BodyRelativeIndex):
+            entity = self.entity_manager.get_entity(station_id)
+            parent = self.entity_manager.get_component(entity, ParentBody) if entity else None
+            if parent and index.has_body(parent.parent_name):
+                index.attach(station_id, parent.parent_name, parent.offset_x, parent.offset_y)
+                return
+        index.update(station_id, position[0], position[1])
+
+    def _on_markets_updated(self, event: MarketsUpdatedEvent) -> None:
+        """Prices were just recalculated - refresh the planning snapshot."""
+        self.publish_snapshot()
 
     def get_route_count(self, ship_position: tuple[float, float], radius: float = 5.0) -> int:
         """Get count of potential trade partners within radius."""
@@ -0,0 +1,174 @@
+"""Strategic world summary for faction AI.
+
+Faction decisions need the same picture of the world - who owns what,
+which bodies are crowded, which resources are scarce and which deposits
+nobody mines yet. The summary is built in one pass over stations and
+bodies per decision cycle, and every faction reads from it.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+    from ..entities.stations import StationType
+    from ..simulation.resources import ResourceType
+    from ..solar_system.bodies import CelestialBodyData
+
+
+@dataclass
+class FactionSummary:
+    """A faction's holdings at summary time."""
+    faction_id: UUID
+    credits: float
+    wealth: float  # Credits plus inventory at owned stations, at base prices
+    ship_count: int = 0
+    station_count: int = 0
+    station_types: dict[StationType, int] = field(default_factory=dict)
+    stations_at_body: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BodySummary:
+    """Occupancy of one celestial body."""
+    name: str
+    position: tuple[float, float]
+    data: CelestialBodyData
+    station_count: int = 0
+    station_types: dict[StationType, int] = field(default_factory=dict)
+    mined: set[ResourceType] = field(default_factory=set)  # Resources with a mining station here
+
+    @property
+    def full(self) -> bool:
+        from ..entities.station_slots import MAX_STATIONS_PER_BODY
+
+        return self.station_count >= MAX_STATIONS_PER_BODY
+
+    def unclaimed(self) -> list[tuple[ResourceType, float]]:
+        """Deposits at this body that no mining station extracts."""
+        return [(res, richness) for res, richness in self.data.resources if res not in self.mined]
+
+
+@dataclass
+class WorldSummary:
+    """Shared strategic picture for one faction AI decision cycle."""
+    factions: dict[UUID, FactionSummary] = field(default_factory=dict)
+    bodies: dict[str, BodySummary] = field(default_factory=dict)
+    # Mean market price over base price; above 1.0 the resource is scarce
+    tightness: dict[ResourceType, float] = field(default_factory=dict)
+
+    def faction(self, faction_id: UUID) -> FactionSummary | None:
+        """Get a faction's summary."""
+        return self.factions.get(faction_id)
+
+    def unclaimed_deposits(self) -> list[tuple[str, ResourceType, float]]:
+        """Every unmined deposit as (body, resource, richness), richest first."""
+        deposits = [
+            (body.name, res, richness)
+            for body in self.bodies.values()
+            for res, richness in body.unclaimed()
+        ]
+        deposits.sort(key=lambda d: d[2], reverse=True)
+        return deposits
+
+    def record_station(
+        self,
+        faction_id: UUID,
+        station_type: StationType,
+        body_name: str,
+        resource_type: ResourceType | None = None
+    ) -> None:
+        """Account for a station built during this cycle.
+
+        Keeps later factions in the same cycle from chasing the same slot
+        or deposit.
+        """
+        from ..entities.stations import StationType
+
+        summary = self.factions.get(faction_id)
+        if summary:
+            summary.station_count += 1
+            summary.station_types[station_type] = summary.station_types.get(station_type, 0) + 1
+            summary.stations_at_body[body_name] = summary.stations_at_body.get(body_name, 0) + 1
+
+        body = self.bodies.get(body_name)
+        if body:
+            body.station_count += 1
+            body.station_types[station_type] = body.station_types.get(station_type, 0) + 1
+            if station_type == StationType.MINING_STATION and resource_type:
+                body.mined.add(resource_type)
+
+
+def build_world_summary(entity_manager: EntityManager) -> WorldSummary:
+    """Summarize factions, body occupancy and markets in one world pass.
+
+    Args:
+        entity_manager: Entity manager to summarize
+
+    Returns:
+        A new WorldSummary
+    """
+    from ..entities.celestial import CelestialBody
+    from ..entities.factions import Faction, get_ownership_index
+    from ..entities.stations import Station, StationType
+    from ..simulation.economy import Market
+    from ..simulation.resources import BASE_PRICES, Inventory, ResourceDeposit
+    from ..solar_system.bodies import SOLAR_SYSTEM_DATA, BodyType
+    from ..solar_system.orbits import Position
+
+    summary = WorldSummary()
+    ownership = get_ownership_index(entity_manager)
+
+    for entity, faction in entity_manager.get_all_components(Faction):
+        summary.factions[entity.id] = FactionSummary(
+            faction_id=entity.id,
+            credits=faction.credits,
+            wealth=faction.credits,
+            ship_count=ownership.ship_count(entity.id),
+        )
+
+    for entity, body in entity_manager.get_all_components(CelestialBody):
+        data = SOLAR_SYSTEM_DATA.get(entity.name)
+        pos = entity_manager.get_component(entity, Position)
+        if not data or not pos or data.body_type == BodyType.STAR:
+            continue
+        summary.bodies[entity.name] = BodySummary(entity.name, (pos.x, pos.y), data)
+
+    price_sums: dict[ResourceType, float] = {}
+    price_counts: dict[ResourceType, int] = {}
+
+    for entity, station in entity_manager.get_all_components(Station):
+        body = summary.bodies.get(station.parent_body)
+        if body:
+            body.station_count += 1
+            body.station_types[station.station_type] = body.station_types.get(station.station_type, 0) + 1
+            if station.station_type == StationType.MINING_STATION:
+                deposit = entity_manager.get_component(entity, ResourceDeposit)
+                if deposit:
+                    body.mined.add(deposit.resource_type)
+
+        owner = summary.factions.get(station.owner_faction_id)
+        if owner:
+            owner.station_count += 1
+            owner.station_types[station.station_type] = owner.station_types.get(station.station_type, 0) + 1
+            owner.stations_at_body[station.parent_body] = owner.stations_at_body.get(station.parent_body, 0) + 1
+
+            inventory = entity_manager.get_component(entity, Inventory)
+            if inventory:
+                for resource, amount in inventory.resources.items():
+                    owner.wealth += amount * BASE_PRICES.get(resource, 10.0)
+
+        market = entity_manager.get_component(entity, Market)
+        if market:
+            for resource, price in market.prices.items():
+                base = BASE_PRICES.get(resource)
+                if base:
+                    price_sums[resource] = price_sums.get(resource, 0.0) + price / base
+                    price_counts[resource] = price_counts.get(resource, 0) + 1
+
+    summary.tightness = {
+        resource: total / price_counts[resource]
+        for resource, total in price_sums.items()
+    }
+    return summary
@@ -5,6 +5,7 @@ from .events import EventBus, Event
 from .system_priority import SystemPriority
 from .registries import ResourceRegistry, RecipeRegistry, get_resource_registry, get_recipe_registry
 from .transactions import TransactionService, Transaction, TransactionType, get_transaction_service
+from .spatial import SpatialIndex, BodyRelativeIndex
 
 __all__ = [
     'Entity', 'Component', 'System', 'EntityManager',
@@ -12,4 +13,5 @@ __all__ = [
     'SystemPriority',
     'ResourceRegistry', 'RecipeRegistry', 'get_resource_registry', 'get_recipe_registry',
     'TransactionService', 'Transaction', 'TransactionType', 'get_transaction_service',
+    'SpatialIndex', 'BodyRelativeIndex',
 ]
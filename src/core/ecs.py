@@ -38,6 +38,8 @@ class EntityManager:
         self._entities: dict[UUID, Entity] = {}
         self._components: dict[type[Component], dict[UUID, Component]] = {}
         self._entity_components: dict[UUID, set[type[Component]]] = {}
+        # Singleton component type -> (holder entity ID, component)
+        self._resources: dict[type[Component], tuple[UUID, Component]] = {}
 
     def create_entity(
         self,
@@ -65,6 +67,7 @@ class EntityManager:
         self._entities.clear()
         self._components.clear()
         self._entity_components.clear()
+        self._resources.clear()
 
     def destroy_entity(self, entity: Entity) -> None:
         """Remove an entity and all its components."""
@@ -135,6 +138,27 @@ class EntityManager:
         """Get an entity by its ID."""
         return self._entities.get(entity_id)
 
+    def get_resource(self, component_type: type[C]) -> C | None:
+        """Get a singleton component (parking manager, event manager, ...).
+
+        Singletons live on their own entity like any other component. The
+        first lookup scans for it; later ones are a cache hit, checked
+        against the component store so a destroyed or replaced singleton
+        is found again.
+        """
+        cached = self._resources.get(component_type)
+        if cached is not None:
+            entity_id, component = cached
+            store = self._components.get(component_type)
+            if store is not None and store.get(entity_id) is component:
+                return component  # type: ignore
+
+        for entity, component in self.get_all_components(component_type):
+            self._resources[component_type] = (entity.id, component)
+            return component
+        self._resources.pop(component_type, None)
+        return None
+
     def get_entity_by_name(self, name: str) -> Entity | None:
         """Get the first entity with a specific name."""
         for entity in self._entities.values():
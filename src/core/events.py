@@ -60,6 +60,12 @@ class PriceChangeEvent(Event):
     new_price: float
 
 
+@dataclass
+class MarketsUpdatedEvent(Event):
+    """Fired after each economy tick, once every market's prices are updated."""
+    game_time: float
+
+
 @dataclass
 class ShipArrivedEvent(Event):
     """Fired when a ship arrives at a destination."""
@@ -67,6 +73,13 @@ class ShipArrivedEvent(Event):
     destination_id: UUID
 
 
+@dataclass
+class NavigationArrivedEvent(Event):
+    """Fired by navigation when an entity reaches its target or captures orbit."""
+    entity_id: UUID
+    body_name: str = ""  # Body captured into orbit, if any
+
+
 @dataclass
 class FactionEvent(Event):
     """Base class for faction-related events."""
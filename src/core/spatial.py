@@ -0,0 +1,392 @@
+"""Grid-based spatial indexes.
+
+SpatialIndex buckets entities by world position for nearby, box and
+k-nearest queries; BodyRelativeIndex layers per-body indexes on top for
+entities parked on moving bodies. Shared by navigation, AI and the
+systems that keep the indexes current.
+"""
+from __future__ import annotations
+from typing import Callable, Iterator
+from uuid import UUID
+import math
+
+
+class SpatialIndex:
+    """Grid-based spatial index for O(1) nearby entity lookup.
+
+    Divides space into cells and tracks which entities are in each cell.
+    Lookups only need to check cells within the search radius. Updates are
+    incremental: an entity only changes cell when it crosses a boundary.
+    """
+
+    def __init__(self, cell_size: float = 0.5) -> None:
+        """Initialize spatial index.
+
+        Args:
+            cell_size: Size of each cell in AU (default 0.5 AU)
+        """
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[UUID]] = {}
+        self._positions: dict[UUID, tuple[float, float]] = {}
+        self._keys: dict[UUID, tuple[int, int]] = {}
+        # Bounds of every cell ever occupied - limits k-nearest ring growth
+        self._min_cell: tuple[int, int] | None = None
+        self._max_cell: tuple[int, int] | None = None
+
+    def _cell_key(self, x: float, y: float) -> tuple[int, int]:
+        """Get cell key for a position.
+
+        Uses floor so negative coordinates get their own cells instead of
+        sharing the cells at the origin.
+        """
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def update(self, entity_id: UUID, x: float, y: float) -> None:
+        """Update entity position in the index."""
+        self._positions[entity_id] = (x, y)
+
+        new_key = self._cell_key(x, y)
+        old_key = self._keys.get(entity_id)
+        if old_key == new_key:
+            return
+
+        # Crossed a cell boundary (or newly inserted)
+        if old_key is not None:
+            self._discard_from_cell(old_key, entity_id)
+
+        cell = self._cells.get(new_key)
+        if cell is None:
+            cell = self._cells[new_key] = set()
+            self._extend_bounds(new_key)
+        cell.add(entity_id)
+        self._keys[entity_id] = new_key
+
+    def remove(self, entity_id: UUID) -> None:
+        """Remove entity from the index."""
+        key = self._keys.pop(entity_id, None)
+        if key is not None:
+            self._discard_from_cell(key, entity_id)
+        self._positions.pop(entity_id, None)
+
+    def _discard_from_cell(self, key: tuple[int, int], entity_id: UUID) -> None:
+        """Remove an entity from a cell, dropping the cell when empty."""
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.discard(entity_id)
+            if not cell:
+                del self._cells[key]
+
+    def _extend_bounds(self, key: tuple[int, int]) -> None:
+        """Grow the occupied-cell bounds to include a key."""
+        if self._min_cell is None or self._max_cell is None:
+            self._min_cell = key
+            self._max_cell = key
+            return
+        self._min_cell = (min(self._min_cell[0], key[0]), min(self._min_cell[1], key[1]))
+        self._max_cell = (max(self._max_cell[0], key[0]), max(self._max_cell[1], key[1]))
+
+    def get_nearby(self, x: float, y: float, radius: float) -> Iterator[UUID]:
+        """Get entities within radius of a position.
+
+        Yields entity IDs that are within the specified radius.
+        Average case O(1) for sparse distributions.
+        """
+        radius_sq = radius * radius
+        min_cx, min_cy = self._cell_key(x - radius, y - radius)
+        max_cx, max_cy = self._cell_key(x + radius, y + radius)
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = self._cells.get((cx, cy))
+                if not cell:
+                    continue
+
+                for entity_id in cell:
+                    ex, ey = self._positions[entity_id]
+                    dist_sq = (ex - x) ** 2 + (ey - y) ** 2
+                    if dist_sq <= radius_sq:
+                        yield entity_id
+
+    def get_in_box(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float
+    ) -> Iterator[UUID]:
+        """Get entities inside an axis-aligned box (inclusive).
+
+        Useful for viewport queries.
+        """
+        min_cx, min_cy = self._cell_key(min_x, min_y)
+        max_cx, max_cy = self._cell_key(max_x, max_y)
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = self._cells.get((cx, cy))
+                if not cell:
+                    continue
+
+                for entity_id in cell:
+                    ex, ey = self._positions[entity_id]
+                    if min_x <= ex <= max_x and min_y <= ey <= max_y:
+                        yield entity_id
+
+    def k_nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        max_radius: float = float('inf'),
+        predicate: Callable[[UUID], bool] | None = None
+    ) -> list[tuple[UUID, float]]:
+        """Find the k nearest entities to a position.
+
+        Searches rings of cells outward from the query cell and stops once
+        no unsearched cell can hold anything closer than the k-th result.
+
+        Args:
+            x: Query x in AU
+            y: Query y in AU
+            k: Number of results wanted
+            max_radius: Ignore entities farther than this
+            predicate: Optional filter on entity IDs
+
+        Returns:
+            List of (entity_id, distance) sorted nearest first
+        """
+        if k <= 0 or not self._cells or self._min_cell is None or self._max_cell is None:
+            return []
+
+        cx, cy = self._cell_key(x, y)
+        # No occupied cell lies beyond this many rings from the query cell
+        max_ring = max(
+            cx - self._min_cell[0], self._max_cell[0] - cx,
+            cy - self._min_cell[1], self._max_cell[1] - cy,
+            0
+        )
+        if max_radius != float('inf'):
+            max_ring = min(max_ring, int(math.ceil(max_radius / self.cell_size)) + 1)
+
+        found: list[tuple[float, UUID]] = []
+        max_radius_sq = max_radius * max_radius
+
+        for ring in range(max_ring + 1):
+            for key in self._ring_keys(cx, cy, ring):
+                cell = self._cells.get(key)
+                if not cell:
+                    continue
+                for entity_id in cell:
+                    if predicate is not None and not predicate(entity_id):
+                        continue
+                    ex, ey = self._positions[entity_id]
+                    dist_sq = (ex - x) ** 2 + (ey - y) ** 2
+                    if dist_sq <= max_radius_sq:
+                        found.append((dist_sq, entity_id))
+
+            # Anything outside this ring is more than ring * cell_size away
+            if len(found) >= k:
+                found.sort(key=lambda f: f[0])
+                del found[k:]
+                reach = ring * self.cell_size
+                if found[-1][0] <= reach * reach:
+                    break
+
+        found.sort(key=lambda f: f[0])
+        return [(entity_id, math.sqrt(dist_sq)) for dist_sq, entity_id in found[:k]]
+
+    @staticmethod
+    def _ring_keys(cx: int, cy: int, ring: int) -> Iterator[tuple[int, int]]:
+        """Yield the cell keys forming a square ring around a center cell."""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+    def get_position(self, entity_id: UUID) -> tuple[float, float] | None:
+        """Get cached position of an entity."""
+        return self._positions.get(entity_id)
+
+    def __contains__(self, entity_id: UUID) -> bool:
+        return entity_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def clear(self) -> None:
+        """Clear the index."""
+        self._cells.clear()
+        self._positions.clear()
+        self._keys.clear()
+        self._min_cell = None
+        self._max_cell = None
+
+
+class BodyRelativeIndex:
+    """Hierarchical spatial index for entities parked on moving bodies.
+
+    Entities with a ParentBody are stored per body in body-local
+    coordinates, so they never change cell when their planet orbits.
+    A small top-level index tracks the bodies themselves; queries first
+    find candidate bodies and then search within each. Free-flying
+    entities live in an ordinary world-space SpatialIndex.
+
+    Exposes the same query interface as SpatialIndex.
+    """
+
+    def __init__(
+        self,
+        cell_size: float = 0.5,
+        body_cell_size: float = 2.0,
+        local_cell_size: float = 0.05
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            cell_size: Cell size in AU for free-flying entities
+            body_cell_size: Cell size in AU for the top-level body index
+            local_cell_size: Cell size in AU for body-local indexes
+        """
+        self.cell_size = cell_size
+        self.local_cell_size = local_cell_size
+        self._free = SpatialIndex(cell_size)
+        self._bodies = SpatialIndex(body_cell_size)  # Keyed by body name
+        self._local: dict[str, SpatialIndex] = {}
+        self._parent_of: dict[UUID, str] = {}
+        # Largest body-local offset seen - pads body candidate searches
+        self._max_extent = 0.0
+
+    def update_body(self, body_name: str, x: float, y: float) -> None:
+        """Update the world position of a parent body."""
+        self._bodies.update(body_name, x, y)
+
+    def has_body(self, body_name: str) -> bool:
+        """Check whether a body position is known."""
+        return body_name in self._bodies
+
+    def attach(self, entity_id: UUID, body_name: str, offset_x: float, offset_y: float) -> None:
+        """Index an entity at a fixed offset from a parent body."""
+        current = self._parent_of.get(entity_id)
+        if current != body_name:
+            if current is not None:
+                self._local[current].remove(entity_id)
+            else:
+                self._free.remove(entity_id)
+            self._parent_of[entity_id] = body_name
+
+        local = self._local.get(body_name)
+        if local is None:
+            local = self._local[body_name] = SpatialIndex(self.local_cell_size)
+        local.update(entity_id, offset_x, offset_y)
+
+        extent = math.sqrt(offset_x * offset_x + offset_y * offset_y)
+        if extent > self._max_extent:
+            self._max_extent = extent
+
+    def update(self, entity_id: UUID, x: float, y: float) -> None:
+        """Index a free-flying entity at a world position."""
+        body_name = self._parent_of.pop(entity_id, None)
+        if body_name is not None:
+            self._local[body_name].remove(entity_id)
+        self._free.update(entity_id, x, y)
+
+    def remove(self, entity_id: UUID) -> None:
+        """Remove an entity from the index."""
+        body_name = self._parent_of.pop(entity_id, None)
+        if body_name is not None:
+            self._local[body_name].remove(entity_id)
+        else:
+            self._free.remove(entity_id)
+
+    def _candidate_bodies(self, x: float, y: float, radius: float) -> Iterator[tuple[str, float, float]]:
+        """Yield (name, x, y) for bodies that may hold entities within radius."""
+        for body_name in self._bodies.get_nearby(x, y, radius + self._max_extent):
+            local = self._local.get(body_name)
+            if local:
+                bx, by = self._bodies.get_position(body_name)
+                yield body_name, bx, by
+
+    def get_nearby(self, x: float, y: float, radius: float) -> Iterator[UUID]:
+        """Get entities within radius of a world position."""
+        yield from self._free.get_nearby(x, y, radius)
+        for body_name, bx, by in self._candidate_bodies(x, y, radius):
+            yield from self._local[body_name].get_nearby(x - bx, y - by, radius)
+
+    def get_in_box(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float
+    ) -> Iterator[UUID]:
+        """Get entities inside an axis-aligned world-space box (inclusive)."""
+        yield from self._free.get_in_box(min_x, min_y, max_x, max_y)
+        pad = self._max_extent
+        for body_name in self._bodies.get_in_box(min_x - pad, min_y - pad, max_x + pad, max_y + pad):
+            local = self._local.get(body_name)
+            if not local:
+                continue
+            bx, by = self._bodies.get_position(body_name)
+            yield from local.get_in_box(min_x - bx, min_y - by, max_x - bx, max_y - by)
+
+    def k_nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        max_radius: float = float('inf'),
+        predicate: Callable[[UUID], bool] | None = None
+    ) -> list[tuple[UUID, float]]:
+        """Find the k nearest entities to a world position.
+
+        Bodies are visited nearest first and the search stops once no
+        remaining body can hold anything closer than the k-th result.
+        """
+        found = self._free.k_nearest(x, y, k, max_radius, predicate)
+        if not self._parent_of:
+            return found
+
+        bodies = self._bodies.k_nearest(
+            x, y, k=len(self._bodies), max_radius=max_radius + self._max_extent,
+            predicate=lambda name: bool(self._local.get(name))
+        )
+        for body_name, body_dist in bodies:
+            if len(found) >= k and body_dist - self._max_extent > found[-1][1]:
+                break
+            bx, by = self._bodies.get_position(body_name)
+            found.extend(self._local[body_name].k_nearest(x - bx, y - by, k, max_radius, predicate))
+            found.sort(key=lambda f: f[1])
+            del found[k:]
+
+        return found
+
+    def get_position(self, entity_id: UUID) -> tuple[float, float] | None:
+        """Get the current world position of an entity."""
+        body_name = self._parent_of.get(entity_id)
+        if body_name is None:
+            return self._free.get_position(entity_id)
+
+        body_pos = self._bodies.get_position(body_name)
+        offset = self._local[body_name].get_position(entity_id)
+        if body_pos is None or offset is None:
+            return None
+        return (body_pos[0] + offset[0], body_pos[1] + offset[1])
+
+    def __contains__(self, entity_id: UUID) -> bool:
+        return entity_id in self._parent_of or entity_id in self._free
+
+    def __len__(self) -> int:
+        return len(self._free) + len(self._parent_of)
+
+    def clear(self) -> None:
+        """Clear the index."""
+        self._free.clear()
+        self._bodies.clear()
+        self._local.clear()
+        self._parent_of.clear()
+        self._max_extent = 0.0
@@ -21,6 +21,7 @@ class SystemPriority(IntEnum):
     # Movement and navigation
     NAVIGATION = 10
     MOVEMENT = 12
+    SPATIAL_INDEX = 13
 
     # Resource extraction and production
     EXTRACTION = 15
@@ -64,6 +65,7 @@ SYSTEM_PRIORITIES = {
     "OrbitalSystem": SystemPriority.ORBITAL,
     "NavigationSystem": SystemPriority.NAVIGATION,
     "MovementSystem": SystemPriority.MOVEMENT,
+    "SpatialIndexSystem": SystemPriority.SPATIAL_INDEX,
     "ExtractionSystem": SystemPriority.EXTRACTION,
     "ProductionSystem": SystemPriority.PRODUCTION,
     "FactionAI": SystemPriority.AI_FACTION,
@@ -77,4 +79,5 @@ SYSTEM_PRIORITIES = {
     "GoalSystem": SystemPriority.GOALS,
     "BuildingSystem": SystemPriority.BUILDING,
     "FreelancerSpawner": SystemPriority.SPAWNING,
+    "OwnershipSystem": SystemPriority.LATE_UPDATE,
 }
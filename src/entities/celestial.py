@@ -18,6 +18,8 @@ if TYPE_CHECKING:
 @dataclass
 class CelestialBody(Component):
     """Component identifying a celestial body."""
+    static = True  # Set up with the solar system and never changed
+
     body_type: BodyType = BodyType.PLANET
     radius: float = 1000.0  # km
     color: tuple[int, int, int] = (150, 150, 150)
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from ..core.ecs import Component, Entity
+from ..core.ecs import Component, Entity, EntityManager
 from ..core.world import World
 
 if TYPE_CHECKING:
@@ -47,6 +47,104 @@ class Owned(Component):
     acquired_time: float = 0.0  # Game time when acquired
 
 
+@dataclass
+class OwnershipIndex(Component):
+    """Singleton component mapping factions to the ships and stations they own.
+
+    Kept current by the ship and station factories, transfer_ownership and
+    OwnershipSystem (for destroyed entities). Owned ids are held in
+    insertion-ordered dicts so iteration order is stable.
+    """
+    ships: dict[UUID, dict[UUID, None]] = field(default_factory=dict)
+    stations: dict[UUID, dict[UUID, None]] = field(default_factory=dict)
+    # Entity -> (owner faction, "ship" or "station")
+    owners: dict[UUID, tuple[UUID, str]] = field(default_factory=dict)
+
+    def _bucket(self, kind: str) -> dict[UUID, dict[UUID, None]]:
+        return self.ships if kind == "ship" else self.stations
+
+    def set_owner(self, entity_id: UUID, faction_id: UUID | None, kind: str) -> None:
+        """Record an entity's owner, replacing any previous one.
+
+        Args:
+            entity_id: Ship or station entity ID
+            faction_id: Owning faction (None removes the entity)
+            kind: "ship" or "station"
+        """
+        self.remove(entity_id)
+        if faction_id is None:
+            return
+        self._bucket(kind).setdefault(faction_id, {})[entity_id] = None
+        self.owners[entity_id] = (faction_id, kind)
+
+    def remove(self, entity_id: UUID) -> None:
+        """Forget an entity."""
+        previous = self.owners.pop(entity_id, None)
+        if previous is None:
+            return
+        faction_id, kind = previous
+        bucket = self._bucket(kind)
+        owned = bucket.get(faction_id)
+        if owned is not None:
+            owned.pop(entity_id, None)
+            if not owned:
+                del bucket[faction_id]
+
+    def owner_of(self, entity_id: UUID) -> UUID | None:
+        """Get the faction owning an entity."""
+        entry = self.owners.get(entity_id)
+        return entry[0] if entry else None
+
+    def ships_of(self, faction_id: UUID) -> list[UUID]:
+        """IDs of ships owned by a faction."""
+        return list(self.ships.get(faction_id, ()))
+
+    def stations_of(self, faction_id: UUID) -> list[UUID]:
+        """IDs of stations owned by a faction."""
+        return list(self.stations.get(faction_id, ()))
+
+    def ship_count(self, faction_id: UUID) -> int:
+        """Number of ships owned by a faction."""
+        return len(self.ships.get(faction_id, ()))
+
+    def station_count(self, faction_id: UUID) -> int:
+        """Number of stations owned by a faction."""
+        return len(self.stations.get(faction_id, ()))
+
+    def rebuild(self, entity_manager: EntityManager) -> None:
+        """Re-read every ship and station owner from the world."""
+        from .ships import Ship
+        from .stations import Station
+
+        self.ships.clear()
+        self.stations.clear()
+        self.owners.clear()
+        for entity, ship in entity_manager.get_all_components(Ship):
+            self.set_owner(entity.id, ship.owner_faction_id, "ship")
+        for entity, station in entity_manager.get_all_components(Station):
+            self.set_owner(entity.id, station.owner_faction_id, "station")
+
+
+def get_ownership_index(entity_manager: EntityManager) -> OwnershipIndex:
+    """Get the ownership index, building it from the world on first use.
+
+    Args:
+        entity_manager: Entity manager holding the singleton
+
+    Returns:
+        The shared OwnershipIndex
+    """
+    index = entity_manager.get_resource(OwnershipIndex)
+    if index is not None:
+        return index
+
+    index = OwnershipIndex()
+    index.rebuild(entity_manager)
+    entity = entity_manager.create_entity(name="Ownership Index")
+    entity_manager.add_component(entity, index)
+    return index
+
+
 # Predefined factions
 PREDEFINED_FACTIONS: dict[str, dict] = {
     "Earth Coalition": {
@@ -179,9 +277,20 @@ def transfer_ownership(
         entity: Entity to transfer
         new_owner_id: New owner faction ID (None for unowned)
     """
+    from .ships import Ship
+    from .stations import Station
+
     em = world.entity_manager
     owned = em.get_component(entity, Owned)
 
+    # Ships and stations carry their owner directly - keep them and the index in step
+    ship = em.get_component(entity, Ship)
+    station = em.get_component(entity, Station)
+    owner = ship or station
+    if owner:
+        owner.owner_faction_id = new_owner_id
+        get_ownership_index(em).set_owner(entity.id, new_owner_id, "ship" if ship else "station")
+
     if new_owner_id is None:
         # Remove ownership
         if owned:
@@ -191,10 +300,10 @@ def transfer_ownership(
         # Add or update ownership
         if owned:
             owned.faction_id = new_owner_id
-            owned.acquired_time = world.game_time.total_seconds
+            owned.acquired_time = world.game_time.total_days
         else:
             em.add_component(entity, Owned(
                 faction_id=new_owner_id,
-                acquired_time=world.game_time.total_seconds,
+                acquired_time=world.game_time.total_days,
             ))
         entity.tags.add("owned")
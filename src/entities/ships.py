@@ -9,6 +9,7 @@ from ..core.ecs import Component, Entity
 from ..core.world import World
 from ..solar_system.orbits import Position, Velocity, NavigationTarget
 from ..simulation.trade import Trader, CargoHold
+from .factions import get_ownership_index
 
 if TYPE_CHECKING:
     pass
@@ -159,6 +160,7 @@ def create_ship(
         max_crew=config["max_crew"],
         crew=config["max_crew"] // 2,  # Start half crewed
     ))
+    get_ownership_index(em).set_owner(entity.id, owner_faction_id, "ship")
 
     # Add position and velocity
     em.add_component(entity, Position(x=position[0], y=position[1]))
@@ -219,6 +221,7 @@ def create_drone(
         home_station_id=home_station_id,
         local_system=local_system,
     ))
+    get_ownership_index(em).set_owner(entity.id, owner_faction_id, "ship")
 
     # Add position and velocity
     em.add_component(entity, Position(x=position[0], y=position[1]))
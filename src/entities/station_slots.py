@@ -1,5 +1,6 @@
 """Orbital slot system for station placement around celestial bodies."""
 from __future__ import annotations
+import heapq
 import math
 import random
 from dataclasses import dataclass, field
@@ -58,11 +59,26 @@ class OrbitalSlotManager(Component):
     """Singleton component tracking which orbital slots are occupied.
 
     Each celestial body can have up to 12 stations in fixed orbital slots.
+    Free slots are kept per body in a min-heap, so the innermost free slot
+    is found without scanning and release is a push.
     """
     # Maps body_name -> list of slot indices that are occupied (0-11)
     occupied_slots: dict[str, list[int]] = field(default_factory=dict)
     # Maps body_name -> {slot_index: station_entity_id}
     slot_assignments: dict[str, dict[int, UUID]] = field(default_factory=dict)
+    # Maps station_id -> (body_name, slot_index) for reverse lookup
+    station_slots: dict[UUID, tuple[str, int]] = field(default_factory=dict)
+    # Maps body_name -> heap of free slot indices (built on first use)
+    free_slots: dict[str, list[int]] = field(default_factory=dict)
+
+    def _free(self, body_name: str) -> list[int]:
+        """Get a body's free-slot heap."""
+        free = self.free_slots.get(body_name)
+        if free is None:
+            occupied = set(self.occupied_slots.get(body_name, ()))
+            free = [slot for slot in range(MAX_STATIONS_PER_BODY) if slot not in occupied]
+            self.free_slots[body_name] = free  # Ascending, so already a heap
+        return free
 
     def get_next_available_slot(self, body_name: str) -> int | None:
         """Get the next available slot index for a body.
@@ -70,11 +86,8 @@ class OrbitalSlotManager(Component):
         Returns:
             Slot index (0-11) or None if full
         """
-        occupied = self.occupied_slots.get(body_name, [])
-        for slot in range(MAX_STATIONS_PER_BODY):
-            if slot not in occupied:
-                return slot
-        return None
+        free = self._free(body_name)
+        return free[0] if free else None
 
     def occupy_slot(self, body_name: str, slot_index: int, station_id: UUID) -> None:
         """Mark a slot as occupied."""
@@ -82,21 +95,39 @@ class OrbitalSlotManager(Component):
             self.occupied_slots[body_name] = []
             self.slot_assignments[body_name] = {}
 
+        free = self._free(body_name)
+        if free and free[0] == slot_index:
+            heapq.heappop(free)
+        elif slot_index in free:
+            # A specific slot was requested (e.g. a preset station)
+            free.remove(slot_index)
+            heapq.heapify(free)
+
         if slot_index not in self.occupied_slots[body_name]:
             self.occupied_slots[body_name].append(slot_index)
+
+        previous = self.slot_assignments[body_name].get(slot_index)
+        if previous is not None and previous != station_id:
+            self.station_slots.pop(previous, None)
         self.slot_assignments[body_name][slot_index] = station_id
+        self.station_slots[station_id] = (body_name, slot_index)
 
     def release_slot(self, body_name: str, station_id: UUID) -> None:
         """Release a slot when a station is destroyed."""
-        if body_name not in self.slot_assignments:
+        location = self.station_slots.get(station_id)
+        if location is None or location[0] != body_name:
             return
 
-        for slot, sid in list(self.slot_assignments[body_name].items()):
-            if sid == station_id:
-                self.slot_assignments[body_name].pop(slot)
-                if slot in self.occupied_slots[body_name]:
-                    self.occupied_slots[body_name].remove(slot)
-                break
+        slot = location[1]
+        del self.station_slots[station_id]
+        self.slot_assignments[body_name].pop(slot, None)
+        if slot in self.occupied_slots[body_name]:
+            self.occupied_slots[body_name].remove(slot)
+        heapq.heappush(self._free(body_name), slot)
+
+    def get_station_slot(self, station_id: UUID) -> tuple[str, int] | None:
+        """Get a station's (body_name, slot_index)."""
+        return self.station_slots.get(station_id)
 
     def get_slot_count(self, body_name: str) -> int:
         """Get number of occupied slots for a body."""
@@ -282,12 +313,25 @@ class ShipParkingManager(Component):
     """Singleton component tracking ship parking around celestial bodies.
 
     Ships park in 3 concentric rings at 45-degree offsets from station slots,
-    preventing visual overlap between ships and stations.
+    preventing visual overlap between ships and stations. Free slots are
+    kept per body in a min-heap, so busy hubs assign and release parking
+    without scanning.
     """
     # Maps body_name -> {slot_index: ship_entity_id}
     parking_assignments: dict[str, dict[int, UUID]] = field(default_factory=dict)
     # Maps ship_id -> (body_name, slot_index) for reverse lookup
     ship_locations: dict[UUID, tuple[str, int]] = field(default_factory=dict)
+    # Maps body_name -> heap of free slot indices (built on first use)
+    free_slots: dict[str, list[int]] = field(default_factory=dict)
+
+    def _free(self, body_name: str) -> list[int]:
+        """Get a body's free-slot heap."""
+        free = self.free_slots.get(body_name)
+        if free is None:
+            assigned = self.parking_assignments.get(body_name, {})
+            free = [slot for slot in range(MAX_SHIP_PARKING_SLOTS) if slot not in assigned]
+            self.free_slots[body_name] = free  # Ascending, so already a heap
+        return free
 
     def get_available_slot(self, body_name: str) -> int | None:
         """Get an available parking slot for a body.
@@ -295,11 +339,8 @@ class ShipParkingManager(Component):
         Returns:
             Slot index (0-11) or None if full
         """
-        assigned = self.parking_assignments.get(body_name, {})
-        for slot in range(MAX_SHIP_PARKING_SLOTS):
-            if slot not in assigned:
-                return slot
-        return None
+        free = self._free(body_name)
+        return free[0] if free else None
 
     def assign_parking(self, body_name: str, ship_id: UUID, slot_index: int | None = None) -> int | None:
         """Assign a parking slot to a ship.
@@ -318,18 +359,16 @@ class ShipParkingManager(Component):
         if body_name not in self.parking_assignments:
             self.parking_assignments[body_name] = {}
 
-        # Auto-assign if no slot specified
-        if slot_index is None:
-            slot_index = self.get_available_slot(body_name)
-            if slot_index is None:
-                return None
-
-        # Check if slot is available
-        if slot_index in self.parking_assignments[body_name]:
-            # Slot taken, try to find another
-            slot_index = self.get_available_slot(body_name)
-            if slot_index is None:
-                return None
+        free = self._free(body_name)
+        if slot_index is not None and slot_index in free:
+            # Specific slot requested and available
+            free.remove(slot_index)
+            heapq.heapify(free)
+        elif free:
+            # Auto-assign (or the requested slot is taken)
+            slot_index = heapq.heappop(free)
+        else:
+            return None
 
         self.parking_assignments[body_name][slot_index] = ship_id
         self.ship_locations[ship_id] = (body_name, slot_index)
@@ -342,7 +381,8 @@ class ShipParkingManager(Component):
 
         body_name, slot_index = self.ship_locations[ship_id]
         if body_name in self.parking_assignments:
-            self.parking_assignments[body_name].pop(slot_index, None)
+            if self.parking_assignments[body_name].pop(slot_index, None) is not None:
+                heapq.heappush(self._free(body_name), slot_index)
         del self.ship_locations[ship_id]
 
     def get_ship_slot(self, ship_id: UUID) -> tuple[str, int] | None:
@@ -11,6 +11,7 @@ from ..solar_system.orbits import Position, ParentBody
 from ..simulation.resources import ResourceType, Inventory
 from ..simulation.economy import Market, MarketType, Population
 from ..simulation.production import Producer, Extractor, RECIPES
+from .factions import get_ownership_index
 
 if TYPE_CHECKING:
     pass
@@ -170,11 +171,8 @@ def create_station(
     config = STATION_CONFIGS[station_type]
     em = world.entity_manager
 
-    # Get or create slot manager
-    slot_manager = None
-    for _, sm in em.get_all_components(OrbitalSlotManager):
-        slot_manager = sm
-        break
+    # Get slot manager
+    slot_manager = em.get_resource(OrbitalSlotManager)
 
     # Determine orbital slot
     slot_index = 0
@@ -211,6 +209,7 @@ def create_station(
         parent_body=parent_body,
         owner_faction_id=owner_faction_id,
     ))
+    get_ownership_index(em).set_owner(entity.id, owner_faction_id, "station")
 
     # Add position (will be updated by OrbitalSystem if parent_body is set)
     em.add_component(entity, Position(x=position[0], y=position[1]))
@@ -365,6 +364,7 @@ def create_earth_market(
         parent_body="Earth",
         owner_faction_id=owner_faction_id,
     ))
+    get_ownership_index(em).set_owner(entity.id, owner_faction_id, "station")
 
     # Add position locked to Earth
     em.add_component(entity, Position(x=position[0], y=position[1]))
@@ -432,8 +432,8 @@ def create_earth_market(
 
     # Register Earth market with slot manager so new builds don't overlap
     from .station_slots import OrbitalSlotManager
-    for _, slot_mgr in em.get_all_components(OrbitalSlotManager):
+    slot_mgr = em.get_resource(OrbitalSlotManager)
+    if slot_mgr:
         slot_mgr.occupy_slot("Earth", 0, entity.id)
-        break
 
     return entity
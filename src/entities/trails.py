@@ -1,16 +1,25 @@
-"""Trail components for ship path visualization."""
+"""Trail components for ship path visualization.
+
+Trail points for every ship live in one shared TrailStore: preallocated
+(rows x points) arrays of x, y and birth time, one row per ship used as a
+ring buffer. A point's age is derived from its birth time, so nothing is
+touched per frame; expired points are dropped by advancing the ring's
+start index.
+"""
 from __future__ import annotations
+import heapq
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
 
 from ..core.ecs import Component
 
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
 
-@dataclass
-class TrailPoint:
-    """A single point in a ship's trail."""
-    x: float
-    y: float
-    timestamp: float  # Game time when point was recorded
+# Points held per trail row
+TRAIL_LENGTH = 30
 
 
 @dataclass
@@ -18,9 +27,151 @@ class Trail(Component):
     """Component that stores a ship's position history for trail rendering.
 
     Creates the visual "ant farm" effect by showing where ships have been.
+    The points themselves are kept in the shared TrailStore row ``row``.
     """
-    points: list[TrailPoint] = field(default_factory=list)
-    max_points: int = 30  # Maximum number of trail points to store
+    persistent = False  # Eye candy; rebuilt after loading
+
+    max_points: int = TRAIL_LENGTH  # Maximum number of trail points to store
     max_age: float = 5.0  # Seconds before trail points fade completely
     record_interval: float = 0.1  # Time between recording points
-    last_record_time: float = 0.0  # Last time a point was recorded
+    last_record_time: float = 0.0  # Time since the last point was recorded
+    row: int = -1  # TrailStore row, -1 until allocated
+    head: int = 0  # Ring index the next point is written to
+    count: int = 0  # Live points in the ring
+
+    @property
+    def length(self) -> int:
+        """Ring size in points."""
+        return max(1, min(self.max_points, TRAIL_LENGTH))
+
+    @property
+    def start(self) -> int:
+        """Ring index of the oldest live point."""
+        return (self.head - self.count) % self.length
+
+
+@dataclass
+class TrailStore(Component):
+    """Singleton holding the trail points of every ship.
+
+    Arrays are (rows, TRAIL_LENGTH) and grow by doubling; released rows
+    are reused lowest first.
+    """
+    persistent = False  # Eye candy; rebuilt after loading
+
+    xs: np.ndarray = field(default_factory=lambda: np.zeros((0, TRAIL_LENGTH)))
+    ys: np.ndarray = field(default_factory=lambda: np.zeros((0, TRAIL_LENGTH)))
+    births: np.ndarray = field(default_factory=lambda: np.zeros((0, TRAIL_LENGTH)))
+    free_rows: list[int] = field(default_factory=list)  # Min-heap
+    time: float = 0.0  # Clock that birth times are measured against
+
+    @property
+    def rows(self) -> int:
+        return self.xs.shape[0]
+
+    def _grow(self) -> None:
+        """Double the number of rows."""
+        old = self.rows
+        new = max(16, old * 2)
+        for name in ("xs", "ys", "births"):
+            grown = np.zeros((new, TRAIL_LENGTH))
+            grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        for row in range(old, new):
+            heapq.heappush(self.free_rows, row)
+
+    def allocate(self, trail: Trail) -> None:
+        """Give a trail a row of its own."""
+        if trail.row >= 0:
+            return
+        if not self.free_rows:
+            self._grow()
+        trail.row = heapq.heappop(self.free_rows)
+        trail.head = 0
+        trail.count = 0
+
+    def release(self, trail: Trail) -> None:
+        """Return a trail's row for reuse."""
+        if trail.row >= 0:
+            heapq.heappush(self.free_rows, trail.row)
+        trail.row = -1
+        trail.head = 0
+        trail.count = 0
+
+    def push(self, trail: Trail, x: float, y: float) -> None:
+        """Record a point born now, overwriting the oldest if the ring is full."""
+        if trail.row < 0:
+            self.allocate(trail)
+        row, head = trail.row, trail.head
+        self.xs[row, head] = x
+        self.ys[row, head] = y
+        self.births[row, head] = self.time
+        trail.head = (head + 1) % trail.length
+        trail.count = min(trail.count + 1, trail.length)
+
+    def expire(self, trail: Trail) -> None:
+        """Drop points older than the trail's max_age from the ring."""
+        if not trail.count:
+            return
+        cutoff = self.time - trail.max_age
+        births = self.births[trail.row]
+        length = trail.length
+        start = trail.start
+        while trail.count and births[start] <= cutoff:
+            start = (start + 1) % length
+            trail.count -= 1
+
+    def segments(self, trail: Trail) -> list[slice]:
+        """Contiguous column slices of a trail's live points, oldest first."""
+        if not trail.count:
+            return []
+        start = trail.start
+        end = start + trail.count
+        if end <= trail.length:
+            return [slice(start, end)]
+        return [slice(start, trail.length), slice(0, end - trail.length)]
+
+    def points(self, trail: Trail) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """A trail's live points, oldest first.
+
+        Returns:
+            (x, y, age) arrays
+        """
+        if not trail.count:
+            empty = np.zeros(0)
+            return empty, empty, empty
+        row = trail.row
+        parts = self.segments(trail)
+        xs = np.concatenate([self.xs[row, s] for s in parts])
+        ys = np.concatenate([self.ys[row, s] for s in parts])
+        ages = self.time - np.concatenate([self.births[row, s] for s in parts])
+        return xs, ys, ages
+
+    def gather(self, trails: list[Trail]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Live points of many trails at once, oldest first.
+
+        Every trail must have a row. Each trail's points are left-aligned
+        in its output row; slots past its count hold stale values.
+
+        Returns:
+            (x, y, age) arrays of shape (len(trails), TRAIL_LENGTH) and the
+            live point count of each trail
+        """
+        n = len(trails)
+        rows = np.fromiter((t.row for t in trails), dtype=np.intp, count=n)
+        starts = np.fromiter((t.start for t in trails), dtype=np.intp, count=n)
+        lengths = np.fromiter((t.length for t in trails), dtype=np.intp, count=n)
+        counts = np.fromiter((t.count for t in trails), dtype=np.intp, count=n)
+        cols = (starts[:, None] + np.arange(TRAIL_LENGTH)) % lengths[:, None]
+        rows = rows[:, None]
+        return self.xs[rows, cols], self.ys[rows, cols], self.time - self.births[rows, cols], counts
+
+
+def get_trail_store(entity_manager: EntityManager) -> TrailStore:
+    """Get the trail store, creating an empty one on first use."""
+    store = entity_manager.get_resource(TrailStore)
+    if store is None:
+        store = TrailStore()
+        entity = entity_manager.create_entity(name="Trail Store")
+        entity_manager.add_component(entity, store)
+    return store
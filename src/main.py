@@ -11,21 +11,27 @@ from .core.transactions import get_transaction_service
 from .core.registries import get_resource_registry, get_recipe_registry
 from .solar_system.orbits import OrbitalSystem, MovementSystem, NavigationSystem
 from .simulation.production import ProductionSystem, ExtractionSystem
-from .simulation.economy import EconomySystem, PopulationSystem
+from .simulation.economy import EconomySystem, PopulationSystem, OpportunityIndex
 from .simulation.trade import TradeSystem
 from .simulation.events import EventSystem, DiscoverySystem
 from .simulation.goals import GoalSystem, EarthShipyardGoal, GoalStatus
 from .simulation.freelancer import FreelancerSpawner, FreelancerManager
 from .ai.faction_ai import FactionAI
 from .ai.ship_ai import ShipAI
-from .ai.trade_routes import TradeRouteFinder, SpatialIndex
+from .ai.trade_routes import TradeRouteFinder
+from .ai.trade_assignment import TradeAssignmentSolver, AssignmentMode
+from .ai.route_planner import RoutePlanner
+from .ai.planning_pool import PlanningPool
 from .ui.camera import Camera
 from .ui.renderer import Renderer
 from .ui.input import InputHandler, InputAction
 from .systems.building import BuildingSystem
 from .systems.ship_ai_v2 import ShipAISystemV2
-from .systems.save_load import save_game, load_game
+from .systems.autosave import Autosaver
+from .systems.delta_save import DeltaSaver
 from .systems.trail_system import TrailSystem
+from .systems.spatial_index import SpatialIndexSystem
+from .systems.ownership import OwnershipSystem
 
 
 def create_initial_world(world: World) -> None:
@@ -418,6 +424,27 @@ def create_competitive_start(world: World) -> dict:
     }
 
 
+def update_observer_view(world: World, renderer: Renderer, camera: Camera) -> None:
+    """Record what is on screen so unobserved ships can be simulated analytically."""
+    from .solar_system.observation import get_observer_view
+
+    if renderer.is_in_sector_view():
+        bounds = renderer.sector_view.get_world_bounds(world)
+        regions = [bounds] if bounds else []
+    else:
+        regions = [camera.get_visible_bounds()]
+
+    watched = set()
+    if camera.locked_entity_id is not None:
+        watched.add(camera.locked_entity_id)
+    if renderer.selected_entity is not None:
+        watched.add(renderer.selected_entity.id)
+    if renderer.sector_view.selected_ship_id is not None:
+        watched.add(renderer.sector_view.selected_ship_id)
+
+    get_observer_view(world.entity_manager).set_view(regions, watched)
+
+
 def main() -> None:
     """Main entry point."""
     # Initialize Pygame
@@ -445,21 +472,39 @@ def main() -> None:
     # Initialize transaction service
     transaction_service = get_transaction_service(event_bus)
 
-    # Create spatial index and trade route finder for efficient route discovery
-    spatial_index = SpatialIndex(cell_size=0.5)
-    route_finder = TradeRouteFinder(world.entity_manager, spatial_index)
+    # Shared station/ship grids, kept current by the spatial index system
+    spatial_index_system = SpatialIndexSystem(event_bus=event_bus)
+    # Snapshots after each economy tick let tours be planned in worker processes
+    route_finder = TradeRouteFinder(
+        world.entity_manager, spatial_index_system.stations,
+        event_bus=event_bus, auto_update_index=False, publish_snapshots=True
+    )
+
+    # Best buy/sell quotes per resource, rebuilt by the economy each price tick
+    opportunity_index = OpportunityIndex()
 
     # Create systems
-    building_system = BuildingSystem(event_bus)
+    building_system = BuildingSystem(event_bus, ship_index=spatial_index_system.ships)
     faction_ai = FactionAI(event_bus)
 
     # Create V2 ship AI system with behaviors (optional - can run alongside or replace ShipAI)
-    ship_ai_v2 = ShipAISystemV2(event_bus, route_finder, transaction_service)
+    # Fleet-wide trade assignment so traders don't all chase the same route;
+    # the rest of each trader's tour is planned in a worker while it flies
+    assignment_solver = TradeAssignmentSolver(AssignmentMode.GREEDY, opportunity_index=opportunity_index)
+    planning_pool = PlanningPool()
+    route_planner = RoutePlanner(opportunity_index=opportunity_index)
+    ship_ai_v2 = ShipAISystemV2(
+        event_bus, route_finder, transaction_service, assignment_solver,
+        planning_pool=planning_pool, route_planner=route_planner, game_time=world.game_time
+    )
 
     # Add systems (order matters - priority determines update order)
     world.add_system(OrbitalSystem())
-    world.add_system(NavigationSystem())
+    # Arrivals wake ships parked by the AI; trips are solved up front and
+    # only on-screen ships are positioned every frame
+    world.add_system(NavigationSystem(event_bus, closed_form=True))
     world.add_system(MovementSystem())
+    world.add_system(spatial_index_system)  # Sync spatial grids after movement
     world.add_system(TrailSystem())  # Record ship trails after movement
     world.add_system(ExtractionSystem(event_bus))
     world.add_system(ProductionSystem(event_bus))
@@ -467,12 +512,14 @@ def main() -> None:
     world.add_system(DiscoverySystem(event_bus))
     # world.add_system(ShipAI(event_bus))  # V1 ship AI (disabled)
     world.add_system(ship_ai_v2)  # V2 ship AI with behavior strategies
-    world.add_system(TradeSystem(event_bus))
-    world.add_system(EconomySystem(event_bus))
+    # Reservations are saved, so they expire against the saved world clock
+    world.add_system(TradeSystem(event_bus, opportunity_index, world.game_time))
+    world.add_system(EconomySystem(event_bus, opportunity_index, world.game_time))
     world.add_system(EventSystem(event_bus))
     world.add_system(GoalSystem(event_bus))
     world.add_system(building_system)
     world.add_system(faction_ai)
+    world.add_system(OwnershipSystem())  # Drop destroyed entities from the ownership index
 
     # Create competitive start (5 corporations racing)
     game_state = create_competitive_start(world)
@@ -732,20 +779,19 @@ def main() -> None:
     def on_upgrade_station() -> None:
         renderer.toggle_upgrade_menu()
 
+    # F5 writes a full save once, then deltas on top of it
+    quicksaver = DeltaSaver("quicksave")
+
     def on_quick_save() -> None:
-        success, message = save_game(world, "quicksave")
+        success, message = quicksaver.save(world)
         if success:
             renderer.add_notification(message, "success")
         else:
             renderer.add_notification(message, "error")
 
     def on_quick_load() -> None:
-        from pathlib import Path
-        from .systems.save_load import SAVE_DIR
-
-        quicksave_path = SAVE_DIR / "quicksave.json"
-        if quicksave_path.exists():
-            success, message = load_game(world, quicksave_path)
+        if quicksaver.base_path.exists():
+            success, message = quicksaver.load(world)
             if success:
                 renderer.add_notification(message, "success")
                 # Find and update player faction
@@ -883,6 +929,10 @@ def main() -> None:
     input_handler.register_callback(InputAction.NEWS, on_news)
     input_handler.register_callback(InputAction.FLEET, on_fleet)
     input_handler.register_callback(InputAction.TOGGLE_MAP, on_toggle_map)
+    input_handler.register_callback(InputAction.TOGGLE_TRAILS, renderer.toggle_trail_accumulation)
+
+    # Autosave in the background every 30 game days
+    autosaver = Autosaver(interval=30.0)
 
     # Main game loop
     running = True
@@ -942,9 +992,9 @@ def main() -> None:
                     if renderer.handle_story_event_key(event.key):
                         # Story event was acknowledged, check for more
                         from src.simulation.events import EventManager as EM
-                        for ent, em in world.entity_manager.get_all_components(EM):
+                        em = world.entity_manager.get_resource(EM)
+                        if em:
                             em.acknowledge_story_event()
-                            break
                     continue
 
                 # Handle Escape - closes the top menu
@@ -1114,18 +1164,21 @@ def main() -> None:
 
         # Check for pending story events
         from src.simulation.events import EventManager as EM
-        for entity, em in world.entity_manager.get_all_components(EM):
-            # Try to show next story event if none is currently displayed
-            if not renderer.is_story_event_active():
-                next_event = em.show_next_story_event()
-                if next_event:
-                    renderer.show_story_event(next_event)
-            break
+        em = world.entity_manager.get_resource(EM)
+        # Try to show next story event if none is currently displayed
+        if em and not renderer.is_story_event_active():
+            next_event = em.show_next_story_event()
+            if next_event:
+                renderer.show_story_event(next_event)
 
         # Update simulation (paused during story events)
         dt = clock.tick(FPS) / 1000.0  # Delta time in seconds
         if not renderer.is_story_event_active():
+            update_observer_view(world, renderer, camera)
             world.update(dt)
+            autosave_result = autosaver.update(world)
+            if autosave_result and not autosave_result[0]:
+                renderer.add_notification(autosave_result[1], "error")
 
         # Update camera lock position (even when paused, to follow moving bodies)
         camera.update_lock(world.entity_manager)
@@ -1172,6 +1225,8 @@ def main() -> None:
         pygame.display.flip()
 
     # Cleanup
+    autosaver.shutdown()
+    planning_pool.shutdown()
     pygame.quit()
     sys.exit(0)
 
@@ -1,7 +1,7 @@
 """Economic simulation systems."""
-from .economy import EconomySystem, Market
+from .economy import EconomySystem, Market, OpportunityIndex
 from .production import ProductionSystem
 from .resources import ResourceType, Inventory
 from .trade import TradeSystem
 
-__all__ = ['EconomySystem', 'Market', 'ProductionSystem', 'ResourceType', 'Inventory', 'TradeSystem']
+__all__ = ['EconomySystem', 'Market', 'OpportunityIndex', 'ProductionSystem', 'ResourceType', 'Inventory', 'TradeSystem']
@@ -6,11 +6,11 @@ from typing import TYPE_CHECKING
 from uuid import UUID
 
 from ..core.ecs import Component, System, EntityManager
-from ..core.events import EventBus, PriceChangeEvent, DividendEvent
-from .resources import ResourceType, BASE_PRICES, Inventory
+from ..core.events import EventBus, PriceChangeEvent, DividendEvent, MarketsUpdatedEvent
+from .resources import ResourceType, BASE_PRICES, Inventory, ReservationLedger
 
 if TYPE_CHECKING:
-    pass
+    from ..core.world import GameTime
 
 
 # Dividend system configuration
@@ -54,6 +54,22 @@ class Market(Component):
     volatility: float = 0.1
     # Credits available for purchases
     credits: float = 10000.0
+    # Credits claimed by ships on their way to sell here, per resource
+    reservations: ReservationLedger = field(default_factory=ReservationLedger)
+
+    def available_credits(self, holder_id: UUID | None = None) -> float:
+        """Credits not claimed by in-flight trades.
+
+        Args:
+            holder_id: Count this holder's own claims as available
+        """
+        claimed = self.reservations.total()
+        if holder_id is not None:
+            claimed -= sum(
+                r.amount for (holder, _), r in self.reservations.entries.items()
+                if holder == holder_id
+            )
+        return max(0.0, self.credits - claimed)
 
     def get_price_modifier(self) -> float:
         """Get price modifier based on market type."""
@@ -214,16 +230,28 @@ class EconomySystem(System):
 
     priority = 50  # Run after production and population
 
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        opportunity_index: OpportunityIndex | None = None,
+        game_time: GameTime | None = None
+    ) -> None:
         self.event_bus = event_bus
+        # Shared with TradeSystem, rebuilt after every price update
+        self.opportunity_index = opportunity_index
+        # World clock that reservation expiry is measured against; saved
+        # ledgers stay valid across a load because the clock is saved too
+        self.game_time = game_time
         self._update_interval = 5.0  # Update prices every 5 seconds
         self._time_since_update = 0.0
         self._dividend_timer = 0.0  # Timer for dividend processing
+        self._game_time = 0.0  # Game days, for reservation expiry
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
         """Update market prices and process dividends."""
         self._time_since_update += dt
         self._dividend_timer += dt
+        self._game_time = self.game_time.total_days if self.game_time is not None else self._game_time + dt
 
         # Process dividends on a separate timer
         if self._dividend_timer >= DIVIDEND_INTERVAL:
@@ -241,6 +269,10 @@ class EconomySystem(System):
             if not inventory:
                 continue
 
+            # Free claims left behind by ships that never arrived
+            market.reservations.expire(self._game_time)
+            inventory.reservations.expire(self._game_time)
+
             # For population centers, adjust target stock based on population
             population = entity_manager.get_component(entity, Population)
             if population:
@@ -265,56 +297,61 @@ class EconomySystem(System):
                         new_price=new_price
                     ))
 
-    def _process_dividends(self, entity_manager: EntityManager) -> None:
-        """Transfer excess credits from owned stations to their owner factions."""
-        from ..entities.stations import Station
-        from ..entities.factions import Faction
-
-        # Build faction lookup
-        factions: dict[UUID, Faction] = {}
-        for entity, faction in entity_manager.get_all_components(Faction):
-            factions[entity.id] = faction
-
-        # Process each station with a market
-        for entity, station in entity_manager.get_all_components(Station):
-            # Skip stations without owners
-            if not station.owner_faction_id:
-                continue
+        if self.opportunity_index is not None:
+            self.opportunity_index.rebuild(entity_manager)
 
-            # Get owner faction
-            owner_faction = factions.get(station.owner_faction_id)
-            if not owner_faction:
-                continue
+        self.event_bus.publish(MarketsUpdatedEvent(game_time=self._game_time))
 
-            # Get station's market
-            market = entity_manager.get_component(entity, Market)
-            if not market:
-                continue
+    def _process_dividends(self, entity_manager: EntityManager) -> None:
+        """Transfer excess credits from owned stations to their owner factions."""
+        from ..entities.factions import Faction, get_ownership_index
+
+        ownership = get_ownership_index(entity_manager)
+
+        # Process each faction's owned stations
+        for faction_entity, owner_faction in entity_manager.get_all_components(Faction):
+            for station_id in ownership.stations_of(faction_entity.id):
+                entity = entity_manager.get_entity(station_id)
+                if entity:
+                    self._pay_dividend(entity, faction_entity.id, owner_faction, entity_manager)
+
+    def _pay_dividend(
+        self,
+        entity,
+        faction_id: UUID,
+        owner_faction,
+        entity_manager: EntityManager
+    ) -> None:
+        """Transfer part of one station's excess credits to its owner."""
+        # Get station's market
+        market = entity_manager.get_component(entity, Market)
+        if not market:
+            return
 
-            # Calculate excess credits above operating threshold
-            excess = market.credits - DIVIDEND_THRESHOLD
-            if excess <= 0:
-                continue
+        # Calculate excess credits above operating threshold
+        excess = market.credits - DIVIDEND_THRESHOLD
+        if excess <= 0:
+            return
 
-            # Transfer percentage of excess to owner
-            dividend = excess * DIVIDEND_PERCENTAGE
-            if dividend < 1.0:  # Skip tiny amounts
-                continue
+        # Transfer percentage of excess to owner
+        dividend = excess * DIVIDEND_PERCENTAGE
+        if dividend < 1.0:  # Skip tiny amounts
+            return
 
-            # Transfer credits
-            market.credits -= dividend
-            owner_faction.credits += dividend
+        # Transfer credits
+        market.credits -= dividend
+        owner_faction.credits += dividend
 
-            # Get station name for event
-            station_name = entity.name or "Station"
+        # Get station name for event
+        station_name = entity.name or "Station"
 
-            # Fire dividend event
-            self.event_bus.publish(DividendEvent(
-                station_id=entity.id,
-                faction_id=station.owner_faction_id,
-                amount=dividend,
-                station_name=station_name
-            ))
+        # Fire dividend event
+        self.event_bus.publish(DividendEvent(
+            station_id=entity.id,
+            faction_id=faction_id,
+            amount=dividend,
+            station_name=station_name
+        ))
 
 
 def find_best_trade(
@@ -345,10 +382,10 @@ def find_best_trade(
         if profit_per_unit <= 0:
             continue
 
-        # Calculate max tradeable amount
-        available = source_inventory.get(resource)
+        # Calculate max tradeable amount, net of in-flight reservations
+        available = source_inventory.available(resource)
         dest_space = dest_inventory.free_space
-        affordable = dest_market.credits / buy_price if buy_price > 0 else 0
+        affordable = dest_market.available_credits() / buy_price if buy_price > 0 else 0
 
         max_amount = min(available, cargo_capacity, dest_space, affordable)
 
@@ -362,3 +399,131 @@ def find_best_trade(
             best_trade = (resource, max_amount, profit_per_unit)
 
     return best_trade
+
+
+@dataclass
+class MarketQuote:
+    """A single station's standing offer for one resource."""
+    station_id: UUID
+    price: float
+    quantity: float  # Units on offer (sellers) or units the station can absorb (buyers)
+
+
+class OpportunityIndex:
+    """World-level index of the best buy and sell quotes per resource.
+
+    Rebuilt once per economy tick. For each resource it keeps the top sellers
+    (lowest ask with stock on hand) and the top buyers (highest bid with
+    credits and storage to pay for it), so route selection for a ship is a
+    small top-k merge instead of a scan over every station pair.
+    """
+
+    def __init__(self, top_k: int = 8) -> None:
+        """Initialize the index.
+
+        Args:
+            top_k: Number of sellers and buyers kept per resource
+        """
+        self.top_k = top_k
+        self.sellers: dict[ResourceType, list[MarketQuote]] = {}
+        self.buyers: dict[ResourceType, list[MarketQuote]] = {}
+        self.is_built = False
+
+    def rebuild(self, entity_manager: EntityManager) -> None:
+        """Rebuild the index from the current market state."""
+        sellers: dict[ResourceType, list[MarketQuote]] = {}
+        buyers: dict[ResourceType, list[MarketQuote]] = {}
+
+        for entity in entity_manager.get_entities_with(Market, Inventory):
+            market = entity_manager.get_component(entity, Market)
+            inventory = entity_manager.get_component(entity, Inventory)
+            if not market or not inventory:
+                continue
+
+            free_space = inventory.free_space
+            credits = market.available_credits()
+
+            for resource in market.sells:
+                sell_price = market.get_sell_price(resource)
+                stock = inventory.available(resource)
+                if sell_price is not None and stock > 0:
+                    sellers.setdefault(resource, []).append(
+                        MarketQuote(entity.id, sell_price, stock)
+                    )
+
+            for resource in market.buys:
+                buy_price = market.get_buy_price(resource)
+                if buy_price is None or buy_price <= 0:
+                    continue
+                capacity = min(free_space, credits / buy_price)
+                if capacity > 0:
+                    buyers.setdefault(resource, []).append(
+                        MarketQuote(entity.id, buy_price, capacity)
+                    )
+
+        for quotes in sellers.values():
+            quotes.sort(key=lambda q: q.price)
+            del quotes[self.top_k:]
+        for quotes in buyers.values():
+            quotes.sort(key=lambda q: q.price, reverse=True)
+            del quotes[self.top_k:]
+
+        self.sellers = sellers
+        self.buyers = buyers
+        self.is_built = True
+
+    def find_best_route(
+        self,
+        cargo_capacity: float,
+        min_profit_per_unit: float = 0.0
+    ) -> tuple[UUID, UUID, ResourceType, float, float] | None:
+        """Find the trade with the highest profit per unit.
+
+        Args:
+            cargo_capacity: Free cargo space of the ship
+            min_profit_per_unit: Trades must beat this margin
+
+        Returns:
+            (source_id, dest_id, resource, amount, profit_per_unit) or None
+        """
+        best: tuple[UUID, UUID, ResourceType, float, float] | None = None
+        best_profit = min_profit_per_unit
+
+        if cargo_capacity <= 0:
+            return None
+
+        for resource, sellers in self.sellers.items():
+            buyers = self.buyers.get(resource)
+            if not buyers:
+                continue
+
+            # Sellers ascend by ask, buyers descend by bid - stop as soon as
+            # the spread can no longer beat the best trade found so far
+            for seller in sellers:
+                if buyers[0].price - seller.price <= best_profit:
+                    break
+                for buyer in buyers:
+                    profit = buyer.price - seller.price
+                    if profit <= best_profit:
+                        break
+                    if buyer.station_id == seller.station_id:
+                        continue
+
+                    amount = min(seller.quantity, buyer.quantity, cargo_capacity)
+                    if amount <= 0:
+                        continue
+
+                    best_profit = profit
+                    best = (seller.station_id, buyer.station_id, resource, amount, profit)
+                    break
+
+        return best
+
+    def claim(self, source_id: UUID, dest_id: UUID, resource: ResourceType, amount: float) -> None:
+        """Deduct a newly reserved trade from the quotes until the next rebuild."""
+        for quote in self.sellers.get(resource, ()):
+            if quote.station_id == source_id:
+                quote.quantity = max(0.0, quote.quantity - amount)
+        for quote in self.buyers.get(resource, ()):
+            if quote.station_id == dest_id:
+                quote.quantity = max(0.0, quote.quantity - amount)
@@ -377,8 +377,9 @@ class EventSystem(System):
 
     def _get_event_manager(self, entity_manager: EntityManager) -> EventManager | None:
         """Get the global event manager, creating if needed."""
-        for entity, em in entity_manager.get_all_components(EventManager):
-            return em
+        event_mgr = entity_manager.get_resource(EventManager)
+        if event_mgr is not None:
+            return event_mgr
 
         # Create new event manager on a system entity
         from ..core.ecs import Entity
@@ -611,19 +612,12 @@ class DiscoverySystem(System):
         from ..solar_system.orbits import NavigationTarget, Position, Velocity, ParentBody
         from .resources import ResourceKnowledge, ResourceDeposit
 
-        event_manager = None
-        for entity, em in entity_manager.get_all_components(EventManager):
-            event_manager = em
-            break
-
+        event_manager = entity_manager.get_resource(EventManager)
         if not event_manager:
             return
 
         # Get resource knowledge singleton
-        knowledge = None
-        for entity, k in entity_manager.get_all_components(ResourceKnowledge):
-            knowledge = k
-            break
+        knowledge = entity_manager.get_resource(ResourceKnowledge)
 
         # Check each ship for body surveys (ships that just arrived)
         if knowledge:
@@ -781,28 +775,26 @@ class DiscoverySystem(System):
 
 def get_active_events(entity_manager: EntityManager) -> list[GameEvent]:
     """Get all active events."""
-    for entity, em in entity_manager.get_all_components(EventManager):
-        return em.active_events
-    return []
+    em = entity_manager.get_resource(EventManager)
+    return em.active_events if em else []
 
 
 def get_available_contracts(entity_manager: EntityManager) -> list[Contract]:
     """Get all available contracts."""
-    for entity, em in entity_manager.get_all_components(EventManager):
-        return [c for c in em.available_contracts if not c.accepted]
-    return []
+    em = entity_manager.get_resource(EventManager)
+    return [c for c in em.available_contracts if not c.accepted] if em else []
 
 
 def get_news_feed(entity_manager: EntityManager, limit: int = 10) -> list[NewsItem]:
     """Get recent news items."""
-    for entity, em in entity_manager.get_all_components(EventManager):
-        return em.news_feed[:limit]
-    return []
+    em = entity_manager.get_resource(EventManager)
+    return em.news_feed[:limit] if em else []
 
 
 def accept_contract(entity_manager: EntityManager, contract_id: str, faction_id: UUID) -> bool:
     """Accept a contract for a faction."""
-    for entity, em in entity_manager.get_all_components(EventManager):
+    em = entity_manager.get_resource(EventManager)
+    if em:
         for contract in em.available_contracts:
             if contract.id == contract_id and not contract.accepted:
                 contract.accepted = True
@@ -813,7 +805,8 @@ def accept_contract(entity_manager: EntityManager, contract_id: str, faction_id:
 
 def claim_discovery(entity_manager: EntityManager, discovery_id: str, faction_id: UUID) -> Discovery | None:
     """Claim a discovery and get rewards."""
-    for entity, em in entity_manager.get_all_components(EventManager):
+    em = entity_manager.get_resource(EventManager)
+    if em:
         for i, discovery in enumerate(em.pending_discoveries):
             if discovery.id == discovery_id and not discovery.claimed:
                 discovery.claimed = True
@@ -1,13 +1,15 @@
 """Freelancer spawning system - spawns traders when cargo needs moving."""
 from __future__ import annotations
+import heapq
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from ..core.ecs import Component, System, EntityManager
-from ..core.events import EventBus
+from ..core.ecs import Component, Entity, System, EntityManager
+from ..core.events import EventBus, StationBuiltEvent
 from ..entities.ships import create_ship, ShipType, Ship
 from ..entities.stations import Station
+from ..entities.factions import get_ownership_index
 from ..solar_system.orbits import Position, ParentBody
 from .resources import ResourceType, Inventory
 from .economy import Market
@@ -30,6 +32,128 @@ class FreelancerManager(Component):
     min_cargo_to_move: float = 50.0  # Minimum cargo amount to trigger spawn
 
 
+@dataclass
+class _StationExcess:
+    """Cached pickup score for one station."""
+    entity: Entity
+    inventory: Inventory
+    market: Market
+    version: int = -1  # Inventory version the score reflects
+    ticket: int = 0  # Matches the station's live heap entry
+    resource: ResourceType | None = None
+    amount: float = 0.0
+    score: float = 0.0
+
+
+class _ExcessQueue:
+    """Max-heap of stations by excess-cargo score.
+
+    A station is rescored only when its inventory version moves, and its
+    old heap entry is left behind as stale (skipped by ticket on pop).
+    Station membership is rescanned when marked stale and otherwise every
+    rescan_interval game days.
+    """
+
+    def __init__(self, rescan_interval: float = 30.0) -> None:
+        self.rescan_interval = rescan_interval
+        self._entries: dict[UUID, _StationExcess] = {}
+        self._heap: list[tuple[float, int, UUID]] = []
+        self._next_ticket = 1
+        self._next_rescan: float | None = None  # Rescan on first use
+
+    def mark_stale(self) -> None:
+        """Rescan stations on the next refresh."""
+        self._next_rescan = None
+
+    def refresh(
+        self,
+        manager: FreelancerManager,
+        entity_manager: EntityManager,
+        game_time: float = 0.0
+    ) -> None:
+        """Rescore stations whose inventories changed."""
+        if self._next_rescan is None or game_time >= self._next_rescan:
+            self._rebuild(entity_manager)
+            self._next_rescan = game_time + self.rescan_interval
+
+        for entry in self._entries.values():
+            if entry.inventory.version != entry.version:
+                self._rescore(entry, manager)
+
+    def pop_best(self, skip) -> _StationExcess | None:
+        """Take the highest-scoring station for which skip(station_id) is False.
+
+        Skipped stations stay queued.
+        """
+        skipped = []
+        best = None
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            neg_score, ticket, station_id = item
+            entry = self._entries.get(station_id)
+            if entry is None or entry.ticket != ticket:
+                continue  # Stale entry
+            if skip(station_id):
+                skipped.append(item)
+                continue
+            best = entry
+            entry.ticket = 0  # Re-queued when its stock next changes
+            break
+
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return best
+
+    def _rebuild(self, entity_manager: EntityManager) -> None:
+        """Pick up every station with an inventory and a market."""
+        entries: dict[UUID, _StationExcess] = {}
+        for entity, station in entity_manager.get_all_components(Station):
+            inventory = entity_manager.get_component(entity, Inventory)
+            market = entity_manager.get_component(entity, Market)
+            if not inventory or not market:
+                continue
+            entry = self._entries.get(entity.id)
+            if entry is None or entry.inventory is not inventory:
+                entry = _StationExcess(entity, inventory, market)
+            entries[entity.id] = entry
+
+        self._entries = entries
+
+    def _rescore(self, entry: _StationExcess, manager: FreelancerManager) -> None:
+        """Recompute a station's best pickup and requeue it if it has one."""
+        inventory = entry.inventory
+        entry.version = inventory.version
+        entry.ticket = 0
+        entry.resource = None
+        entry.score = 0.0
+
+        # Check if inventory is getting full
+        fill_ratio = inventory.total_amount / inventory.capacity if inventory.capacity > 0 else 0.0
+        if fill_ratio < manager.inventory_threshold:
+            return
+
+        # Find the resource with the most excess
+        for resource, amount in inventory.resources.items():
+            if amount < manager.min_cargo_to_move:
+                continue
+
+            # Prefer resources that the station is selling (has excess of)
+            if entry.market.get_sell_price(resource) is None:
+                continue
+
+            # Weight by amount and how full the station is
+            score = amount * fill_ratio
+            if score > entry.score:
+                entry.resource = resource
+                entry.amount = amount
+                entry.score = score
+
+        if entry.resource is not None:
+            entry.ticket = self._next_ticket
+            self._next_ticket += 1
+            heapq.heappush(self._heap, (-entry.score, entry.ticket, entry.entity.id))
+
+
 class FreelancerSpawner(System):
     """System that spawns Freelancer ships when cargo needs moving.
 
@@ -39,15 +163,24 @@ class FreelancerSpawner(System):
 
     priority = 75  # Run after goals, before rendering
 
-    def __init__(self, event_bus: EventBus, world: "World") -> None:
+    def __init__(self, event_bus: EventBus, world: "World", check_interval: float = 1.0) -> None:
         self.event_bus = event_bus
         self._world = world
-        self._check_interval = 3.0  # Check every 3 game days
+        self._check_interval = check_interval  # Game days between checks
         self._time_since_check = 0.0
+        self._game_time = 0.0
+        self._excess = _ExcessQueue()
+        self._assigned: dict[UUID, UUID] = {}  # Station -> freelancer sent for its cargo
+        self._anchor_id: UUID | None = None  # Entity freelancers spawn next to
+        self._anchor_offset = 0.0
+        self._anchor_station_count = -1  # Freelancer station count when the anchor was chosen
+
+        event_bus.subscribe(StationBuiltEvent, self._on_station_built)
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
         """Check for cargo that needs moving and spawn Freelancers."""
         self._time_since_check += dt
+        self._game_time += dt
 
         if self._time_since_check < self._check_interval:
             return
@@ -55,10 +188,7 @@ class FreelancerSpawner(System):
         self._time_since_check = 0.0
 
         # Get FreelancerManager
-        manager = None
-        for entity, mgr in entity_manager.get_all_components(FreelancerManager):
-            manager = mgr
-            break
+        manager = entity_manager.get_resource(FreelancerManager)
 
         if not manager or not manager.freelancer_faction_id:
             return
@@ -80,93 +210,62 @@ class FreelancerSpawner(System):
 
         station_entity, resource_type, amount = station_with_cargo
 
-        # Check if there's already a freelancer heading to this station
-        if self._freelancer_targeting_station(station_entity.id, manager.freelancer_faction_id, entity_manager):
-            return
-
         # Spawn a Freelancer to handle this cargo
-        self._spawn_freelancer(
+        ship = self._spawn_freelancer(
             station_entity,
             resource_type,
             manager.freelancer_faction_id,
             entity_manager
         )
+        if ship:
+            self._assigned[station_entity.id] = ship.id
 
         # Set cooldown
         manager.spawn_cooldown = manager.spawn_interval
 
     def _count_freelancer_ships(self, faction_id: UUID, entity_manager: EntityManager) -> int:
         """Count ships owned by the Freelancer faction."""
-        count = 0
-        for entity, ship in entity_manager.get_all_components(Ship):
-            if ship.owner_faction_id == faction_id:
-                count += 1
-        return count
+        return get_ownership_index(entity_manager).ship_count(faction_id)
 
     def _find_station_needing_pickup(
         self,
         manager: FreelancerManager,
         entity_manager: EntityManager
     ) -> tuple | None:
-        """Find a station with excess cargo that needs pickup.
+        """Find the station with the most excess cargo that no freelancer is already handling.
 
         Returns:
             (station_entity, resource_type, amount) or None
         """
-        best_station = None
-        best_resource = None
-        best_amount = 0.0
+        self._excess.refresh(manager, entity_manager, self._game_time)
+        self._refresh_assignments(manager.freelancer_faction_id, entity_manager)
 
-        for entity, station in entity_manager.get_all_components(Station):
-            inventory = entity_manager.get_component(entity, Inventory)
-            market = entity_manager.get_component(entity, Market)
+        entry = self._excess.pop_best(lambda station_id: station_id in self._assigned)
+        if entry is None:
+            return None
+        return (entry.entity, entry.resource, entry.amount)
 
-            if not inventory or not market:
-                continue
-
-            # Check if inventory is getting full
-            fill_ratio = inventory.total_amount / inventory.capacity
-            if fill_ratio < manager.inventory_threshold:
-                continue
-
-            # Find the resource with the most excess
-            for resource, amount in inventory.resources.items():
-                if amount < manager.min_cargo_to_move:
-                    continue
+    def _refresh_assignments(self, faction_id: UUID, entity_manager: EntityManager) -> None:
+        """Rebuild the station -> freelancer map from the freelancer fleet.
 
-                # Prefer resources that the station is selling (has excess of)
-                sell_price = market.get_sell_price(resource)
-                if sell_price is None:
-                    continue
-
-                # Weight by amount and how full the station is
-                score = amount * fill_ratio
-                if score > best_amount:
-                    best_station = entity
-                    best_resource = resource
-                    best_amount = amount
-
-        if best_station:
-            return (best_station, best_resource, best_amount)
-        return None
+        A freelancer counts against the station its current route loads at,
+        or against the station it was spawned for until it picks a route.
+        """
+        spawned_for = {ship_id: station_id for station_id, ship_id in self._assigned.items()}
+        assigned: dict[UUID, UUID] = {}
 
-    def _freelancer_targeting_station(
-        self,
-        station_id: UUID,
-        faction_id: UUID,
-        entity_manager: EntityManager
-    ) -> bool:
-        """Check if a freelancer is already heading to this station."""
-        for entity, trader in entity_manager.get_all_components(Trader):
-            ship = entity_manager.get_component(entity, Ship)
-            if not ship or ship.owner_faction_id != faction_id:
+        for ship_id in get_ownership_index(entity_manager).ships_of(faction_id):
+            entity = entity_manager.get_entity(ship_id)
+            trader = entity_manager.get_component(entity, Trader) if entity else None
+            if not trader:
                 continue
 
             if trader.current_route:
-                if trader.current_route.source_id == station_id:
-                    return True
+                assigned[trader.current_route.source_id] = ship_id
+            elif ship_id in spawned_for:
+                assigned.setdefault(spawned_for[ship_id], ship_id)
 
-        return False
+        self._assigned = assigned
 
     def _spawn_freelancer(
         self,
@@ -174,12 +273,12 @@ class FreelancerSpawner(System):
         resource_type: ResourceType,
         faction_id: UUID,
         entity_manager: EntityManager
-    ) -> None:
+    ) -> Entity | None:
         """Spawn a Freelancer ship to pick up cargo."""
         # Find spawn location - prefer shipyard, otherwise Earth
-        spawn_pos = self._find_spawn_location(entity_manager)
+        spawn_pos = self._find_spawn_location(entity_manager, faction_id)
         if not spawn_pos:
-            return
+            return None
 
         # Generate unique name
         freelancer_count = self._count_freelancer_ships(faction_id, entity_manager)
@@ -197,22 +296,66 @@ class FreelancerSpawner(System):
 
         # The ship's AI will automatically find profitable trades
         # which should include the station we identified
+        return ship
 
-    def _find_spawn_location(self, entity_manager: EntityManager) -> tuple[float, float] | None:
-        """Find where to spawn a Freelancer (shipyard or Earth)."""
-        # First, try to find Earth Public Shipyard
-        for entity, station in entity_manager.get_all_components(Station):
-            if entity.name == "Earth Public Shipyard":
-                pos = entity_manager.get_component(entity, Position)
-                if pos:
-                    return (pos.x + 0.02, pos.y + 0.02)
+    def _find_spawn_location(
+        self,
+        entity_manager: EntityManager,
+        faction_id: UUID | None = None
+    ) -> tuple[float, float] | None:
+        """Find where to spawn a Freelancer (shipyard or Earth).
+
+        The anchor entity is cached; an Earth fallback is re-resolved only
+        when the freelancer faction's station count changes (a shipyard may
+        have opened).
+        """
+        ownership = get_ownership_index(entity_manager)
+        station_count = ownership.station_count(faction_id) if faction_id else -1
+        anchor = entity_manager.get_entity(self._anchor_id) if self._anchor_id else None
+        on_shipyard = anchor is not None and anchor.name == "Earth Public Shipyard"
 
-        # Fall back to Earth position
-        for entity in entity_manager.get_entities_with(Position):
-            if entity.name == "Earth":
-                pos = entity_manager.get_component(entity, Position)
-                if pos:
-                    return (pos.x + 0.05, pos.y + 0.05)
+        if anchor is None or not (on_shipyard or station_count == self._anchor_station_count):
+            anchor, self._anchor_offset = self._resolve_spawn_anchor(entity_manager, faction_id)
+            self._anchor_id = anchor.id if anchor else None
+            self._anchor_station_count = station_count
+
+        pos = entity_manager.get_component(anchor, Position) if anchor else None
+        if pos:
+            return (pos.x + self._anchor_offset, pos.y + self._anchor_offset)
 
         # Last resort - spawn at (1.0, 0.1)
         return (1.0, 0.1)
+
+    def _resolve_spawn_anchor(
+        self,
+        entity_manager: EntityManager,
+        faction_id: UUID | None
+    ) -> tuple[Entity | None, float]:
+        """Find the entity to spawn next to and the offset to use."""
+        # First, try to find Earth Public Shipyard (owned by the freelancers)
+        if faction_id:
+            station_ids = get_ownership_index(entity_manager).stations_of(faction_id)
+            candidates = (entity_manager.get_entity(station_id) for station_id in station_ids)
+        else:
+            candidates = (entity for entity, _ in entity_manager.get_all_components(Station))
+        for entity in candidates:
+            if entity and entity.name == "Earth Public Shipyard" and entity_manager.has_component(entity, Position):
+                return entity, 0.02
+
+        # Fall back to Earth position
+        earth = entity_manager.get_entity_by_name("Earth")
+        if earth and entity_manager.has_component(earth, Position):
+            return earth, 0.05
+
+        return None, 0.0
+
+    def _on_station_built(self, event: StationBuiltEvent) -> None:
+        """New stations join the excess queue on the next check."""
+        self._excess.mark_stale()
+
+    def on_entity_destroyed(self, entity, entity_manager: EntityManager) -> None:
+        """Forget destroyed stations and anchors."""
+        if entity.id == self._anchor_id:
+            self._anchor_id = None
+        if entity_manager.has_component(entity, Station):
+            self._excess.mark_stale()
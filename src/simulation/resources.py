@@ -2,6 +2,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
+from uuid import UUID
 
 
 class ResourceType(Enum):
@@ -69,11 +70,72 @@ BASE_PRICES: dict[ResourceType, float] = {
 }
 
 
+@dataclass
+class Reservation:
+    """A claim held for an in-flight trade."""
+    amount: float
+    expires_at: float  # Game days
+
+
+@dataclass
+class ReservationLedger:
+    """Claims against a station's stock or credits, per resource.
+
+    Each holder (usually a ship) has at most one claim per resource.
+    Claims expire by game time, so a destroyed or reassigned holder
+    cannot lock up stock forever.
+    """
+    entries: dict[tuple[UUID, ResourceType], Reservation] = field(default_factory=dict)
+    _totals: dict[ResourceType, float] = field(default_factory=dict, repr=False)
+
+    def reserve(self, holder_id: UUID, resource: ResourceType, amount: float, expires_at: float) -> None:
+        """Create or replace a holder's claim on a resource."""
+        self.release(holder_id, resource)
+        if amount <= 0:
+            return
+        self.entries[(holder_id, resource)] = Reservation(amount, expires_at)
+        self._totals[resource] = self._totals.get(resource, 0.0) + amount
+
+    def release(self, holder_id: UUID, resource: ResourceType) -> float:
+        """Drop a holder's claim. Returns the amount released."""
+        reservation = self.entries.pop((holder_id, resource), None)
+        if reservation is None:
+            return 0.0
+        remaining = self._totals.get(resource, 0.0) - reservation.amount
+        if remaining > 1e-9:
+            self._totals[resource] = remaining
+        else:
+            self._totals.pop(resource, None)
+        return reservation.amount
+
+    def held_by(self, holder_id: UUID, resource: ResourceType) -> float:
+        """Amount a holder has claimed."""
+        reservation = self.entries.get((holder_id, resource))
+        return reservation.amount if reservation else 0.0
+
+    def total(self, resource: ResourceType | None = None) -> float:
+        """Amount claimed for a resource, or across all resources."""
+        if resource is None:
+            return sum(self._totals.values())
+        return self._totals.get(resource, 0.0)
+
+    def expire(self, now: float) -> int:
+        """Drop claims whose expiry has passed. Returns how many were dropped."""
+        expired = [key for key, r in self.entries.items() if r.expires_at <= now]
+        for holder_id, resource in expired:
+            self.release(holder_id, resource)
+        return len(expired)
+
+
 @dataclass
 class Inventory:
     """Component that stores resources."""
     resources: dict[ResourceType, float] = field(default_factory=dict)
     capacity: float = 1000.0  # Maximum total storage
+    # Stock claimed by ships on their way to buy it
+    reservations: ReservationLedger = field(default_factory=ReservationLedger)
+    # Bumped on every add/remove so indexes can tell when stock changed
+    version: int = field(default=0, compare=False, repr=False)
 
     def add(self, resource: ResourceType, amount: float) -> float:
         """Add resources. Returns actual amount added (limited by capacity)."""
@@ -83,6 +145,7 @@ class Inventory:
 
         if actual_add > 0:
             self.resources[resource] = self.resources.get(resource, 0.0) + actual_add
+            self.version += 1
 
         return actual_add
 
@@ -95,6 +158,7 @@ class Inventory:
             self.resources[resource] = current - actual_remove
             if self.resources[resource] <= 0:
                 del self.resources[resource]
+            self.version += 1
 
         return actual_remove
 
@@ -102,6 +166,18 @@ class Inventory:
         """Get amount of a specific resource."""
         return self.resources.get(resource, 0.0)
 
+    def available(self, resource: ResourceType, holder_id: UUID | None = None) -> float:
+        """Amount not claimed by in-flight trades.
+
+        Args:
+            resource: Resource to check
+            holder_id: Count this holder's own claim as available
+        """
+        claimed = self.reservations.total(resource)
+        if holder_id is not None:
+            claimed -= self.reservations.held_by(holder_id, resource)
+        return max(0.0, self.get(resource) - claimed)
+
     def has(self, resource: ResourceType, amount: float) -> bool:
         """Check if inventory has at least the specified amount."""
         return self.get(resource) >= amount
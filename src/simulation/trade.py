@@ -8,10 +8,10 @@ from uuid import UUID
 from ..core.ecs import Component, System, EntityManager
 from ..core.events import EventBus, TradeCompleteEvent, ResourceTransferEvent
 from .resources import ResourceType, Inventory
-from .economy import Market
+from .economy import Market, OpportunityIndex
 
 if TYPE_CHECKING:
-    pass
+    from ..core.world import GameTime
 
 
 class TradeState(Enum):
@@ -140,16 +140,98 @@ class CargoHold(Component):
         return self.total_cargo == 0
 
 
+# How long a route's stock and credit claims last before expiring (game days).
+# Comfortably longer than the slowest freighter's outer-system round trip.
+RESERVATION_TTL = 120.0
+
+
+def reserve_route(
+    entity_manager: EntityManager,
+    holder_id: UUID,
+    route: TradeRoute,
+    expires_at: float
+) -> None:
+    """Claim source stock and destination credits for an accepted route.
+
+    Args:
+        entity_manager: Entity manager for station access
+        holder_id: Ship holding the claims
+        route: Route being flown
+        expires_at: Game day the claims lapse if never released
+    """
+    source = entity_manager.get_entity(route.source_id)
+    source_inv = entity_manager.get_component(source, Inventory) if source else None
+    if source_inv:
+        source_inv.reservations.reserve(holder_id, route.resource, route.amount, expires_at)
+
+    dest = entity_manager.get_entity(route.destination_id)
+    dest_market = entity_manager.get_component(dest, Market) if dest else None
+    if dest_market:
+        price = dest_market.get_buy_price(route.resource)
+        if price:
+            dest_market.reservations.reserve(holder_id, route.resource, route.amount * price, expires_at)
+
+
+def release_route(
+    entity_manager: EntityManager,
+    holder_id: UUID,
+    route: TradeRoute,
+    stock: bool = True,
+    credits: bool = True
+) -> None:
+    """Release a route's claims once the stock is loaded or the trade ends.
+
+    Args:
+        entity_manager: Entity manager for station access
+        holder_id: Ship holding the claims
+        route: Route being flown
+        stock: Release the claim on source stock
+        credits: Release the claim on destination credits
+    """
+    if stock:
+        source = entity_manager.get_entity(route.source_id)
+        source_inv = entity_manager.get_component(source, Inventory) if source else None
+        if source_inv:
+            source_inv.reservations.release(holder_id, route.resource)
+
+    if credits:
+        dest = entity_manager.get_entity(route.destination_id)
+        dest_market = entity_manager.get_component(dest, Market) if dest else None
+        if dest_market:
+            dest_market.reservations.release(holder_id, route.resource)
+
+
 class TradeSystem(System):
     """System that manages trade between stations."""
 
     priority = 40  # Run after production, before economy
 
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        opportunity_index: OpportunityIndex | None = None,
+        game_time: GameTime | None = None
+    ) -> None:
+        """Initialize the trade system.
+
+        Args:
+            event_bus: Event bus for trade events
+            opportunity_index: Index shared with EconomySystem, which rebuilds it
+                each economy tick. A private index is created if None.
+            game_time: World clock that reservations expire against. Without
+                it the system counts days from its own start.
+        """
         self.event_bus = event_bus
+        self.opportunity_index = opportunity_index or OpportunityIndex()
+        self.game_time = game_time
+        self._game_time = 0.0  # Game days, for reservation expiry
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
         """Update all traders."""
+        self._game_time = self.game_time.total_days if self.game_time is not None else self._game_time + dt
+        if not self.opportunity_index.is_built:
+            self.opportunity_index.rebuild(entity_manager)
+
         for entity, trader in entity_manager.get_all_components(Trader):
             self._update_trader(entity, trader, entity_manager, dt)
 
@@ -169,6 +251,9 @@ class TradeSystem(System):
             # Find a new trade route
             route = self._find_trade_route(entity, trader, cargo, entity_manager)
             if route:
+                # Claim the stock and credits so other ships plan around them
+                reserve_route(entity_manager, entity.id, route, self._game_time + RESERVATION_TTL)
+                self.opportunity_index.claim(route.source_id, route.destination_id, route.resource, route.amount)
                 trader.current_route = route
                 trader.state = TradeState.TRAVELING_TO_BUY
 
@@ -177,9 +262,11 @@ class TradeSystem(System):
             if trader.current_route:
                 success = self._execute_buy(entity, trader, cargo, entity_manager)
                 if success:
+                    release_route(entity_manager, entity.id, trader.current_route, credits=False)
                     trader.state = TradeState.TRAVELING_TO_SELL
                 else:
                     # Trade failed, go idle
+                    release_route(entity_manager, entity.id, trader.current_route)
                     trader.current_route = None
                     trader.state = TradeState.IDLE
 
@@ -187,6 +274,7 @@ class TradeSystem(System):
             # Execute sell at destination
             if trader.current_route:
                 self._execute_sell(entity, trader, cargo, entity_manager)
+                release_route(entity_manager, entity.id, trader.current_route)
             trader.current_route = None
             trader.state = TradeState.IDLE
 
@@ -198,47 +286,20 @@ class TradeSystem(System):
         entity_manager: EntityManager
     ) -> TradeRoute | None:
         """Find the best trade route for this trader."""
-        from .economy import find_best_trade
-
-        best_route: TradeRoute | None = None
-        best_profit = trader.min_profit_threshold
-
-        # Get all stations with markets
-        stations = list(entity_manager.get_entities_with(Market, Inventory))
-
-        for source in stations:
-            source_market = entity_manager.get_component(source, Market)
-            source_inv = entity_manager.get_component(source, Inventory)
-            if not source_market or not source_inv:
-                continue
-
-            for dest in stations:
-                if source.id == dest.id:
-                    continue
-
-                dest_market = entity_manager.get_component(dest, Market)
-                dest_inv = entity_manager.get_component(dest, Inventory)
-                if not dest_market or not dest_inv:
-                    continue
-
-                trade = find_best_trade(
-                    source_market, source_inv,
-                    dest_market, dest_inv,
-                    cargo.free_space
-                )
-
-                if trade and trade[2] > best_profit:
-                    resource, amount, profit = trade
-                    best_profit = profit
-                    best_route = TradeRoute(
-                        source_id=source.id,
-                        destination_id=dest.id,
-                        resource=resource,
-                        amount=amount,
-                        profit_per_unit=profit
-                    )
-
-        return best_route
+        route = self.opportunity_index.find_best_route(
+            cargo.free_space, trader.min_profit_threshold
+        )
+        if not route:
+            return None
+
+        source_id, dest_id, resource, amount, profit = route
+        return TradeRoute(
+            source_id=source_id,
+            destination_id=dest_id,
+            resource=resource,
+            amount=amount,
+            profit_per_unit=profit
+        )
 
     def _execute_buy(
         self,
@@ -267,7 +328,8 @@ class TradeSystem(System):
         if price is None:
             return False
 
-        available = source_inv.get(route.resource)
+        # Our own claim counts as available; other ships' claims do not
+        available = source_inv.available(route.resource, ship_entity.id)
         buy_amount = min(route.amount, available, cargo.free_space)
 
         if buy_amount <= 0:
@@ -322,9 +384,10 @@ class TradeSystem(System):
 
         total_value = price * sell_amount
 
-        # Check if market can afford it
-        if dest_market.credits < total_value:
-            total_value = dest_market.credits
+        # Check if market can afford it (credits claimed by other ships are off limits)
+        credits = dest_market.available_credits(ship_entity.id)
+        if credits < total_value:
+            total_value = credits
             sell_amount = total_value / price
 
         # Transfer resources
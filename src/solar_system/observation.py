@@ -0,0 +1,82 @@
+"""What the player is currently looking at.
+
+The UI records the world-space areas on screen (the map camera's visible
+bounds, or the surroundings of the sector being viewed) and any entities it
+follows. NavigationSystem uses this to simulate unobserved ships in transit
+analytically instead of frame by frame.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..core.ecs import Component
+
+if TYPE_CHECKING:
+    from ..core.ecs import EntityManager
+
+
+@dataclass
+class ObserverView(Component):
+    """Singleton component describing the observed parts of the world."""
+    persistent = False  # UI state, rebuilt every frame - not saved
+
+    # (min_x, min_y, max_x, max_y) in AU
+    regions: list[tuple[float, float, float, float]] = field(default_factory=list)
+    watched: set[UUID] = field(default_factory=set)  # Entities followed regardless of position
+    version: int = 0  # Bumped whenever the view changes
+
+    def set_view(
+        self,
+        regions: list[tuple[float, float, float, float]],
+        watched: set[UUID] | None = None
+    ) -> None:
+        """Replace the observed regions and watched entities."""
+        watched = watched or set()
+        if regions != self.regions or watched != self.watched:
+            self.regions = list(regions)
+            self.watched = set(watched)
+            self.version += 1
+
+    def sees(self, x: float, y: float, pad: float = 0.0) -> bool:
+        """Check if a point lies in an observed region.
+
+        Args:
+            x: World X in AU
+            y: World Y in AU
+            pad: Extra margin as a fraction of each region's larger side
+
+        Returns:
+            True if the point is observed
+        """
+        for min_x, min_y, max_x, max_y in self.regions:
+            margin = pad * max(max_x - min_x, max_y - min_y)
+            if min_x - margin <= x <= max_x + margin and min_y - margin <= y <= max_y + margin:
+                return True
+        return False
+
+    def observes(self, entity_id: UUID, x: float, y: float, pad: float = 0.0) -> bool:
+        """Check if an entity at a position is observed."""
+        return entity_id in self.watched or self.sees(x, y, pad)
+
+
+def get_observer_view(entity_manager: EntityManager) -> ObserverView:
+    """Get the observer view, creating an empty one on first use.
+
+    Args:
+        entity_manager: Entity manager holding the singleton
+
+    Returns:
+        The shared ObserverView
+    """
+    view = find_observer_view(entity_manager)
+    if view is None:
+        view = ObserverView()
+        entity = entity_manager.create_entity(name="Observer View")
+        entity_manager.add_component(entity, view)
+    return view
+
+
+def find_observer_view(entity_manager: EntityManager) -> ObserverView | None:
+    """Get the observer view if one exists."""
+    return entity_manager.get_resource(ObserverView)
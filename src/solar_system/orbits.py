@@ -1,13 +1,18 @@
 """Orbital mechanics (simplified for game)."""
 from __future__ import annotations
+import heapq
 import math
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
+from uuid import UUID
 
 from ..core.ecs import Component, System, EntityManager
+from ..core.spatial import SpatialIndex
+from .trajectory import Trajectory, plan_trajectory
 
 if TYPE_CHECKING:
-    pass
+    from ..core.events import EventBus
+    from .observation import ObserverView
 
 
 @dataclass
@@ -47,6 +52,8 @@ class Velocity(Component):
 @dataclass
 class Orbit(Component):
     """Orbital parameters for celestial bodies."""
+    static = True  # The angle only follows game time; delta saves advance it on load
+
     parent_name: str  # Name of parent body
     semi_major_axis: float  # AU
     orbital_period: float  # Earth days
@@ -65,6 +72,13 @@ class Orbit(Component):
             return 0.0
         return (2 * math.pi) / self.orbital_period
 
+    def advance(self, days: float) -> None:
+        """Move along the orbit by a number of days."""
+        angular_vel = self.angular_velocity()
+        if self.clockwise:
+            angular_vel = -angular_vel
+        self.current_angle = (self.current_angle + angular_vel * days) % (2 * math.pi)
+
 
 @dataclass
 class ParentBody(Component):
@@ -154,11 +168,7 @@ class OrbitalSystem(System):
                 continue
 
             # Update orbital angle
-            angular_vel = orbit.angular_velocity()
-            if orbit.clockwise:
-                angular_vel = -angular_vel
-            orbit.current_angle += angular_vel * dt_days
-            orbit.current_angle %= (2 * math.pi)
+            orbit.advance(dt_days)
 
             # Calculate new position relative to parent
             rel_x, rel_y = orbit.get_position_at_angle(orbit.current_angle)
@@ -204,6 +214,10 @@ class MovementSystem(System):
             if entity_manager.has_component(entity, ParentBody):
                 continue
 
+            # Skip unobserved ships in transit (positioned by NavigationSystem)
+            if entity_manager.has_component(entity, AnalyticTransit):
+                continue
+
             pos = entity_manager.get_component(entity, Position)
             if not pos:
                 continue
@@ -251,40 +265,124 @@ class NavigationTarget(Component):
         return (self.current_speed * self.current_speed) / (2 * self.acceleration)
 
 
+@dataclass
+class AnalyticTransit(Component):
+    """Marks a ship in transit whose trip is simulated in closed form.
+
+    Added by NavigationSystem. MovementSystem leaves the ship alone; its
+    Position is evaluated from the trajectory - every frame while observed
+    (closed-form mode), otherwise only coarsely - and unobserved ships get
+    no trail.
+    """
+    persistent = False  # Not saved; NavigationSystem replans the trip after loading
+
+    trajectory: Trajectory
+    navigation: NavigationTarget  # Target the trajectory was planned for
+    target: tuple  # Snapshot of the target, to notice retargeting
+    ticket: int = 0  # Matches the system's arrival queue entry
+    observed: bool = False  # Positioned every frame
+    arrived: bool = False  # Reached a fixed target; waiting for the AI to clear it
+
+
 class NavigationSystem(System):
-    """System that moves entities towards their navigation targets with predictive tracking."""
+    """System that moves entities towards their navigation targets with predictive tracking.
+
+    With analytic_unobserved set, ships in transit outside the ObserverView
+    are taken off the per-frame path: their trip is solved once as a
+    Trajectory and an arrival queue brings them back to full fidelity when
+    they arrive. Ships are also brought back when the view reaches them.
+
+    With closed_form set, every trip is solved up front when it starts and
+    arrivals are handled straight from the arrival queue. Only ships in the
+    ObserverView have their position evaluated every frame; the rest are
+    refreshed every check_frames updates.
+
+    Analytic ships are checked against the whole view every check_frames
+    updates. When the view changes in between, only the ships that were in
+    the old view and those indexed near the new one are checked again.
+    """
 
     priority = 3  # Run between orbital and movement systems
 
-    def __init__(self) -> None:
+    PROMOTE_PAD = 0.1  # View margin (fraction of view size) that restores full fidelity
+    DEMOTE_PAD = 0.25  # Larger margin to leave before going analytic, so ships don't flip
+
+    def __init__(
+        self,
+        event_bus: EventBus | None = None,
+        analytic_unobserved: bool = False,
+        closed_form: bool = False,
+        check_frames: int = 30
+    ) -> None:
+        """Initialize the navigation system.
+
+        Args:
+            event_bus: Optional event bus for arrival notifications, so AI
+                can leave ships in transit alone until they arrive
+            analytic_unobserved: Simulate unobserved ships in transit analytically
+            closed_form: Simulate every trip analytically, evaluating
+                positions per frame only for observed ships
+            check_frames: Updates between full checks of analytic ships
+                against the view (a view change rechecks nearby ships at once)
+        """
+        self.event_bus = event_bus
+        self.analytic_unobserved = analytic_unobserved
+        self.closed_form = closed_form
+        self.check_frames = max(1, check_frames)
+
         # Cache of body positions and orbits for predictive targeting
         self._body_positions: dict[str, Position] = {}
         self._body_orbits: dict[str, Orbit] = {}
+        self._body_parents: dict[str, ParentBody] = {}
+
+        # Analytic transits: game clock, arrival queue of (time, ticket, entity)
+        self._time = 0.0
+        self._arrivals: list[tuple[float, int, UUID]] = []
+        self._ticket = 0
+        self._frames_until_check = 0  # Check everything on the first update
+        self._view_version = -1
+        self._visible: set[UUID] = set()  # Closed-form ships positioned every frame
+        # Analytic ship positions as of the last full check, for view changes
+        self._transit_index = SpatialIndex(cell_size=2.0)
+        self._indexed_at = 0.0
+        self._transit_speed = 0.0  # Fastest indexed ship, bounds drift since then
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
         """Update velocities to move towards targets with predictive tracking."""
         dt_days = dt  # 1 second = 1 day (X-Drive era)
+        self._time += dt_days
 
         # Cache celestial body positions and orbits
         self._update_body_cache(entity_manager)
 
+        if self.closed_form:
+            self._update_closed_form(entity_manager)
+            return
+
+        view = None
+        if self.analytic_unobserved:
+            from .observation import find_observer_view
+
+            view = find_observer_view(entity_manager)
+            self._update_analytic(view, entity_manager)
+
         # Collect into list first to avoid modifying dict during iteration
         nav_entities = list(entity_manager.get_all_components(NavigationTarget))
         for entity, nav in nav_entities:
+            transit = entity_manager.get_component(entity, AnalyticTransit)
+            if transit is not None:
+                if transit.navigation is nav and transit.target == self._target_key(nav):
+                    continue
+                # Retargeted mid-flight - resume from where the old trip had got to
+                self._promote(entity, transit, entity_manager)
+
             pos = entity_manager.get_component(entity, Position)
             vel = entity_manager.get_component(entity, Velocity)
 
             if not pos or not vel:
                 continue
 
-            # If ship has a ParentBody, it's locked - remove it to start moving
-            if entity_manager.has_component(entity, ParentBody):
-                entity_manager.remove_component(entity, ParentBody)
-                # Release parking slot
-                from ..entities.station_slots import ShipParkingManager
-                for _, pm in entity_manager.get_all_components(ShipParkingManager):
-                    pm.release_parking(entity.id)
-                    break
+            self._leave_parking(entity, entity_manager)
 
             # Update target position if tracking a body
             if nav.target_body_name:
@@ -304,6 +402,7 @@ class NavigationSystem(System):
                 nav.current_speed = 0.0
                 # Remove navigation target - we've arrived
                 entity_manager.remove_component(entity, NavigationTarget)
+                self._publish_arrival(entity.id, nav.target_body_name)
                 continue
 
             # Check if arrived at fixed coordinate (no body tracking)
@@ -316,11 +415,18 @@ class NavigationSystem(System):
                 vel.vy = 0.0
                 nav.current_speed = 0.0
                 self._lock_to_nearest_body(entity, pos, entity_manager)
+                self._publish_arrival(entity.id)
                 continue
 
             # Normalize direction
             if dist < 0.001:
                 continue  # Too close to determine direction
+
+            # Nobody is watching - solve the rest of the trip once
+            if self.analytic_unobserved and not self._observed(view, entity.id, pos.x, pos.y, self.DEMOTE_PAD):
+                self._begin_transit(entity, nav, pos, vel, entity_manager)
+                continue
+
             dir_x = dx / dist
             dir_y = dy / dist
 
@@ -396,20 +502,374 @@ class NavigationSystem(System):
         nav.target_x = future_x
         nav.target_y = future_y
 
+    def _leave_parking(self, entity, entity_manager: EntityManager) -> None:
+        """Unlock a ship from its body so it can move, releasing its parking slot."""
+        if entity_manager.has_component(entity, ParentBody):
+            entity_manager.remove_component(entity, ParentBody)
+            # Release parking slot
+            from ..entities.station_slots import ShipParkingManager
+            parking_manager = entity_manager.get_resource(ShipParkingManager)
+            if parking_manager:
+                parking_manager.release_parking(entity.id)
+
+    def current_position(self, entity, entity_manager: EntityManager) -> tuple[float, float] | None:
+        """Where an entity is right now, evaluating its trajectory if it has one.
+
+        Position is only refreshed coarsely for unobserved ships in transit;
+        use this when the exact position matters.
+        """
+        transit = entity_manager.get_component(entity, AnalyticTransit)
+        if transit is not None and not transit.arrived:
+            return transit.trajectory.position_at(self._time)
+        pos = entity_manager.get_component(entity, Position)
+        return (pos.x, pos.y) if pos else None
+
+    def _update_closed_form(self, entity_manager: EntityManager) -> None:
+        """Plan new trips, handle due arrivals and position observed ships."""
+        from .observation import find_observer_view
+
+        view = find_observer_view(entity_manager)
+        now = self._time
+
+        while self._arrivals and self._arrivals[0][0] <= now:
+            _, ticket, entity_id = heapq.heappop(self._arrivals)
+            entity = entity_manager.get_entity(entity_id)
+            transit = entity_manager.get_component(entity, AnalyticTransit) if entity else None
+            if transit is not None and transit.ticket == ticket and not transit.arrived:
+                self._arrive(entity, transit, entity_manager)
+
+        # Plan trips that are new or were retargeted
+        for entity, nav in list(entity_manager.get_all_components(NavigationTarget)):
+            transit = entity_manager.get_component(entity, AnalyticTransit)
+            if transit is not None and transit.navigation is nav and transit.target == self._target_key(nav):
+                continue
+
+            pos = entity_manager.get_component(entity, Position)
+            vel = entity_manager.get_component(entity, Velocity)
+            if not pos or not vel:
+                continue
+
+            if transit is not None and not transit.arrived:
+                # Carry on from where the old trip had got to
+                pos.x, pos.y = transit.trajectory.position_at(now)
+                nav.current_speed = transit.trajectory.speed_at(now)
+            self._leave_parking(entity, entity_manager)
+            if nav.target_body_name:
+                self._update_target_for_body(nav, pos, entity_manager)
+
+            transit = self._begin_transit(entity, nav, pos, vel, entity_manager)
+            transit.observed = self._observed(view, entity.id, pos.x, pos.y, self.PROMOTE_PAD)
+            if transit.observed:
+                self._visible.add(entity.id)
+
+        version = view.version if view else -1
+        self._frames_until_check -= 1
+        if self._frames_until_check <= 0:
+            self._frames_until_check = self.check_frames
+            self._view_version = version
+            self._reset_transit_index()
+            self._visible.clear()
+            for entity, transit in list(entity_manager.get_all_components(AnalyticTransit)):
+                self._check_closed_form(entity, transit, view, entity_manager)
+        elif version != self._view_version:
+            # Only ships in the old view or near the new one can change state
+            self._view_version = version
+            candidates = self._visible | self._near_view(view)
+            self._visible.clear()
+            for entity_id in candidates:
+                entity = entity_manager.get_entity(entity_id)
+                transit = entity_manager.get_component(entity, AnalyticTransit) if entity else None
+                if transit is not None:
+                    self._check_closed_form(entity, transit, view, entity_manager)
+
+        # Observed ships move smoothly; the trajectory gives position and speed
+        for entity_id in self._visible:
+            entity = entity_manager.get_entity(entity_id)
+            transit = entity_manager.get_component(entity, AnalyticTransit) if entity else None
+            if transit is None or transit.arrived:
+                continue
+            trajectory = transit.trajectory
+            pos = entity_manager.get_component(entity, Position)
+            vel = entity_manager.get_component(entity, Velocity)
+            if not pos or not vel:
+                continue
+            pos.x, pos.y = trajectory.position_at(now)
+            dir_x, dir_y = trajectory.direction
+            speed = trajectory.speed_at(now)
+            vel.vx = dir_x * speed
+            vel.vy = dir_y * speed
+
+    def _check_closed_form(
+        self,
+        entity,
+        transit: AnalyticTransit,
+        view: ObserverView | None,
+        entity_manager: EntityManager
+    ) -> None:
+        """Check a closed-form ship against the view, refreshing it if unobserved."""
+        if transit.arrived:
+            if not entity_manager.has_component(entity, NavigationTarget):
+                entity_manager.remove_component(entity, AnalyticTransit)
+            return
+        if not entity_manager.has_component(entity, NavigationTarget):
+            # Trip cancelled - stop where the ship had got to
+            self._promote(entity, transit, entity_manager)
+            return
+
+        x, y = transit.trajectory.position_at(self._time)
+        self._index_transit(entity.id, x, y, transit.trajectory)
+        transit.observed = self._observed(view, entity.id, x, y, self.PROMOTE_PAD)
+        if transit.observed:
+            self._visible.add(entity.id)
+            return
+
+        pos = entity_manager.get_component(entity, Position)
+        if pos:
+            pos.x = x
+            pos.y = y
+        self._set_average_velocity(entity, transit.trajectory, entity_manager)
+
+    def _reset_transit_index(self) -> None:
+        """Start a fresh index of analytic ships; the full check refills it."""
+        self._transit_index.clear()
+        self._indexed_at = self._time
+        self._transit_speed = 0.0
+
+    def _index_transit(self, entity_id: UUID, x: float, y: float, trajectory: Trajectory) -> None:
+        """Record where an analytic ship is, widening the drift bound to its speed."""
+        self._transit_index.update(entity_id, x, y)
+        self._transit_speed = max(self._transit_speed, trajectory.peak_speed, trajectory.initial_speed)
+
+    def _near_view(self, view: ObserverView | None) -> set[UUID]:
+        """Indexed analytic ships that may have moved into the view since indexing."""
+        if view is None:
+            return set()
+        drift = self._transit_speed * (self._time - self._indexed_at)
+        near = set(view.watched)
+        for min_x, min_y, max_x, max_y in view.regions:
+            margin = self.PROMOTE_PAD * max(max_x - min_x, max_y - min_y) + drift
+            near.update(self._transit_index.get_in_box(
+                min_x - margin, min_y - margin, max_x + margin, max_y + margin
+            ))
+        return near
+
+    def _arrive(self, entity, transit: AnalyticTransit, entity_manager: EntityManager) -> None:
+        """Finish a closed-form trip: capture into orbit or stop at the target."""
+        pos = entity_manager.get_component(entity, Position)
+        vel = entity_manager.get_component(entity, Velocity)
+        nav = entity_manager.get_component(entity, NavigationTarget)
+        if vel:
+            vel.vx = 0.0
+            vel.vy = 0.0
+        if nav is None or pos is None:
+            entity_manager.remove_component(entity, AnalyticTransit)
+            return
+
+        nav.current_speed = 0.0
+        if nav.target_body_name:
+            pos.x, pos.y = transit.trajectory.position_at(self._time)
+            self._lock_to_body(entity, pos, nav.target_body_name, entity_manager)
+            entity_manager.remove_component(entity, NavigationTarget)
+            entity_manager.remove_component(entity, AnalyticTransit)
+            self._publish_arrival(entity.id, nav.target_body_name)
+            return
+
+        # As in frame-by-frame mode, the AI clears NavigationTarget after arrival
+        pos.x = nav.target_x
+        pos.y = nav.target_y
+        self._lock_to_nearest_body(entity, pos, entity_manager)
+        transit.arrived = True
+        transit.observed = False
+        self._publish_arrival(entity.id)
+
+    @staticmethod
+    def _target_key(nav: NavigationTarget) -> tuple:
+        """The target fields an analytic trajectory was planned from."""
+        return (nav.target_body_name, nav.target_x, nav.target_y, nav.max_speed, nav.acceleration)
+
+    @staticmethod
+    def _observed(view: ObserverView | None, entity_id: UUID, x: float, y: float, pad: float) -> bool:
+        """Check if a ship is observed; with no view, nothing is."""
+        return view is not None and view.observes(entity_id, x, y, pad)
+
+    def _update_analytic(self, view: ObserverView | None, entity_manager: EntityManager) -> None:
+        """Restore analytic ships that arrived or came into view."""
+        now = self._time
+
+        while self._arrivals and self._arrivals[0][0] <= now:
+            _, ticket, entity_id = heapq.heappop(self._arrivals)
+            entity = entity_manager.get_entity(entity_id)
+            transit = entity_manager.get_component(entity, AnalyticTransit) if entity else None
+            if transit is not None and transit.ticket == ticket:
+                self._promote(entity, transit, entity_manager)
+
+        version = view.version if view else -1
+        self._frames_until_check -= 1
+        if self._frames_until_check <= 0:
+            self._frames_until_check = self.check_frames
+            self._reset_transit_index()
+            transits = list(entity_manager.get_all_components(AnalyticTransit))
+        elif version != self._view_version:
+            # Ships out of view stay analytic; only those near the new view can change
+            transits = []
+            for entity_id in self._near_view(view):
+                entity = entity_manager.get_entity(entity_id)
+                transit = entity_manager.get_component(entity, AnalyticTransit) if entity else None
+                if transit is not None:
+                    transits.append((entity, transit))
+        else:
+            return
+        self._view_version = version
+
+        for entity, transit in transits:
+            x, y = transit.trajectory.position_at(now)
+            if (not entity_manager.has_component(entity, NavigationTarget)
+                    or self._observed(view, entity.id, x, y, self.PROMOTE_PAD)):
+                self._promote(entity, transit, entity_manager)
+                continue
+
+            # Keep the position roughly current for AI and spatial queries
+            self._index_transit(entity.id, x, y, transit.trajectory)
+            pos = entity_manager.get_component(entity, Position)
+            if pos:
+                pos.x = x
+                pos.y = y
+
+    def _begin_transit(
+        self,
+        entity,
+        nav: NavigationTarget,
+        pos: Position,
+        vel: Velocity,
+        entity_manager: EntityManager
+    ) -> AnalyticTransit:
+        """Solve a ship's trip, taking it off the per-frame path, and queue its arrival."""
+        trajectory = self._plan_transit(pos, nav)
+        self._ticket += 1
+        transit = AnalyticTransit(
+            trajectory=trajectory,
+            navigation=nav,
+            target=self._target_key(nav),
+            ticket=self._ticket,
+        )
+        entity_manager.add_component(entity, transit)
+        heapq.heappush(self._arrivals, (trajectory.arrival_time, self._ticket, entity.id))
+        self._index_transit(entity.id, pos.x, pos.y, trajectory)
+        self._set_average_velocity(entity, trajectory, entity_manager, vel)
+        return transit
+
+    @staticmethod
+    def _set_average_velocity(
+        entity,
+        trajectory: Trajectory,
+        entity_manager: EntityManager,
+        vel: Velocity | None = None
+    ) -> None:
+        """Report a trip's average velocity; MovementSystem leaves the ship alone."""
+        if vel is None:
+            vel = entity_manager.get_component(entity, Velocity)
+        if not vel:
+            return
+        dir_x, dir_y = trajectory.direction
+        speed = trajectory.distance / trajectory.duration if trajectory.duration > 0 else 0.0
+        vel.vx = dir_x * speed
+        vel.vy = dir_y * speed
+
+    def _promote(self, entity, transit: AnalyticTransit, entity_manager: EntityManager) -> None:
+        """Put an analytic ship back on the per-frame path where its trip has got to."""
+        trajectory = transit.trajectory
+        pos = entity_manager.get_component(entity, Position)
+        if pos:
+            pos.x, pos.y = trajectory.position_at(self._time)
+
+        nav = entity_manager.get_component(entity, NavigationTarget)
+        if nav is transit.navigation:
+            nav.current_speed = trajectory.speed_at(self._time)
+
+        vel = entity_manager.get_component(entity, Velocity)
+        if vel:
+            vel.vx = 0.0
+            vel.vy = 0.0
+        entity_manager.remove_component(entity, AnalyticTransit)
+
+    def _plan_transit(self, pos: Position, nav: NavigationTarget) -> Trajectory:
+        """Solve a ship's trip to its target, intercepting a moving body."""
+        start = (pos.x, pos.y)
+
+        def trip(target: tuple[float, float], stop_short: float) -> Trajectory:
+            # End just inside the arrival zone so the per-frame checks fire
+            dx = target[0] - start[0]
+            dy = target[1] - start[1]
+            dist = math.sqrt(dx * dx + dy * dy)
+            end = start
+            if dist > stop_short:
+                scale = (dist - stop_short) / dist
+                end = (start[0] + dx * scale, start[1] + dy * scale)
+            return plan_trajectory(start, end, self._time, nav.current_speed, nav.max_speed, nav.acceleration)
+
+        if not nav.target_body_name:
+            return trip((nav.target_x, nav.target_y), nav.arrival_threshold * 0.5)
+
+        stop_short = nav.orbit_capture_distance * 0.5
+        target = self._predict_body_position(nav.target_body_name, 0.0) or (nav.target_x, nav.target_y)
+        trajectory = trip(target, stop_short)
+        # Fixed-point iteration on the intercept; ships far outpace bodies, so it converges fast
+        for _ in range(3):
+            target = self._predict_body_position(nav.target_body_name, trajectory.duration) or target
+            trajectory = trip(target, stop_short)
+        return trajectory
+
+    def _predict_body_position(self, body_name: str, days: float, depth: int = 0) -> tuple[float, float] | None:
+        """Where a body will be after some days, following its orbit and parents."""
+        pos = self._body_positions.get(body_name)
+        if not pos:
+            return None
+        if depth > 4:
+            return (pos.x, pos.y)
+
+        orbit = self._body_orbits.get(body_name)
+        if orbit:
+            angular_vel = orbit.angular_velocity()
+            if orbit.clockwise:
+                angular_vel = -angular_vel
+            x, y = orbit.get_position_at_angle(orbit.current_angle + angular_vel * days)
+            parent = self._predict_body_position(orbit.parent_name, days, depth + 1)
+            if parent:
+                x += parent[0]
+                y += parent[1]
+            return (x, y)
+
+        parent_body = self._body_parents.get(body_name)
+        if parent_body:
+            parent = self._predict_body_position(parent_body.parent_name, days, depth + 1)
+            if parent:
+                return (parent[0] + parent_body.offset_x, parent[1] + parent_body.offset_y)
+        return (pos.x, pos.y)
+
+    def _publish_arrival(self, entity_id: UUID, body_name: str = "") -> None:
+        """Notify listeners that an entity reached its navigation target."""
+        if self.event_bus:
+            from ..core.events import NavigationArrivedEvent
+            self.event_bus.publish(NavigationArrivedEvent(entity_id=entity_id, body_name=body_name))
+
     def _update_body_cache(self, entity_manager: EntityManager) -> None:
         """Cache celestial body positions and orbits for predictive targeting."""
         from ..entities.celestial import CelestialBody
 
         self._body_positions.clear()
         self._body_orbits.clear()
+        self._body_parents.clear()
 
         for entity, body in entity_manager.get_all_components(CelestialBody):
             pos = entity_manager.get_component(entity, Position)
             orbit = entity_manager.get_component(entity, Orbit)
+            parent = entity_manager.get_component(entity, ParentBody)
             if pos and entity.name:
                 self._body_positions[entity.name] = pos
             if orbit and entity.name:
                 self._body_orbits[entity.name] = orbit
+            if parent and entity.name:
+                self._body_parents[entity.name] = parent
 
     def _lock_to_body(
         self,
@@ -426,10 +886,7 @@ class NavigationSystem(System):
             return
 
         # Try to get parking manager and assign a slot
-        parking_manager = None
-        for _, pm in entity_manager.get_all_components(ShipParkingManager):
-            parking_manager = pm
-            break
+        parking_manager = entity_manager.get_resource(ShipParkingManager)
 
         if parking_manager:
             # Assign a parking slot
@@ -476,6 +933,7 @@ class NavigationSystem(System):
         nearest_dist = float('inf')
         nearest_pos = None
 
+        # Only runs on arrival, over a few dozen bodies
         for body_name, body_pos in self._body_positions.items():
             dx = body_pos.x - pos.x
             dy = body_pos.y - pos.y
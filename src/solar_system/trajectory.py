@@ -0,0 +1,139 @@
+"""Closed-form ship trajectories.
+
+A straight-line trip under NavigationSystem's speed rules - accelerate to
+cruise speed, cruise, then brake into the arrival zone - has a trapezoidal
+speed profile. Solving it once gives the arrival time and lets position
+and speed be evaluated at any moment without integrating frame by frame.
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    """A straight-line trip with an accelerate/cruise/brake speed profile.
+
+    Times are in game days, distances in AU.
+    """
+    start_x: float
+    start_y: float
+    end_x: float
+    end_y: float
+    start_time: float
+    initial_speed: float
+    peak_speed: float
+    acceleration: float  # Rate used to reach peak speed
+    deceleration: float  # Rate used to brake from peak speed
+    accel_time: float
+    cruise_time: float
+    decel_time: float
+
+    @property
+    def distance(self) -> float:
+        return math.hypot(self.end_x - self.start_x, self.end_y - self.start_y)
+
+    @property
+    def duration(self) -> float:
+        return self.accel_time + self.cruise_time + self.decel_time
+
+    @property
+    def arrival_time(self) -> float:
+        return self.start_time + self.duration
+
+    @property
+    def direction(self) -> tuple[float, float]:
+        dist = self.distance
+        if dist == 0:
+            return (0.0, 0.0)
+        return ((self.end_x - self.start_x) / dist, (self.end_y - self.start_y) / dist)
+
+    def speed_at(self, time: float) -> float:
+        """Speed (AU/day) at a game time."""
+        t = min(max(time - self.start_time, 0.0), self.duration)
+        if t < self.accel_time:
+            return self.initial_speed + self.acceleration * t
+        t -= self.accel_time
+        if t < self.cruise_time:
+            return self.peak_speed
+        t -= self.cruise_time
+        return max(0.0, self.peak_speed - self.deceleration * t)
+
+    def travelled_at(self, time: float) -> float:
+        """Distance covered (AU) by a game time."""
+        t = min(max(time - self.start_time, 0.0), self.duration)
+        v0 = self.initial_speed
+        if t < self.accel_time:
+            return v0 * t + 0.5 * self.acceleration * t * t
+
+        travelled = v0 * self.accel_time + 0.5 * self.acceleration * self.accel_time ** 2
+        t -= self.accel_time
+        if t < self.cruise_time:
+            return travelled + self.peak_speed * t
+
+        travelled += self.peak_speed * self.cruise_time
+        t -= self.cruise_time
+        return travelled + self.peak_speed * t - 0.5 * self.deceleration * t * t
+
+    def position_at(self, time: float) -> tuple[float, float]:
+        """Position (x, y) at a game time."""
+        if time >= self.arrival_time:
+            return (self.end_x, self.end_y)
+        dir_x, dir_y = self.direction
+        travelled = self.travelled_at(time)
+        return (self.start_x + dir_x * travelled, self.start_y + dir_y * travelled)
+
+
+def plan_trajectory(
+    start: tuple[float, float],
+    end: tuple[float, float],
+    start_time: float,
+    initial_speed: float,
+    max_speed: float,
+    acceleration: float
+) -> Trajectory:
+    """Solve the speed profile for a straight trip that ends at rest.
+
+    Args:
+        start: Starting (x, y) in AU
+        end: Point where the ship comes to rest
+        start_time: Game time the trip starts (days)
+        initial_speed: Speed at the start (AU/day)
+        max_speed: Cruise speed cap (AU/day)
+        acceleration: Acceleration and braking rate (AU/day^2)
+
+    Returns:
+        The planned Trajectory
+    """
+    distance = math.hypot(end[0] - start[0], end[1] - start[1])
+    v0 = max(0.0, min(initial_speed, max_speed))
+    a = acceleration
+
+    def trajectory(peak, accel_time, cruise_time, decel_time, decel) -> Trajectory:
+        return Trajectory(
+            start[0], start[1], end[0], end[1], start_time,
+            v0, peak, a, decel, accel_time, cruise_time, decel_time
+        )
+
+    if distance <= 0 or max_speed <= 0:
+        return trajectory(v0, 0.0, 0.0, 0.0, a)
+
+    if a <= 0:
+        # No acceleration - coast the whole way
+        speed = v0 if v0 > 0 else max_speed
+        return trajectory(speed, 0.0, distance / speed, 0.0, 0.0)
+
+    if v0 * v0 / (2 * a) >= distance:
+        # Too fast to stop in time at the normal rate - brake harder
+        decel_time = 2 * distance / v0
+        return trajectory(v0, 0.0, 0.0, decel_time, v0 / decel_time)
+
+    accel_dist = (max_speed * max_speed - v0 * v0) / (2 * a)
+    decel_dist = max_speed * max_speed / (2 * a)
+    if accel_dist + decel_dist <= distance:
+        cruise_time = (distance - accel_dist - decel_dist) / max_speed
+        return trajectory(max_speed, (max_speed - v0) / a, cruise_time, max_speed / a, a)
+
+    # Never reaches cruise speed: accelerate to the peak, then brake
+    peak = math.sqrt(a * distance + v0 * v0 / 2)
+    return trajectory(peak, (peak - v0) / a, 0.0, peak / a, a)
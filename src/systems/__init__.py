@@ -2,8 +2,10 @@
 from .building import BuildingSystem
 from .save_load import save_game, load_game, get_save_files, SAVE_DIR
 from .ship_ai_v2 import ShipAISystemV2
+from .spatial_index import SpatialIndexSystem
+from .ownership import OwnershipSystem
 
 __all__ = [
     "BuildingSystem", "save_game", "load_game", "get_save_files", "SAVE_DIR",
-    "ShipAISystemV2",
+    "ShipAISystemV2", "SpatialIndexSystem", "OwnershipSystem",
 ]
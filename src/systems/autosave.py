@@ -0,0 +1,200 @@
+"""Background autosave.
+
+Saving happens in two stages. On the main thread, snapshot_world() captures
+each component type column by column with its serializer: field values are
+read in bulk and only mutable state (inventories, market prices,
+reservation ledgers, slot tables) is copied, while scalars, enums and
+UUIDs are shared. A worker thread then rebuilds the components, encodes
+them into records, compresses them and writes the file atomically into
+one of a few rotating autosave slots.
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+from uuid import UUID
+
+from ..core.ecs import Entity
+from . import save_load
+from .serializers import get_serializer_registry
+
+if TYPE_CHECKING:
+    from ..core.world import World
+
+AUTOSAVE_PREFIX = "autosave"
+
+
+@dataclass
+class WorldSnapshot:
+    """Point-in-time copy of the world's saveable state.
+
+    Entities and each component type are stored as the entity IDs plus the
+    field columns from ComponentSerializer.capture(). Non-persistent types
+    keep only their IDs, to tell which entities have nothing to save.
+    """
+    header: dict[str, Any]
+    entities: list[Sequence] = field(default_factory=list)
+    entity_count: int = 0
+    components: dict[type, tuple[list[UUID], list[Sequence] | None]] = field(default_factory=dict)
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """Yield a serialized record for each captured entity."""
+        registry = get_serializer_registry()
+        entities = list(registry.get(Entity).rebuild(self.entities, self.entity_count))
+        by_entity: dict[UUID, dict[type, Any]] = {entity.id: {} for entity in entities}
+        for comp_type, (ids, columns) in self.components.items():
+            if columns is None:
+                comps = repeat(None)
+            else:
+                comps = registry.get(comp_type).rebuild(columns, len(ids))
+            for entity_id, comp in zip(ids, comps):
+                held = by_entity.get(entity_id)
+                if held is not None:
+                    held[comp_type] = comp
+        for entity in entities:
+            record = save_load.entity_record(entity, by_entity[entity.id])
+            if record is not None:
+                yield record
+
+
+def snapshot_world(world: World) -> WorldSnapshot:
+    """Capture the world's entities and components.
+
+    Args:
+        world: The game world
+
+    Returns:
+        A snapshot that can be serialized on another thread
+    """
+    em = world.entity_manager
+    registry = get_serializer_registry()
+    with save_load.paused_gc():
+        entities = registry.get(Entity).capture(em._entities.values())
+        components = {}
+        for comp_type, store in em._components.items():
+            serializer = registry.get(comp_type)
+            columns = serializer.capture(store.values()) if serializer.persistent else None
+            components[comp_type] = (list(store), columns)
+
+    return WorldSnapshot(
+        header=save_load.save_header(world),
+        entities=entities,
+        entity_count=len(em._entities),
+        components=components,
+    )
+
+
+def write_snapshot(snapshot: WorldSnapshot, path: Path, compress: bool = True) -> tuple[bool, str]:
+    """Write a snapshot to a binary save atomically.
+
+    Returns:
+        (success, message) tuple
+    """
+    try:
+        save_load.write_atomically(
+            path, lambda f: save_load.write_records(f, snapshot.header, snapshot.records(), compress)
+        )
+        return True, f"Autosaved to {path.name}"
+    except Exception as e:
+        return False, f"Autosave failed: {str(e)}"
+
+
+class Autosaver:
+    """Periodically saves the world on a worker thread.
+
+    Call update() once per frame. Only one save is in flight at a time; if
+    the previous one is still writing when the next is due, the next waits.
+    """
+
+    def __init__(self, interval: float = 30.0, slots: int = 3, compress: bool = True):
+        """Set up the autosaver.
+
+        Args:
+            interval: Game days between autosaves
+            slots: Number of autosave files to rotate through
+            compress: zlib-compress autosaves
+        """
+        self.interval = interval
+        self.slots = max(1, slots)
+        self.compress = compress
+        self.last_result: tuple[bool, str] | None = None
+        self._next_save: float | None = None
+        self._pending: Future | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+
+    @property
+    def busy(self) -> bool:
+        """Whether a save is still being written."""
+        return self._pending is not None and not self._pending.done()
+
+    def slot_path(self, slot: int) -> Path:
+        """Path of an autosave slot."""
+        return save_load.SAVE_DIR / f"{AUTOSAVE_PREFIX}_{slot}{save_load.SAVE_EXTENSION}"
+
+    def _next_slot(self) -> int:
+        """Pick an empty slot, else the one written longest ago."""
+        oldest_slot, oldest_time = 0, None
+        for slot in range(self.slots):
+            path = self.slot_path(slot)
+            if not path.exists():
+                return slot
+            mtime = path.stat().st_mtime
+            if oldest_time is None or mtime < oldest_time:
+                oldest_slot, oldest_time = slot, mtime
+        return oldest_slot
+
+    def update(self, world: World) -> tuple[bool, str] | None:
+        """Start an autosave when one is due.
+
+        Args:
+            world: The game world
+
+        Returns:
+            The result of an autosave that finished since the last call, if any
+        """
+        result = self.poll()
+        now = world.game_time.total_days
+        if self._next_save is None:
+            self._next_save = now + self.interval
+        elif now >= self._next_save and not self.busy:
+            self.save(world)
+        return result
+
+    def save(self, world: World) -> bool:
+        """Snapshot the world and write it to the next slot in the background.
+
+        Returns:
+            False if a previous save is still being written
+        """
+        if self.busy:
+            return False
+        save_load.ensure_save_dir()
+        path = self.slot_path(self._next_slot())
+        snapshot = snapshot_world(world)
+        self._pending = self._executor.submit(write_snapshot, snapshot, path, self.compress)
+        self._next_save = world.game_time.total_days + self.interval
+        return True
+
+    def poll(self) -> tuple[bool, str] | None:
+        """Collect the result of a finished save, if any."""
+        if self._pending is None or not self._pending.done():
+            return None
+        self.last_result = self._pending.result()
+        self._pending = None
+        return self.last_result
+
+    def wait(self, timeout: float | None = None) -> tuple[bool, str] | None:
+        """Block until the in-flight save (if any) finishes and return its result."""
+        if self._pending is not None:
+            try:
+                self._pending.result(timeout)
+            except TimeoutError:
+                return None
+        return self.poll()
+
+    def shutdown(self) -> None:
+        """Finish any in-flight save and stop the worker thread."""
+        self.wait()
+        self._executor.shutdown(wait=True)
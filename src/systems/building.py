@@ -18,6 +18,7 @@ from ..simulation.resources import ResourceType
 
 if TYPE_CHECKING:
     from ..core.world import World
+    from ..core.spatial import SpatialIndex, BodyRelativeIndex
 
 
 # Station costs (credits)
@@ -162,8 +163,20 @@ class BuildingSystem(System):
 
     priority = 55  # Run after economy, before faction AI
 
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        ship_index: SpatialIndex | BodyRelativeIndex | None = None
+    ) -> None:
+        """Initialize the building system.
+
+        Args:
+            event_bus: Event bus for build events
+            ship_index: Optional ship spatial index (kept by SpatialIndexSystem)
+                used for proximity checks instead of scanning every ship
+        """
         self.event_bus = event_bus
+        self.ship_index = ship_index
         self._pending_builds: list[BuildRequest] = []
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
@@ -242,10 +255,9 @@ class BuildingSystem(System):
         # Check if body has space for another station (max 12)
         if parent_body:
             from ..entities.station_slots import OrbitalSlotManager
-            for _, slot_mgr in em.get_all_components(OrbitalSlotManager):
-                if slot_mgr.is_full(parent_body):
-                    return BuildResult(False, f"{parent_body} is full (max 12 stations)")
-                break
+            slot_mgr = em.get_resource(OrbitalSlotManager)
+            if slot_mgr and slot_mgr.is_full(parent_body):
+                return BuildResult(False, f"{parent_body} is full (max 12 stations)")
 
         # Deduct credits
         faction_comp.credits -= cost
@@ -349,13 +361,14 @@ class BuildingSystem(System):
             List of Inventory components
         """
         from ..simulation.resources import Inventory
+        from ..entities.factions import get_ownership_index
 
         inventories = []
-        for entity, station in entity_manager.get_all_components(Station):
-            if station.owner_faction_id == faction_id:
-                inv = entity_manager.get_component(entity, Inventory)
-                if inv:
-                    inventories.append(inv)
+        for station_id in get_ownership_index(entity_manager).stations_of(faction_id):
+            entity = entity_manager.get_entity(station_id)
+            inv = entity_manager.get_component(entity, Inventory) if entity else None
+            if inv:
+                inventories.append(inv)
         return inventories
 
     def _check_material_availability(
@@ -417,6 +430,15 @@ class BuildingSystem(System):
         # Stations can be built anywhere - they will be organized as menu items under planetary bodies
         return True, "Valid position"
 
+    def has_ship_nearby(
+        self,
+        position: tuple[float, float],
+        faction_id: UUID,
+        entity_manager: EntityManager
+    ) -> bool:
+        """Check if a faction could build at a position (a ship of theirs is in range)."""
+        return self._check_ship_nearby(position, faction_id, entity_manager)[0]
+
     def _check_ship_nearby(
         self,
         position: tuple[float, float],
@@ -435,6 +457,14 @@ class BuildingSystem(System):
         """
         px, py = position
 
+        if self.ship_index is not None:
+            for ship_id in self.ship_index.get_nearby(px, py, MAX_BUILD_DISTANCE):
+                entity = entity_manager.get_entity(ship_id)
+                ship = entity_manager.get_component(entity, Ship) if entity else None
+                if ship and ship.owner_faction_id == faction_id:
+                    return True, f"Ship {entity.name} is nearby"
+            return False, f"No ship nearby - send a ship to this location first (within {MAX_BUILD_DISTANCE} AU)"
+
         for entity, ship in entity_manager.get_all_components(Ship):
             # Check if ship belongs to faction
             if ship.owner_faction_id != faction_id:
@@ -470,6 +500,19 @@ class BuildingSystem(System):
             (ship_name, distance) tuple, or (None, inf) if no ships
         """
         px, py = position
+
+        if self.ship_index is not None:
+            def is_faction_ship(ship_id: UUID) -> bool:
+                entity = entity_manager.get_entity(ship_id)
+                ship = entity_manager.get_component(entity, Ship) if entity else None
+                return ship is not None and ship.owner_faction_id == faction_id
+
+            nearest = self.ship_index.k_nearest(px, py, k=1, predicate=is_faction_ship)
+            if not nearest:
+                return None, float('inf')
+            ship_id, distance = nearest[0]
+            return entity_manager.get_entity(ship_id).name, distance
+
         nearest_name = None
         nearest_dist = float('inf')
 
@@ -550,6 +593,64 @@ class BuildingSystem(System):
 
         return True
 
+    def can_afford_ship(
+        self,
+        faction: Faction,
+        ship_type: ShipType,
+        entity_manager: EntityManager | None = None,
+        faction_id: UUID | None = None
+    ) -> bool:
+        """Check if a faction can afford to purchase a ship type.
+
+        Args:
+            faction: Faction component
+            ship_type: Type of ship to purchase
+            entity_manager: Entity manager (needed for material checks)
+            faction_id: Faction ID (needed for material checks)
+
+        Returns:
+            True if faction can afford both credits and materials
+        """
+        if faction.credits < SHIP_COSTS.get(ship_type, float('inf')):
+            return False
+
+        material_reqs = SHIP_MATERIAL_COSTS.get(ship_type, {})
+        if material_reqs and entity_manager and faction_id:
+            inventories = self._get_faction_inventories(faction_id, entity_manager)
+            if self._check_material_availability(material_reqs, inventories):
+                return False
+
+        return True
+
+    def can_afford_upgrade(
+        self,
+        faction: Faction,
+        target_type: StationType,
+        entity_manager: EntityManager | None = None,
+        faction_id: UUID | None = None
+    ) -> bool:
+        """Check if a faction can afford to upgrade a station to a type.
+
+        Args:
+            faction: Faction component
+            target_type: Station type to upgrade to
+            entity_manager: Entity manager (needed for material checks)
+            faction_id: Faction ID (needed for material checks)
+
+        Returns:
+            True if faction can afford both credits and materials
+        """
+        if faction.credits < self.get_upgrade_cost(target_type):
+            return False
+
+        material_reqs = self.get_upgrade_material_cost(target_type)
+        if material_reqs and entity_manager and faction_id:
+            inventories = self._get_faction_inventories(faction_id, entity_manager)
+            if self._check_material_availability(material_reqs, inventories):
+                return False
+
+        return True
+
     def get_cost(self, station_type: StationType) -> float:
         """Get the credit cost of a station type."""
         return STATION_COSTS.get(station_type, 0)
@@ -0,0 +1,330 @@
+"""Delta saves: a base snapshot plus a chain of diffs.
+
+Most of a world (celestial bodies, station configuration, recipes) never
+changes between quicksaves. DeltaSaver writes one full base save, then
+for each later save only the entities whose components changed since the
+previous one. Loading the base applies the delta chain on top.
+
+Components are mutated in place throughout the simulation, so instead of
+per-field dirty flags each component's encoding is hashed when saved; a
+component is dirty when the hash no longer matches. Static component
+types (``static = True``, e.g. celestial bodies and orbits) aren't encoded
+again once an entity has been saved; orbits are advanced to each delta's
+game time on load instead.
+
+Files for a save named "quicksave"::
+
+    quicksave.xps          base snapshot, header carries a base_id
+    quicksave.0001.xpd     delta 1 (header: base_id, sequence)
+    quicksave.0002.xpd     delta 2 ...
+"""
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+from uuid import UUID, uuid4
+
+from . import save_load
+from .save_format import SaveReader, pack
+from .serializers import get_serializer_registry, resolve_type, type_key
+
+if TYPE_CHECKING:
+    from ..core.ecs import Entity, EntityManager
+    from ..core.world import World
+
+DELTA_EXTENSION = ".xpd"
+
+# Entity -> component type (None for the entity's name and tags) -> hash of the encoding
+Fingerprints = dict[UUID, dict[Any, bytes]]
+
+
+def delta_path(base_path: Path, sequence: int) -> Path:
+    """Path of a delta in a base save's chain."""
+    return base_path.with_name(f"{base_path.stem}.{sequence:04d}{DELTA_EXTENSION}")
+
+
+def _digest(values: list) -> bytes:
+    """Hash of packed values, kept instead of the encoding itself."""
+    return hashlib.blake2b(pack(values), digest_size=16).digest()
+
+
+def _encode_entity(
+    entity: Entity,
+    components: dict[type, Any],
+    previous: dict[Any, bytes] | None = None
+) -> tuple[dict[Any, bytes], dict[type, list]] | None:
+    """Encode an entity's persistent components.
+
+    Args:
+        entity: The entity
+        components: Its components by type
+        previous: Its fingerprint from the last save; static components
+            already in it are not encoded again
+
+    Returns:
+        (fingerprint, encoded values by type), or None if the entity has
+        only non-persistent components and isn't saved
+    """
+    registry = get_serializer_registry()
+    fingerprint: dict[Any, bytes] = {None: _digest([entity.name, sorted(entity.tags)])}
+    encoded = {}
+    saved = False
+    for comp_type, comp in components.items():
+        serializer = registry.get(comp_type)
+        if not serializer.persistent:
+            continue
+        saved = True
+        if serializer.static and previous is not None and comp_type in previous:
+            fingerprint[comp_type] = previous[comp_type]
+            continue
+        values = serializer.encode(comp)
+        encoded[comp_type] = values
+        fingerprint[comp_type] = _digest(values)
+    if components and not saved:
+        return None
+    return fingerprint, encoded
+
+
+def _entity_record(entity: Entity, encoded: dict[type, list]) -> dict[str, Any]:
+    """Build a record from already-encoded component values."""
+    registry = get_serializer_registry()
+    return {
+        "id": str(entity.id),
+        "name": entity.name,
+        "tags": list(entity.tags),
+        "components": {registry.get(comp_type).name: values for comp_type, values in encoded.items()},
+    }
+
+
+def fingerprint_world(world: World) -> Fingerprints:
+    """Fingerprint every saved entity in the world."""
+    em = world.entity_manager
+    fingerprints = {}
+    for entity in em._entities.values():
+        result = _encode_entity(entity, save_load.entity_components(em, entity))
+        if result is not None:
+            fingerprints[entity.id] = result[0]
+    return fingerprints
+
+
+def _base_records(world: World, fingerprints: Fingerprints) -> Iterator[dict[str, Any]]:
+    """Yield full records, filling in fingerprints as a side effect."""
+    em = world.entity_manager
+    for entity in list(em._entities.values()):
+        result = _encode_entity(entity, save_load.entity_components(em, entity))
+        if result is not None:
+            fingerprints[entity.id], encoded = result
+            yield _entity_record(entity, encoded)
+
+
+def _delta_records(
+    world: World,
+    previous: Fingerprints,
+    fingerprints: Fingerprints
+) -> Iterator[dict[str, Any]]:
+    """Yield records for entities that changed since the previous save."""
+    em = world.entity_manager
+    for entity in list(em._entities.values()):
+        old = previous.get(entity.id)
+        result = _encode_entity(entity, save_load.entity_components(em, entity), old)
+        if result is None:
+            continue
+        fingerprint, encoded = result
+        fingerprints[entity.id] = fingerprint
+        if old == fingerprint:
+            continue
+
+        if old is None:
+            yield _entity_record(entity, encoded)
+            continue
+        changed = {
+            comp_type: values for comp_type, values in encoded.items()
+            if old.get(comp_type) != fingerprint[comp_type]
+        }
+        record = _entity_record(entity, changed)
+        record["removed"] = [
+            type_key(comp_type) for comp_type in old
+            if comp_type is not None and comp_type not in fingerprint
+        ]
+        yield record
+
+    for entity_id in previous.keys() - fingerprints.keys():
+        yield {"id": str(entity_id), "deleted": True}
+
+
+def _apply_delta_record(
+    em: EntityManager,
+    record: dict[str, Any],
+    decoders: dict[str, Callable[[list], Any]]
+) -> None:
+    """Apply one delta record to the world."""
+    entity_id = UUID(record["id"])
+    entity = em.get_entity(entity_id)
+    if record.get("deleted"):
+        if entity is not None:
+            em.destroy_entity(entity)
+        return
+
+    if entity is None:
+        entity = em.create_entity(entity_id=entity_id)
+    entity.name = record.get("name", "")
+    entity.tags = set(record.get("tags", []))
+    for key in record.get("removed", []):
+        em.remove_component(entity, resolve_type(key))
+    for name, values in record.get("components", {}).items():
+        em.add_component(entity, decoders[name](values))
+
+
+def _advance_orbits(em: EntityManager, days: float) -> None:
+    """Move every orbit on by a number of days (orbits are static in deltas)."""
+    from ..solar_system.orbits import Orbit
+
+    if days:
+        for _, orbit in em.get_all_components(Orbit):
+            orbit.advance(days)
+
+
+def load_save_chain(world: World, base_path: Path | str) -> tuple[str | None, int]:
+    """Load a binary save and apply its delta chain.
+
+    Deltas are applied in sequence until one is missing or belongs to a
+    different base (left over from before the base was rewritten). Before
+    each delta, orbits are advanced to its game time.
+
+    Args:
+        world: The world to load into
+        base_path: Path to the base save
+
+    Returns:
+        (base_id, number of deltas applied); base_id is None for saves
+        that aren't delta bases
+    """
+    base_path = Path(base_path)
+    with open(base_path, "rb") as f:
+        header = save_load.read_save(world, f)
+
+    base_id = header.get("base_id")
+    sequence = 0
+    if base_id is None:
+        return None, sequence
+
+    em = world.entity_manager
+    while True:
+        path = delta_path(base_path, sequence + 1)
+        if not path.exists():
+            break
+        with open(path, "rb") as f:
+            reader = SaveReader(f)
+            if reader.header.get("base_id") != base_id or reader.header.get("sequence") != sequence + 1:
+                break
+            previous_days = world.game_time.total_days
+            decoders = save_load.restore_header(world, reader.header, clear=False)
+            _advance_orbits(em, world.game_time.total_days - previous_days)
+            with save_load.paused_gc():
+                for record in reader:
+                    _apply_delta_record(em, record, decoders)
+        sequence += 1
+    return base_id, sequence
+
+
+class DeltaSaver:
+    """Writes a save as a base snapshot followed by small deltas.
+
+    A new base is written on the first save of a session (or after a
+    load from a save that isn't ours) and after max_deltas deltas, which
+    also keeps loading the chain fast.
+    """
+
+    def __init__(self, name: str = "quicksave", max_deltas: int = 20):
+        """Set up the saver.
+
+        Args:
+            name: Save file name, without extension
+            max_deltas: Deltas written before the next full base
+        """
+        self.name = name
+        self.max_deltas = max_deltas
+        self._base_id: str | None = None
+        self._sequence = 0
+        self._fingerprints: Fingerprints = {}
+
+    @property
+    def base_path(self) -> Path:
+        return save_load.SAVE_DIR / f"{self.name}{save_load.SAVE_EXTENSION}"
+
+    def save(self, world: World) -> tuple[bool, str]:
+        """Save the world, as a delta when possible.
+
+        Returns:
+            (success, message) tuple
+        """
+        try:
+            save_load.ensure_save_dir()
+            if self._base_id is None or self._sequence >= self.max_deltas:
+                self._write_base(world)
+                return True, f"Game saved to {self.base_path.name}"
+            changed = self._write_delta(world)
+            return True, f"Game saved to {self.base_path.name} ({changed} changed)"
+        except Exception as e:
+            return False, f"Failed to save: {str(e)}"
+
+    def load(self, world: World) -> tuple[bool, str]:
+        """Load the base save and its delta chain.
+
+        Returns:
+            (success, message) tuple
+        """
+        try:
+            if not self.base_path.exists():
+                return False, f"Save file not found: {self.base_path}"
+            base_id, sequence = load_save_chain(world, self.base_path)
+            self._base_id = base_id
+            self._sequence = sequence
+            self._fingerprints = fingerprint_world(world) if base_id else {}
+            return True, f"Game loaded from {self.base_path.name}"
+        except Exception as e:
+            return False, f"Failed to load: {str(e)}"
+
+    def _write_base(self, world: World) -> None:
+        """Write a full base save and drop the old delta chain."""
+        base_id = uuid4().hex
+        header = save_load.save_header(world)
+        header["base_id"] = base_id
+        fingerprints: Fingerprints = {}
+        records = _base_records(world, fingerprints)
+        save_load.write_atomically(
+            self.base_path, lambda f: save_load.write_records(f, header, records)
+        )
+
+        # Deltas of the old base are now stale; loading ignores them anyway
+        for path in self.base_path.parent.glob(f"{self.name}.*{DELTA_EXTENSION}"):
+            path.unlink(missing_ok=True)
+
+        self._base_id = base_id
+        self._sequence = 0
+        self._fingerprints = fingerprints
+
+    def _write_delta(self, world: World) -> int:
+        """Write the changes since the last save as the next delta.
+
+        Returns:
+            Number of changed (including added and removed) entities
+        """
+        sequence = self._sequence + 1
+        header = save_load.save_header(world)
+        header["base_id"] = self._base_id
+        header["sequence"] = sequence
+        fingerprints: Fingerprints = {}
+        records = _delta_records(world, self._fingerprints, fingerprints)
+        path = delta_path(self.base_path, sequence)
+
+        changed = 0
+
+        def write(f) -> None:
+            nonlocal changed
+            changed = save_load.write_records(f, header, records)
+
+        save_load.write_atomically(path, write)
+        self._sequence = sequence
+        self._fingerprints = fingerprints
+        return changed
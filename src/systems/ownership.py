@@ -0,0 +1,27 @@
+"""Ownership system - keeps the faction ownership index free of destroyed entities."""
+from __future__ import annotations
+
+from ..core.ecs import System, EntityManager, Entity
+from ..core.system_priority import SystemPriority
+from ..entities.factions import OwnershipIndex
+
+
+class OwnershipSystem(System):
+    """System that drops destroyed ships and stations from the OwnershipIndex.
+
+    Creation and transfers are recorded where they happen (the ship and
+    station factories and transfer_ownership); this system covers the
+    remaining case so owned counts never include destroyed entities.
+    """
+
+    priority = SystemPriority.LATE_UPDATE
+
+    def update(self, dt: float, entity_manager: EntityManager) -> None:
+        """Nothing to do per tick - the index is maintained incrementally."""
+        pass
+
+    def on_entity_destroyed(self, entity: Entity, entity_manager: EntityManager) -> None:
+        """Forget a destroyed entity's ownership."""
+        index = entity_manager.get_resource(OwnershipIndex)
+        if index is not None:
+            index.remove(entity.id)
@@ -0,0 +1,285 @@
+"""Compact binary save file format.
+
+A save file is a small fixed header followed by chunks of entity records::
+
+    magic (4 bytes) | format version (u16) | flags (u8)
+    header length (u32) | packed header
+    chunk: payload length (u32) | record count (u32) | payload
+    ...
+    end marker: payload length 0, record count 0
+
+Records and the header are packed with a msgpack-style tagged encoding of
+None, bools, ints, floats, strings, bytes, lists and string-keyed dicts.
+Each chunk payload is zlib-compressed when the COMPRESSED flag is set, so
+files are written and read a chunk at a time without ever holding every
+entity in memory at once.
+"""
+from __future__ import annotations
+import struct
+import zlib
+from typing import Any, BinaryIO, Iterator
+
+FORMAT_MAGIC = b"XPSV"
+FORMAT_VERSION = 1
+
+# Header flags
+FLAG_COMPRESSED = 0x01
+
+_PREAMBLE = struct.Struct("<4sHB")
+_U32 = struct.Struct("<I")
+_CHUNK = struct.Struct("<II")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# Value tags
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_UINT8 = 0x03
+_INT64 = 0x04
+_FLOAT64 = 0x05
+_STR = 0x06
+_BYTES = 0x07
+_LIST = 0x08
+_DICT = 0x09
+
+
+class SaveFormatError(ValueError):
+    """Raised when a save file is malformed or from an unsupported version."""
+
+
+def _pack_into(value: Any, out: bytearray) -> None:
+    """Append the packed form of a value to a buffer."""
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        if 0 <= value < 256:
+            out.append(_UINT8)
+            out.append(value)
+        else:
+            out.append(_INT64)
+            out += _I64.pack(value)
+    elif isinstance(value, float):
+        out.append(_FLOAT64)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out.append(_STR)
+        out += _U32.pack(len(encoded))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_BYTES)
+        out += _U32.pack(len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        out += _U32.pack(len(value))
+        for item in value:
+            _pack_into(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        out += _U32.pack(len(value))
+        for key, item in value.items():
+            _pack_into(key, out)
+            _pack_into(item, out)
+    else:
+        raise TypeError(f"Cannot pack {type(value).__name__}")
+
+
+def _unpack_from(data: bytes, offset: int) -> tuple[Any, int]:
+    """Read one packed value.
+
+    Returns:
+        (value, offset just past it)
+    """
+    tag = data[offset]
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _UINT8:
+        return data[offset], offset + 1
+    if tag == _INT64:
+        return _I64.unpack_from(data, offset)[0], offset + 8
+    if tag == _FLOAT64:
+        return _F64.unpack_from(data, offset)[0], offset + 8
+
+    size = _U32.unpack_from(data, offset)[0]
+    offset += 4
+    if tag == _STR:
+        return data[offset:offset + size].decode("utf-8"), offset + size
+    if tag == _BYTES:
+        return bytes(data[offset:offset + size]), offset + size
+    if tag == _LIST:
+        items = []
+        for _ in range(size):
+            item, offset = _unpack_from(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == _DICT:
+        result = {}
+        for _ in range(size):
+            key, offset = _unpack_from(data, offset)
+            result[key], offset = _unpack_from(data, offset)
+        return result, offset
+    raise SaveFormatError(f"Unknown value tag 0x{tag:02x}")
+
+
+def pack(value: Any) -> bytes:
+    """Pack a value into bytes."""
+    out = bytearray()
+    _pack_into(value, out)
+    return bytes(out)
+
+
+def unpack(data: bytes) -> Any:
+    """Unpack a single value packed with pack()."""
+    value, _ = _unpack_from(data, 0)
+    return value
+
+
+def is_binary_save(path_or_file: Any) -> bool:
+    """Check whether a file starts with the binary save magic."""
+    if hasattr(path_or_file, "read"):
+        return path_or_file.read(len(FORMAT_MAGIC)) == FORMAT_MAGIC
+    with open(path_or_file, "rb") as f:
+        return f.read(len(FORMAT_MAGIC)) == FORMAT_MAGIC
+
+
+class SaveWriter:
+    """Streams records to a binary save file in chunks.
+
+    Usage:
+        with SaveWriter(f, header) as writer:
+            for record in records:
+                writer.write(record)
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        header: dict[str, Any],
+        compress: bool = True,
+        chunk_size: int = 256
+    ):
+        """Write the file header.
+
+        Args:
+            stream: Binary file object opened for writing
+            header: Save metadata (time, speed, ...)
+            compress: zlib-compress chunk payloads
+            chunk_size: Records buffered per chunk
+        """
+        self.stream = stream
+        self.compress = compress
+        self.chunk_size = max(1, chunk_size)
+        self.records_written = 0
+        self._buffer = bytearray()
+        self._count = 0
+        self._closed = False
+
+        flags = FLAG_COMPRESSED if compress else 0
+        packed_header = pack(header)
+        stream.write(_PREAMBLE.pack(FORMAT_MAGIC, FORMAT_VERSION, flags))
+        stream.write(_U32.pack(len(packed_header)))
+        stream.write(packed_header)
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Buffer a record, flushing a chunk when full."""
+        _pack_into(record, self._buffer)
+        self._count += 1
+        if self._count >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records as one chunk."""
+        if not self._count:
+            return
+        payload = bytes(self._buffer)
+        if self.compress:
+            payload = zlib.compress(payload)
+        self.stream.write(_CHUNK.pack(len(payload), self._count))
+        self.stream.write(payload)
+        self.records_written += self._count
+        self._buffer.clear()
+        self._count = 0
+
+    def close(self) -> None:
+        """Flush remaining records and write the end marker."""
+        if self._closed:
+            return
+        self.flush()
+        self.stream.write(_CHUNK.pack(0, 0))
+        self._closed = True
+
+    def __enter__(self) -> SaveWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+
+class SaveReader:
+    """Reads a binary save file one chunk at a time.
+
+    The header is read on construction; iterating yields entity records.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """Read and validate the file header.
+
+        Args:
+            stream: Binary file object opened for reading
+
+        Raises:
+            SaveFormatError: If the file is not a supported binary save
+        """
+        self.stream = stream
+        preamble = stream.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise SaveFormatError("Truncated save header")
+        magic, version, flags = _PREAMBLE.unpack(preamble)
+        if magic != FORMAT_MAGIC:
+            raise SaveFormatError("Not a binary save file")
+        if version > FORMAT_VERSION:
+            raise SaveFormatError(f"Unsupported save version {version}")
+        self.version = version
+        self.compressed = bool(flags & FLAG_COMPRESSED)
+
+        header_size = _U32.unpack(self._read(_U32.size))[0]
+        self.header: dict[str, Any] = unpack(self._read(header_size))
+
+    def _read(self, size: int) -> bytes:
+        data = self.stream.read(size)
+        if len(data) < size:
+            raise SaveFormatError("Truncated save file")
+        return data
+
+    def chunks(self) -> Iterator[list[dict[str, Any]]]:
+        """Yield the records of each chunk in turn."""
+        while True:
+            size, count = _CHUNK.unpack(self._read(_CHUNK.size))
+            if count == 0:
+                return
+            payload = self._read(size)
+            if self.compressed:
+                payload = zlib.decompress(payload)
+
+            records = []
+            offset = 0
+            for _ in range(count):
+                record, offset = _unpack_from(payload, offset)
+                records.append(record)
+            yield records
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for records in self.chunks():
+            yield from records
@@ -1,18 +1,34 @@
-"""Save and load game state."""
+"""Save and load game state.
+
+Saves are written in the compact binary format from save_format, streamed
+one chunk of entities at a time. JSON is still available as an export.
+"""
 from __future__ import annotations
+import gc
 import json
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator
 from uuid import UUID
 
+from .save_format import SaveReader, SaveWriter, is_binary_save
+from .serializers import get_serializer_registry
+
 if TYPE_CHECKING:
+    from ..core.ecs import Entity, EntityManager
     from ..core.world import World
 
 # Default save directory
 SAVE_DIR = Path.home() / ".xpanse" / "saves"
 
+# Layout of the save header and entity records
+SAVE_VERSION = 2
+
+SAVE_EXTENSION = ".xps"
+EXPORT_EXTENSION = ".json"
+
 
 def ensure_save_dir() -> Path:
     """Ensure save directory exists."""
@@ -21,17 +37,19 @@ def ensure_save_dir() -> Path:
 
 
 def get_save_files() -> list[Path]:
-    """Get list of available save files."""
+    """Get list of available save files (binary saves and JSON exports)."""
     ensure_save_dir()
-    return sorted(SAVE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    files = list(SAVE_DIR.glob(f"*{SAVE_EXTENSION}")) + list(SAVE_DIR.glob(f"*{EXPORT_EXTENSION}"))
+    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
 
 
-def save_game(world: "World", save_name: str = "") -> tuple[bool, str]:
+def save_game(world: "World", save_name: str = "", export_json: bool = False) -> tuple[bool, str]:
     """Save the current game state to a file.
 
     Args:
         world: The game world to save
         save_name: Optional name for the save file
+        export_json: Write a human-readable JSON export instead of a binary save
 
     Returns:
         (success, message) tuple
@@ -44,18 +62,18 @@ def save_game(world: "World", save_name: str = "") -> tuple[bool, str]:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             save_name = f"save_{timestamp}"
 
-        # Add .json extension if not present
-        if not save_name.endswith(".json"):
-            save_name += ".json"
+        # Add the extension if not present
+        extension = EXPORT_EXTENSION if export_json else SAVE_EXTENSION
+        if not save_name.endswith(extension):
+            save_name += extension
 
         save_path = SAVE_DIR / save_name
 
-        # Serialize world state
-        save_data = serialize_world(world)
-
-        # Write to file
-        with open(save_path, "w") as f:
-            json.dump(save_data, f, indent=2)
+        if export_json:
+            with open(save_path, "w") as f:
+                json.dump(serialize_world(world), f, indent=2)
+        else:
+            write_atomically(save_path, lambda f: write_save(world, f))
 
         return True, f"Game saved to {save_name}"
 
@@ -64,7 +82,9 @@ def save_game(world: "World", save_name: str = "") -> tuple[bool, str]:
 
 
 def load_game(world: "World", save_path: Path | str) -> tuple[bool, str]:
-    """Load a game state from a file.
+    """Load a game state from a binary save or JSON export.
+
+    Deltas written on top of a binary save are applied too.
 
     Args:
         world: The world to load into
@@ -78,12 +98,12 @@ def load_game(world: "World", save_path: Path | str) -> tuple[bool, str]:
         if not save_path.exists():
             return False, f"Save file not found: {save_path}"
 
-        # Read save file
-        with open(save_path, "r") as f:
-            save_data = json.load(f)
-
-        # Deserialize into world
-        deserialize_world(world, save_data)
+        if is_binary_save(save_path):
+            from .delta_save import load_save_chain
+            load_save_chain(world, save_path)
+        else:
+            with open(save_path, "r") as f:
+                deserialize_world(world, json.load(f))
 
         return True, f"Game loaded from {save_path.name}"
 
@@ -91,22 +111,131 @@ def load_game(world: "World", save_path: Path | str) -> tuple[bool, str]:
         return False, f"Failed to load: {str(e)}"
 
 
+def write_save(world: "World", stream: BinaryIO, compress: bool = True) -> int:
+    """Stream the world to a binary save.
+
+    Args:
+        world: The game world to save
+        stream: Binary file object opened for writing
+        compress: zlib-compress entity chunks
+
+    Returns:
+        Number of entity records written
+    """
+    return write_records(stream, save_header(world), iter_entity_records(world), compress)
+
+
+def write_records(
+    stream: BinaryIO,
+    header: dict[str, Any],
+    records: Iterable[dict[str, Any]],
+    compress: bool = True
+) -> int:
+    """Stream a header and entity records to a binary save.
+
+    Returns:
+        Number of entity records written
+    """
+    with SaveWriter(stream, header, compress=compress) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.records_written
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Suspend the cyclic garbage collector.
+
+    Building or copying a whole world allocates many long-lived objects,
+    which otherwise triggers repeated collections that scan the entire heap.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def write_atomically(path: Path, write: Callable[[BinaryIO], Any]) -> None:
+    """Write a file via a temporary file and rename.
+
+    A crash or error mid-write leaves any previous file at path intact.
+
+    Args:
+        path: Final file path
+        write: Called with the temporary file opened for binary writing
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_save(world: "World", stream: BinaryIO) -> dict[str, Any]:
+    """Load a binary save, restoring entities one chunk at a time.
+
+    Args:
+        world: The world to load into
+        stream: Binary file object opened for reading
+
+    Returns:
+        The save header
+
+    Raises:
+        SaveFormatError: If the stream is not a supported binary save
+    """
+    reader = SaveReader(stream)
+    decoders = restore_header(world, reader.header)
+    em = world.entity_manager
+    with paused_gc():
+        for record in reader:
+            _restore_entity(em, record, decoders)
+    return reader.header
+
+
 def serialize_world(world: "World") -> dict[str, Any]:
-    """Serialize world state to a dictionary."""
-    from ..entities.celestial import CelestialBody
-    from ..entities.stations import Station
-    from ..entities.ships import Ship
-    from ..entities.factions import Faction
-    from ..solar_system.orbits import Position, Velocity, Orbit
-    from ..simulation.resources import Inventory
-    from ..simulation.economy import Market
-    from ..simulation.production import Producer, Extractor, ResourceDeposit
-    from ..ai.ship_ai import ShipAI
+    """Serialize world state to a dictionary (the JSON export)."""
+    data = save_header(world)
+    data["entities"] = list(iter_entity_records(world))
+    return data
+
 
+def deserialize_world(world: "World", data: dict[str, Any]) -> None:
+    """Deserialize world state from a dictionary."""
+    decoders = restore_header(world, data)
+    em = world.entity_manager
+    with paused_gc():
+        for entity_data in data.get("entities", []):
+            _restore_entity(em, entity_data, decoders)
+
+
+def iter_entity_records(world: "World") -> Iterator[dict[str, Any]]:
+    """Yield a serialized record for each entity with persistent components."""
     em = world.entity_manager
+    for entity in list(em._entities.values()):
+        record = entity_record(entity, entity_components(em, entity))
+        if record is not None:
+            yield record
 
-    data = {
-        "version": 1,
+
+def save_header(world: "World") -> dict[str, Any]:
+    """Save metadata stored ahead of the entities.
+
+    Includes the schema (type and field order) of every component type in
+    the world, which records refer to by name.
+    """
+    em = world.entity_manager
+    comp_types = [comp_type for comp_type, store in em._components.items() if store]
+    return {
+        "version": SAVE_VERSION,
         "timestamp": datetime.now().isoformat(),
         "game_time": {
             "total_days": world.game_time.total_days,
@@ -115,155 +244,37 @@ def serialize_world(world: "World") -> dict[str, Any]:
         },
         "paused": world.paused,
         "speed": world.speed,
-        "entities": [],
+        "components": get_serializer_registry().schema(comp_types),
     }
 
-    # Serialize each entity
-    for entity in em._entities.values():
-        entity_data = {
-            "id": str(entity.id),
-            "name": entity.name,
-            "tags": list(entity.tags),
-            "components": {},
-        }
-
-        # Serialize components - need to gather components for this entity
-        components = {}
-        for comp_type in em._entity_components.get(entity.id, set()):
-            if comp_type in em._components and entity.id in em._components[comp_type]:
-                components[comp_type] = em._components[comp_type][entity.id]
-
-        for comp_type, comp in components.items():
-            comp_name = comp_type.__name__
-
-            if comp_name == "Position":
-                entity_data["components"]["Position"] = {
-                    "x": comp.x,
-                    "y": comp.y,
-                }
-
-            elif comp_name == "Velocity":
-                entity_data["components"]["Velocity"] = {
-                    "vx": comp.vx,
-                    "vy": comp.vy,
-                }
-
-            elif comp_name == "Orbit":
-                entity_data["components"]["Orbit"] = {
-                    "semi_major_axis": comp.semi_major_axis,
-                    "eccentricity": comp.eccentricity,
-                    "period": comp.period,
-                    "angle": comp.angle,
-                    "parent_name": comp.parent_name,
-                }
-
-            elif comp_name == "CelestialBody":
-                entity_data["components"]["CelestialBody"] = {
-                    "body_type": comp.body_type.value,
-                    "mass": comp.mass,
-                    "radius": comp.radius,
-                    "color": list(comp.color),
-                }
-
-            elif comp_name == "Station":
-                entity_data["components"]["Station"] = {
-                    "station_type": comp.station_type.value,
-                    "owner_faction_id": str(comp.owner_faction_id) if comp.owner_faction_id else None,
-                    "population": comp.population,
-                    "production_multiplier": comp.production_multiplier,
-                    "storage_capacity": comp.storage_capacity,
-                    "parent_body": comp.parent_body,
-                }
-
-            elif comp_name == "Ship":
-                entity_data["components"]["Ship"] = {
-                    "ship_type": comp.ship_type.value,
-                    "owner_faction_id": str(comp.owner_faction_id) if comp.owner_faction_id else None,
-                    "speed": comp.speed,
-                    "cargo_capacity": comp.cargo_capacity,
-                    "fuel": comp.fuel,
-                    "fuel_capacity": comp.fuel_capacity,
-                    "crew": comp.crew,
-                    "max_crew": comp.max_crew,
-                }
-
-            elif comp_name == "Faction":
-                entity_data["components"]["Faction"] = {
-                    "faction_type": comp.faction_type.value,
-                    "credits": comp.credits,
-                    "color": list(comp.color),
-                    "is_player": comp.is_player,
-                }
-
-            elif comp_name == "Inventory":
-                entity_data["components"]["Inventory"] = {
-                    "resources": {r.value: a for r, a in comp.resources.items()},
-                    "capacity": comp.capacity,
-                }
-
-            elif comp_name == "Market":
-                entity_data["components"]["Market"] = {
-                    "prices": {r.value: p for r, p in comp.prices.items()},
-                    "demand": {r.value: d for r, d in comp.demand.items()},
-                    "supply": {r.value: s for r, s in comp.supply.items()},
-                    "credits": comp.credits,
-                }
-
-            elif comp_name == "Producer":
-                entity_data["components"]["Producer"] = {
-                    "available_recipes": list(comp.available_recipes),
-                    "active_recipe": comp.active_recipe,
-                    "progress": comp.progress,
-                    "is_active": comp.is_active,
-                }
-
-            elif comp_name == "Extractor":
-                entity_data["components"]["Extractor"] = {
-                    "resource_type": comp.resource_type.value if comp.resource_type else None,
-                    "extraction_rate": comp.extraction_rate,
-                    "is_active": comp.is_active,
-                }
-
-            elif comp_name == "ResourceDeposit":
-                entity_data["components"]["ResourceDeposit"] = {
-                    "resource_type": comp.resource_type.value,
-                    "amount": comp.amount,
-                    "max_amount": comp.max_amount,
-                    "richness": comp.richness,
-                    "extraction_difficulty": comp.extraction_difficulty,
-                }
-
-            elif comp_name == "ShipAI":
-                entity_data["components"]["ShipAI"] = {
-                    "state": comp.state.value,
-                    "target_entity_id": str(comp.target_entity_id) if comp.target_entity_id else None,
-                    "target_position": list(comp.target_position) if comp.target_position else None,
-                    "cargo_resource": comp.cargo_resource.value if comp.cargo_resource else None,
-                    "is_trader": comp.is_trader,
-                    "idle_time": comp.idle_time,
-                }
-
-        data["entities"].append(entity_data)
 
-    return data
+def restore_header(
+    world: "World",
+    data: dict[str, Any],
+    clear: bool = True
+) -> dict[str, Callable[[list], Any]]:
+    """Restore the save metadata, by default clearing the world first.
 
+    Args:
+        world: The world to load into
+        data: Save header
+        clear: Remove existing entities (False when applying a delta)
 
-def deserialize_world(world: "World", data: dict[str, Any]) -> None:
-    """Deserialize world state from a dictionary."""
-    from ..entities.celestial import CelestialBody, BodyType
-    from ..entities.stations import Station, StationType
-    from ..entities.ships import Ship, ShipType
-    from ..entities.factions import Faction, FactionType
-    from ..solar_system.orbits import Position, Velocity, Orbit
-    from ..simulation.resources import Inventory, ResourceType
-    from ..simulation.economy import Market
-    from ..simulation.production import Producer, Extractor, ResourceDeposit
-    from ..ai.ship_ai import ShipAI, ShipState
+    Returns:
+        Component decoders keyed by the names used in the save
 
-    em = world.entity_manager
+    Raises:
+        ValueError: If the save was written by an unsupported version or
+            names component types outside the game
+    """
+    version = data.get("version")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+    decoders = get_serializer_registry().decoders(data.get("components", {}))
 
     # Clear existing entities
-    em.clear()
+    if clear:
+        world.entity_manager.clear()
 
     # Restore game time
     gt = data.get("game_time", {})
@@ -271,136 +282,56 @@ def deserialize_world(world: "World", data: dict[str, Any]) -> None:
     world.game_time.day = gt.get("day", 1)
     world.game_time.year = gt.get("year", 2150)
 
-    world.paused = data.get("paused", False)
+    if data.get("paused", False):
+        world.pause()
+    else:
+        world.unpause()
     world.speed = data.get("speed", 1.0)
+    return decoders
+
+
+def entity_components(em: "EntityManager", entity: "Entity") -> dict[type, Any]:
+    """Gather an entity's components keyed by type."""
+    components = {}
+    for comp_type in em._entity_components.get(entity.id, set()):
+        if comp_type in em._components and entity.id in em._components[comp_type]:
+            components[comp_type] = em._components[comp_type][entity.id]
+    return components
+
+
+def entity_record(entity: "Entity", components: dict[type, Any]) -> dict[str, Any] | None:
+    """Serialize one entity and its components to a record.
+
+    Returns:
+        The record, or None if the entity only holds non-persistent components
+    """
+    registry = get_serializer_registry()
+    saved = {}
+    for comp_type, comp in components.items():
+        serializer = registry.get(comp_type)
+        if serializer.persistent:
+            saved[serializer.name] = serializer.encode(comp)
+    if components and not saved:
+        return None
+
+    return {
+        "id": str(entity.id),
+        "name": entity.name,
+        "tags": list(entity.tags),
+        "components": saved,
+    }
+
 
-    # Create entities
-    for entity_data in data.get("entities", []):
-        entity_id = UUID(entity_data["id"])
-        entity = em.create_entity(
-            name=entity_data.get("name", ""),
-            entity_id=entity_id
-        )
-
-        # Restore tags
-        for tag in entity_data.get("tags", []):
-            entity.add_tag(tag)
-
-        # Restore components
-        components = entity_data.get("components", {})
-
-        if "Position" in components:
-            c = components["Position"]
-            em.add_component(entity, Position(x=c["x"], y=c["y"]))
-
-        if "Velocity" in components:
-            c = components["Velocity"]
-            em.add_component(entity, Velocity(vx=c["vx"], vy=c["vy"]))
-
-        if "Orbit" in components:
-            c = components["Orbit"]
-            em.add_component(entity, Orbit(
-                semi_major_axis=c["semi_major_axis"],
-                eccentricity=c["eccentricity"],
-                period=c["period"],
-                angle=c["angle"],
-                parent_name=c["parent_name"],
-            ))
-
-        if "CelestialBody" in components:
-            c = components["CelestialBody"]
-            em.add_component(entity, CelestialBody(
-                body_type=BodyType(c["body_type"]),
-                mass=c["mass"],
-                radius=c["radius"],
-                color=tuple(c["color"]),
-            ))
-
-        if "Station" in components:
-            c = components["Station"]
-            em.add_component(entity, Station(
-                station_type=StationType(c["station_type"]),
-                owner_faction_id=UUID(c["owner_faction_id"]) if c["owner_faction_id"] else None,
-                population=c["population"],
-                production_multiplier=c["production_multiplier"],
-                storage_capacity=c["storage_capacity"],
-                parent_body=c.get("parent_body", ""),
-            ))
-
-        if "Ship" in components:
-            c = components["Ship"]
-            em.add_component(entity, Ship(
-                ship_type=ShipType(c["ship_type"]),
-                owner_faction_id=UUID(c["owner_faction_id"]) if c["owner_faction_id"] else None,
-                speed=c["speed"],
-                cargo_capacity=c["cargo_capacity"],
-                fuel=c["fuel"],
-                fuel_capacity=c["fuel_capacity"],
-                crew=c["crew"],
-                max_crew=c["max_crew"],
-            ))
-
-        if "Faction" in components:
-            c = components["Faction"]
-            em.add_component(entity, Faction(
-                faction_type=FactionType(c["faction_type"]),
-                credits=c["credits"],
-                color=tuple(c["color"]),
-                is_player=c.get("is_player", False),
-            ))
-
-        if "Inventory" in components:
-            c = components["Inventory"]
-            inv = Inventory(capacity=c["capacity"])
-            for res_name, amount in c.get("resources", {}).items():
-                inv.resources[ResourceType(res_name)] = amount
-            em.add_component(entity, inv)
-
-        if "Market" in components:
-            c = components["Market"]
-            market = Market(credits=c["credits"])
-            for res_name, price in c.get("prices", {}).items():
-                market.prices[ResourceType(res_name)] = price
-            for res_name, demand in c.get("demand", {}).items():
-                market.demand[ResourceType(res_name)] = demand
-            for res_name, supply in c.get("supply", {}).items():
-                market.supply[ResourceType(res_name)] = supply
-            em.add_component(entity, market)
-
-        if "Producer" in components:
-            c = components["Producer"]
-            em.add_component(entity, Producer(
-                available_recipes=set(c["available_recipes"]),
-                active_recipe=c["active_recipe"],
-                progress=c["progress"],
-                is_active=c["is_active"],
-            ))
-
-        if "Extractor" in components:
-            c = components["Extractor"]
-            em.add_component(entity, Extractor(
-                resource_type=ResourceType(c["resource_type"]) if c["resource_type"] else None,
-                extraction_rate=c["extraction_rate"],
-                is_active=c["is_active"],
-            ))
-
-        if "ResourceDeposit" in components:
-            c = components["ResourceDeposit"]
-            em.add_component(entity, ResourceDeposit(
-                resource_type=ResourceType(c["resource_type"]),
-                amount=c["amount"],
-                max_amount=c["max_amount"],
-                richness=c["richness"],
-                extraction_difficulty=c["extraction_difficulty"],
-            ))
-
-        if "ShipAI" in components:
-            c = components["ShipAI"]
-            ship_ai = ShipAI.__new__(ShipAI)
-            ship_ai.state = ShipState(c["state"])
-            ship_ai.target_entity_id = UUID(c["target_entity_id"]) if c["target_entity_id"] else None
-            ship_ai.target_position = tuple(c["target_position"]) if c["target_position"] else None
-            ship_ai.cargo_resource = ResourceType(c["cargo_resource"]) if c["cargo_resource"] else None
-            ship_ai.is_trader = c["is_trader"]
-            ship_ai.idle_time = c["idle_time"]
-            em.add_component(entity, ship_ai)
+def _restore_entity(
+    em: "EntityManager",
+    entity_data: dict[str, Any],
+    decoders: dict[str, Callable[[list], Any]]
+) -> None:
+    """Recreate one entity and its components from a record."""
+    entity = em.create_entity(
+        name=entity_data.get("name", ""),
+        tags=set(entity_data.get("tags", [])),
+        entity_id=UUID(entity_data["id"])
+    )
+    for name, values in entity_data.get("components", {}).items():
+        em.add_component(entity, decoders[name](values))
@@ -0,0 +1,510 @@
+"""Component serializer registry.
+
+Every component type gets a serializer derived once from its dataclass
+fields and type hints. The serializer compiles an encoder that turns a
+component into a positional list of plain values (the field order is
+stored in the save header) and, per saved field order, a decoder that
+rebuilds the component without calling __init__. Components added later
+serialize automatically; types that should never be saved set the class
+attribute ``persistent = False``, and types whose saved state never changes
+after creation set ``static = True`` so delta saves don't re-check them.
+
+Field values are converted according to their annotation: enums by value,
+UUIDs as strings, tuples/sets as lists, dicts with non-string keys as
+[key, value] pairs and nested dataclasses as positional lists. Fields
+annotated loosely (``dict``, ``Any``, bare ``tuple``...) fall back to a
+self-describing encoding that records the type of each value.
+
+Serializers can also capture many components at once as columns of field
+values, copying only mutable state (containers and nested dataclasses)
+and sharing immutable values, so a snapshot can be encoded later, on
+another thread, while the world keeps changing.
+"""
+from __future__ import annotations
+import dataclasses
+import importlib
+import sys
+import types
+import typing
+from enum import Enum
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Sequence
+from uuid import UUID
+
+# A codec is (encode, decode); None on either side means "pass through"
+Codec = tuple[Callable[[Any], Any] | None, Callable[[Any], Any] | None]
+
+_IDENTITY_TYPES = (int, float, str, bool, type(None))
+_PRIMITIVES = (int, float, str, bool)
+
+_type_cache: dict[str, type] = {}
+_GAME_PACKAGE = __name__.split(".")[0]  # Modules save data may name types from
+
+
+def type_key(cls: type) -> str:
+    """Importable "module:qualname" key for a class."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_type(key: str) -> type:
+    """Find the class named by a type_key().
+
+    Save files are untrusted, so only Enum and dataclass types are
+    resolved: ones the serializer registry already knows, or ones defined
+    in the game's own modules. Nothing else is imported.
+
+    Raises:
+        ValueError: If the key names any other kind of object
+    """
+    cls = _type_cache.get(key)
+    if cls is None:
+        cls = get_serializer_registry().known_type(key)
+        if cls is None:
+            module_name, _, qualname = key.partition(":")
+            if module_name.split(".")[0] != _GAME_PACKAGE or not qualname:
+                raise ValueError(f"Type {key!r} is not a game type")
+            try:
+                cls = importlib.import_module(module_name)
+                for part in qualname.split("."):
+                    cls = getattr(cls, part)
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"Unknown type {key!r}") from e
+        if not isinstance(cls, type) or not (issubclass(cls, Enum) or dataclasses.is_dataclass(cls)):
+            raise ValueError(f"Type {key!r} is not an enum or dataclass")
+        _type_cache[key] = cls
+    return cls
+
+
+def _new(cls: type) -> Any:
+    """Create an instance without running __init__."""
+    return object.__new__(cls)
+
+
+def encode_any(value: Any) -> Any:
+    """Encode a value of unknown type, tagging everything but primitives."""
+    if value is None or type(value) in _PRIMITIVES:
+        return value
+    if isinstance(value, Enum):
+        return ["e", type_key(type(value)), value.value]
+    if isinstance(value, UUID):
+        return ["u", str(value)]
+    if isinstance(value, list):
+        return ["l", [encode_any(v) for v in value]]
+    if isinstance(value, tuple):
+        return ["t", [encode_any(v) for v in value]]
+    if isinstance(value, (set, frozenset)):
+        return ["s", [encode_any(v) for v in value]]
+    if isinstance(value, dict):
+        return ["d", [[encode_any(k), encode_any(v)] for k, v in value.items()]]
+    if dataclasses.is_dataclass(value):
+        return ["o", type_key(type(value)), {
+            f.name: encode_any(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }]
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def decode_any(data: Any) -> Any:
+    """Decode a value written by encode_any()."""
+    if not isinstance(data, list):
+        return data
+    tag = data[0]
+    if tag == "e":
+        cls = resolve_type(data[1])
+        if not issubclass(cls, Enum):
+            raise ValueError(f"{data[1]!r} is not an enum")
+        return cls(data[2])
+    if tag == "u":
+        return UUID(data[1])
+    if tag == "l":
+        return [decode_any(v) for v in data[1]]
+    if tag == "t":
+        return tuple(decode_any(v) for v in data[1])
+    if tag == "s":
+        return {decode_any(v) for v in data[1]}
+    if tag == "d":
+        return {decode_any(k): decode_any(v) for k, v in data[1]}
+    if tag == "o":
+        cls = resolve_type(data[1])
+        if not dataclasses.is_dataclass(cls):
+            raise ValueError(f"{data[1]!r} is not a dataclass")
+        obj = _new(cls)
+        obj.__dict__.update({name: decode_any(v) for name, v in data[2].items()})
+        return obj
+    raise ValueError(f"Unknown value tag {tag!r}")
+
+
+_DYNAMIC: Codec = (encode_any, decode_any)
+
+
+def copy_any(value: Any) -> Any:
+    """Copy a value of unknown type, sharing everything immutable."""
+    if value is None or type(value) in _PRIMITIVES or isinstance(value, (Enum, UUID)):
+        return value
+    if isinstance(value, list):
+        return [copy_any(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(copy_any(v) for v in value)
+    if isinstance(value, set):
+        return set(value)
+    if isinstance(value, dict):
+        return {k: copy_any(v) for k, v in value.items()}
+    if dataclasses.is_dataclass(value):
+        clone = _new(type(value))
+        clone.__dict__.update({k: copy_any(v) for k, v in value.__dict__.items()})
+        return clone
+    return value
+
+
+def _field_hints(cls: type) -> dict[str, Any]:
+    """Resolve a dataclass's field annotations, field by field.
+
+    Annotations that can't be evaluated (e.g. names only imported under
+    TYPE_CHECKING) resolve to Any.
+    """
+    namespace = dict(vars(sys.modules.get(cls.__module__, types)))
+    namespace.setdefault("Any", Any)
+    hints = {}
+    for f in dataclasses.fields(cls):
+        annotation = f.type
+        if isinstance(annotation, str):
+            try:
+                annotation = eval(annotation, namespace, dict(vars(cls)))
+            except Exception:
+                annotation = Any
+        hints[f.name] = annotation
+    return hints
+
+
+class ComponentSerializer:
+    """Compiled encoder/decoders for one component type."""
+
+    def __init__(self, comp_type: type, name: str, registry: SerializerRegistry):
+        """Derive the schema of a dataclass component.
+
+        Args:
+            comp_type: Dataclass type to serialize
+            name: Short name written to saves
+            registry: Registry used to look up nested dataclass serializers
+        """
+        if not dataclasses.is_dataclass(comp_type):
+            raise TypeError(f"{comp_type.__name__} is not a dataclass")
+        self.type = comp_type
+        self.name = name
+        self.persistent = getattr(comp_type, "persistent", True)
+        self.static = getattr(comp_type, "static", False)
+        self.fields = dataclasses.fields(comp_type)
+        self.field_names = tuple(f.name for f in self.fields)
+
+        hints = _field_hints(comp_type)
+        self._codecs = {f.name: registry.codec(hints[f.name]) for f in self.fields}
+        self._copiers = [registry.copier(hints[f.name]) for f in self.fields]
+        self._mutable = [(name, c) for name, c in zip(self.field_names, self._copiers) if c is not None]
+        self._decoders: dict[tuple[str, ...], Callable[[list], Any]] = {}
+        self.encode: Callable[[Any], list] = self._compile_encoder()
+
+    def _compile_encoder(self) -> Callable[[Any], list]:
+        """Generate ``encode(component) -> [field values]``."""
+        namespace: dict[str, Any] = {}
+        items = []
+        for i, name in enumerate(self.field_names):
+            encode = self._codecs[name][0]
+            if encode is None:
+                items.append(f"c.{name}")
+            else:
+                namespace[f"_e{i}"] = encode
+                items.append(f"_e{i}(c.{name})")
+        source = f"def encode(c):\n    return [{', '.join(items)}]\n"
+        exec(source, namespace)
+        return namespace["encode"]
+
+    def copy(self, value: Any) -> Any:
+        """Copy one instance, sharing its immutable field values."""
+        clone = _new(self.type)
+        state = clone.__dict__
+        state.update(value.__dict__)
+        for name, copier in self._mutable:
+            state[name] = copier(state[name])
+        return clone
+
+    def capture(self, components: Iterable[Any]) -> list[Sequence]:
+        """Copy the field values of many components, one column per field.
+
+        Values are read and containers copied a whole column at a time, so
+        capturing costs far less per component than encoding it.
+
+        Args:
+            components: Components of this serializer's type
+
+        Returns:
+            Field value columns in field_names order
+        """
+        names = self.field_names
+        if not names:
+            return []
+        if len(names) == 1:
+            columns = [list(map(attrgetter(names[0]), components))]
+        else:
+            columns = list(zip(*map(attrgetter(*names), components))) or [() for _ in names]
+        for i, copier in enumerate(self._copiers):
+            if copier is not None:
+                columns[i] = list(map(copier, columns[i]))
+        return columns
+
+    def rebuild(self, columns: list[Sequence], count: int) -> Iterator[Any]:
+        """Turn columns from capture() back into components.
+
+        Args:
+            columns: Captured field value columns
+            count: Number of components captured
+
+        Yields:
+            One component per captured row
+        """
+        cls, names = self.type, self.field_names
+        for row in (zip(*columns) if columns else repeat((), count)):
+            obj = _new(cls)
+            obj.__dict__.update(zip(names, row))
+            yield obj
+
+    def decoder(self, saved_fields: tuple[str, ...] | list[str] | None = None) -> Callable[[list], Any]:
+        """Get a decoder for values saved in a given field order.
+
+        Fields missing from the save get their defaults; saved fields that
+        no longer exist are ignored.
+
+        Args:
+            saved_fields: Field order used when saving (defaults to the current one)
+
+        Returns:
+            Function turning a positional value list into a component
+        """
+        saved_fields = tuple(saved_fields) if saved_fields is not None else self.field_names
+        decode = self._decoders.get(saved_fields)
+        if decode is None:
+            decode = self._compile_decoder(saved_fields)
+            self._decoders[saved_fields] = decode
+        return decode
+
+    def _compile_decoder(self, saved_fields: tuple[str, ...]) -> Callable[[list], Any]:
+        """Generate ``decode(values) -> component`` for a saved field order."""
+        namespace: dict[str, Any] = {"_new": _new, "_cls": self.type}
+        positions = {name: i for i, name in enumerate(saved_fields)}
+        lines = ["def decode(v):", "    o = _new(_cls)", "    d = o.__dict__"]
+        for j, f in enumerate(self.fields):
+            name = f.name
+            if name in positions:
+                decode = self._codecs[name][1]
+                value = f"v[{positions[name]}]"
+                if decode is not None:
+                    namespace[f"_d{j}"] = decode
+                    value = f"_d{j}({value})"
+            elif f.default_factory is not dataclasses.MISSING:
+                namespace[f"_f{j}"] = f.default_factory
+                value = f"_f{j}()"
+            else:
+                namespace[f"_v{j}"] = None if f.default is dataclasses.MISSING else f.default
+                value = f"_v{j}"
+            lines.append(f"    d[{name!r}] = {value}")
+        lines.append("    return o")
+        exec("\n".join(lines) + "\n", namespace)
+        return namespace["decode"]
+
+    def schema(self) -> dict[str, Any]:
+        """Save header entry describing this type."""
+        return {"type": type_key(self.type), "fields": list(self.field_names)}
+
+
+class SerializerRegistry:
+    """Serializers for component types, created on first use."""
+
+    def __init__(self) -> None:
+        self._by_type: dict[type, ComponentSerializer] = {}
+        self._by_name: dict[str, ComponentSerializer] = {}
+        self._by_key: dict[str, type] = {}
+        self._codecs: dict[Any, Codec] = {}
+        self._copiers: dict[Any, Callable[[Any], Any] | None] = {}
+
+    def get(self, comp_type: type) -> ComponentSerializer:
+        """Get (deriving if needed) the serializer for a component type."""
+        serializer = self._by_type.get(comp_type)
+        if serializer is None:
+            name = comp_type.__name__
+            if name in self._by_name:
+                name = type_key(comp_type)
+            serializer = ComponentSerializer(comp_type, name, self)
+            self._by_type[comp_type] = serializer
+            self._by_name[name] = serializer
+            self._by_key[type_key(comp_type)] = comp_type
+        return serializer
+
+    def known_type(self, key: str) -> type | None:
+        """Get a type with a serializer by its type_key(), if there is one."""
+        return self._by_key.get(key)
+
+    def schema(self, comp_types: typing.Iterable[type]) -> dict[str, dict[str, Any]]:
+        """Header table of the persistent types among comp_types, keyed by name."""
+        table = {}
+        for comp_type in comp_types:
+            serializer = self.get(comp_type)
+            if serializer.persistent:
+                table[serializer.name] = serializer.schema()
+        return table
+
+    def decoders(self, schema: dict[str, dict[str, Any]]) -> dict[str, Callable[[list], Any]]:
+        """Decoders for each type in a save header's component table.
+
+        Raises:
+            ValueError: If an entry names a type that isn't a game dataclass
+        """
+        decoders = {}
+        for name, entry in schema.items():
+            comp_type = resolve_type(entry["type"])
+            if not dataclasses.is_dataclass(comp_type):
+                raise ValueError(f"{entry['type']!r} is not a component type")
+            decoders[name] = self.get(comp_type).decoder(entry["fields"])
+        return decoders
+
+    def codec(self, annotation: Any) -> Codec:
+        """Get the value codec for a field annotation."""
+        codec = self._codecs.get(annotation)
+        if codec is None:
+            codec = self._build_codec(annotation)
+            self._codecs[annotation] = codec
+        return codec
+
+    def _build_codec(self, annotation: Any) -> Codec:
+        if annotation in _IDENTITY_TYPES:
+            return (None, None)
+        if annotation is UUID:
+            return (str, UUID)
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return (lambda e: e.value, annotation)
+        if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+            nested = self.get(annotation)
+            return (nested.encode, nested.decoder())
+
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+
+        if origin in (typing.Union, types.UnionType):
+            options = [a for a in args if a is not type(None)]
+            if len(options) != 1:
+                return _DYNAMIC
+            encode, decode = self.codec(options[0])
+            return (
+                None if encode is None else lambda v: None if v is None else encode(v),
+                None if decode is None else lambda v: None if v is None else decode(v),
+            )
+
+        if origin is list and args:
+            encode, decode = self.codec(args[0])
+            return (
+                None if encode is None else lambda v: [encode(x) for x in v],
+                None if decode is None else lambda v: [decode(x) for x in v],
+            )
+
+        if origin in (set, frozenset) and args:
+            encode, decode = self.codec(args[0])
+            return (
+                list if encode is None else lambda v: [encode(x) for x in v],
+                origin if decode is None else lambda v: origin(decode(x) for x in v),
+            )
+
+        if origin is tuple and args:
+            if len(args) == 2 and args[1] is Ellipsis:
+                encode, decode = self.codec(args[0])
+                return (
+                    None if encode is None else lambda v: [encode(x) for x in v],
+                    tuple if decode is None else lambda v: tuple(decode(x) for x in v),
+                )
+            codecs = [self.codec(a) for a in args]
+            if all(enc is None and dec is None for enc, dec in codecs):
+                return (None, tuple)
+            return (
+                lambda v: [x if enc is None else enc(x) for x, (enc, _) in zip(v, codecs)],
+                lambda v: tuple(x if dec is None else dec(x) for x, (_, dec) in zip(v, codecs)),
+            )
+
+        if origin is dict and len(args) == 2:
+            encode_key, decode_key = self.codec(args[0])
+            encode_value, decode_value = self.codec(args[1])
+            if args[0] is str:
+                return (
+                    None if encode_value is None else lambda v: {k: encode_value(x) for k, x in v.items()},
+                    None if decode_value is None else lambda v: {k: decode_value(x) for k, x in v.items()},
+                )
+            encode_key = encode_key or (lambda k: k)
+            decode_key = decode_key or (lambda k: k)
+            encode_value = encode_value or (lambda x: x)
+            decode_value = decode_value or (lambda x: x)
+            return (
+                lambda v: [[encode_key(k), encode_value(x)] for k, x in v.items()],
+                lambda v: {decode_key(k): decode_value(x) for k, x in v},
+            )
+
+        return _DYNAMIC
+
+    def copier(self, annotation: Any) -> Callable[[Any], Any] | None:
+        """Get the copy function for a field annotation; None means share the value."""
+        if annotation in self._copiers:
+            return self._copiers[annotation]
+        copier = self._build_copier(annotation)
+        self._copiers[annotation] = copier
+        return copier
+
+    def _build_copier(self, annotation: Any) -> Callable[[Any], Any] | None:
+        if annotation in _IDENTITY_TYPES or annotation is UUID:
+            return None
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return None
+        if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+            if annotation.__dataclass_params__.frozen:
+                return None
+            nested = self.get(annotation)
+            return lambda v: None if v is None else nested.copy(v)
+
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+
+        if origin in (typing.Union, types.UnionType):
+            options = [a for a in args if a is not type(None)]
+            if len(options) != 1:
+                return copy_any
+            inner = self.copier(options[0])
+            return None if inner is None else lambda v: None if v is None else inner(v)
+
+        if origin is list and args:
+            inner = self.copier(args[0])
+            return list if inner is None else lambda v: [inner(x) for x in v]
+
+        if origin is set:
+            return set
+        if origin is frozenset:
+            return None
+
+        if origin is tuple and args:
+            if len(args) == 2 and args[1] is Ellipsis:
+                inner = self.copier(args[0])
+                return None if inner is None else lambda v: tuple(inner(x) for x in v)
+            copiers = [self.copier(a) for a in args]
+            if all(c is None for c in copiers):
+                return None
+            return lambda v: tuple(x if c is None else c(x) for x, c in zip(v, copiers))
+
+        if origin is dict and len(args) == 2:
+            inner = self.copier(args[1])
+            return dict if inner is None else lambda v: {k: inner(x) for k, x in v.items()}
+
+        return copy_any
+
+
+_registry: SerializerRegistry | None = None
+
+
+def get_serializer_registry() -> SerializerRegistry:
+    """Get the shared serializer registry."""
+    global _registry
+    if _registry is None:
+        _registry = SerializerRegistry()
+    return _registry
@@ -5,12 +5,14 @@ Adding new behaviors (mining, escort, construction) requires only
 creating a new behavior class - no changes to this system needed.
 """
 from __future__ import annotations
+import heapq
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 from uuid import UUID
 
 from ..core.ecs import System, EntityManager
-from ..core.events import EventBus, ShipArrivedEvent
+from ..core.events import EventBus, ShipArrivedEvent, NavigationArrivedEvent
 from ..core.system_priority import SystemPriority
 from ..entities.ships import Ship
 from ..solar_system.orbits import Position, NavigationTarget
@@ -25,10 +27,15 @@ from ..ai.behaviors import (
     WaypointBehavior,
     BEHAVIOR_REGISTRY,
 )
+from ..ai.supply_index import LocalSupplyIndex
 
 if TYPE_CHECKING:
     from ..ai.trade_routes import TradeRouteFinder
+    from ..ai.trade_assignment import TradeAssignmentSolver
+    from ..ai.planning_pool import PlanningPool
+    from ..ai.route_planner import RoutePlanner
     from ..core.transactions import TransactionService
+    from ..core.world import GameTime
 
 
 @dataclass
@@ -39,6 +46,10 @@ class ShipAIStateV2:
     state_data: dict = field(default_factory=dict)
     wait_time: float = 0.0
     target_entity_id: UUID | None = None
+    # Scheduling - next decision time, queue ticket (0 = not queued), in transit
+    wake_time: float = 0.0
+    ticket: int = 0
+    in_transit: bool = False
 
 
 class ShipAISystemV2(System):
@@ -47,15 +58,34 @@ class ShipAISystemV2(System):
     Each ship has a behavior (trading, drone, patrol, waypoint) that
     determines its decision-making. Behaviors are swappable at runtime
     and new behaviors can be added without modifying this class.
+
+    Ships needing a decision wait in a queue ordered by due time, then by
+    the order they were queued. Each tick works through the ships that were
+    due when it started, each at most once, until the time budget or
+    decision cap runs out; the rest keep their place for the next tick.
+    Ships in transit leave the queue entirely and rejoin when navigation
+    reports their arrival.
+
+    Ships are enrolled when they are created, or when the set of Ship
+    components no longer matches the known ships (as after loading a save).
     """
 
     priority = SystemPriority.AI_SHIP_BEHAVIOR
 
+    PLAYER_CHECK_DELAY = 1.0  # Game days between checks of player-controlled ships
+
     def __init__(
         self,
         event_bus: EventBus,
         route_finder: "TradeRouteFinder | None" = None,
-        transactions: "TransactionService | None" = None
+        transactions: "TransactionService | None" = None,
+        assignment_solver: "TradeAssignmentSolver | None" = None,
+        planning_pool: "PlanningPool | None" = None,
+        route_planner: "RoutePlanner | None" = None,
+        game_time: "GameTime | None" = None,
+        time_budget_ms: float | None = 4.0,
+        max_decisions_per_tick: int | None = None,
+        rescan_frames: int = 300
     ) -> None:
         """Initialize the ship AI system.
 
@@ -63,24 +93,69 @@ class ShipAISystemV2(System):
             event_bus: Event bus for ship events
             route_finder: Optional TradeRouteFinder for trading behavior
             transactions: Optional TransactionService for trade execution
+            assignment_solver: Optional solver that assigns idle traders
+                in one batch per tick
+            planning_pool: Optional PlanningPool that plans trade tours in
+                worker processes (needs a route finder publishing snapshots)
+            route_planner: Optional RoutePlanner for traders' multi-leg tours
+            game_time: Optional world GameTime that traders' stock and credit
+                reservations expire against (decisions keep their own clock)
+            time_budget_ms: Wall-clock milliseconds of decisions per tick
+                (None for unlimited). At least one decision always runs.
+            max_decisions_per_tick: Cap on decisions per tick (None for
+                unlimited), for a budget that doesn't depend on frame timing
+            rescan_frames: Updates between checks of the ships in transit,
+                to wake those whose navigation target was removed by
+                something other than an arrival
         """
         self.event_bus = event_bus
         self.route_finder = route_finder
         self.transactions = transactions
+        self.assignment_solver = assignment_solver
+        self.planning_pool = planning_pool
+        self.time_budget_ms = time_budget_ms
+        self.max_decisions_per_tick = max_decisions_per_tick
+        self.rescan_frames = max(1, rescan_frames)
 
         # AI states for each ship
         self._states: dict[UUID, ShipAIStateV2] = {}
 
+        # Ships due for a decision as (wake_time, ticket, ship_id)
+        self._queue: list[tuple[float, int, UUID]] = []
+        # Traders left idle by their last decision, for the assignment solver
+        self._idle_traders: set[UUID] = set()
+        # Ships parked until navigation reports their arrival
+        self._in_transit: set[UUID] = set()
+        self._next_ticket = 0
+        # Entities created since the last tick - enrolled once they have a Ship
+        self._created: list[UUID] = []
+        # Ship component store the known ships were enrolled from
+        self._ship_store: dict | None = None
+        self._frames_until_rescan = self.rescan_frames
+
+        # Game days elapsed (dt is already scaled by simulation speed)
+        self._game_time = 0.0
+
+        # Drones only use the station index when a SpatialIndexSystem keeps it
+        # current; an index the route finder refreshes itself can be stale
+        station_index = None
+        if route_finder and not route_finder.auto_update_index:
+            station_index = route_finder.spatial_index
+
         # Instantiated behaviors
         self._behaviors: dict[str, ShipBehavior] = {
-            "trading": TradingBehavior(route_finder),
-            "drone": DroneBehavior(),
-            "patrol": PatrolBehavior(),
+            "trading": TradingBehavior(
+                route_finder, route_planner, assignment_solver=assignment_solver,
+                planning_pool=planning_pool, game_time=game_time
+            ),
+            "drone": DroneBehavior(station_index, LocalSupplyIndex(event_bus=event_bus)),
+            "patrol": PatrolBehavior(event_bus),
             "waypoint": WaypointBehavior(),
         }
 
         # Subscribe to events
         self.event_bus.subscribe(ShipArrivedEvent, self._on_ship_arrived)
+        self.event_bus.subscribe(NavigationArrivedEvent, self._on_navigation_arrived)
 
     def register_behavior(self, name: str, behavior: ShipBehavior) -> None:
         """Register a new behavior type.
@@ -135,16 +210,64 @@ class ShipAISystemV2(System):
         ctx = self._create_context(entity_manager, ship_entity, ship, pos, 0.0, state)
         new_behavior.on_enter(ctx)
 
+        self._reschedule(entity_manager, ship_entity, state)
         return True
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
-        """Update all ship AI."""
-        for entity, ship in entity_manager.get_all_components(Ship):
-            # Skip player-controlled ships
+        """Run the decisions that are due, within this tick's budget."""
+        self._game_time += dt
+        if self.route_finder:
+            self.route_finder.set_game_time(self._game_time)
+
+        self._enroll_created(entity_manager)
+        self._enroll_unknown(entity_manager)
+        self._frames_until_rescan -= 1
+        if self._frames_until_rescan <= 0:
+            self._frames_until_rescan = self.rescan_frames
+            self._check_transits(entity_manager)
+
+        # The budget covers the assignment solve as well as the decisions
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        decisions = 0
+
+        if self.assignment_solver:
+            self._assign_idle_traders(entity_manager)
+
+        # Ships queued during this tick (including those just decided with
+        # no wait) carry later tickets and are left for the next tick
+        last_ticket = self._next_ticket
+        while self._queue and self._queue[0][0] <= self._game_time:
+            if self._queue[0][1] > last_ticket:
+                break
+            if decisions > 0:
+                if self.max_decisions_per_tick is not None and decisions >= self.max_decisions_per_tick:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+
+            _, ticket, ship_id = heapq.heappop(self._queue)
+            state = self._states.get(ship_id)
+            if not state or state.ticket != ticket:
+                continue  # Superseded by a later reschedule
+            state.ticket = 0
+
+            entity = entity_manager.get_entity(ship_id)
+            ship = entity_manager.get_component(entity, Ship) if entity else None
+            if not ship:
+                self._forget(ship_id)
+                continue
+
+            # Player-controlled ships are skipped, but checked again later
             if "player_controlled" in entity.tags:
+                self._idle_traders.discard(ship_id)
+                self._schedule(state, ship_id, self.PLAYER_CHECK_DELAY)
                 continue
 
             self._update_ship(entity, ship, entity_manager, dt)
+            self._reschedule(entity_manager, entity, state)
+            decisions += 1
 
     def _update_ship(
         self,
@@ -162,11 +285,6 @@ class ShipAISystemV2(System):
 
         state = self._get_or_create_state(ship_entity.id)
 
-        # Handle waiting
-        if state.wait_time > 0:
-            state.wait_time -= dt
-            return
-
         # Check for arrival
         if nav and nav.has_arrived(pos):
             self._handle_arrival(ship_entity, ship, entity_manager, state, pos)
@@ -189,6 +307,121 @@ class ShipAISystemV2(System):
         # Process result
         self._process_result(entity_manager, ship_entity, ship, state, result)
 
+    def _schedule(self, state: ShipAIStateV2, ship_id: UUID, delay: float) -> None:
+        """Queue a ship's next decision, replacing any earlier entry."""
+        self._next_ticket += 1
+        state.ticket = self._next_ticket
+        state.wake_time = self._game_time + max(0.0, delay)
+        state.in_transit = False
+        self._in_transit.discard(ship_id)
+        heapq.heappush(self._queue, (state.wake_time, state.ticket, ship_id))
+
+    def _reschedule(self, entity_manager: EntityManager, ship_entity, state: ShipAIStateV2) -> None:
+        """Park a ship in transit until arrival, or queue it after its wait."""
+        if entity_manager.has_component(ship_entity, NavigationTarget):
+            state.ticket = 0
+            state.in_transit = True
+            self._in_transit.add(ship_entity.id)
+        else:
+            self._schedule(state, ship_entity.id, state.wait_time)
+        self._track_idle(ship_entity.id, state)
+
+    def _track_idle(self, ship_id: UUID, state: ShipAIStateV2) -> None:
+        """Note whether a trader is waiting on the assignment solver."""
+        if not self.assignment_solver:
+            return
+
+        from ..ai.behaviors.trading import TradingState
+
+        # Ships with tour legs left fly those instead
+        if (
+            state.behavior_name == "trading"
+            and not state.in_transit
+            and state.state_data.get("trade_state", TradingState.IDLE) == TradingState.IDLE
+            and not state.state_data.get("tour_legs")
+        ):
+            self._idle_traders.add(ship_id)
+        else:
+            self._idle_traders.discard(ship_id)
+
+    def _enroll_created(self, entity_manager: EntityManager) -> None:
+        """Queue entities created since the last tick that turned out to be ships."""
+        for entity_id in self._created:
+            entity = entity_manager.get_entity(entity_id)
+            if entity and entity_id not in self._states and entity_manager.has_component(entity, Ship):
+                self._schedule(self._get_or_create_state(entity_id), entity_id, 0.0)
+        self._created.clear()
+
+    def _enroll_unknown(self, entity_manager: EntityManager) -> None:
+        """Enroll ships that appeared without a creation notice.
+
+        Loading a save restores entities straight into the entity manager
+        and replaces the Ship store; every ship is then decided once, known
+        ships keeping their behavior. A ship count that no longer matches
+        the known ships enrolls the unknown ones and drops the missing.
+        """
+        ships = entity_manager._components.get(Ship) or {}
+        reloaded = ships is not self._ship_store
+        if not reloaded and len(ships) == len(self._states):
+            return
+        if ships:
+            self._ship_store = ships
+
+        for ship_id in [ship_id for ship_id in self._states if ship_id not in ships]:
+            self._forget(ship_id)
+        for ship_id in ships:
+            if reloaded or ship_id not in self._states:
+                self._schedule(self._get_or_create_state(ship_id), ship_id, 0.0)
+
+    def _check_transits(self, entity_manager: EntityManager) -> None:
+        """Wake ships in transit whose trip ended without an arrival event."""
+        for ship_id in list(self._in_transit):
+            entity = entity_manager.get_entity(ship_id)
+            state = self._states.get(ship_id)
+            if entity is None or state is None:
+                self._forget(ship_id)
+                continue
+            nav = entity_manager.get_component(entity, NavigationTarget)
+            pos = entity_manager.get_component(entity, Position)
+            if not nav or (pos and nav.has_arrived(pos)):
+                self._schedule(state, ship_id, 0.0)
+
+    def _forget(self, ship_id: UUID) -> None:
+        """Drop a ship's state; any queued entry is skipped when popped."""
+        self._states.pop(ship_id, None)
+        self._idle_traders.discard(ship_id)
+        self._in_transit.discard(ship_id)
+
+    def _assign_idle_traders(self, entity_manager: EntityManager) -> None:
+        """Match every trader due to look for work in a single solve."""
+        from ..ai.trade_assignment import IdleTrader
+        from ..simulation.trade import CargoHold
+
+        idle: list[IdleTrader] = []
+        for ship_id in self._idle_traders:
+            state = self._states.get(ship_id)
+            if not state or not state.ticket or state.wake_time > self._game_time:
+                continue
+            # A finished onward plan is flown instead
+            if self.planning_pool and self.planning_pool.is_ready(ship_id):
+                continue
+            entity = entity_manager.get_entity(ship_id)
+            if not entity or "player_controlled" in entity.tags:
+                continue
+            if entity_manager.has_component(entity, NavigationTarget):
+                continue
+
+            ship = entity_manager.get_component(entity, Ship)
+            pos = entity_manager.get_component(entity, Position)
+            cargo = entity_manager.get_component(entity, CargoHold)
+            if not ship or not pos or not cargo:
+                continue
+
+            idle.append(IdleTrader(ship_id, (pos.x, pos.y), cargo.free_space, ship.max_speed))
+
+        if idle:
+            self.assignment_solver.solve(entity_manager, idle)
+
     def _get_or_create_state(self, ship_id: UUID) -> ShipAIStateV2:
         """Get or create AI state for a ship."""
         if ship_id not in self._states:
@@ -218,6 +451,10 @@ class ShipAISystemV2(System):
         if route and route.waypoints:
             if state.behavior_name != "waypoint":
                 # Switching to waypoint behavior - reset state
+                old_behavior = self._behaviors.get(state.behavior_name)
+                if old_behavior:
+                    ctx = self._create_context(entity_manager, ship_entity, ship, pos, 0.0, state)
+                    old_behavior.on_exit(ctx)
                 state.behavior_name = "waypoint"
                 state.sub_state = "idle"
                 state.state_data = {}
@@ -268,7 +505,7 @@ class ShipAISystemV2(System):
             ship=ship,
             position=pos,
             dt=dt,
-            game_time=0.0,  # TODO: Get from GameTime
+            game_time=self._game_time,
             state_data=state.state_data,
         )
 
@@ -327,10 +564,24 @@ class ShipAISystemV2(System):
         if event.ship_id in self._states:
             state = self._states[event.ship_id]
             state.wait_time = 1.5  # Brief wait on arrival
+            if state.ticket:
+                self._schedule(state, event.ship_id, state.wait_time)
+
+    def _on_navigation_arrived(self, event: NavigationArrivedEvent) -> None:
+        """Queue a ship that just finished its transit."""
+        state = self._states.get(event.entity_id)
+        if state and state.in_transit:
+            self._schedule(state, event.entity_id, 0.0)
+
+    def on_entity_created(self, entity, entity_manager: EntityManager) -> None:
+        """Note new entities - components are added after creation."""
+        self._created.append(entity.id)
 
     def on_entity_destroyed(self, entity, entity_manager: EntityManager) -> None:
         """Clean up when a ship is destroyed."""
-        self._states.pop(entity.id, None)
+        self._forget(entity.id)
+        if self.planning_pool:
+            self.planning_pool.cancel(entity.id)
 
     def get_ship_state(self, ship_id: UUID) -> ShipAIStateV2 | None:
         """Get AI state for a ship (for debugging/UI)."""
@@ -386,6 +637,7 @@ class ShipAISystemV2(System):
             # Immediately run first update to start navigation
             result = waypoint_behavior.update(ctx)
             self._process_result(entity_manager, ship_entity, ship, state, result)
+            self._reschedule(entity_manager, ship_entity, state)
             return True
 
         return False
@@ -0,0 +1,138 @@
+"""Spatial index system - keeps station and ship grids in sync with movement."""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..core.ecs import System, EntityManager, Entity
+from ..core.system_priority import SystemPriority
+from ..core.spatial import BodyRelativeIndex
+from ..entities.celestial import CelestialBody
+from ..entities.stations import Station
+from ..entities.ships import Ship
+from ..solar_system.orbits import Position, ParentBody, NavigationTarget
+
+if TYPE_CHECKING:
+    from ..core.events import EventBus, NavigationArrivedEvent
+
+
+class SpatialIndexSystem(System):
+    """System that maintains shared spatial indexes for stations and ships.
+
+    Runs right after movement so every later system sees current positions.
+    Entities locked to a ParentBody are indexed in body-local coordinates,
+    so only the bodies themselves move as planets orbit; free-flying
+    entities change cell only when they cross a cell boundary.
+
+    Updates are incremental. Each frame only the bodies, ships under way
+    (with a NavigationTarget) and entities marked dirty are synced: new
+    entities, and ships that just arrived and parked (NavigationArrivedEvent).
+    A full rebuild every resync_frames updates catches anything moved by
+    other means, such as loading a save. Destroyed entities are dropped
+    immediately, so consumers never need to rebuild or rescan the world
+    themselves.
+    """
+
+    priority = SystemPriority.SPATIAL_INDEX
+
+    def __init__(
+        self,
+        station_index: BodyRelativeIndex | None = None,
+        ship_index: BodyRelativeIndex | None = None,
+        event_bus: EventBus | None = None,
+        resync_frames: int = 300
+    ) -> None:
+        """Initialize the system.
+
+        Args:
+            station_index: Index to maintain for stations (creates new if None)
+            ship_index: Index to maintain for ships (creates new if None)
+            event_bus: Optional event bus; arrivals mark ships for a resync
+            resync_frames: Updates between full rebuilds of both indexes
+        """
+        self.stations = station_index if station_index is not None else BodyRelativeIndex()
+        self.ships = ship_index if ship_index is not None else BodyRelativeIndex()
+        self.resync_frames = max(1, resync_frames)
+        self._dirty: set[UUID] = set()
+        self._frames_until_resync = 0  # Build everything on the first update
+
+        if event_bus:
+            self.subscribe(event_bus)
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        """Subscribe to the events that move entities outside the in-flight set."""
+        from ..core.events import NavigationArrivedEvent
+
+        event_bus.subscribe(NavigationArrivedEvent, self._on_arrived)
+
+    def mark_dirty(self, entity_id: UUID) -> None:
+        """Resync an entity on the next update."""
+        self._dirty.add(entity_id)
+
+    def update(self, dt: float, entity_manager: EntityManager) -> None:
+        """Sync body positions, then the entities that may have moved."""
+        for entity, _ in entity_manager.get_all_components(CelestialBody):
+            pos = entity_manager.get_component(entity, Position)
+            if pos and entity.name:
+                self.stations.update_body(entity.name, pos.x, pos.y)
+                self.ships.update_body(entity.name, pos.x, pos.y)
+
+        self._frames_until_resync -= 1
+        if self._frames_until_resync <= 0:
+            self.rebuild(entity_manager)
+            return
+
+        for entity, _ in entity_manager.get_all_components(NavigationTarget):
+            self._dirty.add(entity.id)
+
+        for entity_id in self._dirty:
+            entity = entity_manager.get_entity(entity_id)
+            if entity is None:
+                continue
+            if entity_manager.has_component(entity, Ship):
+                self._sync(entity, self.ships, entity_manager)
+            elif entity_manager.has_component(entity, Station):
+                self._sync(entity, self.stations, entity_manager)
+        self._dirty.clear()
+
+    def rebuild(self, entity_manager: EntityManager) -> None:
+        """Rebuild both indexes from scratch, dropping entities that no longer exist."""
+        self.stations.clear()
+        self.ships.clear()
+        for entity, _ in entity_manager.get_all_components(CelestialBody):
+            pos = entity_manager.get_component(entity, Position)
+            if pos and entity.name:
+                self.stations.update_body(entity.name, pos.x, pos.y)
+                self.ships.update_body(entity.name, pos.x, pos.y)
+
+        for entity, _ in entity_manager.get_all_components(Station):
+            self._sync(entity, self.stations, entity_manager)
+        for entity, _ in entity_manager.get_all_components(Ship):
+            self._sync(entity, self.ships, entity_manager)
+
+        self._dirty.clear()
+        self._frames_until_resync = self.resync_frames
+
+    def _sync(self, entity: Entity, index: BodyRelativeIndex, entity_manager: EntityManager) -> None:
+        """Index an entity by parent body offset, or by world position if free."""
+        parent = entity_manager.get_component(entity, ParentBody)
+        if parent and index.has_body(parent.parent_name):
+            index.attach(entity.id, parent.parent_name, parent.offset_x, parent.offset_y)
+            return
+
+        pos = entity_manager.get_component(entity, Position)
+        if pos:
+            index.update(entity.id, pos.x, pos.y)
+
+    def _on_arrived(self, event: NavigationArrivedEvent) -> None:
+        """A ship stopped, possibly parking at a body."""
+        self._dirty.add(event.entity_id)
+
+    def on_entity_created(self, entity: Entity, entity_manager: EntityManager) -> None:
+        """Index new entities once their components are in place."""
+        self._dirty.add(entity.id)
+
+    def on_entity_destroyed(self, entity: Entity, entity_manager: EntityManager) -> None:
+        """Drop destroyed entities from both indexes."""
+        self._dirty.discard(entity.id)
+        self.stations.remove(entity.id)
+        self.ships.remove(entity.id)
@@ -1,26 +1,26 @@
 """Trail system - records ship positions for visual trails."""
 from __future__ import annotations
 
-from ..core.ecs import System, EntityManager
-from ..entities.trails import Trail, TrailPoint
+from ..core.ecs import System, Entity, EntityManager
+from ..entities.trails import Trail, TrailStore, get_trail_store
 from ..entities.ships import Ship
-from ..solar_system.orbits import Position, Velocity, ParentBody
+from ..solar_system.orbits import Position, Velocity, ParentBody, AnalyticTransit
 
 
 class TrailSystem(System):
     """System that records ship positions and manages trail data.
 
     Creates the visual "ant farm" effect by recording position history
-    for moving ships. Trails are cleared when ships park at a body.
+    for moving ships into the shared TrailStore. Trails are cleared when
+    ships park at a body or go unobserved (AnalyticTransit).
     """
 
     priority = 100  # Run after movement systems
 
     def update(self, dt: float, entity_manager: EntityManager) -> None:
         """Update trail data for all ships."""
-        # Get current game time (we'll track it incrementally)
-        # Since we don't have direct access to world.game_time here,
-        # we'll use the trail's own timestamp tracking
+        store = get_trail_store(entity_manager)
+        store.time += dt
 
         for entity, ship in entity_manager.get_all_components(Ship):
             # Get or create trail component
@@ -39,10 +39,18 @@ class TrailSystem(System):
 
             # Clear trail if ship is parked (has ParentBody)
             if parent is not None:
-                if trail.points:
-                    trail.points.clear()
+                trail.count = 0
                 continue
 
+            # Unobserved ships in transit leave no trail
+            transit = entity_manager.get_component(entity, AnalyticTransit)
+            if transit is not None and not transit.observed:
+                trail.count = 0
+                continue
+
+            # Points age by birth time; just drop the expired ones
+            store.expire(trail)
+
             # Check if ship is moving
             is_moving = vel and (abs(vel.vx) > 0.001 or abs(vel.vy) > 0.001)
 
@@ -50,38 +58,15 @@ class TrailSystem(System):
                 # Ship stopped - let trail fade naturally
                 continue
 
-            # Update trail timestamp tracking
-            trail.last_record_time += dt
-
             # Record new point if enough time has passed
+            trail.last_record_time += dt
             if trail.last_record_time >= trail.record_interval:
-                # Add new point at current position
-                new_point = TrailPoint(
-                    x=pos.x,
-                    y=pos.y,
-                    timestamp=trail.last_record_time
-                )
-                trail.points.append(new_point)
+                store.push(trail, pos.x, pos.y)
                 trail.last_record_time = 0.0
 
-                # Prune old points if over max
-                while len(trail.points) > trail.max_points:
-                    trail.points.pop(0)
-
-            # Age all points and remove expired ones
-            self._age_trail_points(trail, dt)
-
-    def _age_trail_points(self, trail: Trail, dt: float) -> None:
-        """Age trail points and remove those past max_age."""
-        if not trail.points:
-            return
-
-        # Update timestamps (increase age)
-        for point in trail.points:
-            point.timestamp += dt
-
-        # Remove points older than max_age
-        trail.points = [
-            p for p in trail.points
-            if p.timestamp < trail.max_age
-        ]
+    def on_entity_destroyed(self, entity: Entity, entity_manager: EntityManager) -> None:
+        """Free a destroyed ship's trail row."""
+        trail = entity_manager.get_component(entity, Trail)
+        store = entity_manager.get_resource(TrailStore)
+        if trail is not None and store is not None:
+            store.release(trail)
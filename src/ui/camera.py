@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 import math
 
+import numpy as np
+
 from ..config import AU_TO_PIXELS, MIN_ZOOM, MAX_ZOOM, SCREEN_WIDTH, SCREEN_HEIGHT
 
 
@@ -43,6 +45,13 @@ class Camera:
 
         return (screen_x, screen_y)
 
+    def world_to_screen_arrays(self, world_x: np.ndarray, world_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized world_to_screen() for arrays of coordinates."""
+        scale = self.zoom * AU_TO_PIXELS
+        screen_x = ((world_x - self.x) * scale + self.screen_width / 2).astype(np.int64)
+        screen_y = ((self.y - world_y) * scale + self.screen_height / 2).astype(np.int64)
+        return screen_x, screen_y
+
     def screen_to_world(self, screen_x: int, screen_y: int) -> tuple[float, float]:
         """Convert screen coordinates (pixels) to world coordinates (AU)."""
         # Offset from screen center
@@ -42,6 +42,7 @@ class InputAction(Enum):
     NEWS = "news"  # Toggle news/events panel
     TOGGLE_MAP = "toggle_map"  # Toggle solar system map (M key)
     FLEET = "fleet"  # Toggle fleet panel (F key)
+    TOGGLE_TRAILS = "toggle_trails"  # Toggle fading trail accumulation (L key)
 
 
 @dataclass
@@ -254,6 +255,9 @@ class InputHandler:
         elif event.key == pygame.K_f:
             self._fire_action(InputAction.FLEET)
 
+        elif event.key == pygame.K_l:
+            self._fire_action(InputAction.TOGGLE_TRAILS)
+
         elif event.key == pygame.K_q:
             self._fire_action(InputAction.QUIT)
 
@@ -745,19 +745,11 @@ class PlayerHUD(Panel):
                 self.credits = faction.credits
                 break
 
-        # Count owned stations
-        from ..entities.stations import Station
-        self.station_count = 0
-        for entity, station in em.get_all_components(Station):
-            if station.owner_faction_id == player_faction_id:
-                self.station_count += 1
-
-        # Count owned ships
-        from ..entities.ships import Ship
-        self.ship_count = 0
-        for entity, ship in em.get_all_components(Ship):
-            if ship.owner_faction_id == player_faction_id:
-                self.ship_count += 1
+        # Count owned stations and ships
+        from ..entities.factions import get_ownership_index
+        ownership = get_ownership_index(em)
+        self.station_count = ownership.station_count(player_faction_id)
+        self.ship_count = ownership.ship_count(player_faction_id)
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
         """Draw the player HUD."""
@@ -1443,7 +1435,7 @@ class TradeRoutePanel(Panel):
 class HelpPanel(Panel):
     """Panel showing keyboard controls and help information."""
     width: int = 400
-    height: int = 480
+    height: int = 498
     title: str = "Help - Keyboard Controls"
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
@@ -1503,6 +1495,7 @@ class HelpPanel(Panel):
             ("OTHER", [
                 ("U", "Upgrade selected station"),
                 ("R", "Toggle trade route lines"),
+                ("L", "Toggle fading ship trails"),
                 ("F5", "Quick save"),
                 ("F9", "Quick load"),
                 ("H or F1", "Toggle this help"),
@@ -1907,12 +1900,12 @@ class NewsFeedPanel:
         contracts = []
         discoveries = []
 
-        for entity, em in world.entity_manager.get_all_components(EventManager):
+        em = world.entity_manager.get_resource(EventManager)
+        if em:
             news = em.news_feed[:15]
             events = em.active_events
             contracts = [c for c in em.available_contracts if not c.accepted]
             discoveries = em.pending_discoveries
-            break
 
         line_height = 20
 
@@ -2391,6 +2384,7 @@ class ShipsListPanel:
     def update_ships(self, world: "World") -> None:
         """Update the ships list from the world with detailed info."""
         from ..entities.ships import Ship, ShipType
+        from ..entities.factions import get_ownership_index
         from ..entities.stations import Station
         from ..solar_system.orbits import Position, NavigationTarget, ParentBody
         from ..simulation.trade import Trader, TradeState, ManualRoute, CargoHold
@@ -2410,8 +2404,10 @@ class ShipsListPanel:
 
         self.ships = []
 
-        for entity, ship in em.get_all_components(Ship):
-            if ship.owner_faction_id != self.player_faction_id:
+        for ship_id in get_ownership_index(em).ships_of(self.player_faction_id):
+            entity = em.get_entity(ship_id)
+            ship = em.get_component(entity, Ship) if entity else None
+            if not ship:
                 continue
 
             pos = em.get_component(entity, Position)
@@ -5,6 +5,8 @@ from uuid import UUID
 import pygame
 import math
 
+import numpy as np
+
 from ..config import COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, TOOLBAR_HEIGHT
 from .camera import Camera
 from .toolbar import Toolbar, ToolbarAction
@@ -28,6 +30,12 @@ if TYPE_CHECKING:
     from ..core.ecs import Entity
     from ..systems.building import BuildingSystem
 
+# Ship trails
+TRAIL_COLOR = (100, 180, 255)  # Cyan-ish for visibility
+TRAIL_OPACITY = 0.6  # Brightness of the newest segment
+TRAIL_LEVELS = 8  # Brightness steps; each ship is one polyline per step
+TRAIL_FADE_PER_FRAME = 1  # Color steps the accumulation surface loses per frame
+
 
 class Renderer:
     """Main renderer for the game."""
@@ -117,6 +125,16 @@ class Renderer:
         self.hover_entity_id: UUID | None = None
         self.hover_distance_threshold = 0.1  # AU distance for hover detection
 
+        # Ship trails: colors per brightness level (0 = not drawn)
+        self._trail_colors = [
+            tuple(int(c * TRAIL_OPACITY * level / TRAIL_LEVELS) for c in TRAIL_COLOR)
+            for level in range(TRAIL_LEVELS + 1)
+        ]
+        self.trail_accumulation = False  # Fade trails on a persistent surface
+        self._trail_surface: pygame.Surface | None = None
+        self._trail_view: tuple | None = None  # Camera state the surface was drawn with
+        self._trail_time = 0.0  # TrailStore time of the last accumulated frame
+
         # Build mode state
         self.build_mode_active = False
         self.selected_station_type: StationType | None = None
@@ -1636,54 +1654,132 @@ class Renderer:
                     self.screen.blit(hint, (screen_x + radius + 5, screen_y + 8))
 
     def _render_ship_trails(self, world: World) -> None:
-        """Render ship trails as fading line segments.
+        """Render ship trails as fading polylines.
 
         Creates the "ant farm" visual effect by showing where ships have traveled.
-        Older trail points are more transparent.
+        Every trail point is projected in one vectorized pass and segments are
+        bucketed into a few brightness levels (older = dimmer), so each ship
+        takes a handful of polyline draws rather than one draw per segment.
         """
-        from ..entities.trails import Trail
+        from ..entities.trails import Trail, TrailStore
 
         em = world.entity_manager
+        store = em.get_resource(TrailStore)
+        if store is None:
+            return
 
-        for entity, trail in em.get_all_components(Trail):
-            if not trail.points or len(trail.points) < 2:
-                continue
+        trails = [trail for _, trail in em.get_all_components(Trail) if trail.count >= 2]
+        batch = self._project_trails(store, trails) if trails else None
 
-            # Draw line segments between consecutive points
-            for i in range(len(trail.points) - 1):
-                p1 = trail.points[i]
-                p2 = trail.points[i + 1]
-
-                # Convert to screen coordinates
-                x1, y1 = self.camera.world_to_screen(p1.x, p1.y)
-                x2, y2 = self.camera.world_to_screen(p2.x, p2.y)
-
-                # Skip if segment is off screen
-                if not self._line_visible((x1, y1), (x2, y2)):
-                    continue
-
-                # Calculate alpha based on age (older = more transparent)
-                # p1 is older than p2
-                age_ratio = p1.timestamp / trail.max_age
-                alpha = int(255 * (1.0 - age_ratio) * 0.6)  # Max 60% opacity
-                alpha = max(0, min(255, alpha))
-
-                if alpha < 10:
-                    continue
-
-                # Trail color: cyan-ish for visibility
-                base_color = (100, 180, 255)
-
-                # Draw the segment with alpha
-                # Since pygame lines don't support alpha directly, we draw with adjusted color
-                # Blend with background approximation
-                color = (
-                    int(base_color[0] * alpha / 255),
-                    int(base_color[1] * alpha / 255),
-                    int(base_color[2] * alpha / 255),
-                )
+        if self.trail_accumulation:
+            self._render_accumulated_trails(store.time, batch)
+            return
+
+        self._trail_surface = None
+        if batch is not None:
+            self._draw_trail_lines(self.screen, *batch)
+
+    def _project_trails(self, store, trails: list) -> tuple[np.ndarray, ...]:
+        """Project trail points to the screen and bucket their brightness.
+
+        Returns:
+            (screen x, screen y, level, count, age); per-point arrays are
+            (len(trails), TRAIL_LENGTH) with points oldest first
+        """
+        xs, ys, ages, counts = store.gather(trails)
+        screen_x, screen_y = self.camera.world_to_screen_arrays(xs, ys)
+        max_ages = np.fromiter((t.max_age for t in trails), dtype=float, count=len(trails))
+        freshness = np.clip(1.0 - ages / max_ages[:, None], 0.0, 1.0)
+        levels = np.rint(freshness * TRAIL_LEVELS).astype(np.intp)
+        return screen_x, screen_y, levels, counts, ages
+
+    def _draw_trail_lines(
+        self,
+        surface: pygame.Surface,
+        screen_x: np.ndarray,
+        screen_y: np.ndarray,
+        levels: np.ndarray,
+        counts: np.ndarray,
+        ages: np.ndarray,
+        newer_than: float | None = None
+    ) -> None:
+        """Draw projected trails as one polyline per run of equal brightness.
+
+        Args:
+            surface: Surface to draw on
+            screen_x, screen_y, levels, counts, ages: Output of _project_trails()
+            newer_than: If set, only draw segments ending at a point younger than this
+        """
+        n, length = screen_x.shape
+        columns = np.arange(length)
+        live = columns < counts[:, None]
+
+        # Skip ships whose whole trail lies off screen
+        margin = 50
+        width, height = self.camera.screen_width, self.camera.screen_height
+        visible = (
+            (np.where(live, screen_x, -margin).max(axis=1) >= -margin) &
+            (np.where(live, screen_x, width + margin).min(axis=1) <= width + margin) &
+            (np.where(live, screen_y, -margin).max(axis=1) >= -margin) &
+            (np.where(live, screen_y, height + margin).min(axis=1) <= height + margin)
+        )
+        if not visible.any():
+            return
+        screen_x, screen_y = screen_x[visible], screen_y[visible]
+        levels, counts, ages = levels[visible], counts[visible], ages[visible]
+
+        # Segment i joins points i and i + 1 and takes the older point's level.
+        # The last column stays 0 so runs never continue into the next ship.
+        segments = np.zeros_like(levels)
+        drawn = columns[:-1] < counts[:, None] - 1
+        if newer_than is not None:
+            drawn &= ages[:, 1:] < newer_than
+        segments[:, :-1] = np.where(drawn, levels[:, :-1], 0)
+
+        flat = segments.ravel()
+        breaks = np.flatnonzero(np.diff(flat)) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [flat.size]))
+        points = np.stack((screen_x.ravel(), screen_y.ravel()), axis=1).tolist()
+        colors = self._trail_colors
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            level = flat[start]
+            if level:
+                pygame.draw.lines(surface, colors[level], False, points[start:end + 1], 1)
+
+    def _render_accumulated_trails(self, time: float, batch: tuple | None) -> None:
+        """Render trails through a persistent surface that fades each frame.
+
+        Only segments recorded since the last frame are drawn; older ones
+        dim by TRAIL_FADE_PER_FRAME per frame instead of by age, and only
+        on frames where trail time advanced. The surface is redrawn from
+        scratch whenever the camera moves.
 
-                pygame.draw.line(self.screen, color, (x1, y1), (x2, y2), 1)
+        Args:
+            time: Current TrailStore time
+            batch: Output of _project_trails(), or None if no trails
+        """
+        camera = self.camera
+        view = (camera.x, camera.y, camera.zoom, camera.screen_width, camera.screen_height)
+        elapsed = time - self._trail_time
+        surface = self._trail_surface
+
+        if surface is None or view != self._trail_view or elapsed < 0:
+            # Camera moved or the clock went back (load): start over
+            surface = pygame.Surface((camera.screen_width, camera.screen_height))
+            self._trail_surface = surface
+            self._trail_view = view
+            if batch is not None:
+                self._draw_trail_lines(surface, *batch)
+        elif elapsed > 0:
+            # Nothing fades or gets drawn while the game is paused
+            fade = (TRAIL_FADE_PER_FRAME,) * 3
+            surface.fill(fade, special_flags=pygame.BLEND_RGB_SUB)
+            if batch is not None:
+                self._draw_trail_lines(surface, *batch, newer_than=elapsed)
+
+        self._trail_time = time
+        self.screen.blit(surface, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
 
     def _render_stations(self, world: World) -> None:
         """Render stations."""
@@ -2061,6 +2157,10 @@ class Renderer:
         """Toggle orbit display."""
         self.show_orbits = not self.show_orbits
 
+    def toggle_trail_accumulation(self) -> None:
+        """Toggle drawing trails through a fading accumulation surface."""
+        self.trail_accumulation = not self.trail_accumulation
+
     def toggle_labels(self) -> None:
         """Toggle label display."""
         self.show_labels = not self.show_labels
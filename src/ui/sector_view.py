@@ -91,6 +91,27 @@ class SectorView:
         """Check if sector view is active."""
         return self.current_sector is not None
 
+    def transit_range(self) -> float:
+        """Distance (AU) from the primary body within which ships in transit are shown."""
+        if self.current_sector and self.current_sector.id in ("earth", "venus", "mercury"):
+            return 0.5
+        return 2.0
+
+    def get_world_bounds(self, world: World) -> tuple[float, float, float, float] | None:
+        """World-space area (min_x, min_y, max_x, max_y) whose ships this view shows."""
+        if not self.current_sector:
+            return None
+
+        from ..solar_system.orbits import Position
+
+        em = world.entity_manager
+        primary = em.get_entity_by_name(self.current_sector.primary_body)
+        pos = em.get_component(primary, Position) if primary else None
+        if not pos:
+            return None
+        r = self.transit_range()
+        return (pos.x - r, pos.y - r, pos.x + r, pos.y + r)
+
     def get_center(self) -> tuple[float, float]:
         """Get the center of the view."""
         return (
@@ -203,13 +224,10 @@ class SectorView:
 
             # Get station's orbital slot position
             slot_index = 0
-            for _, slot_mgr in em.get_all_components(OrbitalSlotManager):
-                if station.parent_body in slot_mgr.slot_assignments:
-                    for slot, sid in slot_mgr.slot_assignments[station.parent_body].items():
-                        if sid == entity.id:
-                            slot_index = slot
-                            break
-                break
+            slot_mgr = em.get_resource(OrbitalSlotManager)
+            location = slot_mgr.get_station_slot(entity.id) if slot_mgr else None
+            if location and location[0] == station.parent_body:
+                slot_index = location[1]
 
             # Calculate orbital position (same as render)
             ring = slot_index // 4
@@ -431,13 +449,10 @@ class SectorView:
 
             # Get station's orbital slot position
             slot_index = 0
-            for _, slot_mgr in em.get_all_components(OrbitalSlotManager):
-                if station.parent_body in slot_mgr.slot_assignments:
-                    for slot, sid in slot_mgr.slot_assignments[station.parent_body].items():
-                        if sid == entity.id:
-                            slot_index = slot
-                            break
-                break
+            slot_mgr = em.get_resource(OrbitalSlotManager)
+            location = slot_mgr.get_station_slot(entity.id) if slot_mgr else None
+            if location and location[0] == station.parent_body:
+                slot_index = location[1]
 
             # Calculate orbital position based on body visual radius
             # Slots 0-3 are inner ring, 4-7 middle, 8-11 outer
@@ -651,8 +666,8 @@ class SectorView:
 
             # Method 2: Ship has Position near sector (for ships in transit)
             if sx is None and pos and primary_world_pos:
-                # Check if ship is within sector range (0.5 AU for inner system, larger for outer)
-                sector_range = 0.5 if self.current_sector.id in ("earth", "venus", "mercury") else 2.0
+                # Check if ship is within sector range
+                sector_range = self.transit_range()
                 dx = pos.x - primary_world_pos[0]
                 dy = pos.y - primary_world_pos[1]
                 dist = math.sqrt(dx * dx + dy * dy)
@@ -809,11 +824,14 @@ class SectorView:
         if not self.current_sector:
             return
 
-        from ..entities.trails import Trail
+        from ..entities.trails import Trail, TrailStore
         from ..entities.ships import Ship
         from ..solar_system.orbits import Position, ParentBody
 
         em = world.entity_manager
+        store = em.get_resource(TrailStore)
+        if store is None:
+            return
 
         # Build lookup of body world positions
         body_positions: dict[str, tuple[float, float]] = {}
@@ -832,7 +850,7 @@ class SectorView:
         primary_pos = body_positions[primary_name]
 
         for entity, trail in em.get_all_components(Trail):
-            if not trail.points or len(trail.points) < 2:
+            if trail.count < 2:
                 continue
 
             # Check if this ship is in this sector
@@ -860,16 +878,14 @@ class SectorView:
                 continue
 
             # Draw trail segments
-            for i in range(len(trail.points) - 1):
-                p1 = trail.points[i]
-                p2 = trail.points[i + 1]
-
+            xs, ys, ages = store.points(trail)
+            for i in range(len(xs) - 1):
                 # Convert world positions to screen positions
                 # Map world offset from primary to screen space
-                offset1_x = p1.x - primary_pos[0]
-                offset1_y = p1.y - primary_pos[1]
-                offset2_x = p2.x - primary_pos[0]
-                offset2_y = p2.y - primary_pos[1]
+                offset1_x = xs[i] - primary_pos[0]
+                offset1_y = ys[i] - primary_pos[1]
+                offset2_x = xs[i + 1] - primary_pos[0]
+                offset2_y = ys[i + 1] - primary_pos[1]
 
                 # Scale to screen (rough approximation - sector view uses grid)
                 # Use the primary body's grid position as reference
@@ -888,7 +904,7 @@ class SectorView:
                 y2 = py - offset2_y * scale
 
                 # Calculate alpha based on age
-                age_ratio = p1.timestamp / trail.max_age
+                age_ratio = ages[i] / trail.max_age
                 alpha = int(255 * (1.0 - age_ratio) * 0.6)
                 alpha = max(0, min(255, alpha))
 
@@ -3,7 +3,7 @@ import pytest
 from src.core.world import World
 from src.core.events import EventBus
 from src.simulation.resources import ResourceType, Inventory, BASE_PRICES
-from src.simulation.economy import Market, EconomySystem, find_best_trade
+from src.simulation.economy import Market, EconomySystem, OpportunityIndex, find_best_trade
 
 
 class TestInventory:
@@ -164,6 +164,61 @@ class TestFindBestTrade:
         assert trade is None
 
 
+class TestOpportunityIndex:
+    """Tests for the world-level opportunity index."""
+
+    def _add_station(self, world, name, sells=None, buys=None, stock=None, credits=10000):
+        em = world.entity_manager
+        entity = world.create_entity(name)
+        market = Market(credits=credits)
+        inv = Inventory(capacity=1000)
+        for resource, price in (sells or {}).items():
+            market.sells[resource] = True
+            market.prices[resource] = price
+        for resource, price in (buys or {}).items():
+            market.buys[resource] = True
+            market.prices[resource] = price
+        for resource, amount in (stock or {}).items():
+            inv.add(resource, amount)
+        em.add_component(entity, market)
+        em.add_component(entity, inv)
+        return entity
+
+    def test_finds_widest_spread(self):
+        """Test that the cheapest seller is matched with the best buyer."""
+        world = World()
+        cheap = self._add_station(world, "Cheap", sells={ResourceType.IRON_ORE: 10},
+                                  stock={ResourceType.IRON_ORE: 100})
+        self._add_station(world, "Pricey", sells={ResourceType.IRON_ORE: 15},
+                          stock={ResourceType.IRON_ORE: 100})
+        buyer = self._add_station(world, "Buyer", buys={ResourceType.IRON_ORE: 30})
+
+        index = OpportunityIndex()
+        index.rebuild(world.entity_manager)
+        route = index.find_best_route(cargo_capacity=50, min_profit_per_unit=5.0)
+
+        assert route is not None
+        source_id, dest_id, resource, amount, profit = route
+        assert source_id == cheap.id
+        assert dest_id == buyer.id
+        assert resource == ResourceType.IRON_ORE
+        assert amount == 50
+        assert profit == pytest.approx(30 - 11)
+
+    def test_skips_empty_sellers_and_broke_buyers(self):
+        """Test that sellers without stock and buyers without credits are excluded."""
+        world = World()
+        self._add_station(world, "Empty", sells={ResourceType.IRON_ORE: 10})
+        self._add_station(world, "Broke", buys={ResourceType.IRON_ORE: 30}, credits=0)
+
+        index = OpportunityIndex()
+        index.rebuild(world.entity_manager)
+
+        assert ResourceType.IRON_ORE not in index.sellers
+        assert ResourceType.IRON_ORE not in index.buyers
+        assert index.find_best_route(cargo_capacity=50) is None
+
+
 class TestEconomySystem:
     """Tests for the economy system."""
 
@@ -193,3 +248,26 @@ class TestEconomySystem:
 
         # Price should have increased due to low stock
         assert market.prices[ResourceType.IRON_ORE] > BASE_PRICES[ResourceType.IRON_ORE]
+
+    def test_reservations_expire_against_world_clock(self):
+        """Test that loaded reservations lapse by the saved world clock, not system uptime."""
+        world = World()
+        world.game_time.total_days = 500.0  # As restored from a save
+        system = EconomySystem(world.event_bus, game_time=world.game_time)
+        system._update_interval = 0
+
+        entity = world.create_entity("Test Station")
+        em = world.entity_manager
+        market = Market()
+        inventory = Inventory(capacity=1000)
+        inventory.add(ResourceType.IRON_ORE, 100)
+        em.add_component(entity, market)
+        em.add_component(entity, inventory)
+
+        lapsed, current = world.create_entity("Old Ship").id, world.create_entity("New Ship").id
+        inventory.reservations.reserve(lapsed, ResourceType.IRON_ORE, 30, expires_at=200.0)
+        inventory.reservations.reserve(current, ResourceType.IRON_ORE, 20, expires_at=600.0)
+
+        system.update(1.0, em)
+
+        assert inventory.available(ResourceType.IRON_ORE) == 80
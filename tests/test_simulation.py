@@ -357,3 +357,986 @@ class TestIntegration:
 
         # World should still be intact
         assert world.entity_manager.entity_count > 0
+
+
+class TestOwnershipIndex:
+    """Tests for the per-faction ownership index."""
+
+    def test_tracks_create_transfer_and_destroy(self):
+        from src.entities.factions import create_faction, get_ownership_index, transfer_ownership
+        from src.entities.ships import create_ship, ShipType
+        from src.entities.stations import create_station, Station, StationType
+        from src.systems.ownership import OwnershipSystem
+
+        world = World()
+        world.add_system(OwnershipSystem())
+        em = world.entity_manager
+        alpha = create_faction(world, "Alpha")
+        beta = create_faction(world, "Beta")
+
+        station = create_station(world, "Depot", StationType.REFINERY, (1.0, 0.0), owner_faction_id=alpha.id)
+        ship = create_ship(world, "Hauler", ShipType.FREIGHTER, (1.0, 0.0), owner_faction_id=alpha.id)
+        create_ship(world, "Drifter", ShipType.FREIGHTER, (1.0, 0.0))
+
+        index = get_ownership_index(em)
+        assert index.station_count(alpha.id) == 1
+        assert index.ships_of(alpha.id) == [ship.id]
+        assert len(index.owners) == 2  # Unowned ships aren't indexed
+
+        transfer_ownership(world, station, beta.id)
+        assert index.station_count(alpha.id) == 0
+        assert index.stations_of(beta.id) == [station.id]
+        assert em.get_component(station, Station).owner_faction_id == beta.id
+
+        world.destroy_entity(ship)
+        assert index.ship_count(alpha.id) == 0
+        assert index.owner_of(ship.id) is None
+
+
+class TestWorldSummary:
+    """Tests for the faction AI world summary."""
+
+    def test_summarizes_holdings_and_deposits(self):
+        from src.ai.world_summary import build_world_summary
+        from src.entities.celestial import create_solar_system
+        from src.entities.factions import create_faction
+        from src.entities.stations import create_mining_station, StationType
+        from src.simulation.resources import ResourceType
+
+        world = World()
+        create_solar_system(world)
+        miner = create_faction(world, "Miner", credits=1000.0)
+        idle = create_faction(world, "Idle", credits=500.0)
+        create_mining_station(world, "Moon Mine", (1.0, 0.0), "Moon", ResourceType.HELIUM3, owner_faction_id=miner.id)
+
+        summary = build_world_summary(world.entity_manager)
+
+        assert summary.faction(miner.id).station_types == {StationType.MINING_STATION: 1}
+        assert summary.faction(miner.id).stations_at_body == {"Moon": 1}
+        assert summary.faction(idle.id).wealth == 500.0
+        assert "Sun" not in summary.bodies
+
+        moon = summary.bodies["Moon"]
+        assert moon.station_count == 1
+        assert moon.unclaimed() == [(ResourceType.SILICATES, 1.0)]
+        assert ("Moon", ResourceType.HELIUM3) not in [(b, r) for b, r, _ in summary.unclaimed_deposits()]
+
+        summary.record_station(idle.id, StationType.OUTPOST, "Moon")
+        assert moon.station_count == 2
+        assert summary.faction(idle.id).station_count == 1
+
+
+class TestFactionPlanner:
+    """Tests for utility-based faction planning."""
+
+    def _setup(self):
+        from src.ai.world_summary import build_world_summary
+        from src.entities.celestial import create_solar_system
+        from src.entities.factions import create_faction
+        from src.entities.ships import create_ship, ShipType
+        from src.systems.building import BuildingSystem
+
+        world = World()
+        create_solar_system(world)
+        faction_entity = create_faction(world, "Planner", credits=50000.0)
+        building = BuildingSystem(world.event_bus)
+        summary = build_world_summary(world.entity_manager)
+        # A ship at Earth puts Earth in building range
+        create_ship(world, "Builder", ShipType.SHUTTLE, summary.bodies["Earth"].position, faction_entity.id)
+        return world, faction_entity, building, summary
+
+    def test_first_choice_is_an_affordable_outpost(self):
+        from src.ai.faction_planner import ActionKind, FactionPlanner
+        from src.entities.factions import Faction
+        from src.entities.stations import StationType
+
+        world, faction_entity, building, summary = self._setup()
+        faction = world.entity_manager.get_component(faction_entity, Faction)
+
+        ranked = FactionPlanner().rank(faction_entity.id, faction, summary, building, world.entity_manager)
+
+        assert ranked[0].action.kind == ActionKind.BUILD_STATION
+        assert ranked[0].action.station_type == StationType.OUTPOST
+        # Refineries need materials the faction doesn't have
+        assert all(s.action.station_type != StationType.REFINERY for s in ranked)
+
+    def test_only_changed_candidates_are_rescored(self):
+        from src.ai.faction_planner import FactionPlanner
+        from src.entities.factions import Faction
+        from src.entities.ships import create_ship, ShipType
+        from src.entities.stations import StationType
+
+        world, faction_entity, building, summary = self._setup()
+        em = world.entity_manager
+        create_ship(world, "Scout", ShipType.SHUTTLE, summary.bodies["Moon"].position, faction_entity.id)
+        faction = em.get_component(faction_entity, Faction)
+        planner = FactionPlanner()
+
+        planner.rank(faction_entity.id, faction, summary, building, em)
+        first = planner.rescored
+        planner.rank(faction_entity.id, faction, summary, building, em)
+        assert planner.rescored == first
+
+        # Another faction mines at the Moon: only Moon candidates are dirty
+        summary.record_station(None, StationType.MINING_STATION, "Moon")
+        planner.rank(faction_entity.id, faction, summary, building, em)
+        assert 0 < planner.rescored - first <= 4
+
+
+    def test_unreachable_and_failed_builds_are_skipped(self):
+        from src.ai.faction_planner import ActionKind, FactionPlanner
+        from src.entities.factions import Faction
+
+        world, faction_entity, building, summary = self._setup()
+        em = world.entity_manager
+        faction = em.get_component(faction_entity, Faction)
+        planner = FactionPlanner()
+
+        ranked = planner.rank(faction_entity.id, faction, summary, building, em)
+        sites = {s.action.body_name for s in ranked if s.action.kind == ActionKind.BUILD_STATION}
+        assert sites == {"Earth"}
+
+        # A failed action stays out of the ranking until its inputs change
+        best = ranked[0].action
+        planner.mark_failed(faction_entity.id, best)
+        assert best not in [s.action for s in planner.rank(faction_entity.id, faction, summary, building, em)]
+
+        summary.record_station(faction_entity.id, best.station_type, best.body_name)
+        assert best in [s.action for s in planner.rank(faction_entity.id, faction, summary, building, em)]
+
+
+class TestFreelancerSpawner:
+    """Tests for excess-cargo freelancer spawning."""
+
+    def test_spawns_for_fullest_uncovered_station(self):
+        from src.entities.factions import create_faction, get_ownership_index
+        from src.entities.stations import create_station, StationType
+        from src.simulation.freelancer import FreelancerManager, FreelancerSpawner
+        from src.simulation.resources import ResourceType
+
+        world = World()
+        em = world.entity_manager
+        freelancers = create_faction(world, "Freelancers")
+        manager_entity = world.create_entity(name="FreelancerManager")
+        em.add_component(manager_entity, FreelancerManager(
+            freelancer_faction_id=freelancers.id, spawn_interval=0.0
+        ))
+        fuller = create_station(world, "Fuller", StationType.MINING_STATION, (1.0, 0.0),
+                                initial_resources={ResourceType.IRON_ORE: 1800})
+        full = create_station(world, "Full", StationType.MINING_STATION, (2.0, 0.0),
+                              initial_resources={ResourceType.IRON_ORE: 1200})
+        create_station(world, "Empty", StationType.MINING_STATION, (3.0, 0.0),
+                       initial_resources={ResourceType.IRON_ORE: 100})
+
+        spawner = FreelancerSpawner(world.event_bus, world, check_interval=1.0)
+        spawner.update(1.0, em)
+        assert get_ownership_index(em).ship_count(freelancers.id) == 1
+        assert list(spawner._assigned) == [fuller.id]
+
+        # The fuller station is covered, so the next spawn goes to the other one
+        spawner.update(1.0, em)
+        assert set(spawner._assigned) == {fuller.id, full.id}
+
+        # Nothing else needs moving
+        spawner.update(1.0, em)
+        assert get_ownership_index(em).ship_count(freelancers.id) == 2
+
+
+class TestPatrolNeighborhoods:
+    """Tests for precomputed patrol targets."""
+
+    def _world(self):
+        from src.entities.celestial import create_solar_system
+        from src.entities.ships import create_ship, ShipType
+        from src.entities.stations import create_station, StationType
+
+        world = World()
+        create_solar_system(world)
+        em = world.entity_manager
+        earth = em.get_component(em.get_entity_by_name("Earth"), Position)
+        for i in range(4):
+            create_station(world, f"Dock {i}", StationType.OUTPOST, (earth.x + 0.01 * i, earth.y), parent_body="Earth")
+        ship = create_ship(world, "Wanderer", ShipType.SHUTTLE, (earth.x, earth.y), is_trader=False)
+        return world, ship
+
+    def _walk(self, world, ship_entity, seed: int) -> list:
+        from src.ai.behaviors.base import BehaviorContext
+        from src.ai.behaviors.patrol import PatrolBehavior
+        from src.entities.ships import Ship
+
+        em = world.entity_manager
+        behavior = PatrolBehavior(seed=seed)
+        ctx = BehaviorContext(
+            em, ship_entity, em.get_component(ship_entity, Ship),
+            em.get_component(ship_entity, Position), dt=0.0, game_time=0.0
+        )
+        behavior.on_enter(ctx)
+
+        names = []
+        for _ in range(6):
+            target = behavior._select_patrol_target(ctx)
+            assert target is not None
+            assert target.id != ctx.state_data["patrol_target_id"]
+            ctx.state_data["patrol_target_id"] = target.id
+            names.append(target.name)
+        return names
+
+    def test_seeded_patrols_repeat(self):
+        world, ship = self._world()
+        first = self._walk(world, ship, seed=7)
+        assert first == self._walk(world, ship, seed=7)
+        # A fresh patrol heads for the closest target
+        assert first[0] == "Dock 0"
+
+
+class TestAnalyticTransit:
+    """Tests for closed-form simulation of unobserved ships."""
+
+    def _world(self, names, body_name="Mars", closed_form=False):
+        from src.core.events import NavigationArrivedEvent
+        from src.entities.celestial import create_solar_system
+        from src.entities.ships import create_ship, ShipType, Ship
+        from src.solar_system.orbits import MovementSystem, NavigationSystem, NavigationTarget
+
+        world = World()
+        world.add_system(OrbitalSystem())
+        world.add_system(NavigationSystem(
+            world.event_bus, analytic_unobserved=not closed_form, closed_form=closed_form
+        ))
+        world.add_system(MovementSystem())
+        create_solar_system(world)
+        em = world.entity_manager
+        earth = em.get_component(em.get_entity_by_name("Earth"), Position)
+
+        ships = []
+        for name in names:
+            ship_entity = create_ship(world, name, ShipType.FREIGHTER, (earth.x + 0.05, earth.y))
+            ship = em.get_component(ship_entity, Ship)
+            em.add_component(ship_entity, NavigationTarget(
+                target_x=earth.x + 1.5, target_y=earth.y + 0.5, target_body_name=body_name,
+                max_speed=ship.max_speed, acceleration=ship.acceleration
+            ))
+            ships.append(ship_entity)
+
+        arrivals = {}
+        clock = [0.0]
+        self.arrival_events = []
+        world.event_bus.subscribe(NavigationArrivedEvent, self.arrival_events.append)
+        world.event_bus.subscribe(
+            NavigationArrivedEvent, lambda e: arrivals.setdefault(e.entity_id, clock[0])
+        )
+        return world, ships, arrivals, clock
+
+    def _run(self, world, arrivals, clock, count, dt=0.05):
+        while len(arrivals) < count and clock[0] < 500:
+            world.update(dt)
+            clock[0] += dt
+
+    def test_unobserved_ship_arrives_like_observed_one(self):
+        from src.solar_system.observation import get_observer_view
+        from src.solar_system.orbits import AnalyticTransit
+
+        world, (watched, unwatched), arrivals, clock = self._world(["Watched", "Unwatched"], body_name="")
+        em = world.entity_manager
+        get_observer_view(em).set_view([], {watched.id})
+
+        dt = 0.05
+        world.update(dt)
+        clock[0] += dt
+        assert not em.has_component(watched, AnalyticTransit)
+        transit = em.get_component(unwatched, AnalyticTransit)
+        assert transit is not None
+
+        self._run(world, arrivals, clock, 2)
+        assert len(arrivals) == 2
+        assert not em.has_component(unwatched, AnalyticTransit)
+        # The solved trip lands close to the frame-by-frame one
+        assert arrivals[unwatched.id] == pytest.approx(arrivals[watched.id], rel=0.1)
+        assert em.get_component(unwatched, Position).distance_to(em.get_component(watched, Position)) < 0.01
+
+    def test_unobserved_ship_intercepts_body(self):
+        from src.solar_system.orbits import AnalyticTransit, ParentBody
+
+        world, (ship,), arrivals, clock = self._world(["Ship"])
+        em = world.entity_manager
+        world.update(0.05)
+        clock[0] += 0.05
+        arrival_time = em.get_component(ship, AnalyticTransit).trajectory.arrival_time
+
+        self._run(world, arrivals, clock, 1)
+        assert arrivals[ship.id] == pytest.approx(arrival_time, abs=0.1)
+        assert em.get_component(ship, ParentBody).parent_name == "Mars"
+
+    def test_view_restores_full_fidelity(self):
+        from src.solar_system.observation import get_observer_view
+        from src.solar_system.orbits import AnalyticTransit
+
+        world, (ship,), arrivals, clock = self._world(["Ship"])
+        em = world.entity_manager
+        for _ in range(20):
+            world.update(0.05)
+
+        transit = em.get_component(ship, AnalyticTransit)
+        assert transit is not None
+        x, y = transit.trajectory.position_at(1.0)
+        get_observer_view(em).set_view([(x - 0.5, y - 0.5, x + 0.5, y + 0.5)])
+        world.update(0.0)
+
+        assert not em.has_component(ship, AnalyticTransit)
+        pos = em.get_component(ship, Position)
+        assert (pos.x, pos.y) == pytest.approx((x, y))
+        assert not arrivals
+
+    def test_closed_form_positions_only_observed_ships_each_frame(self):
+        from src.solar_system.observation import get_observer_view
+        from src.solar_system.orbits import AnalyticTransit
+
+        world, (watched, unwatched), arrivals, clock = self._world(
+            ["Watched", "Unwatched"], body_name="", closed_form=True
+        )
+        em = world.entity_manager
+        get_observer_view(em).set_view([], {watched.id})
+        world.update(0.05)
+        clock[0] += 0.05
+        assert em.get_component(watched, AnalyticTransit).observed
+        assert not em.get_component(unwatched, AnalyticTransit).observed
+
+        before = [(em.get_component(e, Position).x, em.get_component(e, Position).y) for e in (watched, unwatched)]
+        world.update(0.05)
+        clock[0] += 0.05
+        after = [(em.get_component(e, Position).x, em.get_component(e, Position).y) for e in (watched, unwatched)]
+        assert after[0] != before[0]
+        assert after[1] == before[1]  # Refreshed only every check interval
+
+        self._run(world, arrivals, clock, 2)
+        assert arrivals[watched.id] == pytest.approx(arrivals[unwatched.id])
+        for _ in range(10):
+            world.update(0.05)
+        # Fixed-target arrivals are announced once, then wait for the AI
+        assert len(self.arrival_events) == 2
+
+    def test_view_change_rechecks_only_nearby_ships(self):
+        from src.solar_system.observation import get_observer_view
+        from src.solar_system.orbits import AnalyticTransit
+
+        world, (near, far), arrivals, clock = self._world(["Near", "Far"], body_name="", closed_form=True)
+        em = world.entity_manager
+        em.get_component(far, Position).x -= 20.0
+        world.update(0.05)  # Full check: nobody is looking
+        world.update(0.05)
+
+        x, y = em.get_component(near, AnalyticTransit).trajectory.position_at(0.15)
+        far_before = (em.get_component(far, Position).x, em.get_component(far, Position).y)
+        get_observer_view(em).set_view([(x - 0.5, y - 0.5, x + 0.5, y + 0.5)])
+        world.update(0.05)
+
+        assert em.get_component(near, AnalyticTransit).observed
+        assert (em.get_component(near, Position).x, em.get_component(near, Position).y) == pytest.approx((x, y))
+        # The far ship was never near either view, so it waits for the next full check
+        assert not em.get_component(far, AnalyticTransit).observed
+        assert (em.get_component(far, Position).x, em.get_component(far, Position).y) == far_before
+
+        get_observer_view(em).set_view([])
+        world.update(0.05)
+        assert not em.get_component(near, AnalyticTransit).observed
+
+    def test_closed_form_intercepts_body(self):
+        from src.solar_system.orbits import AnalyticTransit, NavigationTarget, ParentBody
+
+        world, (ship,), arrivals, clock = self._world(["Ship"], closed_form=True)
+        em = world.entity_manager
+        world.update(0.05)
+        clock[0] += 0.05
+        arrival_time = em.get_component(ship, AnalyticTransit).trajectory.arrival_time
+
+        self._run(world, arrivals, clock, 1)
+        assert arrivals[ship.id] == pytest.approx(arrival_time, abs=0.06)
+        assert em.get_component(ship, ParentBody).parent_name == "Mars"
+        assert not em.has_component(ship, NavigationTarget)
+        assert not em.has_component(ship, AnalyticTransit)
+        mars = em.get_component(em.get_entity_by_name("Mars"), Position)
+        assert em.get_component(ship, Position).distance_to(mars) < 0.1
+
+
+class TestSlotFreeLists:
+    """Tests for free-list slot allocation and singleton resources."""
+
+    def test_parking_reuses_lowest_free_slot(self):
+        from uuid import uuid4
+        from src.entities.station_slots import ShipParkingManager, MAX_SHIP_PARKING_SLOTS
+
+        pm = ShipParkingManager()
+        ships = [uuid4() for _ in range(MAX_SHIP_PARKING_SLOTS + 1)]
+        slots = [pm.assign_parking("Earth", ship) for ship in ships]
+        assert slots == list(range(MAX_SHIP_PARKING_SLOTS)) + [None]
+
+        pm.release_parking(ships[7])
+        pm.release_parking(ships[2])
+        assert pm.get_available_slot("Earth") == 2
+        assert pm.assign_parking("Earth", uuid4(), slot_index=7) == 7
+        assert pm.assign_parking("Earth", uuid4()) == 2
+        assert pm.get_available_slot("Earth") is None
+
+    def test_station_slots_release_by_station(self):
+        from uuid import uuid4
+        from src.entities.station_slots import OrbitalSlotManager
+
+        sm = OrbitalSlotManager()
+        preset, first, second = uuid4(), uuid4(), uuid4()
+        sm.occupy_slot("Mars", 0, preset)
+        for station in (first, second):
+            sm.occupy_slot("Mars", sm.get_next_available_slot("Mars"), station)
+        assert sm.get_station_slot(second) == ("Mars", 2)
+
+        sm.release_slot("Mars", first)
+        assert sm.get_next_available_slot("Mars") == 1
+        assert sm.get_slot_count("Mars") == 2
+        assert sm.get_station_slot(first) is None
+
+    def test_resource_lookup_follows_replacement(self):
+        from src.entities.station_slots import ShipParkingManager
+
+        em = EntityManager()
+        assert em.get_resource(ShipParkingManager) is None
+        holder = em.create_entity("Parking")
+        first = ShipParkingManager()
+        em.add_component(holder, first)
+        assert em.get_resource(ShipParkingManager) is first
+
+        em.destroy_entity(holder)
+        replacement = ShipParkingManager()
+        em.add_component(em.create_entity("Parking"), replacement)
+        assert em.get_resource(ShipParkingManager) is replacement
+
+
+class TestBinarySaves:
+    """Tests for the chunked binary save format."""
+
+    def _world(self) -> World:
+        from src.solar_system.orbits import Velocity
+        from src.simulation.resources import Inventory, ResourceType
+
+        world = World()
+        em = world.entity_manager
+        world.game_time.advance(42.5)
+        for i in range(600):
+            entity = em.create_entity(f"Ship {i}", tags={"ship"})
+            em.add_component(entity, Position(x=i * 0.01, y=-i * 0.5))
+            em.add_component(entity, Velocity(vx=0.1, vy=-1e-9))
+            inventory = Inventory(capacity=250.0)
+            inventory.resources[ResourceType.IRON_ORE] = float(i)
+            em.add_component(entity, inventory)
+        return world
+
+    def test_pack_round_trip(self):
+        from src.systems.save_format import pack, unpack
+
+        value = {"a": [None, True, False, 0, 255, 256, -3, 2 ** 40, 1.5, "é", b"\x00"], "b": {}}
+        assert unpack(pack(value)) == value
+        assert unpack(pack((1, 2))) == [1, 2]
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_stream_round_trip(self, compress):
+        import io
+        from src.solar_system.orbits import Velocity
+        from src.simulation.resources import Inventory, ResourceType
+        from src.systems.save_format import SaveReader
+        from src.systems.save_load import write_save, read_save
+
+        world = self._world()
+        buffer = io.BytesIO()
+        assert write_save(world, buffer, compress=compress) == 600
+
+        buffer.seek(0)
+        chunks = list(SaveReader(buffer).chunks())
+        assert len(chunks) > 1
+        assert sum(len(records) for records in chunks) == 600
+
+        buffer.seek(0)
+        loaded = World()
+        read_save(loaded, buffer)
+        em = loaded.entity_manager
+        assert loaded.game_time.total_days == world.game_time.total_days
+        assert len(list(em.get_entities_with(Position, Velocity, Inventory))) == 600
+        original = world.entity_manager.get_entity_by_name("Ship 321")
+        ship = em.get_entity(original.id)
+        assert ship.tags == {"ship"}
+        assert em.get_component(ship, Position).y == -160.5
+        assert em.get_component(ship, Velocity).vy == -1e-9
+        assert em.get_component(ship, Inventory).get(ResourceType.IRON_ORE) == 321.0
+
+    def test_save_game_binary_and_json_export(self, tmp_path, monkeypatch):
+        from src.systems import save_load
+        from src.systems.save_format import SaveFormatError
+
+        monkeypatch.setattr(save_load, "SAVE_DIR", tmp_path)
+        world = self._world()
+        assert save_load.save_game(world, "slot")[0]
+        assert save_load.save_game(world, "slot", export_json=True)[0]
+        binary, export = tmp_path / "slot.xps", tmp_path / "slot.json"
+        assert binary.stat().st_size < export.stat().st_size / 4
+        assert set(save_load.get_save_files()) == {binary, export}
+
+        for path in (binary, export):
+            loaded = World()
+            assert save_load.load_game(loaded, path)[0]
+            assert len(list(loaded.entity_manager.get_entities_with(Position))) == 600
+
+        with pytest.raises(SaveFormatError):
+            save_load.read_save(World(), export.open("rb"))
+
+
+class TestAutosave:
+    """Tests for snapshot-based background autosaves."""
+
+    def test_snapshot_is_isolated_from_live_world(self, tmp_path):
+        from src.simulation.resources import Inventory, ResourceType
+        from src.systems.autosave import snapshot_world, write_snapshot
+        from src.systems.save_load import load_game
+
+        world = TestBinarySaves()._world()
+        em = world.entity_manager
+        ship = em.get_entity_by_name("Ship 5")
+        snapshot = snapshot_world(world)
+
+        em.get_component(ship, Position).x = 99.0
+        em.get_component(ship, Inventory).resources[ResourceType.IRON_ORE] = 0.0
+        em.destroy_entity(em.get_entity_by_name("Ship 6"))
+
+        path = tmp_path / "snap.xps"
+        assert write_snapshot(snapshot, path)[0]
+        assert not list(tmp_path.glob("*.tmp"))
+
+        loaded = World()
+        assert load_game(loaded, path)[0]
+        saved = loaded.entity_manager.get_entity(ship.id)
+        assert loaded.entity_manager.get_component(saved, Position).x == 0.05
+        assert loaded.entity_manager.get_component(saved, Inventory).get(ResourceType.IRON_ORE) == 5.0
+        assert loaded.entity_manager.get_entity_by_name("Ship 6") is not None
+
+    def test_snapshot_does_not_share_nested_state(self, tmp_path):
+        from src.entities.station_slots import ShipParkingManager
+        from src.simulation.resources import Inventory, ResourceType
+        from src.systems.autosave import snapshot_world, write_snapshot
+        from src.systems.save_load import load_game
+
+        world = TestBinarySaves()._world()
+        em = world.entity_manager
+        ship = em.get_entity_by_name("Ship 5")
+        other = em.get_entity_by_name("Ship 6")
+        inventory = em.get_component(ship, Inventory)
+        inventory.reservations.reserve(other.id, ResourceType.IRON_ORE, 2.0, 100.0)
+        parking = ShipParkingManager()
+        parking.assign_parking("Mars", other.id)
+        em.add_component(em.create_entity("Parking"), parking)
+        snapshot = snapshot_world(world)
+
+        inventory.reservations.reserve(other.id, ResourceType.IRON_ORE, 4.0, 100.0)
+        inventory.reservations.reserve(ship.id, ResourceType.WATER, 1.0, 100.0)
+        parking.assign_parking("Mars", ship.id)
+
+        path = tmp_path / "snap.xps"
+        assert write_snapshot(snapshot, path)[0]
+        loaded = World()
+        assert load_game(loaded, path)[0]
+        lem = loaded.entity_manager
+        ledger = lem.get_component(lem.get_entity(ship.id), Inventory).reservations
+        assert [(key, r.amount) for key, r in ledger.entries.items()] == [((other.id, ResourceType.IRON_ORE), 2.0)]
+        assert lem.get_resource(ShipParkingManager).get_parked_ships("Mars") == [(0, other.id)]
+
+    def test_autosaves_rotate_slots(self, tmp_path, monkeypatch):
+        import os
+        from src.systems import save_load
+        from src.systems.autosave import Autosaver
+
+        monkeypatch.setattr(save_load, "SAVE_DIR", tmp_path)
+        world = TestBinarySaves()._world()
+        autosaver = Autosaver(interval=10.0, slots=2)
+        try:
+            assert autosaver.update(world) is None  # Schedules the first save
+            written = []
+            for step in range(3):
+                world.game_time.advance(10.0)
+                autosaver.update(world)
+                assert autosaver.wait()[0]
+                newest = max(tmp_path.glob("autosave_*.xps"), key=lambda p: p.stat().st_mtime_ns)
+                written.append(newest.name)
+                # Keep mtimes distinct on coarse-grained filesystems
+                os.utime(newest, ns=(step * 10 ** 9, step * 10 ** 9))
+        finally:
+            autosaver.shutdown()
+        assert written == ["autosave_0.xps", "autosave_1.xps", "autosave_0.xps"]
+
+
+class TestComponentSerializers:
+    """Tests for the schema-derived component serializer registry."""
+
+    def test_world_round_trip_keeps_every_component(self):
+        import io
+        from src.entities.celestial import create_solar_system
+        from src.entities.stations import create_station, StationType
+        from src.entities.ships import create_ship, ShipType, ShipState
+        from src.simulation.trade import ManualRoute, Waypoint
+        from src.simulation.resources import Inventory, ResourceType
+        from src.solar_system.observation import get_observer_view
+        from src.systems.save_load import write_save, read_save, entity_components
+
+        world = World()
+        em = world.entity_manager
+        create_solar_system(world)
+        station = create_station(world, "Depot", StationType.REFINERY, (1.0, 0.0), parent_body="Earth")
+        ship = create_ship(world, "Hauler", ShipType.FREIGHTER, (1.0, 0.5))
+        em.get_component(station, Inventory).reservations.reserve(ship.id, ResourceType.IRON_ORE, 5.0, 10.0)
+        em.add_component(ship, ManualRoute(waypoints=[Waypoint(station.id, "Depot", ResourceType.IRON_ORE)]))
+        em.add_component(ship, ShipState(state_data={"target": station.id, "at": (1.0, 2.0)}))
+        get_observer_view(em).set_view([(0.0, 0.0, 1.0, 1.0)])
+
+        buffer = io.BytesIO()
+        write_save(world, buffer)
+        buffer.seek(0)
+        loaded = World()
+        read_save(loaded, buffer)
+
+        assert loaded.entity_manager.get_entity_by_name("Observer View") is None
+        for entity in em._entities.values():
+            if entity.name == "Observer View":
+                continue
+            restored = loaded.entity_manager.get_entity(entity.id)
+            assert entity_components(loaded.entity_manager, restored) == entity_components(em, entity)
+
+    def test_decoder_follows_saved_field_order(self):
+        from src.entities.ships import Ship, ShipType
+        from src.systems.serializers import SerializerRegistry
+
+        serializer = SerializerRegistry().get(Ship)
+        ship = Ship(ship_type=ShipType.TANKER, max_speed=4.0, crew=3)
+        values = dict(zip(serializer.field_names, serializer.encode(ship)))
+        assert values["ship_type"] == ShipType.TANKER.value
+
+        # An older save without crew, plus a field that no longer exists
+        saved_fields = ["retired_field", "max_speed", "ship_type"]
+        decoded = serializer.decoder(saved_fields)([True, 4.0, values["ship_type"]])
+        assert decoded == Ship(ship_type=ShipType.TANKER, max_speed=4.0)
+
+    def test_capture_copies_only_mutable_state(self):
+        from uuid import uuid4
+        from src.simulation.resources import Inventory, ResourceType
+        from src.systems.serializers import SerializerRegistry
+
+        serializer = SerializerRegistry().get(Inventory)
+        inventory = Inventory(capacity=50.0)
+        inventory.resources[ResourceType.WATER] = 3.0
+        columns = serializer.capture([inventory])
+        inventory.resources[ResourceType.WATER] = 9.0
+        holder = uuid4()
+        inventory.reservations.reserve(holder, ResourceType.WATER, 1.0, 5.0)
+
+        (copy,) = serializer.rebuild(columns, 1)
+        assert copy.resources == {ResourceType.WATER: 3.0}
+        assert copy.capacity == 50.0
+        assert not copy.reservations.entries
+        assert inventory.reservations.entries[(holder, ResourceType.WATER)].amount == 1.0
+
+    def test_save_data_only_names_game_types(self):
+        from src.entities.ships import ShipType
+        from src.systems.serializers import decode_any, get_serializer_registry
+
+        assert decode_any(["e", "src.entities.ships:ShipType", ShipType.TANKER.value]) is ShipType.TANKER
+        for data in (
+            ["e", "builtins:print", "x"],
+            ["e", "os:system", "true"],
+            ["e", "src.entities.ships:Ship", "x"],  # A dataclass, not an enum
+            ["o", "src.entities.ships:ShipType", {}],
+            ["e", "src.entities.ships:create_ship", "x"],
+        ):
+            with pytest.raises(ValueError):
+                decode_any(data)
+        with pytest.raises(ValueError):
+            get_serializer_registry().decoders({"Ship": {"type": "subprocess:Popen", "fields": []}})
+
+
+class TestDeltaSaves:
+    """Tests for base-plus-delta quicksaves."""
+
+    def _assert_same(self, world: World, loaded: World) -> None:
+        from src.systems.save_load import entity_components
+
+        em, loaded_em = world.entity_manager, loaded.entity_manager
+        assert set(em._entities) == set(loaded_em._entities)
+        for entity in em._entities.values():
+            restored = loaded_em.get_entity(entity.id)
+            assert (restored.name, restored.tags) == (entity.name, entity.tags)
+            assert entity_components(loaded_em, restored) == entity_components(em, entity)
+
+    def test_delta_chain_round_trip(self, tmp_path, monkeypatch):
+        from src.solar_system.orbits import Velocity
+        from src.entities.ships import ShipState
+        from src.systems import save_load
+        from src.systems.delta_save import DeltaSaver, delta_path
+
+        monkeypatch.setattr(save_load, "SAVE_DIR", tmp_path)
+        world = TestBinarySaves()._world()
+        em = world.entity_manager
+        saver = DeltaSaver("quick")
+        assert saver.save(world)[0]
+
+        # Change a handful of entities between saves
+        em.get_component(em.get_entity_by_name("Ship 1"), Position).x = 7.0
+        em.add_component(em.get_entity_by_name("Ship 2"), ShipState())
+        em.remove_component(em.get_entity_by_name("Ship 3"), Velocity)
+        em.destroy_entity(em.get_entity_by_name("Ship 4"))
+        em.get_entity_by_name("Ship 5").tags.add("docked")
+        assert saver.save(world) == (True, "Game saved to quick.xps (5 changed)")
+        em.add_component(em.create_entity("Newcomer"), Position(x=3.0))
+        assert saver.save(world)[0]
+
+        assert delta_path(saver.base_path, 1).stat().st_size < saver.base_path.stat().st_size / 20
+        for load in (DeltaSaver("quick").load, lambda w: save_load.load_game(w, saver.base_path)):
+            loaded = World()
+            assert load(loaded)[0]
+            self._assert_same(world, loaded)
+
+    def test_new_base_discards_old_chain(self, tmp_path, monkeypatch):
+        from src.systems import save_load
+        from src.systems.delta_save import DeltaSaver, delta_path
+
+        monkeypatch.setattr(save_load, "SAVE_DIR", tmp_path)
+        world = TestBinarySaves()._world()
+        saver = DeltaSaver("quick", max_deltas=1)
+        assert saver.save(world)[0]
+        assert saver.save(world)[0]
+        assert delta_path(saver.base_path, 1).exists()
+
+        # A load continues the chain; the next save is past max_deltas
+        resumed = DeltaSaver("quick", max_deltas=1)
+        loaded = World()
+        assert resumed.load(loaded)[0]
+        loaded.entity_manager.get_component(loaded.entity_manager.get_entity_by_name("Ship 9"), Position).x = 1.0
+        assert resumed.save(loaded)[0]
+        assert not delta_path(saver.base_path, 1).exists()
+
+        final = World()
+        assert DeltaSaver("quick").load(final)[0]
+        self._assert_same(loaded, final)
+
+    def test_static_components_stay_out_of_deltas(self, tmp_path, monkeypatch):
+        from src.entities.celestial import CelestialBody, create_solar_system
+        from src.systems import save_load
+        from src.systems.delta_save import DeltaSaver, delta_path
+        from src.systems.save_format import SaveReader
+
+        monkeypatch.setattr(save_load, "SAVE_DIR", tmp_path)
+        world = World()
+        world.add_system(OrbitalSystem())
+        create_solar_system(world)
+        em = world.entity_manager
+        saver = DeltaSaver("quick")
+        assert saver.save(world)[0]
+        assert all(len(digest) == 16 for digests in saver._fingerprints.values() for digest in digests.values())
+
+        for _ in range(3):
+            world.update(2.5)
+            assert saver.save(world)[0]
+        with open(delta_path(saver.base_path, 3), "rb") as f:
+            names = {name for record in SaveReader(f) for name in record["components"]}
+        assert names == {"Position"}
+
+        loaded = World()
+        assert DeltaSaver("quick").load(loaded)[0]
+        loaded_em = loaded.entity_manager
+        for entity, orbit in em.get_all_components(Orbit):
+            restored = loaded_em.get_entity(entity.id)
+            assert loaded_em.get_component(restored, Orbit).current_angle == pytest.approx(orbit.current_angle)
+            assert loaded_em.get_component(restored, CelestialBody) == em.get_component(entity, CelestialBody)
+
+
+class TestTrailStore:
+    """Tests for ring-buffer trail storage."""
+
+    def _ship(self, em: EntityManager, name: str) -> Entity:
+        from src.entities.ships import Ship
+        from src.solar_system.orbits import Velocity
+
+        ship = em.create_entity(name)
+        em.add_component(ship, Ship())
+        em.add_component(ship, Position(x=0.0, y=0.0))
+        em.add_component(ship, Velocity(vx=1.0, vy=0.0))
+        return ship
+
+    def test_ring_keeps_newest_points_in_order(self):
+        from src.entities.trails import Trail, TrailStore, get_trail_store
+        from src.solar_system.orbits import Velocity
+        from src.systems.trail_system import TrailSystem
+
+        em = EntityManager()
+        ship = self._ship(em, "Runner")
+        system = TrailSystem()
+        for step in range(1, 46):
+            em.get_component(ship, Position).x = float(step)
+            system.update(0.1, em)
+
+        trail = em.get_component(ship, Trail)
+        store = get_trail_store(em)
+        assert trail.count == trail.length == 30
+        assert len(store.segments(trail)) == 2  # Wrapped around the ring
+        xs, ys, ages = store.points(trail)
+        assert list(xs) == [float(step) for step in range(16, 46)]
+        assert ages[0] > ages[-1] >= 0.0
+
+        # A stopped ship's trail fades out by birth time
+        em.get_component(ship, Velocity).vx = 0.0
+        for _ in range(30):
+            system.update(0.1, em)
+        assert 0 < trail.count < 30
+        system.update(2.5, em)
+        assert trail.count == 0
+        assert em.get_resource(TrailStore) is store
+
+    def test_rows_are_reused_after_destroy(self):
+        from src.entities.trails import Trail
+        from src.systems.trail_system import TrailSystem
+
+        world = World()
+        em = world.entity_manager
+        system = TrailSystem()
+        world.add_system(system)
+        first, second = self._ship(em, "A"), self._ship(em, "B")
+        system.update(0.2, em)
+        rows = {em.get_component(first, Trail).row, em.get_component(second, Trail).row}
+        assert rows == {0, 1}
+
+        world.destroy_entity(first)
+        third = self._ship(em, "C")
+        system.update(0.2, em)
+        assert em.get_component(third, Trail).row in rows - {em.get_component(second, Trail).row}
+
+
+    def test_gather_matches_per_trail_points(self):
+        from src.entities.trails import Trail, get_trail_store
+        from src.systems.trail_system import TrailSystem
+
+        em = EntityManager()
+        ships = [self._ship(em, f"S{i}") for i in range(3)]
+        system = TrailSystem()
+        for step in range(1, 40):
+            for i, ship in enumerate(ships[:step]):
+                em.get_component(ship, Position).x = float(step + 100 * i)
+            system.update(0.1, em)
+
+        store = get_trail_store(em)
+        trails = [em.get_component(ship, Trail) for ship in ships]
+        xs, ys, ages, counts = store.gather(trails)
+        for i, trail in enumerate(trails):
+            px, py, page = store.points(trail)
+            assert counts[i] == trail.count
+            assert list(xs[i, :trail.count]) == list(px)
+            assert list(ages[i, :trail.count]) == list(page)
+
+class TestShipAIScheduling:
+    """Tests for the budgeted ship AI decision queue."""
+
+    class _CountingBehavior:
+        """Patrol stand-in that records which ships it decided for."""
+
+        def __init__(self, target=None, wait=100.0):
+            self.decided = []
+            self.target = target
+            self.wait = wait
+
+        def update(self, ctx):
+            from src.ai.behaviors import BehaviorResult, BehaviorStatus
+            self.decided.append(ctx.ship_entity.id)
+            if self.target:
+                return BehaviorResult(
+                    status=BehaviorStatus.RUNNING, target_x=self.target[0], target_y=self.target[1]
+                )
+            return BehaviorResult(status=BehaviorStatus.WAITING, wait_time=self.wait)
+
+        def on_enter(self, ctx):
+            pass
+
+        def on_exit(self, ctx):
+            pass
+
+        def can_activate(self, ctx):
+            return True
+
+    def _make_world(self, behavior, max_decisions=None):
+        from src.systems.ship_ai_v2 import ShipAISystemV2
+        from src.entities.ships import create_ship, ShipType
+
+        world = World()
+        ai = ShipAISystemV2(world.event_bus, time_budget_ms=None, max_decisions_per_tick=max_decisions)
+        ai.register_behavior("patrol", behavior)
+        world.add_system(ai)
+        ships = [
+            create_ship(world, f"Ship {i}", ShipType.FREIGHTER, (1.0 + i, 0.0))
+            for i in range(5)
+        ]
+        return world, ai, ships
+
+    def test_decisions_spread_across_ticks_in_order(self):
+        """Test that a decision cap spreads a burst of idle ships over ticks."""
+        behavior = self._CountingBehavior()
+        world, _, ships = self._make_world(behavior, max_decisions=2)
+
+        world.update(0.1)
+        assert behavior.decided == [ships[0].id, ships[1].id]
+
+        world.update(0.1)
+        world.update(0.1)
+        world.update(0.1)
+        assert behavior.decided == [ship.id for ship in ships]
+
+    def test_ship_with_no_wait_is_decided_once_per_tick(self):
+        """Test that a ship requeued with no wait waits for the next tick."""
+        behavior = self._CountingBehavior(wait=0.0)
+        world, _, ships = self._make_world(behavior)
+
+        world.update(0.1)
+        assert behavior.decided == [ship.id for ship in ships]
+
+        world.update(0.1)
+        assert behavior.decided == [ship.id for ship in ships] * 2
+
+    def test_ships_in_transit_are_not_visited_until_arrival(self):
+        """Test that navigating ships leave the queue until navigation reports arrival."""
+        from src.core.events import NavigationArrivedEvent
+        from src.solar_system.orbits import NavigationTarget
+
+        behavior = self._CountingBehavior(target=(50.0, 50.0))
+        world, ai, ships = self._make_world(behavior)
+
+        for _ in range(30):
+            world.update(0.1)
+        assert len(behavior.decided) == 5
+        assert all(ai.get_ship_state(ship.id).in_transit for ship in ships)
+
+        em = world.entity_manager
+        em.remove_component(ships[2], NavigationTarget)
+        world.event_bus.publish(NavigationArrivedEvent(entity_id=ships[2].id))
+        world.update(0.1)
+        assert behavior.decided[5:] == [ships[2].id]
+
+    def test_ships_loaded_without_notice_are_enrolled(self):
+        """Test that ships restored straight into the entity manager get decisions."""
+        from src.entities.ships import Ship
+
+        behavior = self._CountingBehavior(target=(50.0, 50.0))
+        world, ai, ships = self._make_world(behavior)
+        world.update(0.1)
+        world.update(0.1)
+        assert len(behavior.decided) == 5
+
+        # As when loading: entities come back without creation notices
+        em = world.entity_manager
+        saved = [(ship, em.get_component(ship, Ship), em.get_component(ship, Position)) for ship in ships[:3]]
+        em.clear()
+        for ship, ship_comp, pos in saved:
+            restored = em.create_entity(ship.name, entity_id=ship.id)
+            em.add_component(restored, ship_comp)
+            em.add_component(restored, Position(x=pos.x, y=pos.y))
+        world.update(0.1)
+
+        assert behavior.decided[5:] == [ship.id for ship in ships[:3]]
+        assert ai.get_ship_state(ships[4].id) is None
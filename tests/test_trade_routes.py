@@ -0,0 +1,596 @@
+"""Tests for spatial indexing and trade route discovery."""
+import math
+import pytest
+from uuid import uuid4
+from src.core.world import World
+from src.core.events import PriceChangeEvent, StationBuiltEvent
+from src.entities.stations import create_station, StationType
+from src.simulation.resources import ResourceType, Inventory
+from src.solar_system.orbits import Position
+from src.simulation.economy import Market, find_best_trade
+from src.simulation.trade import TradeRoute, reserve_route, release_route
+from src.ai.trade_routes import TradeRouteFinder
+from src.core.spatial import SpatialIndex, BodyRelativeIndex
+from src.ai.route_planner import RoutePlanner
+from src.ai.trade_assignment import TradeAssignmentSolver, AssignmentMode, IdleTrader
+from src.systems.spatial_index import SpatialIndexSystem
+
+
+def _make_trade_pair(world):
+    """Create a mining station selling iron ore and a refinery buying it."""
+    mine = create_station(
+        world, "Mine", StationType.MINING_STATION, (1.0, 0.0),
+        initial_resources={ResourceType.IRON_ORE: 500},
+    )
+    refinery = create_station(world, "Refinery", StationType.REFINERY, (1.2, 0.0))
+    em = world.entity_manager
+    em.get_component(mine, Market).prices[ResourceType.IRON_ORE] = 10
+    em.get_component(refinery, Market).prices[ResourceType.IRON_ORE] = 40
+    return mine, refinery
+
+
+def _add_market(world, name, position, sells=None, buys=None, stock=None, credits=10000.0):
+    """Create a bare market station with the given quotes and stock."""
+    em = world.entity_manager
+    entity = world.create_entity(name)
+    market = Market(credits=credits)
+    inv = Inventory(capacity=1000)
+    for resource, price in (sells or {}).items():
+        market.sells[resource] = True
+        market.prices[resource] = price
+    for resource, price in (buys or {}).items():
+        market.buys[resource] = True
+        market.prices[resource] = price
+    for resource, amount in (stock or {}).items():
+        inv.add(resource, amount)
+    em.add_component(entity, market)
+    em.add_component(entity, inv)
+    em.add_component(entity, Position(x=position[0], y=position[1]))
+    return entity
+
+
+class TestSpatialIndex:
+    """Tests for the grid spatial index."""
+
+    def test_negative_coordinates_use_own_cells(self):
+        """Test that positions either side of the origin land in different cells."""
+        index = SpatialIndex(cell_size=1.0)
+        left, right = uuid4(), uuid4()
+        index.update(left, -0.5, 0.0)
+        index.update(right, 0.5, 0.0)
+
+        assert index._keys[left] != index._keys[right]
+        assert list(index.get_nearby(-0.5, 0.0, 0.1)) == [left]
+
+    def test_k_nearest_orders_by_distance(self):
+        """Test k-nearest search across cells, with a predicate and radius."""
+        index = SpatialIndex(cell_size=0.5)
+        ids = [uuid4() for _ in range(4)]
+        for entity_id, x in zip(ids, [0.1, -0.7, 2.0, -6.0]):
+            index.update(entity_id, x, 0.0)
+
+        nearest = index.k_nearest(0.0, 0.0, k=3)
+        assert [entity_id for entity_id, _ in nearest] == ids[:3]
+        assert nearest[0][1] == pytest.approx(0.1)
+
+        far_only = index.k_nearest(0.0, 0.0, k=1, predicate=lambda e: e == ids[3])
+        assert far_only[0][0] == ids[3]
+        assert index.k_nearest(0.0, 0.0, k=4, max_radius=1.0) == nearest[:2]
+
+    def test_incremental_move_and_box_query(self):
+        """Test that moved entities leave their old cell and box queries see them."""
+        index = SpatialIndex(cell_size=0.5)
+        entity_id = uuid4()
+        index.update(entity_id, 0.1, 0.1)
+        index.update(entity_id, 3.1, -2.1)
+
+        assert list(index.get_in_box(0.0, 0.0, 1.0, 1.0)) == []
+        assert list(index.get_in_box(3.0, -3.0, 4.0, -2.0)) == [entity_id]
+        assert len(index._cells) == 1
+
+        index.remove(entity_id)
+        assert entity_id not in index
+        assert not index._cells
+
+    def test_body_relative_entities_follow_their_body(self):
+        """Test that parked entities move with their body without re-indexing."""
+        index = BodyRelativeIndex()
+        index.update_body("Earth", 1.0, 0.0)
+        parked, free = uuid4(), uuid4()
+        index.attach(parked, "Earth", 0.02, 0.0)
+        index.update(free, -3.0, 0.0)
+
+        index.update_body("Earth", 0.0, 1.0)
+
+        assert index.get_position(parked) == pytest.approx((0.02, 1.0))
+        assert list(index.get_nearby(0.0, 1.0, 0.05)) == [parked]
+        assert index.k_nearest(0.0, 0.0, k=2)[0] == (parked, pytest.approx(math.hypot(0.02, 1.0)))
+
+        # Leaving orbit moves the entity back into world space
+        index.update(parked, 5.0, 5.0)
+        assert list(index.get_nearby(0.0, 1.0, 0.05)) == []
+        assert len(index) == 2
+
+    def test_system_tracks_stations_and_destruction(self):
+        """Test that the system indexes stations and drops destroyed ones."""
+        world = World()
+        mine, refinery = _make_trade_pair(world)
+        system = SpatialIndexSystem()
+        world.add_system(system)
+        world.update(0.1)
+
+        assert set(system.stations.get_nearby(1.1, 0.0, 0.5)) == {mine.id, refinery.id}
+
+        world.destroy_entity(mine)
+        assert mine.id not in system.stations
+
+    def test_system_syncs_only_moving_and_changed_entities(self):
+        """Test that ships are resynced while under way and when they park."""
+        from src.core.events import NavigationArrivedEvent
+        from src.entities.celestial import CelestialBody
+        from src.entities.ships import Ship
+        from src.solar_system.orbits import NavigationTarget, ParentBody
+
+        world = World()
+        em = world.entity_manager
+        system = SpatialIndexSystem(event_bus=world.event_bus, resync_frames=1000)
+        world.add_system(system)
+        earth = world.create_entity("Earth")
+        em.add_component(earth, CelestialBody())
+        em.add_component(earth, Position(x=1.0, y=0.0))
+        ship = world.create_entity("Ship")
+        em.add_component(ship, Ship())
+        pos = Position(x=3.0, y=0.0)
+        em.add_component(ship, pos)
+        world.update(0.1)
+        assert system.ships.get_position(ship.id) == (3.0, 0.0)
+
+        # Under way: tracked every frame
+        em.add_component(ship, NavigationTarget(target_x=1.0, target_y=0.0))
+        pos.x = 2.0
+        system.update(0.1, em)
+        assert system.ships.get_position(ship.id) == (2.0, 0.0)
+
+        # Parked: the arrival event moves it onto the body
+        em.remove_component(ship, NavigationTarget)
+        em.add_component(ship, ParentBody(parent_name="Earth", offset_x=0.01))
+        world.event_bus.publish(NavigationArrivedEvent(entity_id=ship.id, body_name="Earth"))
+        em.get_component(earth, Position).y = 0.5
+        system.update(0.1, em)
+        assert system.ships.get_position(ship.id) == pytest.approx((1.01, 0.5))
+
+
+class TestRouteCache:
+    """Tests for game-time route caching and event invalidation."""
+
+    def test_cache_uses_game_time(self):
+        """Test that cached routes only expire as game time advances."""
+        world = World()
+        mine, refinery = _make_trade_pair(world)
+        finder = TradeRouteFinder(world.entity_manager, cache_ttl=10.0)
+        ship_id = world.create_entity("Ship").id
+
+        route = finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100)
+        assert route is not None
+        assert route.source_id == mine.id
+        assert route.destination_id == refinery.id
+
+        # Change prices without an event - cached route is still served
+        world.entity_manager.get_component(refinery, Market).prices[ResourceType.IRON_ORE] = 5
+        assert finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100) is route
+
+        finder.set_game_time(11.0)
+        assert finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100) is None
+
+    def test_price_change_invalidates_station_routes(self):
+        """Test that a price change drops cached routes through that station."""
+        world = World()
+        mine, refinery = _make_trade_pair(world)
+        finder = TradeRouteFinder(world.entity_manager, event_bus=world.event_bus)
+        ship_id = world.create_entity("Ship").id
+
+        assert finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100) is not None
+
+        world.entity_manager.get_component(refinery, Market).prices[ResourceType.IRON_ORE] = 5
+        world.event_bus.publish(PriceChangeEvent(
+            station_id=refinery.id,
+            resource_type=ResourceType.IRON_ORE.value,
+            old_price=40, new_price=5,
+        ))
+
+        assert finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100) is None
+
+    def test_station_built_invalidates_nearby_queries(self):
+        """Test that a new station inside a ship's search area clears its cache."""
+        world = World()
+        _make_trade_pair(world)
+        finder = TradeRouteFinder(world.entity_manager, event_bus=world.event_bus)
+        ship_id = world.create_entity("Ship").id
+        finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100, max_distance=2.0)
+
+        far = world.create_entity("Far")
+        world.event_bus.publish(StationBuiltEvent(
+            station_id=far.id, faction_id=far.id, station_type="outpost",
+            position=(50.0, 50.0), cost=0,
+        ))
+        assert ship_id in finder._route_cache
+
+        near = world.create_entity("Near")
+        world.event_bus.publish(StationBuiltEvent(
+            station_id=near.id, faction_id=near.id, station_type="outpost",
+            position=(1.5, 0.0), cost=0,
+        ))
+        assert ship_id not in finder._route_cache
+
+    def test_invalidating_a_ship_unlinks_its_stations(self):
+        """Test that dropped caches don't leave ship IDs in the station lookup."""
+        world = World()
+        mine, refinery = _make_trade_pair(world)
+        finder = TradeRouteFinder(world.entity_manager, event_bus=world.event_bus)
+        ship_id = world.create_entity("Ship").id
+
+        finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100)
+        assert ship_id in finder._ships_by_station[mine.id]
+
+        finder.invalidate_cache(ship_id)
+        assert mine.id not in finder._ships_by_station
+        assert refinery.id not in finder._ships_by_station
+
+        # Expiry goes through the same path
+        finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100)
+        finder.set_game_time(100.0)
+        world.entity_manager.get_component(refinery, Market).prices[ResourceType.IRON_ORE] = 5
+        assert finder.find_best_route(ship_id, (1.0, 0.0), cargo_space=100) is None
+        assert not finder._ships_by_station
+
+    def test_station_built_attaches_parked_station(self):
+        """Test that a new station on a body is indexed relative to the body."""
+        from src.solar_system.orbits import ParentBody
+
+        world = World()
+        em = world.entity_manager
+        index = BodyRelativeIndex()
+        index.update_body("Mars", 1.5, 0.0)
+        finder = TradeRouteFinder(em, index, event_bus=world.event_bus, auto_update_index=False)
+
+        station = world.create_entity("Outpost")
+        em.add_component(station, ParentBody(parent_name="Mars", offset_x=0.02))
+        world.event_bus.publish(StationBuiltEvent(
+            station_id=station.id, faction_id=station.id, station_type="outpost",
+            position=(1.52, 0.0), cost=0,
+        ))
+
+        # Follows Mars instead of staying at the build position
+        index.update_body("Mars", 0.0, 1.5)
+        assert index.get_position(station.id) == pytest.approx((0.02, 1.5))
+
+
+class TestFindAllRoutes:
+    """Tests for vectorized route evaluation."""
+
+    def test_routes_sorted_and_limited(self):
+        """Test that routes come back best-first and capped at the limit."""
+        world = World()
+        mine, refinery = _make_trade_pair(world)
+        hub = create_station(world, "Hub", StationType.TRADE_HUB, (1.1, 0.1))
+        world.entity_manager.get_component(hub, Market).prices[ResourceType.IRON_ORE] = 60
+        finder = TradeRouteFinder(world.entity_manager)
+
+        routes = list(finder.find_all_routes((1.0, 0.0), cargo_space=100, limit=2))
+
+        assert len(routes) == 2
+        assert routes[0].score >= routes[1].score
+        assert routes[0].source_id == mine.id
+        assert routes[0].destination_id == hub.id
+        assert routes[0].amount == pytest.approx(100)
+        assert routes[0].profit_per_unit == pytest.approx(60 - 10 * 1.1 * 0.8)  # Mining markup
+
+    def test_no_routes_from_station_to_itself(self):
+        """Test that a station that buys and sells the same good is not paired with itself."""
+        world = World()
+        hub = create_station(world, "Hub", StationType.TRADE_HUB, (1.0, 0.0),
+                             initial_resources={ResourceType.IRON_ORE: 100})
+        create_station(world, "Outpost", StationType.OUTPOST, (1.1, 0.0))
+        finder = TradeRouteFinder(world.entity_manager)
+
+        routes = list(finder.find_all_routes((1.0, 0.0), cargo_space=100, min_profit=-1000))
+
+        assert all(r.source_id != r.destination_id for r in routes)
+
+
+class TestRoutePlanner:
+    """Tests for multi-leg tour planning."""
+
+    def test_chains_return_leg_instead_of_deadheading(self):
+        """Test that a round trip beats the best single hop per travel-day."""
+        world = World()
+        mine = _add_market(
+            world, "Mine", (0.0, 0.0),
+            sells={ResourceType.IRON_ORE: 10}, buys={ResourceType.REFINED_METAL: 80},
+            stock={ResourceType.IRON_ORE: 100},
+        )
+        refinery = _add_market(
+            world, "Refinery", (1.0, 0.0),
+            sells={ResourceType.REFINED_METAL: 20}, buys={ResourceType.IRON_ORE: 40},
+            stock={ResourceType.REFINED_METAL: 100},
+        )
+        # Pays slightly more for ore, but is far away
+        _add_market(world, "Outpost", (10.0, 0.0), buys={ResourceType.IRON_ORE: 45})
+
+        tour = RoutePlanner().plan(world.entity_manager, (0.0, 0.0), cargo_capacity=100, speed=0.1)
+
+        assert [(leg.source_id, leg.destination_id) for leg in tour.legs] == [
+            (mine.id, refinery.id), (refinery.id, mine.id)
+        ]
+        assert tour.total_profit == pytest.approx(100 * (40 - 11) + 100 * (80 - 22))
+        assert tour.travel_days == pytest.approx(24.0)
+
+    def test_evaluate_leg_rejects_stale_leg(self):
+        """Test that a planned leg is dropped once its spread disappears."""
+        world = World()
+        mine = _add_market(world, "Mine", (0.0, 0.0), sells={ResourceType.IRON_ORE: 10},
+                                stock={ResourceType.IRON_ORE: 100})
+        buyer = _add_market(world, "Buyer", (1.0, 0.0), buys={ResourceType.IRON_ORE: 40})
+        planner = RoutePlanner()
+
+        leg = planner.evaluate_leg(world.entity_manager, mine.id, buyer.id, cargo_capacity=50)
+        assert leg.amount == 50
+
+        world.entity_manager.get_component(buyer, Market).prices[ResourceType.IRON_ORE] = 12
+        assert planner.evaluate_leg(world.entity_manager, mine.id, buyer.id, cargo_capacity=50) is None
+
+    def _round_trip_world(self):
+        world = World()
+        _add_market(
+            world, "Mine", (0.0, 0.0),
+            sells={ResourceType.IRON_ORE: 10}, buys={ResourceType.REFINED_METAL: 80},
+            stock={ResourceType.IRON_ORE: 100},
+        )
+        _add_market(
+            world, "Refinery", (1.0, 0.0),
+            sells={ResourceType.REFINED_METAL: 20}, buys={ResourceType.IRON_ORE: 40},
+            stock={ResourceType.REFINED_METAL: 100},
+        )
+        _add_market(world, "Outpost", (3.0, 1.0), buys={ResourceType.IRON_ORE: 45}, credits=900.0)
+        return world
+
+    def test_snapshot_plan_matches_live_plan(self):
+        """Test that planning from a snapshot finds the same tour as live markets."""
+        world = self._round_trip_world()
+        snapshot = TradeRouteFinder(world.entity_manager).build_snapshot()
+        planner = RoutePlanner()
+
+        live = planner.plan(world.entity_manager, (0.5, 0.5), cargo_capacity=80, speed=0.1)
+        planned = planner.plan_snapshot(snapshot, (0.5, 0.5), cargo_capacity=80, speed=0.1)
+
+        assert planned.legs == live.legs
+        assert planned.travel_days == pytest.approx(live.travel_days)
+
+    def test_plans_share_index_seeded_memo_within_a_tick(self):
+        """Test that plans at one game time reuse legs, seeded from the opportunity index."""
+        from src.simulation.economy import OpportunityIndex
+
+        world = self._round_trip_world()
+        em = world.entity_manager
+        index = OpportunityIndex()
+        index.rebuild(em)
+        planner = RoutePlanner(opportunity_index=index)
+
+        first = planner.plan(em, (0.5, 0.5), cargo_capacity=80, speed=0.1, game_time=1.0)
+        leg = first.legs[0]
+        em.get_component(em.get_entity(leg.source_id), Market).prices[leg.resource] = 1000
+
+        # Same tick: the memoized legs still stand
+        assert planner.plan(em, (0.5, 0.5), cargo_capacity=80, speed=0.1, game_time=1.0).legs == first.legs
+        later = planner.plan(em, (0.5, 0.5), cargo_capacity=80, speed=0.1, game_time=2.0)
+        assert leg not in later.legs
+
+    def test_start_id_fixes_first_source(self):
+        """Test that an onward tour leaves from the station the ship is headed to."""
+        world = self._round_trip_world()
+        em = world.entity_manager
+        refinery = next(e for e in em.get_entities_with(Market) if e.name == "Refinery")
+
+        tour = RoutePlanner().plan(em, (0.0, 0.0), cargo_capacity=80, speed=0.1, start_id=refinery.id)
+
+        assert tour.legs[0].source_id == refinery.id
+
+    def test_planning_pool_answers_from_worker_process(self):
+        """Test that a published snapshot is planned in a worker and collected later."""
+        import time
+        from src.ai.planning_pool import PlanningPool
+        from src.core.events import MarketsUpdatedEvent
+
+        world = self._round_trip_world()
+        finder = TradeRouteFinder(world.entity_manager, event_bus=world.event_bus, publish_snapshots=True)
+        world.event_bus.publish(MarketsUpdatedEvent(game_time=0.0))
+        assert len(finder.snapshot) == 3
+
+        pool = PlanningPool(max_workers=1)
+        ship_id = uuid4()
+        try:
+            pool.submit(ship_id, RoutePlanner(), finder.snapshot, (0.5, 0.5), 80, 0.1)
+            deadline = time.monotonic() + 30.0
+            while pool.is_pending(ship_id) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            tour = pool.take(ship_id)
+        finally:
+            pool.shutdown()
+
+        live = RoutePlanner().plan(world.entity_manager, (0.5, 0.5), cargo_capacity=80, speed=0.1)
+        assert tour.legs == live.legs
+        assert not pool.is_ready(ship_id)
+
+
+class TestLocalSupplyIndex:
+    """Tests for the per-system drone supply index."""
+
+    def _drone_world(self):
+        from src.entities.ships import create_drone
+
+        world = World()
+        home = create_station(world, "Home Refinery", StationType.REFINERY, (1.0, 0.0), parent_body="Earth")
+        lunar = create_station(
+            world, "Lunar Mine", StationType.MINING_STATION, (1.02, 0.0), parent_body="Moon",
+            initial_resources={ResourceType.IRON_ORE: 100},
+        )
+        # Closer, but in another planetary system
+        create_station(
+            world, "Stray Mine", StationType.MINING_STATION, (1.01, 0.0), parent_body="Mars",
+            initial_resources={ResourceType.IRON_ORE: 100},
+        )
+        drone = create_drone(world, "Drone", (1.0, 0.0), uuid4(), home.id, "Earth")
+        return world, home, lunar, drone
+
+    def _context(self, world, drone):
+        from src.ai.behaviors import BehaviorContext
+        from src.entities.ships import Ship
+
+        em = world.entity_manager
+        return BehaviorContext(
+            entity_manager=em, ship_entity=drone, ship=em.get_component(drone, Ship),
+            position=em.get_component(drone, Position), dt=0.0, game_time=0.0,
+        )
+
+    def test_indexed_pickup_matches_scan_and_tracks_stock(self):
+        """Test that the index finds the same pickup as a scan and notices stock changes."""
+        from src.ai.behaviors import DroneBehavior
+        from src.ai.supply_index import LocalSupplyIndex
+
+        world, home, lunar, drone = self._drone_world()
+        em = world.entity_manager
+        for resource in list(em.get_component(home, Inventory).resources):
+            em.get_component(home, Inventory).remove(resource, 1e9)
+        ctx = self._context(world, drone)
+        scan = DroneBehavior()
+        indexed = DroneBehavior(supply_index=LocalSupplyIndex())
+
+        expected = scan._find_pickup_target(ctx, home)
+        assert expected == (lunar.id, ResourceType.IRON_ORE)
+        assert indexed._find_pickup_target(ctx, home) == expected
+
+        em.get_component(lunar, Inventory).remove(ResourceType.IRON_ORE, 98)
+        assert scan._find_pickup_target(ctx, home) is None
+        assert indexed._find_pickup_target(ctx, home) is None
+
+
+def _ore_route(source, dest, amount=0.0):
+    """Iron ore route between two stations."""
+    return TradeRoute(source.id, dest.id, ResourceType.IRON_ORE, amount, 0.0)
+
+
+class TestReservations:
+    """Tests for stock and credit reservations on in-flight trades."""
+
+    def test_reservations_hide_claimed_stock_and_credits(self):
+        """Test that planners only see what other ships have not claimed."""
+        world = World()
+        em = world.entity_manager
+        mine = _add_market(world, "Mine", (0.0, 0.0), sells={ResourceType.IRON_ORE: 10},
+                           stock={ResourceType.IRON_ORE: 100})
+        buyer = _add_market(world, "Buyer", (1.0, 0.0), buys={ResourceType.IRON_ORE: 40})
+        ship_id = uuid4()
+
+        reserve_route(em, ship_id, _ore_route(mine, buyer, amount=60), expires_at=10.0)
+
+        inv = em.get_component(mine, Inventory)
+        market = em.get_component(buyer, Market)
+        assert inv.available(ResourceType.IRON_ORE) == 40
+        assert inv.available(ResourceType.IRON_ORE, ship_id) == 100
+        assert market.available_credits() == 10000 - 60 * 40
+        trade = find_best_trade(em.get_component(mine, Market), inv, market, em.get_component(buyer, Inventory), 100)
+        assert trade[1] == 40
+
+        # Claims lapse by game time if the ship never shows up
+        assert inv.reservations.expire(9.0) == 0
+        assert inv.reservations.expire(10.0) == 1
+        assert market.reservations.expire(10.0) == 1
+        assert inv.available(ResourceType.IRON_ORE) == 100
+        assert market.available_credits() == 10000
+
+
+class TestTradeAssignment:
+    """Tests for fleet-level trade assignment."""
+
+    def _make_market(self, world):
+        mine = _add_market(
+            world, "Mine", (0.0, 0.0),
+            sells={ResourceType.IRON_ORE: 10}, stock={ResourceType.IRON_ORE: 300},
+        )
+        buyer = _add_market(world, "Buyer", (1.0, 0.0), buys={ResourceType.IRON_ORE: 40}, credits=100000.0)
+        return mine, buyer
+
+    def test_greedy_does_not_oversubscribe_stock(self):
+        """Test that ships share the seller's stock instead of all claiming it."""
+        world = World()
+        mine, buyer = self._make_market(world)
+        em = world.entity_manager
+        solver = TradeAssignmentSolver(AssignmentMode.GREEDY)
+        traders = [IdleTrader(uuid4(), (0.0, 0.1 * i), 200, 0.1) for i in range(3)]
+
+        assigned = solver.solve(em, traders)
+
+        amounts = sorted(a.leg.amount for a in assigned.values())
+        assert amounts == [100, 200]
+        # Nearest ship gets the full load
+        assert assigned[traders[0].ship_id].leg.amount == 200
+
+        # Ships reserve what they take, so a later solve sees nothing left
+        for trader in traders:
+            assignment = solver.take_assignment(trader.ship_id)
+            if assignment:
+                leg = assignment.leg
+                route = TradeRoute(leg.source_id, leg.destination_id, leg.resource, leg.amount, leg.profit_per_unit)
+                reserve_route(em, trader.ship_id, route, expires_at=50.0)
+
+        late = IdleTrader(uuid4(), (0.0, 0.0), 200, 0.1)
+        assert solver.solve(em, [late]) == {}
+
+        # Releasing one claim frees its stock for the next solve
+        release_route(em, traders[0].ship_id, _ore_route(mine, buyer))
+        assert solver.solve(em, [late])[late.ship_id].leg.amount == 200
+
+    def test_shared_index_carries_claims_between_solves(self):
+        """Test that held and taken legs stay claimed across solves against the economy's index."""
+        from src.simulation.economy import OpportunityIndex
+
+        world = World()
+        self._make_market(world)
+        index = OpportunityIndex()
+        index.rebuild(world.entity_manager)
+        solver = TradeAssignmentSolver(AssignmentMode.GREEDY, opportunity_index=index)
+
+        first = IdleTrader(uuid4(), (0.0, 0.0), 200, 0.1)
+        held = solver.solve(world.entity_manager, [first])[first.ship_id]
+        assert held.leg.amount == 200
+
+        # Not taken yet: the first ship keeps its leg and the second gets the rest
+        second = IdleTrader(uuid4(), (0.0, 0.0), 200, 0.1)
+        assigned = solver.solve(world.entity_manager, [first, second])
+        assert list(assigned) == [second.ship_id]
+        assert assigned[second.ship_id].leg.amount == 100
+        # Deadhead and leg share one straight-line model: 1 AU at 0.1 AU/day plus docking
+        assert assigned[second.ship_id].profit_per_day == pytest.approx(100 * (40 - 11) / 12.0)
+
+        # Taking a leg claims it on the index until the next rebuild
+        assert solver.take_assignment(first.ship_id) is held
+        assert solver.take_assignment(second.ship_id).leg.amount == 100
+        late = IdleTrader(uuid4(), (0.0, 0.0), 200, 0.1)
+        assert solver.solve(world.entity_manager, [late]) == {}
+
+    def test_auction_gives_each_opportunity_one_ship(self):
+        """Test that auction mode spreads ships over distinct opportunities."""
+        world = World()
+        self._make_market(world)
+        _add_market(
+            world, "Mine2", (5.0, 0.0),
+            sells={ResourceType.IRON_ORE: 10}, stock={ResourceType.IRON_ORE: 300},
+        )
+        solver = TradeAssignmentSolver(AssignmentMode.AUCTION)
+        traders = [IdleTrader(uuid4(), (0.0, 0.0), 200, 0.1), IdleTrader(uuid4(), (5.0, 0.0), 200, 0.1)]
+
+        assigned = solver.solve(world.entity_manager, traders)
+
+        sources = {a.leg.source_id for a in assigned.values()}
+        assert len(assigned) == 2
+        assert len(sources) == 2